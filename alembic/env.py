@@ -20,6 +20,7 @@ from applications.capp.capp.core.database import (
     ComplianceRecord,
     Settlement,
     Refund,
+    PaymentStatsRollup,
 )
 from applications.capp.capp.config.settings import get_settings
 
@@ -0,0 +1,75 @@
+"""Add payment_stats_rollups table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00.000000
+
+payment_stats_rollups
+---------------------
+Hourly and daily pre-aggregates of payment count, amount and fees per
+corridor (sender_country → recipient_country) and status, bucketed by the
+payment's created_at. PaymentRepository keeps the rows up to date on every
+insert, status transition and delete, and answers get_statistics() from
+them instead of loading every payment in the range.
+
+The table is backfilled from the existing payments on upgrade.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'payment_stats_rollups',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+
+        # Bucket identity
+        # granularity: hour | day
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('sender_country', sa.String(length=3), nullable=False),
+        sa.Column('recipient_country', sa.String(length=3), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+
+        # Aggregates
+        sa.Column('payment_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('total_amount', sa.Numeric(precision=20, scale=2), nullable=False,
+                  server_default='0'),
+        sa.Column('total_fees', sa.Numeric(precision=20, scale=2), nullable=False,
+                  server_default='0'),
+
+        sa.Column('updated_at', sa.DateTime(), nullable=False,
+                  server_default=sa.text('now()')),
+
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('granularity', 'bucket_start', 'sender_country',
+                            'recipient_country', 'status',
+                            name='uq_payment_stats_rollup_bucket'),
+    )
+    op.create_index('idx_payment_stats_rollups_range',
+                    'payment_stats_rollups', ['granularity', 'bucket_start'])
+
+    # ── Backfill from existing payments ──────────────────────────────────────
+    for granularity in ('hour', 'day'):
+        op.execute(f"""
+            INSERT INTO payment_stats_rollups
+                (granularity, bucket_start, sender_country, recipient_country, status,
+                 payment_count, total_amount, total_fees)
+            SELECT '{granularity}', date_trunc('{granularity}', created_at),
+                   sender_country, recipient_country, status,
+                   count(*), coalesce(sum(amount), 0), coalesce(sum(fees), 0)
+            FROM payments
+            GROUP BY date_trunc('{granularity}', created_at),
+                     sender_country, recipient_country, status;
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_payment_stats_rollups_range', table_name='payment_stats_rollups')
+    op.drop_table('payment_stats_rollups')
@@ -0,0 +1,60 @@
+"""Add composite keyset-pagination indexes on payments
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+PaymentRepository listings paginate by cursor on (created_at, id) instead
+of OFFSET. Each listing filter gets a composite index ending in
+(created_at, id) so a page is a single index range scan at any depth:
+
+idx_payments_status_created_id   (status, created_at, id)
+idx_payments_sender_created      (sender_id, created_at, id)
+idx_payments_recipient_created   (recipient_id, created_at, id)
+idx_payments_corridor_created    (sender_country, recipient_country, created_at, id)
+
+The first three supersede idx_payments_status_created, idx_payments_sender_id
+and idx_payments_recipient_id, which are dropped. Indexes are built
+CONCURRENTLY so the payments table stays writable during the upgrade.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+_NEW_INDEXES = [
+    ('idx_payments_status_created_id', ['status', 'created_at', 'id']),
+    ('idx_payments_sender_created', ['sender_id', 'created_at', 'id']),
+    ('idx_payments_recipient_created', ['recipient_id', 'created_at', 'id']),
+    ('idx_payments_corridor_created', ['sender_country', 'recipient_country', 'created_at', 'id']),
+]
+
+_SUPERSEDED_INDEXES = [
+    ('idx_payments_status_created', ['status', 'created_at']),
+    ('idx_payments_sender_id', ['sender_id']),
+    ('idx_payments_recipient_id', ['recipient_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in _NEW_INDEXES:
+            op.create_index(name, 'payments', columns,
+                            postgresql_concurrently=True, if_not_exists=True)
+        for name, _ in _SUPERSEDED_INDEXES:
+            op.drop_index(name, table_name='payments',
+                          postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in _SUPERSEDED_INDEXES:
+            op.create_index(name, 'payments', columns,
+                            postgresql_concurrently=True, if_not_exists=True)
+        for name, _ in _NEW_INDEXES:
+            op.drop_index(name, table_name='payments',
+                          postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,38 @@
+"""Add partial index on settling payments for the watchdog
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+
+PaymentWatchdog pages through payments stuck in 'settling' by
+(settled_at, id). A partial index restricted to status = 'settling' stays
+small (only in-flight settlements) and serves that scan as a single range
+read, independent of how many historical payments the table holds:
+
+idx_payments_settling_settled_at   (settled_at, id) WHERE status = 'settling'
+
+Built CONCURRENTLY so the payments table stays writable during the upgrade.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_payments_settling_settled_at', 'payments', ['settled_at', 'id'],
+            postgresql_where=sa.text("status = 'settling'"),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_payments_settling_settled_at', table_name='payments',
+                      postgresql_concurrently=True, if_exists=True)
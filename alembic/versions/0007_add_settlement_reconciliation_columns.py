@@ -0,0 +1,39 @@
+"""Add settlement source wallet and confirmed_at index for reconciliation
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00.000000
+
+ReconciliationService keeps checkpointed running sums of confirmed
+settlements per (chain, currency, source wallet) and only reads rows
+confirmed since its last watermark:
+
+settlements.source_address            hot wallet the funds left from
+                                       (NULL = the chain's primary wallet)
+idx_settlements_status_confirmed      (status, confirmed_at)
+
+The index is built CONCURRENTLY so settlements stay writable during the
+upgrade.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('settlements', sa.Column('source_address', sa.String(length=255), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index('idx_settlements_status_confirmed', 'settlements', ['status', 'confirmed_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_settlements_status_confirmed', table_name='settlements',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_column('settlements', 'source_address')
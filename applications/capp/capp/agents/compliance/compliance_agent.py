@@ -589,8 +589,10 @@ class ComplianceAgent(BasePaymentAgent):
         try:
             # Call Fraud Service
             fraud_result = await self.fraud_service.analyze_transaction(
-                user_id=str(payment.sender.dict().get("sender_id", "anonymous")),
-                amount=float(payment.amount)
+                user_id=str(payment.sender.sender_id or payment.sender.phone_number),
+                amount=float(payment.amount),
+                recipient_id=str(payment.recipient.recipient_id or payment.recipient.phone_number),
+                corridor=f"{payment.from_currency.value}-{payment.to_currency.value}"
             )
             
             risk_score = fraud_result["risk_score"]
@@ -610,7 +612,8 @@ class ComplianceAgent(BasePaymentAgent):
                 details={
                     "violations": violations,
                     "required_actions": required_actions,
-                    "is_high_risk": fraud_result["is_high_risk"]
+                    "is_high_risk": fraud_result["is_high_risk"],
+                    "velocity_breaches": fraud_result["velocity_breaches"]
                 },
                 timestamp=datetime.now(timezone.utc),
                 duration_ms=processing_time
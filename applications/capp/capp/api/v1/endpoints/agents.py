@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from typing import List, Optional
 import uuid
-import secrets
 from datetime import datetime, timezone, timedelta
 from passlib.context import CryptContext
 
@@ -12,6 +11,7 @@ from applications.capp.capp.models.agent_credential import (
     AgentCredentialIssueResponse,
     AgentCredentialInDB
 )
+from applications.capp.capp.core.agent_api_keys import generate_agent_api_key, verified_key_cache
 
 router = APIRouter()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -19,6 +19,8 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # In-memory store for Phase 2 demonstration purposes
 # In a real deployment, this interfaces with SQLAlchemy
 mock_db_agent_creds = {}
+# Public key prefix -> credential id; a key is checked against exactly one hash
+mock_db_agent_key_prefixes = {}
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -26,6 +28,14 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def find_agent_cred_by_prefix(key_prefix: str) -> Optional[AgentCredentialInDB]:
+    credential_id = mock_db_agent_key_prefixes.get(key_prefix)
+    return mock_db_agent_creds.get(credential_id) if credential_id else None
+
+def _store_agent_cred(db_cred: AgentCredentialInDB) -> None:
+    mock_db_agent_creds[db_cred.id] = db_cred
+    mock_db_agent_key_prefixes[db_cred.key_prefix] = db_cred.id
+
 @router.post("/credentials", response_model=AgentCredentialIssueResponse, status_code=status.HTTP_201_CREATED)
 async def issue_agent_credential(cred_in: AgentCredentialCreate):
     """
@@ -33,7 +43,7 @@ async def issue_agent_credential(cred_in: AgentCredentialCreate):
     This links an agent to a human principal and establishes its spending limits.
     """
     # Generate a secure random API key
-    raw_api_key = f"capp_agent_{secrets.token_urlsafe(32)}"
+    raw_api_key, key_prefix = generate_agent_api_key("capp_agent_")
     hashed_key = get_password_hash(raw_api_key)
     
     expires_at = datetime.now(timezone.utc) + timedelta(days=cred_in.expiry_days)
@@ -41,11 +51,12 @@ async def issue_agent_credential(cred_in: AgentCredentialCreate):
     db_cred = AgentCredentialInDB(
         **cred_in.dict(exclude={"expiry_days"}),
         hashed_api_key=hashed_key,
+        key_prefix=key_prefix,
         expires_at=expires_at
     )
     
     # Store in mock DB
-    mock_db_agent_creds[db_cred.id] = db_cred
+    _store_agent_cred(db_cred)
     
     # Return response including the raw key (only time it is shown)
     response_data = db_cred.dict()
@@ -92,7 +103,7 @@ async def delegate_credential(parent_agent_id: str, cred_in: AgentCredentialCrea
               raise HTTPException(status_code=400, detail="Sub-agent corridors must be a subset of parent's allowed corridors.")
 
     # 4. Issue credential
-    raw_api_key = f"capp_subagent_{secrets.token_urlsafe(32)}"
+    raw_api_key, key_prefix = generate_agent_api_key("capp_subagent_")
     hashed_key = get_password_hash(raw_api_key)
     
     expires_at = datetime.now(timezone.utc) + timedelta(days=cred_in.expiry_days)
@@ -106,10 +117,11 @@ async def delegate_credential(parent_agent_id: str, cred_in: AgentCredentialCrea
     db_cred = AgentCredentialInDB(
         **cred_data,
         hashed_api_key=hashed_key,
+        key_prefix=key_prefix,
         expires_at=expires_at
     )
     
-    mock_db_agent_creds[db_cred.id] = db_cred
+    _store_agent_cred(db_cred)
     
     response_data = db_cred.dict()
     response_data["raw_api_key"] = raw_api_key
@@ -131,6 +143,8 @@ async def update_agent_credential(credential_id: uuid.UUID, update_data: AgentCr
     update_dict = update_data.dict(exclude_unset=True)
     for k, v in update_dict.items():
         setattr(db_cred, k, v)
+    if update_dict.get("is_active") is False:
+        verified_key_cache.invalidate(credential_id)
         
     return AgentCredentialResponse(**db_cred.dict())
 
@@ -143,5 +157,7 @@ async def revoke_agent_credential(credential_id: uuid.UUID):
     if credential_id not in mock_db_agent_creds:
         raise HTTPException(status_code=404, detail="Agent credential not found")
         
-    del mock_db_agent_creds[credential_id]
+    db_cred = mock_db_agent_creds.pop(credential_id)
+    mock_db_agent_key_prefixes.pop(db_cred.key_prefix, None)
+    verified_key_cache.invalidate(credential_id)
     return None
@@ -1,10 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from typing import Literal
-from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from applications.capp.capp.core.database import get_db
+from applications.capp.capp.core.database import AsyncSessionLocal
 from applications.capp.capp.services.compliance import ComplianceService
 from applications.capp.capp.api.dependencies.auth import get_current_user
 from applications.capp.capp.models.user import User
@@ -16,25 +15,28 @@ compliance_service = ComplianceService()
 async def download_compliance_report(
     report_type: Literal["CSV", "PDF"] = Query(..., description="Format of the report"),
     year: int = Query(..., description="Year for the report"),
-    current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
     """
     Generate and download a compliance report.
+
+    The report is streamed as it is generated; rows are read over a
+    server-side cursor on a session owned by the stream itself.
     """
     user_id = current_user.id
-    
-    try:
-        report = await compliance_service.generate_report(user_id, report_type, year, session)
-        
-        media_type = "text/csv" if report_type == "CSV" else "text/plain"
-        
-        return Response(
-            content=report["content"],
-            media_type=media_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={report['filename']}"
-            }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate report: {str(e)}")
+
+    async def body():
+        async with AsyncSessionLocal() as session:
+            async for chunk in compliance_service.stream_report(user_id, report_type, year, session):
+                yield chunk
+
+    media_type = "text/csv" if report_type == "CSV" else "text/plain"
+    filename = compliance_service.report_filename(report_type, year)
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
@@ -8,7 +8,7 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
@@ -206,8 +206,10 @@ class PaymentHistoryItem(BaseModel):
 
 @router.get("/history", response_model=List[PaymentHistoryItem])
 async def get_payment_history(
+    response: Response,
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
     status: Optional[PaymentStatus] = None,
     payment_service: PaymentService = Depends(),
     current_user: User = Depends(get_current_active_user)
@@ -215,17 +217,22 @@ async def get_payment_history(
     """
     Get payment history for the current user
 
-    Returns a list of payments sent or received by the user.
+    Returns a list of payments sent or received by the user, newest first.
+    When more payments exist, the ``X-Next-Cursor`` response header holds a
+    cursor to pass back as ``cursor`` for the next page.
 
     **Authentication required**: Bearer token
     """
     try:
-        payments = await payment_service.get_user_payments(
+        payments, next_cursor = await payment_service.get_user_payments_page(
             user_id=current_user.id,
             limit=limit,
-            offset=offset,
-            status=status.value if status else None
+            cursor=cursor,
+            status=status.value if status else None,
+            offset=offset
         )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         return [
             PaymentHistoryItem(
@@ -245,6 +252,9 @@ async def get_payment_history(
             for p in payments
         ]
 
+    except ValueError as e:
+        # Malformed cursor (``status`` is shadowed by the query parameter here)
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("Failed to fetch payment history", error=str(e))
         raise HTTPException(
@@ -71,6 +71,16 @@ class Settings(BaseSettings):
         default="capp.settlements",
         env="KAFKA_TOPIC_SETTLEMENTS"
     )
+    KAFKA_BROKER: str = Field(default="memory", env="KAFKA_BROKER")  # memory | file
+    KAFKA_FILE_BROKER_DIR: str = Field(default="data/events", env="KAFKA_FILE_BROKER_DIR")
+    KAFKA_LINGER_MS: int = Field(default=5, env="KAFKA_LINGER_MS")
+    KAFKA_BATCH_SIZE: int = Field(default=500, env="KAFKA_BATCH_SIZE")
+    KAFKA_BATCH_MAX_BYTES: int = Field(default=1048576, env="KAFKA_BATCH_MAX_BYTES")
+    KAFKA_COMPRESSION: str = Field(default="gzip", env="KAFKA_COMPRESSION")  # none | gzip | zstd | lz4
+    KAFKA_MAX_BUFFERED_EVENTS: int = Field(default=10000, env="KAFKA_MAX_BUFFERED_EVENTS")
+    KAFKA_BACKPRESSURE: str = Field(default="drop_oldest", env="KAFKA_BACKPRESSURE")  # drop_oldest | drop_new
+    KAFKA_MAX_RETRIES: int = Field(default=3, env="KAFKA_MAX_RETRIES")
+    KAFKA_RETRY_BACKOFF_MS: int = Field(default=100, env="KAFKA_RETRY_BACKOFF_MS")
     
     # Starknet Blockchain
     STARKNET_NODE_URL: str = Field(
@@ -155,6 +165,8 @@ class Settings(BaseSettings):
     # Fraud Detection
     FRAUD_DETECTION_ENABLED: bool = Field(default=True, env="FRAUD_DETECTION_ENABLED")
     FRAUD_THRESHOLD_SCORE: float = Field(default=0.8, env="FRAUD_THRESHOLD_SCORE")
+    # Comma-separated extra velocity rules (or "all"), e.g. "SENDER_VELOCITY_1M,RECIPIENT_VELOCITY_1H"
+    FRAUD_EXTRA_VELOCITY_RULES: str = Field(default="", env="FRAUD_EXTRA_VELOCITY_RULES")
     
     # Compliance
     COMPLIANCE_ENABLED: bool = Field(default=True, env="COMPLIANCE_ENABLED")
@@ -167,7 +179,50 @@ class Settings(BaseSettings):
     # Performance
     MAX_CONCURRENT_PAYMENTS: int = Field(default=10000, env="MAX_CONCURRENT_PAYMENTS")
     PAYMENT_BATCH_SIZE: int = Field(default=100, env="PAYMENT_BATCH_SIZE")
-    
+    METRICS_BUFFER_ENABLED: bool = Field(default=True, env="METRICS_BUFFER_ENABLED")
+    METRICS_FLUSH_INTERVAL_MS: int = Field(default=250, env="METRICS_FLUSH_INTERVAL_MS")
+    METRICS_MAX_PENDING_OPS: int = Field(default=5000, env="METRICS_MAX_PENDING_OPS")
+
+    # Dead Letter Queue retries
+    DLQ_RETRY_ENABLED: bool = Field(default=True, env="DLQ_RETRY_ENABLED")
+    DLQ_POLL_INTERVAL_MS: int = Field(default=1000, env="DLQ_POLL_INTERVAL_MS")
+    DLQ_CLAIM_BATCH_SIZE: int = Field(default=50, env="DLQ_CLAIM_BATCH_SIZE")
+    DLQ_BACKOFF_BASE_SECONDS: float = Field(default=5.0, env="DLQ_BACKOFF_BASE_SECONDS")
+    DLQ_BACKOFF_MAX_SECONDS: float = Field(default=3600.0, env="DLQ_BACKOFF_MAX_SECONDS")
+    DLQ_LEASE_SECONDS: int = Field(default=300, env="DLQ_LEASE_SECONDS")
+
+    # Human approvals
+    APPROVAL_TTL_SECONDS: int = Field(default=3600, env="APPROVAL_TTL_SECONDS")
+    APPROVAL_RETENTION_SECONDS: int = Field(default=604800, env="APPROVAL_RETENTION_SECONDS")  # 7 days
+    # How long /wallet/send holds an approval-gated payment open for a decision before
+    # answering PENDING_APPROVAL; only payments approved within it are executed (0 = answer at once)
+    APPROVAL_WAIT_SECONDS: float = Field(default=10.0, env="APPROVAL_WAIT_SECONDS")
+
+    # Reconciliation
+    # JSON list of hot wallets: [{"chain", "address", "token", "token_address", "opening_balance"}]
+    RECONCILIATION_WALLETS: str = Field(default="", env="RECONCILIATION_WALLETS")
+    RECONCILIATION_FETCH_TIMEOUT_SECONDS: float = Field(default=10.0, env="RECONCILIATION_FETCH_TIMEOUT_SECONDS")
+    RECONCILIATION_MAX_CONCURRENT_FETCHES: int = Field(default=16, env="RECONCILIATION_MAX_CONCURRENT_FETCHES")
+    RECONCILIATION_CONFIRMATION_LAG_SECONDS: int = Field(default=30, env="RECONCILIATION_CONFIRMATION_LAG_SECONDS")
+
+    # Agent API key authentication
+    AGENT_AUTH_HASH_WORKERS: int = Field(default=4, env="AGENT_AUTH_HASH_WORKERS")
+    AGENT_AUTH_CACHE_TTL_SECONDS: float = Field(default=60.0, env="AGENT_AUTH_CACHE_TTL_SECONDS")
+    AGENT_AUTH_CACHE_MAX_ENTRIES: int = Field(default=10000, env="AGENT_AUTH_CACHE_MAX_ENTRIES")
+
+    # API worker startup
+    # Integrations initialised / preloaded at startup; everything else loads on first use
+    API_FEATURES: str = Field(default="aptos,polygon,settlement", env="API_FEATURES")
+
+    # Chain event indexer
+    # JSON map of chain -> contract addresses to index: {"POLYGON": ["0x..."]}; empty = simulation
+    CHAIN_INDEXER_CONTRACTS: str = Field(default="", env="CHAIN_INDEXER_CONTRACTS")
+    CHAIN_INDEXER_CONFIRMATIONS: int = Field(default=12, env="CHAIN_INDEXER_CONFIRMATIONS")
+    CHAIN_INDEXER_INITIAL_RANGE: int = Field(default=2000, env="CHAIN_INDEXER_INITIAL_RANGE")
+    CHAIN_INDEXER_MAX_RANGE: int = Field(default=10000, env="CHAIN_INDEXER_MAX_RANGE")
+    CHAIN_INDEXER_TARGET_LOGS: int = Field(default=5000, env="CHAIN_INDEXER_TARGET_LOGS")
+    CHAIN_INDEXER_POLL_INTERVAL_SECONDS: float = Field(default=5.0, env="CHAIN_INDEXER_POLL_INTERVAL_SECONDS")
+
     # SMS/USSD Configuration
     SMS_PROVIDER: str = Field(default="twilio", env="SMS_PROVIDER")
     SMS_API_KEY: str = Field(default="", env="SMS_API_KEY")
@@ -186,6 +241,8 @@ class Settings(BaseSettings):
     # AI Providers
     GEMINI_API_KEY: Optional[str] = Field(default=None, env="GEMINI_API_KEY")
     GEMINI_MODEL: str = Field(default="gemini-2.0-flash", env="GEMINI_MODEL")
+    LLM_CACHE_ENABLED: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=1024, env="LLM_CACHE_MAX_ENTRIES")
     
     model_config = SettingsConfigDict(
         env_file=".env",
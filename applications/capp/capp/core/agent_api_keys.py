@@ -0,0 +1,169 @@
+"""
+Agent API key issuance and verification for CAPP
+
+Keys look like ``capp_agent_<prefix>_<secret>``. The prefix is public and
+indexed to exactly one credential, so authentication costs one lookup and
+at most one bcrypt check however many agents exist. bcrypt runs on a small
+dedicated thread pool instead of the event loop, and keys that verified
+recently are remembered by digest so repeat callers skip hashing entirely.
+"""
+
+import asyncio
+import hashlib
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+from uuid import UUID
+
+import structlog
+
+from applications.capp.capp.config.settings import settings
+from applications.capp.capp.models.agent_credential import AgentCredentialInDB
+
+logger = structlog.get_logger(__name__)
+
+AGENT_KEY_SCHEMES = ("capp_agent_", "capp_subagent_")
+KEY_PREFIX_BYTES = 6  # 12 hex chars
+
+
+def generate_agent_api_key(scheme: str = "capp_agent_") -> Tuple[str, str]:
+    """
+    Create a new raw API key.
+
+    Returns:
+        (raw_api_key, key_prefix)
+    """
+    key_prefix = secrets.token_hex(KEY_PREFIX_BYTES)
+    return f"{scheme}{key_prefix}_{secrets.token_urlsafe(32)}", key_prefix
+
+
+def parse_key_prefix(raw_api_key: str) -> Optional[str]:
+    """Lookup prefix of a raw key, or None if it is not an agent key"""
+    for scheme in AGENT_KEY_SCHEMES:
+        if raw_api_key.startswith(scheme):
+            key_prefix, sep, secret = raw_api_key[len(scheme):].partition("_")
+            if sep and secret and len(key_prefix) == 2 * KEY_PREFIX_BYTES:
+                return key_prefix
+            return None
+    return None
+
+
+def is_agent_api_key(raw_api_key: Optional[str]) -> bool:
+    return bool(raw_api_key) and raw_api_key.startswith(AGENT_KEY_SCHEMES)
+
+
+def key_digest(raw_api_key: str) -> str:
+    return hashlib.sha256(raw_api_key.encode()).hexdigest()
+
+
+class VerifiedKeyCache:
+    """
+    Short-lived memory of keys whose bcrypt check already passed.
+
+    Maps the SHA-256 digest of a raw key to the credential it verified
+    against and the bcrypt hash it matched. Only that binding is cached:
+    the credential itself is re-read on every hit, so deactivation and
+    expiry take effect immediately, and a rotated or deleted credential
+    no longer matches its cached hash and is dropped.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[UUID, str, float]]" = OrderedDict()
+
+    def get(self, digest: str) -> Optional[Tuple[UUID, str]]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        credential_id, hashed_api_key, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[digest]
+            return None
+        self._entries.move_to_end(digest)
+        return credential_id, hashed_api_key
+
+    def put(self, digest: str, credential_id: UUID, hashed_api_key: str) -> None:
+        self._entries[digest] = (credential_id, hashed_api_key, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, credential_id: UUID) -> None:
+        """Forget every key that verified against ``credential_id``"""
+        stale = [digest for digest, entry in self._entries.items() if entry[0] == credential_id]
+        for digest in stale:
+            del self._entries[digest]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+verified_key_cache = VerifiedKeyCache(
+    ttl_seconds=settings.AGENT_AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AGENT_AUTH_CACHE_MAX_ENTRIES,
+)
+
+# bcrypt is CPU-bound; cap how many cores auth may take from the process
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.AGENT_AUTH_HASH_WORKERS,
+    thread_name_prefix="agent-key-bcrypt",
+)
+
+
+class AgentKeyAuthenticator:
+    """
+    Resolves a raw agent API key to its credential.
+
+    Args:
+        find_by_prefix: Returns the credential registered under a key prefix
+        get_by_id: Returns a credential by id (used on cache hits)
+        verify: bcrypt check ``verify(raw_key, hashed_key) -> bool``
+        cache: Verified-key cache (module-wide cache by default)
+        executor: Thread pool bcrypt runs on
+    """
+
+    def __init__(
+        self,
+        find_by_prefix: Callable[[str], Optional[AgentCredentialInDB]],
+        get_by_id: Callable[[UUID], Optional[AgentCredentialInDB]],
+        verify: Callable[[str, str], bool],
+        cache: Optional[VerifiedKeyCache] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.find_by_prefix = find_by_prefix
+        self.get_by_id = get_by_id
+        self.verify = verify
+        self.cache = cache if cache is not None else verified_key_cache
+        self.executor = executor or _hash_executor
+
+    async def authenticate(self, raw_api_key: str) -> Optional[AgentCredentialInDB]:
+        digest = key_digest(raw_api_key)
+
+        cached = self.cache.get(digest)
+        if cached is not None:
+            credential_id, hashed_api_key = cached
+            cred = self.get_by_id(credential_id)
+            if cred is not None and cred.hashed_api_key == hashed_api_key:
+                return cred
+            self.cache.invalidate(credential_id)
+
+        key_prefix = parse_key_prefix(raw_api_key)
+        if key_prefix is None:
+            return None
+        cred = self.find_by_prefix(key_prefix)
+        if cred is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(self.executor, self.verify, raw_api_key, cred.hashed_api_key):
+            logger.warning("agent_key_verification_failed", key_prefix=key_prefix)
+            return None
+
+        self.cache.put(digest, cred.id, cred.hashed_api_key)
+        return cred
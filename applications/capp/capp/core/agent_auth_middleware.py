@@ -10,31 +10,74 @@ from fastapi.responses import Response
 
 from datetime import datetime, timezone
 
+from typing import Optional
+
+from applications.capp.capp.core.asgi_pipeline import PipelineStage, Rejection, RequestContext
 from applications.capp.capp.models.agent_credential import AgentCredentialInDB
-from applications.capp.capp.api.v1.endpoints.agents import mock_db_agent_creds, verify_password
+from applications.capp.capp.core.agent_api_keys import AgentKeyAuthenticator, is_agent_api_key
+from applications.capp.capp.api.v1.endpoints.agents import (
+    find_agent_cred_by_prefix, mock_db_agent_creds, verify_password
+)
+
+_authenticator = AgentKeyAuthenticator(
+    find_by_prefix=find_agent_cred_by_prefix,
+    get_by_id=mock_db_agent_creds.get,
+    verify=verify_password,
+)
+
+async def _get_agent_cred_from_key(raw_api_key: str) -> Optional[AgentCredentialInDB]:
+    """Finds the agent credential for a raw key via its public prefix (one bcrypt check at most)."""
+    return await _authenticator.authenticate(raw_api_key)
+
+class AgentAuthStage(PipelineStage):
+    """
+    ``ASGIPipeline`` stage authenticating Agent API keys
+
+    Same checks as ``AgentAuthMiddleware``: unknown keys get 401, revoked or
+    expired credentials 403, and authenticated requests carry ``is_agent``,
+    ``agent_cred`` and ``principal_id`` on ``request.state``.
+    """
+
+    async def on_request(self, ctx: RequestContext) -> Optional[Rejection]:
+        api_key = ctx.headers.get("x-api-key")
+        if not is_agent_api_key(api_key):
+            return None
+
+        agent_cred = await _get_agent_cred_from_key(api_key)
+        if not agent_cred:
+            return Rejection(401, "Invalid or unknown Agent API Key")
+        if not agent_cred.is_active:
+            return Rejection(403, "Agent credential has been revoked or deactivated")
+        if agent_cred.is_expired():
+            return Rejection(403, "Agent credential has expired")
+
+        ctx.state["is_agent"] = True
+        ctx.state["agent_cred"] = agent_cred
+        ctx.state["principal_id"] = agent_cred.principal_id
+        return None
+
+    def on_complete(self, ctx: RequestContext, error: Optional[BaseException]) -> None:
+        agent_cred = ctx.state.get("agent_cred")
+        if agent_cred is not None and error is None:
+            agent_cred.last_used_at = datetime.now(timezone.utc)
 
-def _get_agent_cred_from_key(raw_api_key: str) -> AgentCredentialInDB:
-    """Finds an agent credential by verifying the raw key against hashed keys in the DB."""
-    # In a real setup, we'd lookup by an ID prefix first, then verify the hash.
-    for cred in mock_db_agent_creds.values():
-        if verify_password(raw_api_key, cred.hashed_api_key):
-            return cred
-    return None
 
 class AgentAuthMiddleware(BaseHTTPMiddleware):
     """
     Middleware that intercepts requests with Agent API Keys and validates policies.
+
+    Superseded by ``AgentAuthStage`` in the app's ``ASGIPipeline``.
     """
     async def dispatch(self, request: Request, call_next) -> Response:
         
         # Check if this is an Agent request
         api_key = request.headers.get("X-API-Key")
-        if not api_key or not api_key.startswith("capp_agent_"):
+        if not is_agent_api_key(api_key):
             # Not an agent request, pass through to normal auth/routes
             return await call_next(request)
             
         # 1. Authenticate the Agent
-        agent_cred = _get_agent_cred_from_key(api_key)
+        agent_cred = await _get_agent_cred_from_key(api_key)
         
         if not agent_cred:
             return JSONResponse(
@@ -0,0 +1,154 @@
+"""
+Pure-ASGI request pipeline for CAPP
+
+Runs the cross-cutting request handling (logging, security headers, input
+validation, agent authentication) as stages of a single ASGI middleware.
+Unlike stacked ``BaseHTTPMiddleware`` layers there is no extra task per
+layer and the response is never buffered, so streaming bodies pass straight
+through. Request metadata is parsed once into a ``RequestContext`` shared by
+every stage.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+@dataclass
+class Rejection:
+    """Short-circuit response returned by a stage"""
+    status_code: int
+    detail: str
+
+
+class RequestContext:
+    """Per-request data shared by the pipeline stages"""
+
+    __slots__ = ("scope", "method", "path", "headers", "state", "started", "status_code")
+
+    def __init__(self, scope: Dict):
+        self.scope = scope
+        self.method: str = scope["method"]
+        self.path: str = scope["path"]
+        # ASGI header names are already lower-case
+        self.headers: Dict[str, str] = {
+            name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]
+        }
+        # Shared with Starlette's ``request.state``
+        self.state: Dict = scope.setdefault("state", {})
+        self.started = time.perf_counter()
+        self.status_code: Optional[int] = None
+
+    @property
+    def query_string(self) -> str:
+        return self.scope.get("query_string", b"").decode("latin-1")
+
+    @property
+    def client_host(self) -> Optional[str]:
+        client = self.scope.get("client")
+        return client[0] if client else None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class PipelineStage:
+    """
+    One step of the pipeline. Override the hooks that are needed.
+
+    ``on_request`` hooks run in stage order and may reject the request;
+    they are skipped for paths starting with any of ``skip_prefixes``.
+    ``on_response_start`` hooks run in reverse order on every response,
+    rejections included, and ``on_complete`` runs once the request is done.
+    """
+
+    skip_prefixes: Tuple[str, ...] = ()
+
+    def applies_to(self, path: str) -> bool:
+        return not path.startswith(self.skip_prefixes)
+
+    async def on_request(self, ctx: RequestContext) -> Optional[Rejection]:
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: Headers) -> None:
+        pass
+
+    def on_complete(self, ctx: RequestContext, error: Optional[BaseException]) -> None:
+        pass
+
+
+class ASGIPipeline:
+    """
+    ASGI middleware running ``stages`` around the wrapped application.
+
+    Usage:
+        app.add_middleware(ASGIPipeline, stages=[...])
+    """
+
+    def __init__(self, app, stages: Sequence[PipelineStage]):
+        self.app = app
+        self.stages = list(stages)
+        self._response_stages = list(reversed(self.stages))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope)
+
+        async def send_with_hooks(message):
+            if message["type"] == "http.response.start":
+                ctx.status_code = message["status"]
+                headers = list(message.get("headers", []))
+                for stage in self._response_stages:
+                    stage.on_response_start(ctx, headers)
+                message = {**message, "headers": headers}
+            await send(message)
+
+        error: Optional[BaseException] = None
+        try:
+            for stage in self.stages:
+                if not stage.applies_to(ctx.path):
+                    continue
+                rejection = await stage.on_request(ctx)
+                if rejection is not None:
+                    await self._reject(rejection, send_with_hooks)
+                    return
+            await self.app(scope, receive, send_with_hooks)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            for stage in self._response_stages:
+                try:
+                    stage.on_complete(ctx, error)
+                except Exception as hook_error:
+                    logger.error("pipeline_completion_hook_failed", stage=type(stage).__name__, error=str(hook_error))
+
+    @staticmethod
+    async def _reject(rejection: Rejection, send) -> None:
+        body = json.dumps({"detail": rejection.detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": rejection.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def set_header(headers: Headers, name: bytes, value: bytes) -> None:
+    """Replace (or add) a response header in place; ``name`` must be lower-case"""
+    headers[:] = [(k, v) for k, v in headers if k.lower() != name]
+    headers.append((name, value))
@@ -13,7 +13,7 @@ from uuid import uuid4
 
 from sqlalchemy import (
     Column, String, Integer, BigInteger, Numeric, DateTime, Boolean, Text,
-    ForeignKey, Index, UniqueConstraint, CheckConstraint, select
+    ForeignKey, Index, UniqueConstraint, CheckConstraint, select, text
 )
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
@@ -164,12 +164,20 @@ class Payment(Base):
     agent_activities: Mapped[List["AgentActivity"]] = relationship("AgentActivity", back_populates="payment", lazy="selectin")
 
     __table_args__ = (
-        Index("idx_payments_status_created", "status", "created_at"),
+        # Keyset pagination indexes: (filter..., created_at, id) in listing order
+        Index("idx_payments_status_created_id", "status", "created_at", "id"),
+        Index("idx_payments_sender_created", "sender_id", "created_at", "id"),
+        Index("idx_payments_recipient_created", "recipient_id", "created_at", "id"),
+        Index("idx_payments_corridor_created", "sender_country", "recipient_country", "created_at", "id"),
+        # Partial index for the PaymentWatchdog: only rows currently settling
+        Index(
+            "idx_payments_settling_settled_at", "settled_at", "id",
+            postgresql_where=text("status = 'settling'"),
+            sqlite_where=text("status = 'settling'"),
+        ),
         Index("idx_payments_currencies", "from_currency", "to_currency"),
         Index("idx_payments_sender_country", "sender_country"),
         Index("idx_payments_recipient_country", "recipient_country"),
-        Index("idx_payments_sender_id", "sender_id"),
-        Index("idx_payments_recipient_id", "recipient_id"),
         CheckConstraint("amount > 0", name="check_positive_amount"),
         CheckConstraint("total_cost > 0", name="check_positive_total"),
     )
@@ -388,6 +396,8 @@ class Settlement(Base):
     # On-chain identity
     blockchain_tx_hash = Column(String(255), unique=True, nullable=False, index=True)
     blockchain_network = Column(String(50), nullable=False)
+    # Hot wallet the funds left from; NULL means the chain's primary wallet
+    source_address = Column(String(255), nullable=True)
 
     # Financial amounts
     settlement_amount = Column(Numeric(15, 2), nullable=False)
@@ -415,6 +425,8 @@ class Settlement(Base):
     __table_args__ = (
         Index("idx_settlements_payment_id", "payment_id"),
         Index("idx_settlements_status", "status", "settled_at"),
+        # Incremental reconciliation reads confirmed rows past a watermark
+        Index("idx_settlements_status_confirmed", "status", "confirmed_at"),
         Index("idx_settlements_network", "blockchain_network"),
         CheckConstraint("settlement_amount > 0", name="check_positive_settlement_amount"),
     )
@@ -514,6 +526,41 @@ class Refund(Base):
         self._failed_rollbacks = json.dumps(value) if value is not None else None
 
 
+class PaymentStatsRollup(Base):
+    """
+    Pre-aggregated payment statistics per corridor, status and time bucket.
+
+    Maintained incrementally by PaymentRepository on every payment insert,
+    status transition and delete, so range statistics can be answered from
+    a handful of bucket rows instead of scanning the payments table.
+    Buckets are keyed by the payment's ``created_at`` truncated to the hour
+    or day (``granularity``).
+    """
+
+    __tablename__ = "payment_stats_rollups"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    granularity = Column(String(10), nullable=False)  # hour | day
+    bucket_start = Column(DateTime, nullable=False)
+    sender_country = Column(String(3), nullable=False)
+    recipient_country = Column(String(3), nullable=False)
+    status = Column(String(50), nullable=False)
+
+    payment_count = Column(BigInteger, default=0, nullable=False)
+    total_amount = Column(Numeric(20, 2), default=0, nullable=False)
+    total_fees = Column(Numeric(20, 2), default=0, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity", "bucket_start", "sender_country", "recipient_country", "status",
+            name="uq_payment_stats_rollup_bucket"
+        ),
+        Index("idx_payment_stats_rollups_range", "granularity", "bucket_start"),
+    )
+
+
 # Database session management
 async def get_db() -> AsyncSession:
     """
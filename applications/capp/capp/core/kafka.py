@@ -6,12 +6,27 @@ agent communication, and system events.
 """
 
 import asyncio
+import gzip
 import json
-from typing import Optional, Dict, Any, Callable
+import os
+import struct
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Dict, Any, Callable, Deque, Iterator, List, Tuple
 from datetime import datetime, timezone
 import structlog
 
-from .config.settings import get_settings
+from applications.capp.capp.config.settings import get_settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
 
 logger = structlog.get_logger(__name__)
 
@@ -27,11 +42,25 @@ async def init_kafka():
     settings = get_settings()
     
     try:
-        # This would initialize the actual Kafka producer
-        # For now, create a mock producer
-        _kafka_producer = MockKafkaProducer(settings.KAFKA_BOOTSTRAP_SERVERS)
+        # No Kafka client is wired in yet; events go to a local broker stand-in
+        if settings.KAFKA_BROKER == "file":
+            broker = FileEventBroker(settings.KAFKA_FILE_BROKER_DIR)
+        else:
+            broker = InMemoryEventBroker()
+
+        _kafka_producer = BatchingEventProducer(
+            broker,
+            linger_ms=settings.KAFKA_LINGER_MS,
+            max_batch_size=settings.KAFKA_BATCH_SIZE,
+            max_batch_bytes=settings.KAFKA_BATCH_MAX_BYTES,
+            compression=settings.KAFKA_COMPRESSION,
+            max_buffered=settings.KAFKA_MAX_BUFFERED_EVENTS,
+            backpressure=settings.KAFKA_BACKPRESSURE,
+            max_retries=settings.KAFKA_MAX_RETRIES,
+            retry_backoff_ms=settings.KAFKA_RETRY_BACKOFF_MS,
+        )
         
-        logger.info("Kafka producer initialized successfully")
+        logger.info("Kafka producer initialized successfully", broker=settings.KAFKA_BROKER)
         
     except Exception as e:
         logger.error("Failed to initialize Kafka", error=str(e))
@@ -98,6 +127,364 @@ class MockKafkaProducer:
         self.logger.info("Kafka producer closed")
 
 
+# Batch compression codecs: name -> (compress, decompress)
+_CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "none": (lambda data: data, lambda data: data),
+    # Level 1: event JSON compresses well even at the cheapest setting
+    "gzip": (lambda data: gzip.compress(data, compresslevel=1), gzip.decompress),
+}
+if zstandard is not None:
+    _CODECS["zstd"] = (zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress)
+if lz4_frame is not None:
+    _CODECS["lz4"] = (lz4_frame.compress, lz4_frame.decompress)
+
+# Stable ids for the file broker's on-disk batch header
+_CODEC_IDS = ["none", "gzip", "zstd", "lz4"]
+
+EventDeliveryCallback = Callable[[str, int, Optional[Exception]], None]
+
+
+def decode_event_batch(payload: bytes, compression: str) -> List[Dict[str, Any]]:
+    """Decode a batch written by BatchingEventProducer into its records"""
+    raw = _CODECS[compression][1](payload)
+    return [json.loads(line) for line in raw.split(b"\n") if line]
+
+
+class InMemoryEventBroker:
+    """In-process broker stand-in for tests and local development"""
+
+    def __init__(self, max_batches_per_topic: int = 10000):
+        self.max_batches_per_topic = max_batches_per_topic
+        self.batches: Dict[str, Deque[Tuple[bytes, str, int]]] = {}
+
+    async def send_batch(self, topic: str, payload: bytes, count: int, compression: str) -> None:
+        batches = self.batches.get(topic)
+        if batches is None:
+            batches = deque(maxlen=self.max_batches_per_topic)
+            self.batches[topic] = batches
+        batches.append((payload, compression, count))
+
+    def messages(self, topic: str) -> List[Dict[str, Any]]:
+        """All records delivered to ``topic``, oldest first"""
+        records = []
+        for payload, compression, _ in self.batches.get(topic, ()):
+            records.extend(decode_event_batch(payload, compression))
+        return records
+
+    async def close(self):
+        pass
+
+
+class FileEventBroker:
+    """
+    Append-only file broker stand-in
+
+    Each topic is a ``<topic>.events`` file of length-prefixed compressed
+    batches, so dev environments keep an inspectable event log without Kafka.
+    """
+
+    _HEADER = struct.Struct(">BII")  # codec id, record count, payload length
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, topic: str) -> str:
+        return os.path.join(self.directory, f"{topic}.events")
+
+    async def send_batch(self, topic: str, payload: bytes, count: int, compression: str) -> None:
+        header = self._HEADER.pack(_CODEC_IDS.index(compression), count, len(payload))
+        await asyncio.to_thread(self._append, self.path_for(topic), header + payload)
+
+    def messages(self, topic: str) -> Iterator[Dict[str, Any]]:
+        """Read back every record written to ``topic``, oldest first"""
+        path = self.path_for(topic)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(self._HEADER.size)
+                if len(header) < self._HEADER.size:
+                    return
+                codec_id, _, length = self._HEADER.unpack(header)
+                yield from decode_event_batch(f.read(length), _CODEC_IDS[codec_id])
+
+    async def close(self):
+        pass
+
+    @staticmethod
+    def _append(path: str, data: bytes) -> None:
+        with open(path, "ab") as f:
+            f.write(data)
+
+
+class BatchingEventProducer:
+    """
+    Non-blocking, batching event producer
+
+    ``publish`` serializes the event into an in-memory buffer and returns
+    immediately. Buffered events are grouped by topic and handed to the
+    broker as one compressed batch per topic, ``linger_ms`` after the first
+    buffered event or as soon as a topic reaches ``max_batch_size`` events /
+    ``max_batch_bytes``. The buffer holds at most ``max_buffered`` events;
+    when full, ``publish`` either drops the oldest buffered event or refuses
+    the new one (``backpressure``), while ``send`` waits for room instead.
+    A batch the broker rejects is retried ``max_retries`` times with
+    exponential backoff, then put back at the front of the buffer (as far
+    as ``max_buffered`` allows) for the next flush; only events that do not
+    fit, or that are still undelivered on ``close``, count as failed.
+    Delivery callbacks receive ``(topic, count, error)`` for every batch.
+    """
+
+    BACKPRESSURE_POLICIES = ("drop_oldest", "drop_new")
+
+    def __init__(
+        self,
+        broker: Any,
+        linger_ms: int = 5,
+        max_batch_size: int = 500,
+        max_batch_bytes: int = 1048576,
+        compression: str = "gzip",
+        max_buffered: int = 10000,
+        backpressure: str = "drop_oldest",
+        max_retries: int = 3,
+        retry_backoff_ms: int = 100,
+    ):
+        if compression not in _CODECS:
+            raise ValueError(f"Unsupported compression '{compression}', available: {sorted(_CODECS)}")
+        if backpressure not in self.BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{backpressure}'")
+
+        self.broker = broker
+        self.linger = linger_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.compression = compression
+        self.max_buffered = max_buffered
+        self.backpressure = backpressure
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff_ms / 1000.0
+
+        self._compress = _CODECS[compression][0]
+        self._buffer: Deque[Tuple[str, bytes]] = deque()
+        self._topic_counts: Dict[str, int] = {}
+        self._topic_bytes: Dict[str, int] = {}
+        self._callbacks: List[EventDeliveryCallback] = []
+
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_queued = False
+        self._space: Optional[asyncio.Event] = None
+        self._tasks = set()
+        self._closing = False
+
+        self.published = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.requeued = 0
+        self.batches = 0
+        self.bytes_uncompressed = 0
+        self.bytes_compressed = 0
+        self.max_delivery_ms = 0.0
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    def add_delivery_callback(self, callback: EventDeliveryCallback) -> None:
+        """Call ``callback(topic, count, error)`` after every delivered or failed batch"""
+        self._callbacks.append(callback)
+
+    def publish(self, topic: str, message: Dict[str, Any], key: Optional[str] = None) -> bool:
+        """
+        Buffer an event for delivery without waiting
+
+        Args:
+            topic: Destination topic
+            message: JSON-serializable event body
+            key: Partition key
+
+        Returns:
+            bool: False if the event was refused because the buffer is full
+        """
+        if len(self._buffer) >= self.max_buffered:
+            if self.backpressure == "drop_new":
+                self.dropped += 1
+                return False
+            old_topic, old_record = self._buffer.popleft()
+            self._forget(old_topic, old_record)
+            self.dropped += 1
+
+        record = json.dumps({
+            "key": key,
+            "value": message,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }, default=str).encode()
+
+        self._buffer.append((topic, record))
+        self._topic_counts[topic] = self._topic_counts.get(topic, 0) + 1
+        self._topic_bytes[topic] = self._topic_bytes.get(topic, 0) + len(record)
+        self.published += 1
+        self._on_write(topic)
+        return True
+
+    async def send(self, topic: str, message: Dict[str, Any], key: Optional[str] = None) -> bool:
+        """Buffer an event, waiting for room instead of dropping when the buffer is full"""
+        while len(self._buffer) >= self.max_buffered:
+            if self._space is None:
+                self._space = asyncio.Event()
+            self._space.clear()
+            self._spawn_flush()
+            await self._space.wait()
+        return self.publish(topic, message, key=key)
+
+    async def flush(self) -> int:
+        """
+        Deliver everything buffered
+
+        Returns:
+            int: Number of events delivered
+        """
+        async with self._flush_lock:
+            self._flush_queued = False
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+
+            if not self._buffer:
+                return 0
+
+            pending = self._buffer
+            self._buffer = deque()
+            self._topic_counts = {}
+            self._topic_bytes = {}
+            if self._space is not None:
+                self._space.set()
+
+            by_topic: "OrderedDict[str, List[bytes]]" = OrderedDict()
+            for topic, record in pending:
+                by_topic.setdefault(topic, []).append(record)
+
+            delivered = 0
+            for topic, records in by_topic.items():
+                for batch in self._split(records):
+                    delivered += await self._deliver(topic, batch)
+            return delivered
+
+    async def close(self):
+        """Flush buffered events and close the broker"""
+        self._closing = True
+        for task in list(self._tasks):
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+        await self.broker.close()
+        logger.info("Kafka producer closed", **self.get_stats())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "requeued": self.requeued,
+            "buffered": self.buffered,
+            "batches": self.batches,
+            "avg_batch_size": self.delivered / self.batches if self.batches else 0.0,
+            "compression_ratio": self.bytes_compressed / self.bytes_uncompressed if self.bytes_uncompressed else 1.0,
+            "max_delivery_ms": self.max_delivery_ms,
+        }
+
+    def _split(self, records: List[bytes]) -> Iterator[List[bytes]]:
+        batch, size = [], 0
+        for record in records:
+            if batch and (len(batch) >= self.max_batch_size or size + len(record) > self.max_batch_bytes):
+                yield batch
+                batch, size = [], 0
+            batch.append(record)
+            size += len(record)
+        if batch:
+            yield batch
+
+    async def _deliver(self, topic: str, records: List[bytes]) -> int:
+        raw = b"\n".join(records)
+        payload = self._compress(raw)
+        error: Optional[Exception] = None
+
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                await self.broker.send_batch(topic, payload, len(records), self.compression)
+            except Exception as e:
+                error = e
+                logger.warning("Event batch delivery attempt failed", topic=topic, events=len(records),
+                               attempt=attempt + 1, error=str(e))
+            else:
+                error = None
+                break
+        self.max_delivery_ms = max(self.max_delivery_ms, (time.perf_counter() - started) * 1000)
+
+        if error is None:
+            self.delivered += len(records)
+            self.batches += 1
+            self.bytes_uncompressed += len(raw)
+            self.bytes_compressed += len(payload)
+        else:
+            requeued = 0 if self._closing else self._requeue(topic, records)
+            self.failed += len(records) - requeued
+            logger.error("Failed to deliver event batch", topic=topic, events=len(records),
+                         requeued=requeued, error=str(error))
+
+        for callback in self._callbacks:
+            try:
+                callback(topic, len(records), error)
+            except Exception as e:
+                logger.warning("Event delivery callback failed", error=str(e))
+        return 0 if error else len(records)
+
+    def _requeue(self, topic: str, records: List[bytes]) -> int:
+        """Put undelivered records back at the front of the buffer, oldest first"""
+        room = max(0, self.max_buffered - len(self._buffer))
+        kept = records[:room]
+        if not kept:
+            return 0
+        self._buffer.extendleft((topic, record) for record in reversed(kept))
+        self._topic_counts[topic] = self._topic_counts.get(topic, 0) + len(kept)
+        self._topic_bytes[topic] = self._topic_bytes.get(topic, 0) + sum(len(r) for r in kept)
+        self.requeued += len(kept)
+        self._on_write(topic)
+        return len(kept)
+
+    def _forget(self, topic: str, record: bytes) -> None:
+        self._topic_counts[topic] -= 1
+        self._topic_bytes[topic] -= len(record)
+
+    def _on_write(self, topic: str) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (sync caller); the next flush from async code picks it up
+            return
+
+        if self._topic_counts[topic] >= self.max_batch_size or self._topic_bytes[topic] >= self.max_batch_bytes:
+            self._spawn_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.linger, self._spawn_flush)
+
+    def _spawn_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_queued:
+            return  # a flush that has not started yet will pick these events up
+        self._flush_queued = True
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
 class MockKafkaConsumer:
     """Mock Kafka consumer for development"""
     
@@ -152,16 +539,16 @@ class KafkaMessageService:
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
-            success = await self.producer.send(
+            success = self.producer.publish(
                 topic=self.settings.KAFKA_TOPIC_PAYMENTS,
                 message=message,
                 key=payment_id
             )
             
             if success:
-                self.logger.info("Payment event sent", payment_id=payment_id, event_type=event_type)
+                self.logger.debug("Payment event queued", payment_id=payment_id, event_type=event_type)
             else:
-                self.logger.error("Failed to send payment event", payment_id=payment_id, event_type=event_type)
+                self.logger.warning("Payment event dropped, producer buffer full", payment_id=payment_id, event_type=event_type)
             
             return success
             
@@ -179,16 +566,16 @@ class KafkaMessageService:
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
-            success = await self.producer.send(
+            success = self.producer.publish(
                 topic=self.settings.KAFKA_TOPIC_SETTLEMENTS,
                 message=message,
                 key=settlement_id
             )
             
             if success:
-                self.logger.info("Settlement event sent", settlement_id=settlement_id, event_type=event_type)
+                self.logger.debug("Settlement event queued", settlement_id=settlement_id, event_type=event_type)
             else:
-                self.logger.error("Failed to send settlement event", settlement_id=settlement_id, event_type=event_type)
+                self.logger.warning("Settlement event dropped, producer buffer full", settlement_id=settlement_id, event_type=event_type)
             
             return success
             
@@ -206,16 +593,16 @@ class KafkaMessageService:
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
-            success = await self.producer.send(
+            success = self.producer.publish(
                 topic="capp.agents",
                 message=message,
                 key=agent_id
             )
             
             if success:
-                self.logger.info("Agent event sent", agent_id=agent_id, event_type=event_type)
+                self.logger.debug("Agent event queued", agent_id=agent_id, event_type=event_type)
             else:
-                self.logger.error("Failed to send agent event", agent_id=agent_id, event_type=event_type)
+                self.logger.warning("Agent event dropped, producer buffer full", agent_id=agent_id, event_type=event_type)
             
             return success
             
@@ -232,15 +619,15 @@ class KafkaMessageService:
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
-            success = await self.producer.send(
+            success = self.producer.publish(
                 topic="capp.system",
                 message=message
             )
             
             if success:
-                self.logger.info("System event sent", event_type=event_type)
+                self.logger.debug("System event queued", event_type=event_type)
             else:
-                self.logger.error("Failed to send system event", event_type=event_type)
+                self.logger.warning("System event dropped, producer buffer full", event_type=event_type)
             
             return success
             
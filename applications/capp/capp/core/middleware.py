@@ -7,11 +7,13 @@ authentication, rate limiting, and error handling.
 
 import time
 import uuid
-from typing import Callable
+from typing import Callable, Optional
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import structlog
 
+from .asgi_pipeline import Headers, PipelineStage, RequestContext
+
 logger = structlog.get_logger(__name__)
 
 
@@ -86,6 +88,54 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             raise
 
 
+class RequestLoggingStage(PipelineStage):
+    """
+    ``ASGIPipeline`` stage with the behaviour of ``RequestLoggingMiddleware``
+
+    Assigns ``request.state.request_id``, logs request start and completion
+    (or failure) and adds ``X-Request-ID`` / ``X-Processing-Time`` headers.
+    """
+
+    async def on_request(self, ctx: RequestContext) -> None:
+        ctx.state["request_id"] = str(uuid.uuid4())
+        logger.info(
+            "HTTP request started",
+            request_id=ctx.state["request_id"],
+            method=ctx.method,
+            path=ctx.path,
+            client_ip=ctx.client_host,
+            user_agent=ctx.headers.get("user-agent"),
+            content_length=ctx.headers.get("content-length")
+        )
+        return None
+
+    def on_response_start(self, ctx: RequestContext, headers: Headers) -> None:
+        request_id = ctx.state.get("request_id")
+        if request_id:
+            headers.append((b"x-request-id", request_id.encode()))
+        headers.append((b"x-processing-time", str(ctx.elapsed).encode()))
+
+    def on_complete(self, ctx: RequestContext, error: Optional[BaseException]) -> None:
+        if error is not None:
+            logger.error(
+                "HTTP request failed",
+                request_id=ctx.state.get("request_id"),
+                method=ctx.method,
+                path=ctx.path,
+                error=str(error),
+                processing_time=ctx.elapsed,
+            )
+            return
+        logger.info(
+            "HTTP request completed",
+            request_id=ctx.state.get("request_id"),
+            method=ctx.method,
+            path=ctx.path,
+            status_code=ctx.status_code,
+            processing_time=ctx.elapsed,
+        )
+
+
 class AuthenticationMiddleware(BaseHTTPMiddleware):
     """
     Middleware for API authentication
@@ -3,25 +3,26 @@ Redis connection management for CAPP
 """
 
 import asyncio
-from typing import Optional, Any, List
-import json
-import pickle
+from typing import Optional, Any, Dict, Iterable, List, Mapping
 import time
 
 import redis.asyncio as redis
 import structlog
 
 from applications.capp.capp.config.settings import get_settings
+from packages.integrations.data.codec import CodecError, decode, encode
 
 logger = structlog.get_logger(__name__)
 
 # Global Redis client
 _redis_client: Optional[redis.Redis] = None
+# Same server, raw bytes replies; backs RedisCache's binary codec
+_binary_client: Optional[redis.Redis] = None
 
 
 async def init_redis() -> None:
     """Initialize Redis connection"""
-    global _redis_client
+    global _redis_client, _binary_client
     
     settings = get_settings()
     
@@ -38,6 +39,16 @@ async def init_redis() -> None:
             max_connections=settings.REDIS_POOL_SIZE
         )
         
+        _binary_client = redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=False,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            retry_on_timeout=True,
+            health_check_interval=30,
+            max_connections=settings.REDIS_POOL_SIZE
+        )
+        
         # Test connection
         await _redis_client.ping()
         
@@ -47,12 +58,18 @@ async def init_redis() -> None:
         logger.warning("Failed to connect to Redis, using mock client for demo", error=str(e))
         # Create a mock Redis client for demo purposes
         _redis_client = MockRedisClient()
+        _binary_client = _redis_client
         logger.info("Mock Redis client initialized for demo")
 
 
 async def close_redis() -> None:
     """Close Redis connection"""
-    global _redis_client
+    global _redis_client, _binary_client, _cache
+    
+    if _binary_client and _binary_client is not _redis_client:
+        await _binary_client.close()
+    _binary_client = None
+    _cache = None
     
     if _redis_client:
         await _redis_client.close()
@@ -71,6 +88,15 @@ def get_redis_client() -> redis.Redis:
     return _redis_client
 
 
+def get_binary_redis_client() -> redis.Redis:
+    """Get Redis client returning raw bytes (used by RedisCache)"""
+    global _binary_client
+    if not _binary_client:
+        # The mock stores values as given, so it can serve both roles
+        _binary_client = get_redis_client()
+    return _binary_client
+
+
 class MockRedisClient:
     """Mock Redis client for demo purposes when Redis is not available"""
     
@@ -106,14 +132,15 @@ class MockRedisClient:
         self._expiry[key] = time.time() + ex
         return True
     
-    async def delete(self, key: str) -> int:
+    async def delete(self, *keys: str) -> int:
         """Mock delete"""
-        if key in self._data:
-            del self._data[key]
-            if key in self._expiry:
-                del self._expiry[key]
-            return 1
-        return 0
+        deleted = 0
+        for key in keys:
+            if key in self._data:
+                del self._data[key]
+                self._expiry.pop(key, None)
+                deleted += 1
+        return deleted
     
     async def exists(self, key: str) -> int:
         """Mock exists"""
@@ -158,6 +185,10 @@ class MockRedisClient:
         self._data[hash_key] = value
         return 1
     
+    async def hmget(self, key: str, fields: List[str]) -> List[Optional[str]]:
+        """Mock hmget"""
+        return [await self.hget(key, field) for field in fields]
+    
     async def hgetall(self, key: str) -> dict:
         """Mock hgetall"""
         result = {}
@@ -186,7 +217,8 @@ class MockRedisClient:
     async def lrange(self, key: str, start: int, end: int) -> List[str]:
         """Mock lrange"""
         if key in self._data and isinstance(self._data[key], list):
-            return self._data[key][start:end+1]
+            # Inclusive end; -1 means through the last element, as in Redis
+            return self._data[key][start:None if end == -1 else end+1]
         return []
     
     async def lpush(self, key: str, *values: str) -> int:
@@ -198,6 +230,12 @@ class MockRedisClient:
         self._data[key].extend(values)
         return len(self._data[key])
     
+    async def ltrim(self, key: str, start: int, end: int) -> bool:
+        """Mock ltrim"""
+        if key in self._data and isinstance(self._data[key], list):
+            self._data[key] = self._data[key][start:] if end == -1 else self._data[key][start:end + 1]
+        return True
+    
     async def rpop(self, key: str) -> Optional[str]:
         """Mock rpop"""
         if key in self._data and isinstance(self._data[key], list) and self._data[key]:
@@ -210,6 +248,75 @@ class MockRedisClient:
             return len(self._data[key])
         return 0
     
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Mock mget"""
+        return [await self.get(key) for key in keys]
+
+    async def mset(self, mapping: dict) -> bool:
+        """Mock mset"""
+        for key, value in mapping.items():
+            await self.set(key, value)
+        return True
+
+    def pipeline(self, transaction: bool = True) -> "MockPipeline":
+        """Mock pipeline"""
+        return MockPipeline(self)
+
+    async def zadd(self, key: str, mapping: dict) -> int:
+        """Mock zadd"""
+        if not isinstance(self._data.get(key), dict):
+            self._data[key] = {}
+        added = sum(1 for member in mapping if member not in self._data[key])
+        self._data[key].update({member: float(score) for member, score in mapping.items()})
+        return added
+
+    async def zrem(self, key: str, *members: str) -> int:
+        """Mock zrem"""
+        zset = self._data.get(key)
+        if not isinstance(zset, dict):
+            return 0
+        return sum(1 for member in members if zset.pop(member, None) is not None)
+
+    async def zscore(self, key: str, member: str) -> Optional[float]:
+        """Mock zscore"""
+        zset = self._data.get(key)
+        return zset.get(member) if isinstance(zset, dict) else None
+
+    async def zcard(self, key: str) -> int:
+        """Mock zcard"""
+        zset = self._data.get(key)
+        return len(zset) if isinstance(zset, dict) else 0
+
+    async def zrangebyscore(self, key: str, min: Any, max: Any,
+                            start: Optional[int] = None, num: Optional[int] = None) -> List[str]:
+        """Mock zrangebyscore"""
+        zset = self._data.get(key)
+        if not isinstance(zset, dict):
+            return []
+        low = float("-inf") if min == "-inf" else float(min)
+        high = float("inf") if max == "+inf" else float(max)
+        members = [m for m, score in sorted(zset.items(), key=lambda item: (item[1], item[0])) if low <= score <= high]
+        if start is not None and num is not None:
+            members = members[start:start + num]
+        return members
+
+    async def zremrangebyscore(self, key: str, min: Any, max: Any) -> int:
+        """Mock zremrangebyscore"""
+        members = await self.zrangebyscore(key, min, max)
+        return await self.zrem(key, *members)
+
+    async def zrevrange(self, key: str, start: int, end: int) -> List[str]:
+        """Mock zrevrange"""
+        zset = self._data.get(key)
+        if not isinstance(zset, dict):
+            return []
+        members = [m for m, _ in sorted(zset.items(), key=lambda item: (item[1], item[0]), reverse=True)]
+        return members[start:] if end == -1 else members[start:end + 1]
+
+    async def publish(self, channel: str, message: str) -> int:
+        """Mock publish (no subscribers)"""
+        return 0
+
     async def close(self):
         """Mock close"""
         self._data.clear()
@@ -235,28 +342,58 @@ class MockRedisClient:
         return True
 
 
+class MockPipeline:
+    """Queues commands against a MockRedisClient until ``execute``"""
+
+    def __init__(self, client: MockRedisClient):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]
+
+
 class RedisCache:
-    """Redis cache wrapper with serialization support"""
+    """
+    Redis cache wrapper with serialization support
+
+    Values are stored with the typed binary codec
+    (``packages.integrations.data.codec``), so Decimal, UUID, datetime and
+    registered Enums round-trip as themselves. Values written before the
+    codec are still read as JSON or plain strings. ``redis_client`` must
+    return raw bytes (see ``get_binary_redis_client``).
+    """
     
     def __init__(self, redis_client: redis.Redis):
         self.redis = redis_client
     
+    @staticmethod
+    def _decode(value: Any, default: Any = None) -> Any:
+        if value is None:
+            return default
+        try:
+            return decode(value)
+        except CodecError as e:
+            logger.warning("Failed to decode cached value", error=str(e))
+            return default
+    
+    @staticmethod
+    def _field_name(field: Any) -> str:
+        return field.decode() if isinstance(field, bytes) else field
+    
     async def get(self, key: str, default: Any = None) -> Any:
         """Get value from cache"""
         try:
-            value = await self.redis.get(key)
-            if value is None:
-                return default
-            
-            # Try to deserialize JSON first, then pickle
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                try:
-                    return pickle.loads(value.encode('latin1'))
-                except Exception:
-                    return value
-                    
+            return self._decode(await self.redis.get(key), default)
         except Exception as e:
             logger.warning("Failed to get from cache", key=key, error=str(e))
             return default
@@ -264,11 +401,7 @@ class RedisCache:
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in cache"""
         try:
-            # Try JSON serialization first, fallback to pickle
-            try:
-                serialized = json.dumps(value)
-            except (TypeError, ValueError):
-                serialized = pickle.dumps(value).decode('latin1')
+            serialized = encode(value)
             
             if ttl:
                 return await self.redis.setex(key, ttl, serialized)
@@ -278,15 +411,65 @@ class RedisCache:
         except Exception as e:
             logger.warning("Failed to set cache", key=key, error=str(e))
             return False
+    
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values in one round trip (MGET)
+        
+        Returns:
+            Mapping of the keys that were found to their values
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            values = await self.redis.mget(keys)
+        except Exception as e:
+            logger.warning("Failed to get many from cache", count=len(keys), error=str(e))
+            return {}
+        
+        result = {}
+        for key, raw in zip(keys, values):
+            if raw is not None:
+                value = self._decode(raw)
+                if value is not None:
+                    result[key] = value
+        return result
+    
+    async def set_many(self, mapping: Mapping[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values in one round trip (MSET, or a pipeline of SET EX when ``ttl`` is given)"""
+        if not mapping:
+            return True
+        try:
+            serialized = {key: encode(value) for key, value in mapping.items()}
+            
+            if not ttl:
+                return bool(await self.redis.mset(serialized))
+            
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in serialized.items():
+                pipe.set(key, value, ex=ttl)
+            return all(await pipe.execute())
+            
+        except Exception as e:
+            logger.warning("Failed to set many in cache", count=len(mapping), error=str(e))
+            return False
+    
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys in one round trip; returns how many existed"""
+        keys = list(keys)
+        if not keys:
+            return 0
+        try:
+            return await self.redis.delete(*keys)
+        except Exception as e:
+            logger.warning("Failed to delete many from cache", count=len(keys), error=str(e))
+            return 0
             
     async def setnx(self, key: str, value: Any) -> bool:
         """Set value if not exists (Atomic Lock)"""
         try:
-            # Try JSON serialization first, fallback to pickle
-            try:
-                serialized = json.dumps(value)
-            except (TypeError, ValueError):
-                serialized = str(value)
+            serialized = encode(value)
             
             # Use set(nx=True) which is modern Redis API, or setnx if available
             if hasattr(self.redis, "setnx"):
@@ -354,16 +537,7 @@ class RedisCache:
     async def hget(self, key: str, field: str, default: Any = None) -> Any:
         """Get hash field"""
         try:
-            value = await self.redis.hget(key, field)
-            if value is None:
-                return default
-            
-            # Try to deserialize
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
-                
+            return self._decode(await self.redis.hget(key, field), default)
         except Exception as e:
             logger.warning("Failed to get hash field", key=key, field=field, error=str(e))
             return default
@@ -371,13 +545,7 @@ class RedisCache:
     async def hset(self, key: str, field: str, value: Any) -> bool:
         """Set hash field"""
         try:
-            # Try JSON serialization
-            try:
-                serialized = json.dumps(value)
-            except (TypeError, ValueError):
-                serialized = str(value)
-            
-            result = await self.redis.hset(key, field, serialized)
+            result = await self.redis.hset(key, field, encode(value))
             return result >= 0
             
         except Exception as e:
@@ -396,15 +564,7 @@ class RedisCache:
         """Get all hash fields"""
         try:
             data = await self.redis.hgetall(key)
-            result = {}
-            
-            for field, value in data.items():
-                try:
-                    result[field] = json.loads(value)
-                except json.JSONDecodeError:
-                    result[field] = value
-            
-            return result
+            return {self._field_name(field): self._decode(value) for field, value in data.items()}
             
         except Exception as e:
             logger.warning("Failed to get all hash fields", key=key, error=str(e))
@@ -413,14 +573,7 @@ class RedisCache:
     async def lpush(self, key: str, *values: Any) -> int:
         """Push values to list"""
         try:
-            serialized_values = []
-            for value in values:
-                try:
-                    serialized_values.append(json.dumps(value))
-                except (TypeError, ValueError):
-                    serialized_values.append(str(value))
-            
-            return await self.redis.lpush(key, *serialized_values)
+            return await self.redis.lpush(key, *(encode(value) for value in values))
             
         except Exception as e:
             logger.warning("Failed to push to list", key=key, error=str(e))
@@ -429,20 +582,19 @@ class RedisCache:
     async def rpop(self, key: str, default: Any = None) -> Any:
         """Pop value from list"""
         try:
-            value = await self.redis.rpop(key)
-            if value is None:
-                return default
-            
-            # Try to deserialize
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
-                
+            return self._decode(await self.redis.rpop(key), default)
         except Exception as e:
             logger.warning("Failed to pop from list", key=key, error=str(e))
             return default
     
+    async def lrange(self, key: str, start: int, end: int) -> List[Any]:
+        """Get range from list"""
+        try:
+            return [self._decode(value) for value in await self.redis.lrange(key, start, end)]
+        except Exception as e:
+            logger.warning("Failed to get list range", key=key, error=str(e))
+            return []
+    
     async def llen(self, key: str) -> int:
         """Get list length"""
         try:
@@ -469,7 +621,6 @@ def get_cache() -> RedisCache:
     global _cache
     
     if not _cache:
-        redis_client = get_redis_client()
-        _cache = RedisCache(redis_client)
+        _cache = RedisCache(get_binary_redis_client())
     
     return _cache 
\ No newline at end of file
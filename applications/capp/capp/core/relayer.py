@@ -1,27 +1,47 @@
 import asyncio
 import structlog
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from applications.capp.capp.core.starknet import get_starknet_client
 from applications.capp.capp.core.aptos import get_aptos_client
 from applications.capp.capp.config.settings import get_settings
+from applications.capp.capp.core.redis import get_cache
+from applications.capp.capp.services.chain_indexer import ChainEvent, ChainEventIndexer
 
 logger = structlog.get_logger(__name__)
 
+# Claim recorded per bridge log before its release is sent
+RELEASE_CLAIM_PREFIX = "relayer:released:"
+
 class RelayerService:
     """
-    Relayer Agent that monitors Starknet Bridge for 'TokensLocked' events
+    Relayer Agent that monitors the bridge for 'TokensLocked' events
     and triggers 'release_funds' on Aptos.
+
+    Events come from a ``ChainEventIndexer`` over the bridge contract; its
+    checkpoint replaces the old in-memory ``last_processed_block``.
+
+    The indexer delivers at least once (a failed range is retried, a reorg
+    rewinds and replays), so every lock is claimed in Redis by its
+    ``ChainEvent.key`` before funds are released and seen keys are skipped.
     """
     
-    def __init__(self):
+    def __init__(self, indexer: Optional[ChainEventIndexer] = None, cache: Any = None):
         self.settings = get_settings()
         self.starknet_client = get_starknet_client()
         self.aptos_client = get_aptos_client()
+        self.cache = cache or get_cache()
         self.is_running = False
-        
-        self.last_processed_block = 0 
-        # In prod, persist this to DB/Redis
+
+        self.indexer = indexer
+        if indexer is not None:
+            indexer.subscribe(self.handle_bridge_events, kinds=["bridge"])
+
+    @property
+    def last_processed_block(self) -> int:
+        if self.indexer is None or self.indexer.last_block is None:
+            return 0
+        return self.indexer.last_block
 
     async def start(self):
         """Start the monitoring loop"""
@@ -42,22 +62,38 @@ class RelayerService:
 
     async def monitor_events(self):
         """
-        Check for new TokensLocked events on Starknet.
+        Index new bridge blocks; TokensLocked events reach handle_bridge_events.
         """
-        # For MVP/Sim, we might not have a deployed contract emitting real events constantly.
-        # We will mock the "Finding" of an event for the verification script,
-        # but implement the logic structure for real usage.
-        
-        # Real logic would be:
-        # events = await self.starknet_client.client.get_events(
-        #    from_block=self.last_processed_block + 1,
-        #    address=self.settings.STARKNET_BRIDGE_ADDRESS,
-        #    keys=[hash("TokensLocked")]
-        # )
-        
-        # Here we just log "Polling"
-        # logger.debug("Polling Starknet for bridge events...")
-        pass
+        if self.indexer is None:
+            return
+        await self.indexer.poll()
+
+    async def handle_bridge_events(self, events: List[ChainEvent]):
+        """Release funds once for every lock in a batch of bridge events"""
+        for event in events:
+            if event.name != "TokensLocked":
+                continue
+
+            # The key leaves out the block hash, so a lock re-included after
+            # a reorg maps to the same claim as the original delivery
+            claim_key = f"{RELEASE_CLAIM_PREFIX}{event.key}"
+            if not await self.cache.setnx(claim_key, event.tx_hash):
+                if await self.cache.exists(claim_key):
+                    logger.info("Bridge lock already released, skipping", event_key=event.key)
+                    continue
+                # Redis unavailable: fail the batch so the indexer retries the range
+                raise RuntimeError(f"Could not record bridge lock {event.key} before release")
+
+            try:
+                await self.process_event({
+                    "amount": event.args["amount"],
+                    "recipient": event.args["recipient"],
+                    "token": event.args["token"],
+                    "tx_hash": event.tx_hash,
+                })
+            except Exception:
+                await self.cache.delete(claim_key)
+                raise
 
     async def process_event(self, event_data: Dict[str, Any]):
         """
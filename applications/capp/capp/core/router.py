@@ -3,9 +3,6 @@ from typing import List, Optional
 import time
 from decimal import Decimal
 
-from applications.capp.capp.core.aptos import get_aptos_client
-from applications.capp.capp.core.polygon import PolygonSettlementService
-from applications.capp.capp.core.starknet import get_starknet_client
 from applications.capp.capp.config.settings import get_settings
 
 # We'll use the API schema for now to avoid circular imports if we used models/payments.py
@@ -75,6 +72,7 @@ class PaymentRouter:
         return scored_routes
 
     async def _evaluate_aptos(self, amount: float, recipient: str) -> RouteOption:
+        from applications.capp.capp.core.aptos import get_aptos_client
         client = get_aptos_client()
         # Estimate Gas (Live)
         try:
@@ -94,6 +92,7 @@ class PaymentRouter:
         )
         
     async def _evaluate_polygon(self, amount: float, recipient: str) -> RouteOption:
+        from applications.capp.capp.core.polygon import PolygonSettlementService
         service = PolygonSettlementService()
         # Estimate Gas (Live)
         try:
@@ -113,6 +112,7 @@ class PaymentRouter:
         )
 
     async def _evaluate_starknet(self, amount: float, recipient: str) -> RouteOption:
+        from applications.capp.capp.core.starknet import get_starknet_client
         client = get_starknet_client()
         # Estimate Gas (Live)
         try:
@@ -9,6 +9,67 @@ from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
+from .asgi_pipeline import Headers, PipelineStage, RequestContext
+
+# Content Security Policy
+# Restrictive policy - adjust based on your needs
+CSP_DIRECTIVES = [
+    "default-src 'self'",
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Adjust for production
+    "style-src 'self' 'unsafe-inline'",
+    "img-src 'self' data: https:",
+    "font-src 'self' data:",
+    "connect-src 'self'",
+    "frame-ancestors 'none'",
+    "base-uri 'self'",
+    "form-action 'self'"
+]
+
+# Permissions Policy (formerly Feature-Policy)
+PERMISSIONS_DIRECTIVES = [
+    "geolocation=()",
+    "microphone=()",
+    "camera=()",
+    "payment=()",
+    "usb=()",
+    "magnetometer=()",
+    "gyroscope=()",
+    "accelerometer=()"
+]
+
+SECURITY_HEADERS = {
+    # Prevent MIME type sniffing
+    "X-Content-Type-Options": "nosniff",
+    # Prevent clickjacking
+    "X-Frame-Options": "DENY",
+    # Enable XSS filter in browsers
+    "X-XSS-Protection": "1; mode=block",
+    # Enforce HTTPS (only add in production)
+    # Note: This should only be enabled when serving over HTTPS
+    # "Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload",
+    "Content-Security-Policy": "; ".join(CSP_DIRECTIVES),
+    # Control referrer information
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": ", ".join(PERMISSIONS_DIRECTIVES),
+    # Add custom security header
+    "X-Security-Headers": "enabled",
+}
+
+
+class SecurityHeadersStage(PipelineStage):
+    """
+    ``ASGIPipeline`` stage adding ``SECURITY_HEADERS`` to every response
+    and removing the ``server`` header.
+    """
+
+    def __init__(self):
+        self._headers = [(name.lower().encode(), value.encode()) for name, value in SECURITY_HEADERS.items()]
+        self._replaced = frozenset(name for name, _ in self._headers) | {b"server"}
+
+    def on_response_start(self, ctx: RequestContext, headers: Headers) -> None:
+        headers[:] = [(k, v) for k, v in headers if k.lower() not in self._replaced]
+        headers.extend(self._headers)
+
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """
@@ -22,6 +83,8 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Content-Security-Policy: Restrictive CSP
     - Referrer-Policy: strict-origin-when-cross-origin
     - Permissions-Policy: Restrictive permissions
+
+    Superseded by ``SecurityHeadersStage`` in the app's ``ASGIPipeline``.
     """
 
     async def dispatch(self, request: Request, call_next):
@@ -37,57 +100,11 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         """
         response = await call_next(request)
 
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # Enable XSS filter in browsers
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Enforce HTTPS (only add in production)
-        # Note: This should only be enabled when serving over HTTPS
-        # response.headers["Strict-Transport-Security"] = (
-        #     "max-age=31536000; includeSubDomains; preload"
-        # )
-
-        # Content Security Policy
-        # Restrictive policy - adjust based on your needs
-        csp_directives = [
-            "default-src 'self'",
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Adjust for production
-            "style-src 'self' 'unsafe-inline'",
-            "img-src 'self' data: https:",
-            "font-src 'self' data:",
-            "connect-src 'self'",
-            "frame-ancestors 'none'",
-            "base-uri 'self'",
-            "form-action 'self'"
-        ]
-        response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
-
-        # Control referrer information
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Permissions Policy (formerly Feature-Policy)
-        permissions_directives = [
-            "geolocation=()",
-            "microphone=()",
-            "camera=()",
-            "payment=()",
-            "usb=()",
-            "magnetometer=()",
-            "gyroscope=()",
-            "accelerometer=()"
-        ]
-        response.headers["Permissions-Policy"] = ", ".join(permissions_directives)
+        for name, value in SECURITY_HEADERS.items():
+            response.headers[name] = value
 
         # Remove server header (security through obscurity)
         if "server" in response.headers:
             del response.headers["server"]
 
-        # Add custom security header
-        response.headers["X-Security-Headers"] = "enabled"
-
         return response
@@ -7,11 +7,14 @@ injection attacks, malformed requests, and other security threats.
 
 import re
 from typing import Optional
+from urllib.parse import parse_qsl
 import structlog
 from fastapi import Request, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
+from .asgi_pipeline import PipelineStage, Rejection, RequestContext
+
 logger = structlog.get_logger(__name__)
 
 # Maximum request body size (10MB)
@@ -40,6 +43,17 @@ PATH_TRAVERSAL_PATTERN = re.compile(
     re.IGNORECASE
 )
 
+# One scan per query value; the individual patterns only run on a hit
+SUSPICIOUS_INPUT_PATTERN = re.compile(
+    f"{SQL_INJECTION_PATTERN.pattern}|{XSS_PATTERN.pattern}",
+    re.IGNORECASE
+)
+
+# Paths (by prefix) that skip validation
+VALIDATION_SKIP_PREFIXES = ("/docs", "/redoc", "/openapi.json", "/health")
+
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
 
 class RequestValidationMiddleware(BaseHTTPMiddleware):
     """
@@ -50,6 +64,8 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
     - Content type validation
     - Basic injection attack patterns
     - Path traversal attempts
+
+    Superseded by ``RequestValidationStage`` in the app's ``ASGIPipeline``.
     """
 
     async def dispatch(self, request: Request, call_next):
@@ -153,6 +169,61 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
             )
 
 
+class RequestValidationStage(PipelineStage):
+    """
+    ``ASGIPipeline`` stage applying the checks of ``RequestValidationMiddleware``
+
+    Rejections are returned as JSON error responses (413 / 415 / 400)
+    instead of exceptions.
+    """
+
+    skip_prefixes = VALIDATION_SKIP_PREFIXES
+
+    async def on_request(self, ctx: RequestContext) -> Optional[Rejection]:
+        # Validate request size
+        content_length = ctx.headers.get("content-length")
+        if content_length is not None:
+            try:
+                size = int(content_length)
+            except ValueError:
+                return Rejection(status.HTTP_400_BAD_REQUEST, "Invalid Content-Length header")
+            if size > MAX_REQUEST_SIZE:
+                logger.warning("Request too large", size=size, max_size=MAX_REQUEST_SIZE, path=ctx.path)
+                return Rejection(
+                    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    f"Request too large. Maximum size is {MAX_REQUEST_SIZE} bytes"
+                )
+
+        # Validate content type for POST/PUT/PATCH requests
+        if ctx.method in BODY_METHODS:
+            content_type = ctx.headers.get("content-type", "").split(";")[0].strip()
+            if content_type and content_type not in ALLOWED_CONTENT_TYPES:
+                logger.warning("Invalid content type", content_type=content_type, path=ctx.path)
+                return Rejection(
+                    status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    f"Content type '{content_type}' not supported"
+                )
+
+        # Validate URL path for traversal attempts
+        if PATH_TRAVERSAL_PATTERN.search(ctx.path):
+            logger.warning("Path traversal attempt detected", path=ctx.path, client=ctx.client_host or "unknown")
+            return Rejection(status.HTTP_400_BAD_REQUEST, "Invalid path")
+
+        # Validate query parameters for injection attempts
+        query_string = ctx.query_string
+        if query_string:
+            for key, value in parse_qsl(query_string, keep_blank_values=True):
+                if not SUSPICIOUS_INPUT_PATTERN.search(value):
+                    continue
+                if SQL_INJECTION_PATTERN.search(value):
+                    logger.warning("Potential SQL injection in query param", param=key, path=ctx.path)
+                else:
+                    logger.warning("Potential XSS in query param", param=key, path=ctx.path)
+                return Rejection(status.HTTP_400_BAD_REQUEST, "Invalid query parameter")
+
+        return None
+
+
 def validate_no_sql_injection(value: str) -> str:
     """
     Validate that a string doesn't contain SQL injection patterns
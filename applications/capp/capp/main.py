@@ -17,15 +17,18 @@ from typing import Optional
 from .config.settings import settings
 from .api.v1.router import api_router
 from .core.rate_limit import limiter, rate_limit_exceeded_handler
-from .core.validation import RequestValidationMiddleware
-from .core.security_headers import SecurityHeadersMiddleware
-from .core.agent_auth_middleware import AgentAuthMiddleware
+from .core.asgi_pipeline import ASGIPipeline
+from .core.middleware import RequestLoggingStage
+from .core.validation import RequestValidationStage
+from .core.security_headers import SecurityHeadersStage
+from .core.agent_auth_middleware import AgentAuthStage
 from .core.secrets import validate_all_secrets_on_startup
 from .core.error_handlers import register_error_handlers
 from .core.redis import init_redis, close_redis
 from .core.database import init_db, close_db
 from .core.aptos import init_aptos_client, close_aptos_client
 from .core.polygon import init_polygon_client
+from .services.metrics_buffer import flush_all_metrics
 
 # Configure structured logging
 structlog.configure(
@@ -62,6 +65,7 @@ async def lifespan(app: FastAPI):
     logger.info("CAPP application started successfully")
     yield
     logger.info("Shutting down CAPP application...")
+    await flush_all_metrics()
     await close_redis()
     await close_db()
     await close_aptos_client()
@@ -86,11 +90,18 @@ register_error_handlers(app)
 # Add rate limit exception handler
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
-# Add security headers middleware (first to ensure all responses have security headers)
-app.add_middleware(SecurityHeadersMiddleware)
-
-# Add validation middleware (processes requests before other middleware)
-app.add_middleware(RequestValidationMiddleware)
+# Request pipeline: one pure-ASGI middleware instead of a BaseHTTPMiddleware stack.
+# Stages run in order on the way in (validation rejects before auth runs bcrypt);
+# every response, rejections included, gets the logging and security headers.
+app.add_middleware(
+    ASGIPipeline,
+    stages=[
+        RequestLoggingStage(),
+        SecurityHeadersStage(),
+        RequestValidationStage(),
+        AgentAuthStage(),
+    ],
+)
 
 # Add CORS middleware
 origins = settings.ALLOWED_ORIGINS
@@ -106,9 +117,6 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization", "X-Request-ID", "X-API-Key"],
 )
 
-# Add Agent Auth Middleware
-app.add_middleware(AgentAuthMiddleware)
-
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -49,6 +49,7 @@ class AgentCredentialInDB(AgentCredentialBase):
     """Database model for agent credentials"""
     id: UUID = Field(default_factory=uuid4)
     hashed_api_key: str = Field(description="Bcrypt hash of the agent's API key")
+    key_prefix: Optional[str] = Field(None, description="Public lookup prefix embedded in the API key")
     
     # Status and lifecyle
     is_active: bool = True
@@ -77,6 +78,7 @@ class AgentCredentialInDB(AgentCredentialBase):
 class AgentCredentialResponse(AgentCredentialBase):
     """Response model for agent credentials (never includes the raw key except on issue)"""
     id: UUID
+    key_prefix: Optional[str] = None
     is_active: bool
     issued_at: datetime
     expires_at: datetime
@@ -20,8 +20,9 @@ class FailedTask(BaseModel):
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
     last_retry_at: Optional[datetime] = None
-    
-    status: str = "FAILED" # FAILED, RETRYING, RECOVERED, ARCHIVED
+    next_attempt_at: Optional[datetime] = None
+
+    status: str = "FAILED" # FAILED, RETRYING, RECOVERED, QUARANTINED, ARCHIVED
 
     class Config:
         json_encoders = {
@@ -5,17 +5,21 @@ This module provides the PaymentRepository class for managing payment data
 with full CRUD operations and complex queries.
 """
 
-from typing import Optional, List, Dict, Any
+import base64
+from types import SimpleNamespace
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 import structlog
-from sqlalchemy import select, update, delete, and_, or_, func
+from sqlalchemy import select, update, delete, and_, or_, func, literal, tuple_, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.database import (
     Payment as PaymentModel,
+    PaymentStatsRollup,
     User as UserModel,
     PaymentRoute,
     AgentActivity
@@ -23,6 +27,132 @@ from ..core.database import (
 
 logger = structlog.get_logger(__name__)
 
+# Rollup bucket sizes maintained for every payment
+ROLLUP_GRANULARITIES = ("hour", "day")
+
+# Payment columns that determine which rollup bucket a payment counts towards
+_ROLLUP_COLUMNS = (
+    PaymentModel.created_at,
+    PaymentModel.sender_country,
+    PaymentModel.recipient_country,
+    PaymentModel.status,
+    PaymentModel.amount,
+    PaymentModel.fees,
+)
+_ROLLUP_FIELDS = {"created_at", "sender_country", "recipient_country", "status", "amount", "fees"}
+
+
+# Rows fetched per round trip when streaming payments for exports
+STREAM_BATCH_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, payment_id: UUID) -> str:
+    """
+    Encode an opaque keyset pagination cursor
+
+    Args:
+        created_at: Creation time of the last payment on the page
+        payment_id: ID of the last payment on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{payment_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by ``encode_cursor``
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, payment_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(payment_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def _after_cursor(query, cursor: Optional[str], descending: bool = True):
+    """Restrict a payments query to rows after the cursor in listing order"""
+    if not cursor:
+        return query
+    created_at, payment_id = decode_cursor(cursor)
+    key = tuple_(PaymentModel.created_at, PaymentModel.id)
+    boundary = tuple_(literal(created_at, PaymentModel.created_at.type), literal(payment_id, PaymentModel.id.type))
+    return query.where(key < boundary if descending else key > boundary)
+
+
+def _listing_order(descending: bool = True):
+    if descending:
+        return (PaymentModel.created_at.desc(), PaymentModel.id.desc())
+    return (PaymentModel.created_at.asc(), PaymentModel.id.asc())
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Payment timestamps are stored as naive UTC"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _bucket_floor(value: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _bucket_ceil(value: datetime, granularity: str) -> datetime:
+    floor = _bucket_floor(value, granularity)
+    if floor == value:
+        return floor
+    return floor + (timedelta(hours=1) if granularity == "hour" else timedelta(days=1))
+
+
+def _plan_statistics_segments(
+    start: Optional[datetime],
+    end: datetime
+) -> List[Tuple[str, Optional[datetime], datetime]]:
+    """
+    Split ``[start, end]`` into rollup-backed and live segments
+
+    Whole days come from daily rollups, whole hours around them from hourly
+    rollups, and only the unaligned edges (at most an hour on each side)
+    are aggregated live from the payments table. The final live segment is
+    inclusive of ``end``; all others are half-open.
+
+    Returns:
+        List of ``(source, start, end)`` where source is live, hour or day
+    """
+    last_hour = _bucket_floor(end, "hour")
+    segments: List[Tuple[str, Optional[datetime], datetime]] = []
+
+    if start is None:
+        last_day = _bucket_floor(last_hour, "day")
+        segments.append(("day", None, last_day))
+        segments.append(("hour", last_day, last_hour))
+    else:
+        first_hour = _bucket_ceil(start, "hour")
+        if first_hour >= last_hour:
+            return [("live", start, end)]
+
+        segments.append(("live", start, first_hour))
+        first_day = _bucket_ceil(first_hour, "day")
+        last_day = _bucket_floor(last_hour, "day")
+        if first_day < last_day:
+            segments.append(("hour", first_hour, first_day))
+            segments.append(("day", first_day, last_day))
+            segments.append(("hour", last_day, last_hour))
+        else:
+            segments.append(("hour", first_hour, last_hour))
+
+    segments = [seg for seg in segments if seg[1] is None or seg[1] < seg[2]]
+    segments.append(("live", last_hour, end))
+    return segments
+
 
 class PaymentRepository:
     """
@@ -113,6 +243,8 @@ class PaymentRepository:
         )
 
         self.session.add(payment)
+        await self.session.flush()
+        await self._apply_rollup_deltas(self._rollup_deltas(None, payment))
         await self.session.commit()
         await self.session.refresh(payment)
 
@@ -183,21 +315,26 @@ class PaymentRepository:
         elif status == "settled" and "settled_at" not in kwargs:
             update_data['settled_at'] = datetime.utcnow()
 
+        previous = await self._get_rollup_row(payment_id)
+
         result = await self.session.execute(
             update(PaymentModel)
             .where(PaymentModel.id == payment_id)
             .values(**update_data)
             .returning(PaymentModel)
         )
+        payment = result.scalar_one_or_none()
+
+        if payment and previous:
+            await self._apply_rollup_deltas(self._rollup_deltas(previous, payment))
 
         await self.session.commit()
-        payment = result.scalar_one_or_none()
 
         if payment:
             logger.info(
                 "Payment status updated",
                 payment_id=str(payment_id),
-                old_status=payment.status if hasattr(payment, 'status') else None,
+                old_status=previous.status if previous else None,
                 new_status=status
             )
 
@@ -220,46 +357,145 @@ class PaymentRepository:
         """
         kwargs['updated_at'] = datetime.utcnow()
 
+        previous = None
+        if _ROLLUP_FIELDS.intersection(kwargs):
+            previous = await self._get_rollup_row(payment_id)
+
         result = await self.session.execute(
             update(PaymentModel)
             .where(PaymentModel.id == payment_id)
             .values(**kwargs)
             .returning(PaymentModel)
         )
+        payment = result.scalar_one_or_none()
+
+        if payment and previous:
+            await self._apply_rollup_deltas(self._rollup_deltas(previous, payment))
 
         await self.session.commit()
-        return result.scalar_one_or_none()
+        return payment
+
+    async def transition_statuses(
+        self,
+        payment_ids: List[UUID],
+        from_status: str,
+        to_status: str,
+        commit: bool = True,
+        **kwargs
+    ) -> List[UUID]:
+        """
+        Move payments from one status to another in a single UPDATE
+
+        Only rows still in ``from_status`` are changed, and the rollup
+        buckets of every changed row are adjusted in the same transaction.
+        Writers outside the repository (watchdog, chain indexer) must use
+        this instead of updating ``payments.status`` directly.
+
+        Args:
+            payment_ids: Payments to move
+            from_status: Status the payments must currently have
+            to_status: New status
+            commit: Set False to leave the transaction open for the caller
+            **kwargs: Additional fields to update
+
+        Returns:
+            IDs of the payments that were actually moved
+        """
+        if not payment_ids:
+            return []
+
+        values = {'status': to_status, 'updated_at': datetime.utcnow()}
+        values.update(kwargs)
+
+        result = await self.session.execute(
+            update(PaymentModel)
+            .where(PaymentModel.id.in_(payment_ids))
+            .where(PaymentModel.status == from_status)
+            .values(**values)
+            .returning(PaymentModel.id, *_ROLLUP_COLUMNS)
+        )
+        rows = result.all()
+
+        deltas: Dict[Tuple[str, datetime, str, str, str], List[Any]] = {}
+        for row in rows:
+            previous = SimpleNamespace(**{**row._asdict(), 'status': from_status})
+            for key, delta in self._rollup_deltas(previous, row).items():
+                total = deltas.setdefault(key, [0, Decimal("0"), Decimal("0")])
+                for i, value in enumerate(delta):
+                    total[i] += value
+        await self._apply_rollup_deltas({key: delta for key, delta in deltas.items() if any(delta)})
+
+        if commit:
+            await self.session.commit()
+
+        if rows:
+            logger.info(
+                "Payment statuses transitioned",
+                count=len(rows),
+                old_status=from_status,
+                new_status=to_status
+            )
+
+        return [row.id for row in rows]
+
+    @staticmethod
+    def next_cursor(payments: List[PaymentModel], limit: Optional[int]) -> Optional[str]:
+        """
+        Cursor for the page following ``payments``
+
+        Args:
+            payments: Page returned by one of the listing methods
+            limit: Page size that was requested
+
+        Returns:
+            Cursor string, or None if this was the last page
+        """
+        if not payments or limit is None or len(payments) < limit:
+            return None
+        last = payments[-1]
+        return encode_cursor(last.created_at, last.id)
 
     async def get_by_user(
         self,
         user_id: UUID,
         limit: int = 50,
         offset: int = 0,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[PaymentModel]:
         """
         Get payments for a user (sent or received)
 
+        The sent and received sides are fetched as two index range scans
+        and merged, rather than a single OR that cannot use either index.
+
         Args:
             user_id: User UUID
             limit: Maximum number of payments
-            offset: Number of payments to skip
+            offset: Number of payments to skip (prefer ``cursor``)
             status: Optional status filter
+            cursor: Keyset cursor from ``next_cursor`` of the previous page
 
         Returns:
             List of payment models
         """
-        query = select(PaymentModel).where(
-            or_(
-                PaymentModel.sender_id == user_id,
-                PaymentModel.recipient_id == user_id
-            )
-        )
+        def side(column):
+            query = select(PaymentModel.id, PaymentModel.created_at).where(column == user_id)
+            if status:
+                query = query.where(PaymentModel.status == status)
+            query = _after_cursor(query, cursor)
+            # Wrapped so each side keeps its own ORDER BY/LIMIT on every dialect
+            return select(query.order_by(*_listing_order()).limit(limit + offset).subquery())
 
-        if status:
-            query = query.where(PaymentModel.status == status)
+        page = union(side(PaymentModel.sender_id), side(PaymentModel.recipient_id)).subquery()
 
-        query = query.limit(limit).offset(offset).order_by(PaymentModel.created_at.desc())
+        query = (
+            select(PaymentModel)
+            .join(page, PaymentModel.id == page.c.id)
+            .order_by(*_listing_order())
+            .limit(limit)
+            .offset(offset)
+        )
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
@@ -268,7 +504,8 @@ class PaymentRepository:
         self,
         sender_id: UUID,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[PaymentModel]:
         """
         Get payments sent by a user
@@ -276,17 +513,18 @@ class PaymentRepository:
         Args:
             sender_id: Sender user ID
             limit: Maximum number of payments
-            offset: Number of payments to skip
+            offset: Number of payments to skip (prefer ``cursor``)
+            cursor: Keyset cursor from ``next_cursor`` of the previous page
 
         Returns:
             List of payment models
         """
+        query = select(PaymentModel).where(PaymentModel.sender_id == sender_id)
         result = await self.session.execute(
-            select(PaymentModel)
-            .where(PaymentModel.sender_id == sender_id)
+            _after_cursor(query, cursor)
+            .order_by(*_listing_order())
             .limit(limit)
             .offset(offset)
-            .order_by(PaymentModel.created_at.desc())
         )
         return list(result.scalars().all())
 
@@ -294,7 +532,8 @@ class PaymentRepository:
         self,
         recipient_id: UUID,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[PaymentModel]:
         """
         Get payments received by a user
@@ -302,17 +541,18 @@ class PaymentRepository:
         Args:
             recipient_id: Recipient user ID
             limit: Maximum number of payments
-            offset: Number of payments to skip
+            offset: Number of payments to skip (prefer ``cursor``)
+            cursor: Keyset cursor from ``next_cursor`` of the previous page
 
         Returns:
             List of payment models
         """
+        query = select(PaymentModel).where(PaymentModel.recipient_id == recipient_id)
         result = await self.session.execute(
-            select(PaymentModel)
-            .where(PaymentModel.recipient_id == recipient_id)
+            _after_cursor(query, cursor)
+            .order_by(*_listing_order())
             .limit(limit)
             .offset(offset)
-            .order_by(PaymentModel.created_at.desc())
         )
         return list(result.scalars().all())
 
@@ -320,7 +560,8 @@ class PaymentRepository:
         self,
         status: str,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[PaymentModel]:
         """
         Get payments by status
@@ -328,17 +569,18 @@ class PaymentRepository:
         Args:
             status: Payment status
             limit: Maximum number of payments
-            offset: Number of payments to skip
+            offset: Number of payments to skip (prefer ``cursor``)
+            cursor: Keyset cursor from ``next_cursor`` of the previous page
 
         Returns:
             List of payment models
         """
+        query = select(PaymentModel).where(PaymentModel.status == status)
         result = await self.session.execute(
-            select(PaymentModel)
-            .where(PaymentModel.status == status)
+            _after_cursor(query, cursor)
+            .order_by(*_listing_order())
             .limit(limit)
             .offset(offset)
-            .order_by(PaymentModel.created_at.desc())
         )
         return list(result.scalars().all())
 
@@ -347,7 +589,8 @@ class PaymentRepository:
         from_country: str,
         to_country: str,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[PaymentModel]:
         """
         Get payments for a specific corridor
@@ -356,34 +599,39 @@ class PaymentRepository:
             from_country: Source country code
             to_country: Destination country code
             limit: Maximum number of payments
-            offset: Number of payments to skip
+            offset: Number of payments to skip (prefer ``cursor``)
+            cursor: Keyset cursor from ``next_cursor`` of the previous page
 
         Returns:
             List of payment models
         """
-        result = await self.session.execute(
-            select(PaymentModel)
-            .where(
-                and_(
-                    PaymentModel.sender_country == from_country,
-                    PaymentModel.recipient_country == to_country
-                )
+        query = select(PaymentModel).where(
+            and_(
+                PaymentModel.sender_country == from_country,
+                PaymentModel.recipient_country == to_country
             )
+        )
+        result = await self.session.execute(
+            _after_cursor(query, cursor)
+            .order_by(*_listing_order())
             .limit(limit)
             .offset(offset)
-            .order_by(PaymentModel.created_at.desc())
         )
         return list(result.scalars().all())
 
     async def get_pending_payments(
         self,
-        older_than_minutes: Optional[int] = None
+        older_than_minutes: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> List[PaymentModel]:
         """
-        Get all pending payments
+        Get pending payments, oldest first
 
         Args:
             older_than_minutes: Only get payments pending longer than this
+            limit: Optional page size; all matching payments when omitted
+            cursor: Keyset cursor from ``next_cursor`` of the previous page
 
         Returns:
             List of pending payment models
@@ -394,11 +642,55 @@ class PaymentRepository:
             cutoff_time = datetime.utcnow() - timedelta(minutes=older_than_minutes)
             query = query.where(PaymentModel.created_at < cutoff_time)
 
-        query = query.order_by(PaymentModel.created_at.asc())
+        query = _after_cursor(query, cursor, descending=False).order_by(*_listing_order(descending=False))
+        if limit is not None:
+            query = query.limit(limit)
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def stream_by_user(
+        self,
+        user_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[PaymentModel]:
+        """
+        Stream a user's payments oldest first over a server-side cursor
+
+        Rows are fetched ``batch_size`` at a time, so exports of any size
+        hold at most one batch of ORM objects in memory.
+
+        Args:
+            user_id: User UUID
+            start_date: Optional inclusive lower bound on created_at
+            end_date: Optional exclusive upper bound on created_at
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Payment models
+        """
+        query = select(PaymentModel).where(
+            or_(
+                PaymentModel.sender_id == user_id,
+                PaymentModel.recipient_id == user_id
+            )
+        )
+        if start_date:
+            query = query.where(PaymentModel.created_at >= _naive_utc(start_date))
+        if end_date:
+            query = query.where(PaymentModel.created_at < _naive_utc(end_date))
+
+        query = query.order_by(*_listing_order(descending=False)).execution_options(yield_per=batch_size)
+
+        result = await self.session.stream_scalars(query)
+        try:
+            async for payment in result:
+                yield payment
+        finally:
+            await result.close()
+
     async def count_by_status(self, status: str) -> int:
         """
         Count payments by status
@@ -417,36 +709,54 @@ class PaymentRepository:
     async def get_statistics(
         self,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        from_country: Optional[str] = None,
+        to_country: Optional[str] = None,
+        use_rollups: bool = True
     ) -> Dict[str, Any]:
         """
         Get payment statistics
 
+        Aligned hours and days are read from ``payment_stats_rollups``; only
+        the partial hours at either end of the range are aggregated from the
+        payments table, and all aggregation happens in SQL.
+
         Args:
             start_date: Optional start date filter
             end_date: Optional end date filter
+            from_country: Optional corridor source country filter
+            to_country: Optional corridor destination country filter
+            use_rollups: Set False to aggregate the payments table directly
 
         Returns:
             Dictionary with payment statistics
         """
-        query = select(PaymentModel)
-
-        if start_date:
-            query = query.where(PaymentModel.created_at >= start_date)
-        if end_date:
-            query = query.where(PaymentModel.created_at <= end_date)
-
-        result = await self.session.execute(query)
-        payments = list(result.scalars().all())
-
-        # Calculate statistics
-        total_count = len(payments)
-        total_amount = sum(float(p.amount) for p in payments)
-        total_fees = sum(float(p.fees) for p in payments)
-
-        status_counts = {}
-        for payment in payments:
-            status_counts[payment.status] = status_counts.get(payment.status, 0) + 1
+        start = _naive_utc(start_date) if start_date else None
+        end = _naive_utc(end_date) if end_date else datetime.utcnow()
+
+        if use_rollups:
+            segments = _plan_statistics_segments(start, end)
+        else:
+            segments = [("live", start, end)]
+
+        totals: Dict[str, List[Any]] = {}
+        for index, (source, seg_start, seg_end) in enumerate(segments):
+            inclusive = index == len(segments) - 1
+            if source == "live":
+                rows = await self._aggregate_payments(seg_start, seg_end, inclusive, from_country, to_country)
+            else:
+                rows = await self._aggregate_rollups(source, seg_start, seg_end, from_country, to_country)
+
+            for status, count, amount, fees in rows:
+                bucket = totals.setdefault(status, [0, Decimal("0"), Decimal("0")])
+                bucket[0] += int(count or 0)
+                bucket[1] += Decimal(amount or 0)
+                bucket[2] += Decimal(fees or 0)
+
+        status_counts = {status: values[0] for status, values in totals.items() if values[0]}
+        total_count = sum(status_counts.values())
+        total_amount = float(sum(values[1] for values in totals.values()))
+        total_fees = float(sum(values[2] for values in totals.values()))
 
         return {
             "total_count": total_count,
@@ -458,6 +768,188 @@ class PaymentRepository:
             "end_date": end_date.isoformat() if end_date else None
         }
 
+    async def rebuild_rollups(self, start_date: datetime, end_date: datetime) -> None:
+        """
+        Recompute rollup buckets from the payments table
+
+        Use after bulk imports or writes that bypassed this repository.
+        The range is widened to whole days so every affected bucket is
+        rebuilt from scratch.
+
+        Args:
+            start_date: Start of the range to rebuild
+            end_date: End of the range to rebuild
+        """
+        start = _bucket_floor(_naive_utc(start_date), "day")
+        end = _bucket_ceil(_naive_utc(end_date), "day")
+
+        await self.session.execute(
+            delete(PaymentStatsRollup).where(
+                and_(
+                    PaymentStatsRollup.bucket_start >= start,
+                    PaymentStatsRollup.bucket_start < end
+                )
+            )
+        )
+
+        for granularity in ROLLUP_GRANULARITIES:
+            bucket = func.date_trunc(granularity, PaymentModel.created_at)
+            source = (
+                select(
+                    literal(granularity),
+                    bucket,
+                    PaymentModel.sender_country,
+                    PaymentModel.recipient_country,
+                    PaymentModel.status,
+                    func.count(PaymentModel.id),
+                    func.coalesce(func.sum(PaymentModel.amount), 0),
+                    func.coalesce(func.sum(PaymentModel.fees), 0),
+                )
+                .where(and_(PaymentModel.created_at >= start, PaymentModel.created_at < end))
+                .group_by(bucket, PaymentModel.sender_country, PaymentModel.recipient_country, PaymentModel.status)
+            )
+            await self.session.execute(
+                pg_insert(PaymentStatsRollup).from_select(
+                    [
+                        "granularity", "bucket_start", "sender_country", "recipient_country",
+                        "status", "payment_count", "total_amount", "total_fees",
+                    ],
+                    source
+                )
+            )
+
+        await self.session.commit()
+        logger.info("Payment rollups rebuilt", start=start.isoformat(), end=end.isoformat())
+
+    async def _aggregate_payments(
+        self,
+        start: Optional[datetime],
+        end: datetime,
+        end_inclusive: bool,
+        from_country: Optional[str],
+        to_country: Optional[str]
+    ) -> List[Tuple[str, int, Any, Any]]:
+        """Aggregate payments in a range per status directly in SQL"""
+        query = select(
+            PaymentModel.status,
+            func.count(PaymentModel.id),
+            func.coalesce(func.sum(PaymentModel.amount), 0),
+            func.coalesce(func.sum(PaymentModel.fees), 0),
+        ).group_by(PaymentModel.status)
+
+        if start is not None:
+            query = query.where(PaymentModel.created_at >= start)
+        if end_inclusive:
+            query = query.where(PaymentModel.created_at <= end)
+        else:
+            query = query.where(PaymentModel.created_at < end)
+        if from_country:
+            query = query.where(PaymentModel.sender_country == from_country)
+        if to_country:
+            query = query.where(PaymentModel.recipient_country == to_country)
+
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def _aggregate_rollups(
+        self,
+        granularity: str,
+        start: Optional[datetime],
+        end: datetime,
+        from_country: Optional[str],
+        to_country: Optional[str]
+    ) -> List[Tuple[str, int, Any, Any]]:
+        """Sum rollup buckets of one granularity in ``[start, end)`` per status"""
+        query = select(
+            PaymentStatsRollup.status,
+            func.sum(PaymentStatsRollup.payment_count),
+            func.sum(PaymentStatsRollup.total_amount),
+            func.sum(PaymentStatsRollup.total_fees),
+        ).where(
+            and_(
+                PaymentStatsRollup.granularity == granularity,
+                PaymentStatsRollup.bucket_start < end
+            )
+        ).group_by(PaymentStatsRollup.status)
+
+        if start is not None:
+            query = query.where(PaymentStatsRollup.bucket_start >= start)
+        if from_country:
+            query = query.where(PaymentStatsRollup.sender_country == from_country)
+        if to_country:
+            query = query.where(PaymentStatsRollup.recipient_country == to_country)
+
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def _get_rollup_row(self, payment_id: UUID):
+        """Lock a payment and read the columns that place it in a rollup bucket"""
+        result = await self.session.execute(
+            select(*_ROLLUP_COLUMNS)
+            .where(PaymentModel.id == payment_id)
+            .with_for_update()
+        )
+        return result.one_or_none()
+
+    @staticmethod
+    def _rollup_deltas(previous: Any, current: Any) -> Dict[Tuple[str, datetime, str, str, str], List[Any]]:
+        """
+        Compute per-bucket adjustments for a payment change
+
+        ``previous`` is removed from its buckets and ``current`` added to
+        its own; either may be None for inserts and deletes.
+        """
+        deltas: Dict[Tuple[str, datetime, str, str, str], List[Any]] = {}
+        for row, sign in ((previous, -1), (current, 1)):
+            if row is None:
+                continue
+            for granularity in ROLLUP_GRANULARITIES:
+                key = (
+                    granularity,
+                    _bucket_floor(row.created_at, granularity),
+                    row.sender_country,
+                    row.recipient_country,
+                    row.status,
+                )
+                delta = deltas.setdefault(key, [0, Decimal("0"), Decimal("0")])
+                delta[0] += sign
+                delta[1] += sign * Decimal(row.amount or 0)
+                delta[2] += sign * Decimal(row.fees or 0)
+
+        return {key: delta for key, delta in deltas.items() if any(delta)}
+
+    async def _apply_rollup_deltas(self, deltas: Dict[Tuple[str, datetime, str, str, str], List[Any]]) -> None:
+        """Upsert rollup adjustments in a single statement within the current transaction"""
+        if not deltas:
+            return
+
+        now = datetime.utcnow()
+        stmt = pg_insert(PaymentStatsRollup).values([
+            {
+                "granularity": granularity,
+                "bucket_start": bucket_start,
+                "sender_country": sender_country,
+                "recipient_country": recipient_country,
+                "status": status,
+                "payment_count": count,
+                "total_amount": amount,
+                "total_fees": fees,
+                "updated_at": now,
+            }
+            for (granularity, bucket_start, sender_country, recipient_country, status), (count, amount, fees)
+            in deltas.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_payment_stats_rollup_bucket",
+            set_={
+                "payment_count": PaymentStatsRollup.payment_count + stmt.excluded.payment_count,
+                "total_amount": PaymentStatsRollup.total_amount + stmt.excluded.total_amount,
+                "total_fees": PaymentStatsRollup.total_fees + stmt.excluded.total_fees,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        await self.session.execute(stmt)
+
     async def delete(self, payment_id: UUID) -> bool:
         """
         Delete payment (soft delete by marking as cancelled)
@@ -483,9 +975,13 @@ class PaymentRepository:
         Returns:
             True if successful, False otherwise
         """
+        previous = await self._get_rollup_row(payment_id)
+
         result = await self.session.execute(
             delete(PaymentModel).where(PaymentModel.id == payment_id)
         )
+        if result.rowcount > 0 and previous:
+            await self._apply_rollup_deltas(self._rollup_deltas(previous, None))
         await self.session.commit()
 
         deleted = result.rowcount > 0
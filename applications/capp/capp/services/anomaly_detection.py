@@ -1,5 +0,0 @@
-class AnomalyDetector:
-    def analyze_transaction(self, agent_id, tx_req):
-        pass
-
-anomaly_detector = AnomalyDetector()
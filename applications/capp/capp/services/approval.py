@@ -1,14 +1,79 @@
-from datetime import datetime
-from typing import Dict, Any, Optional
+"""
+Human Approval Queue
+
+Approval requests live in Redis so every worker sees the same queue:
+
+- ``approval:req:<id>``          hash with the request fields
+- ``approval:status:<STATUS>``   sorted set of ids per status (by time)
+- ``approval:agent:<agent_id>``  sorted set of ids per requester (by time)
+- ``approval:expiry``            sorted set of pending ids by deadline
+
+Creating and deciding a request are single Lua scripts, so a request is
+decided exactly once and its index entries always move with it. Each
+decision is published on ``approval:decisions``; one listener per process
+wakes every local waiter, so gated payments resume as soon as anyone
+approves on any worker. Expiry pops due ids from ``approval:expiry``
+instead of scanning.
+"""
+
+import asyncio
+import json
+import time
 import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
 import structlog
 from pydantic import BaseModel
-from eth_account import Account
-from eth_account.messages import encode_defunct
+
+from applications.capp.capp.config.settings import settings
+from applications.capp.capp.core.redis import get_redis_client
 from .activity_log import get_activity_log
 
 logger = structlog.get_logger(__name__)
 
+KEY_PREFIX = "approval:req:"
+STATUS_INDEX_PREFIX = "approval:status:"
+AGENT_INDEX_PREFIX = "approval:agent:"
+EXPIRY_KEY = "approval:expiry"
+DECISION_CHANNEL = "approval:decisions"
+
+PENDING = "PENDING"
+APPROVED = "APPROVED"
+REJECTED = "REJECTED"
+EXPIRED = "EXPIRED"
+
+# KEYS: request hash, pending index, agent index, expiry set.
+# ARGV: id, created (epoch s), expires (epoch s), key ttl, then field/value pairs.
+CREATE_SCRIPT = """
+for i = 5, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[1])
+redis.call('ZADD', KEYS[4], ARGV[3], ARGV[1])
+return 1
+"""
+
+# KEYS: request hash, pending index, expiry set, target status index.
+# ARGV: id, status, decided (epoch s), signature, signer, retention ttl, channel.
+# Only a PENDING request can be decided; returns 0 otherwise.
+DECIDE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'status') ~= 'PENDING' then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[2], 'decided_at', ARGV[3],
+           'signature', ARGV[4], 'signer_address', ARGV[5])
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+redis.call('ZADD', KEYS[4], ARGV[3], ARGV[1])
+redis.call('PUBLISH', ARGV[7], ARGV[1] .. ':' .. ARGV[2])
+return 1
+"""
+
+
 class ApprovalRequest(BaseModel):
     id: str
     created_at: datetime
@@ -16,67 +81,109 @@ class ApprovalRequest(BaseModel):
     action_type: str
     description: str
     payload: Dict[str, Any]
-    status: str = "PENDING"
+    status: str = PENDING
+    expires_at: Optional[datetime] = None
+    decided_at: Optional[datetime] = None
     signature: Optional[str] = None
     signer_address: Optional[str] = None
 
+
 class ApprovalService:
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ApprovalService, cls).__new__(cls)
-            cls._instance.pending_requests: Dict[str, ApprovalRequest] = {}
-        return cls._instance
-
-    def request_approval(self, agent_id: str, action_type: str, description: str, payload: Dict[str, Any] = None) -> str:
+    """Redis-backed approval queue shared by all workers."""
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        ttl_seconds: Optional[int] = None,
+        retention_seconds: Optional[int] = None,
+    ):
+        self._redis = redis_client
+        self.ttl_seconds = ttl_seconds or settings.APPROVAL_TTL_SECONDS
+        self.retention_seconds = retention_seconds or settings.APPROVAL_RETENTION_SECONDS
+        self._create_script = None
+        self._decide_script = None
+        # request id -> futures of local callers waiting on its decision
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed: Optional[asyncio.Event] = None
+
+    def _get_redis(self):
+        """Text-mode Redis client (the mock client when Redis is unavailable)"""
+        return self._redis if self._redis is not None else get_redis_client()
+
+    async def request_approval(self, agent_id: str, action_type: str, description: str,
+                               payload: Dict[str, Any] = None, ttl_seconds: Optional[int] = None) -> str:
+        await self.expire_due()
+
         req_id = str(uuid.uuid4())
-        request = ApprovalRequest(
-            id=req_id,
-            created_at=datetime.utcnow(),
-            agent_id=agent_id,
-            action_type=action_type,
-            description=description,
-            payload=payload or {}
-        )
-        self.pending_requests[req_id] = request
-        
+        created = time.time()
+        ttl = ttl_seconds or self.ttl_seconds
+        fields = {
+            "id": req_id,
+            "created_at": datetime.utcfromtimestamp(created).isoformat(),
+            "expires_at": datetime.utcfromtimestamp(created + ttl).isoformat(),
+            "agent_id": agent_id,
+            "action_type": action_type,
+            "description": description,
+            "payload": json.dumps(payload or {}, default=str),
+            "status": PENDING,
+        }
+        keys = [f"{KEY_PREFIX}{req_id}", f"{STATUS_INDEX_PREFIX}{PENDING}",
+                f"{AGENT_INDEX_PREFIX}{agent_id}", EXPIRY_KEY]
+        args: List[Any] = [req_id, created, created + ttl, ttl + self.retention_seconds]
+
+        redis = self._get_redis()
+        if hasattr(redis, "register_script"):
+            if self._create_script is None:
+                self._create_script = redis.register_script(CREATE_SCRIPT)
+            for field, value in fields.items():
+                args.extend((field, value))
+            await self._create_script(keys=keys, args=args)
+        else:
+            # Clients without scripting (mock/in-memory) get the same commands one by one
+            for field, value in fields.items():
+                await redis.hset(keys[0], field, value)
+            await redis.expire(keys[0], args[3])
+            await redis.zadd(keys[1], {req_id: created})
+            await redis.zadd(keys[2], {req_id: created})
+            await redis.zadd(keys[3], {req_id: created + ttl})
+
         get_activity_log().log_activity(
             agent_id=agent_id,
-            agent_type="system", 
-            action_type=action_type, 
+            agent_type="system",
+            action_type=action_type,
             message=description,
             metadata={
                 "request_id": req_id,
                 "payload": payload,
-                "status": "PENDING"
+                "status": PENDING
             }
         )
         logger.info("Approval Requested", req_id=req_id, agent=agent_id)
         return req_id
 
-    def approve_request(self, request_id: str, signature: str = None) -> bool:
-        if request_id not in self.pending_requests:
+    async def approve_request(self, request_id: str, signature: str = None) -> bool:
+        req = await self.get_request(request_id)
+        if req is None or req.status != PENDING:
             return False
 
-        req = self.pending_requests[request_id]
-
+        signer = None
         # Phase 3: Enforce Signature Verification
         if signature:
             try:
                 # Recover address from signature
                 # Message that was signed (must match frontend)
+                from eth_account import Account
+                from eth_account.messages import encode_defunct
+
                 msg = f"Approve Request: {request_id}"
                 message = encode_defunct(text=msg)
                 signer = Account.recover_message(message, signature=signature)
-                
-                req.signature = signature
-                req.signer_address = signer
                 logger.info("Signature Verified", signer=signer, req_id=request_id)
-                
+
                 # In production, check if 'signer' is an authorized admin
                 # For now, we accept any valid signature
-                
+
             except Exception as e:
                 logger.error("Invalid Signature", error=str(e))
                 return False
@@ -85,43 +192,203 @@ class ApprovalService:
             logger.warning("Unsigned Approval Attempt", req_id=request_id)
             # UNCOMMENT TO ENFORCE: return False
 
-        req.status = "APPROVED"
+        if not await self._decide(request_id, APPROVED, signature=signature, signer=signer):
+            # Decided (or expired) by someone else in the meantime
+            return False
         logger.info("Request Approved", req_id=request_id)
-        
+
         get_activity_log().log_activity(
             agent_id=req.agent_id,
             agent_type="system",
             action_type="DECISION",
             message=f"Approved: {req.description}",
             metadata={
-                "request_id": request_id, 
-                "status": "APPROVED",
-                "signer": req.signer_address
+                "request_id": request_id,
+                "status": APPROVED,
+                "signer": signer
             }
         )
         return True
 
-    def reject_request(self, request_id: str) -> bool:
-        if request_id in self.pending_requests:
-            self.pending_requests[request_id].status = "REJECTED"
-            
-            req = self.pending_requests[request_id]
-            logger.info("Request Rejected", req_id=request_id)
-
-            get_activity_log().log_activity(
-                agent_id=req.agent_id,
-                agent_type="system",
-                action_type="JURISDICTION", 
-                message=f"Rejected: {req.description}",
-                metadata={"request_id": request_id, "status": "REJECTED"}
-            )
-            return True
-        return False
-
-    def get_request_status(self, request_id: str) -> Optional[str]:
-        if request_id in self.pending_requests:
-            return self.pending_requests[request_id].status
-        return None
-
-def get_approval_service():
-    return ApprovalService()
+    async def reject_request(self, request_id: str) -> bool:
+        req = await self.get_request(request_id)
+        if req is None or not await self._decide(request_id, REJECTED):
+            return False
+
+        logger.info("Request Rejected", req_id=request_id)
+        get_activity_log().log_activity(
+            agent_id=req.agent_id,
+            agent_type="system",
+            action_type="JURISDICTION",
+            message=f"Rejected: {req.description}",
+            metadata={"request_id": request_id, "status": REJECTED}
+        )
+        return True
+
+    async def get_request(self, request_id: str) -> Optional[ApprovalRequest]:
+        raw = await self._get_redis().hgetall(f"{KEY_PREFIX}{request_id}")
+        return _to_request(raw) if raw else None
+
+    async def get_request_status(self, request_id: str) -> Optional[str]:
+        return await self._get_redis().hget(f"{KEY_PREFIX}{request_id}", "status")
+
+    async def list_requests(self, status: Optional[str] = PENDING, agent_id: Optional[str] = None,
+                            limit: int = 50) -> List[ApprovalRequest]:
+        """
+        Newest requests from the status or requester index. With both
+        filters the requester index is read and filtered by status.
+        """
+        await self.expire_due()
+        redis = self._get_redis()
+        index = f"{AGENT_INDEX_PREFIX}{agent_id}" if agent_id else f"{STATUS_INDEX_PREFIX}{status or PENDING}"
+
+        # Trim ids whose records have passed retention; the index itself never needs a scan
+        await redis.zremrangebyscore(index, "-inf", time.time() - self.ttl_seconds - self.retention_seconds)
+        ids = await redis.zrevrange(index, 0, limit - 1)
+        if not ids:
+            return []
+
+        if hasattr(redis, "pipeline"):
+            pipe = redis.pipeline(transaction=False)
+            for req_id in ids:
+                pipe.hgetall(f"{KEY_PREFIX}{req_id}")
+            rows = await pipe.execute()
+        else:
+            rows = [await redis.hgetall(f"{KEY_PREFIX}{req_id}") for req_id in ids]
+
+        requests = [_to_request(raw) for raw in rows if raw]
+        if agent_id and status:
+            requests = [req for req in requests if req.status == status]
+        return requests
+
+    async def wait_for_decision(self, request_id: str, timeout: float) -> Optional[str]:
+        """
+        Wait until the request is decided on any worker.
+
+        Returns:
+            The final status, ``PENDING`` if still undecided after ``timeout``
+            seconds, or None for an unknown request.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(request_id, set()).add(future)
+        try:
+            await self._ensure_listener()
+            # Checked after subscribing so a decision made in between is not missed
+            status = await self.get_request_status(request_id)
+            if status != PENDING:
+                return status
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                await self.expire_due()
+                return await self.get_request_status(request_id)
+        finally:
+            waiters = self._waiters.get(request_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[request_id]
+
+    async def expire_due(self, limit: int = 100) -> int:
+        """Expire pending requests whose deadline has passed; returns how many."""
+        due = await self._get_redis().zrangebyscore(EXPIRY_KEY, "-inf", time.time(), start=0, num=limit)
+        expired = 0
+        for req_id in due:
+            if await self._decide(req_id, EXPIRED):
+                expired += 1
+            else:
+                # Already decided, or its record is gone
+                await self._get_redis().zrem(EXPIRY_KEY, req_id)
+        if expired:
+            logger.info("Approval requests expired", count=expired)
+        return expired
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
+    async def _decide(self, request_id: str, status: str, signature: Optional[str] = None,
+                      signer: Optional[str] = None) -> bool:
+        decided = time.time()
+        keys = [f"{KEY_PREFIX}{request_id}", f"{STATUS_INDEX_PREFIX}{PENDING}",
+                EXPIRY_KEY, f"{STATUS_INDEX_PREFIX}{status}"]
+        args = [request_id, status, decided, signature or "", signer or "",
+                self.retention_seconds, DECISION_CHANNEL]
+
+        redis = self._get_redis()
+        if hasattr(redis, "register_script"):
+            if self._decide_script is None:
+                self._decide_script = redis.register_script(DECIDE_SCRIPT)
+            applied = bool(await self._decide_script(keys=keys, args=args))
+        else:
+            # Clients without scripting (mock/in-memory) get the same commands one by one
+            applied = await redis.hget(keys[0], "status") == PENDING
+            if applied:
+                for field, value in (("status", status), ("decided_at", decided),
+                                     ("signature", args[3]), ("signer_address", args[4])):
+                    await redis.hset(keys[0], field, str(value))
+                await redis.expire(keys[0], self.retention_seconds)
+                await redis.zrem(keys[1], request_id)
+                await redis.zrem(keys[2], request_id)
+                await redis.zadd(keys[3], {request_id: decided})
+                await redis.publish(DECISION_CHANNEL, f"{request_id}:{status}")
+
+        if applied:
+            # Local waiters are woken directly; other workers via the published decision
+            self._notify(request_id, status)
+        return applied
+
+    def _notify(self, request_id: str, status: str) -> None:
+        for future in self._waiters.get(request_id, ()):
+            if not future.done():
+                future.set_result(status)
+
+    async def _ensure_listener(self) -> None:
+        redis = self._get_redis()
+        if not hasattr(redis, "pubsub"):
+            return
+        if self._listener is None or self._listener.done():
+            self._subscribed = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen(redis))
+        await self._subscribed.wait()
+
+    async def _listen(self, redis) -> None:
+        """One subscription per process, fanned out to local waiters."""
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(DECISION_CHANNEL)
+            self._subscribed.set()
+            async for message in pubsub.listen():
+                request_id, _, status = str(message["data"]).rpartition(":")
+                self._notify(request_id, status)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Waiters fall back to their timeout; the next wait resubscribes
+            logger.warning("Approval decision listener stopped", error=str(e))
+        finally:
+            self._subscribed.set()
+            await pubsub.close()
+
+
+def _to_request(raw: Dict[str, str]) -> ApprovalRequest:
+    fields: Dict[str, Any] = {name: value for name, value in raw.items() if value != ""}
+    fields["payload"] = json.loads(fields.get("payload", "{}"))
+    if "decided_at" in fields:
+        fields["decided_at"] = datetime.utcfromtimestamp(float(fields["decided_at"]))
+    return ApprovalRequest(**fields)
+
+
+_approval_service: Optional[ApprovalService] = None
+
+
+def get_approval_service() -> ApprovalService:
+    global _approval_service
+    if _approval_service is None:
+        _approval_service = ApprovalService()
+    return _approval_service
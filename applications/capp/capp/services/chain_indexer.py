@@ -0,0 +1,580 @@
+"""
+Chain Event Indexer for CAPP
+
+Streams bridge and settlement events out of EVM chains by fetching logs for
+whole block ranges (``eth_getLogs``) instead of polling individual
+transaction receipts. Each chain keeps a checkpoint in Redis, only blocks
+``confirmations`` deep are indexed, and deeper reorgs are detected from the
+block hashes stored with the checkpoint and rewound. Logs are decoded once
+and handed to subscribers (oracle index, payment status) in batches.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+import structlog
+
+from applications.capp.capp.core.redis import get_cache
+
+logger = structlog.get_logger(__name__)
+
+# Block hashes kept with a checkpoint to locate the fork point of a reorg
+MAX_ANCHORS = 32
+# Successful ranges after which a refused range size is tried again
+RANGE_PROBE_AFTER = 50
+
+
+class LogRangeTooLarge(Exception):
+    """The log provider refused a block range (too many blocks or results)"""
+    pass
+
+
+class ChainEventDecodeError(Exception):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Event decoding
+# ---------------------------------------------------------------------------
+
+def event_topic(signature: str) -> str:
+    """topic0 of an event signature, e.g. ``Transfer(address,address,uint256)``"""
+    from web3 import Web3
+    return "0x" + bytes(Web3.keccak(text=signature)).hex()
+
+
+def _hex(value: Any) -> str:
+    """Normalise HexBytes / bytes / str to a lowercase 0x-prefixed string"""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    value = str(value).lower()
+    return value if value.startswith("0x") else "0x" + value
+
+
+def _decode_word(word: str, abi_type: str) -> Any:
+    """Decode one 32-byte ABI word (64 hex chars, no prefix)"""
+    if abi_type == "address":
+        return "0x" + word[-40:]
+    if abi_type.startswith("uint"):
+        return int(word, 16)
+    if abi_type.startswith("int"):
+        value = int(word, 16)
+        return value - (1 << 256) if value >= 1 << 255 else value
+    if abi_type == "bool":
+        return int(word, 16) != 0
+    if abi_type == "bytes32":
+        return "0x" + word
+    raise ChainEventDecodeError(f"Unsupported ABI type {abi_type}")
+
+
+@dataclass(frozen=True)
+class EventSpec:
+    """
+    Static ABI layout of an event this indexer understands.
+
+    Only fixed-size types are supported, which covers every event emitted
+    by the CAPP bridge and settlement contracts.
+    """
+    name: str
+    kind: str                                   # "bridge" | "settlement"
+    indexed: Tuple[Tuple[str, str], ...]        # (arg name, ABI type) in topics[1:]
+    data: Tuple[Tuple[str, str], ...] = ()      # (arg name, ABI type) in data
+
+    @property
+    def signature(self) -> str:
+        types = [abi_type for _, abi_type in self.indexed + self.data]
+        return f"{self.name}({','.join(types)})"
+
+    def decode(self, topics: Sequence[str], data: str) -> Dict[str, Any]:
+        if len(topics) != len(self.indexed) + 1:
+            raise ChainEventDecodeError(f"{self.name}: expected {len(self.indexed)} indexed topics")
+        args = {
+            name: _decode_word(topic[2:].rjust(64, "0"), abi_type)
+            for (name, abi_type), topic in zip(self.indexed, topics[1:])
+        }
+        payload = data[2:] if data.startswith("0x") else data
+        if len(payload) < 64 * len(self.data):
+            raise ChainEventDecodeError(f"{self.name}: data too short")
+        for i, (name, abi_type) in enumerate(self.data):
+            args[name] = _decode_word(payload[64 * i:64 * (i + 1)], abi_type)
+        return args
+
+
+BRIDGE_AND_SETTLEMENT_EVENTS: Tuple[EventSpec, ...] = (
+    EventSpec("TokensLocked", "bridge",
+              indexed=(("sender", "address"),),
+              data=(("recipient", "bytes32"), ("token", "address"), ("amount", "uint256"))),
+    EventSpec("TokensReleased", "bridge",
+              indexed=(("lock_tx_hash", "bytes32"),),
+              data=(("recipient", "address"), ("amount", "uint256"))),
+    EventSpec("SettlementConfirmed", "settlement",
+              indexed=(("payment_ref", "bytes32"),),
+              data=(("amount", "uint256"),)),
+    EventSpec("SettlementFailed", "settlement",
+              indexed=(("payment_ref", "bytes32"),),
+              data=(("reason", "uint256"),)),
+)
+
+
+@dataclass
+class ChainEvent:
+    """A decoded contract event"""
+    chain: str
+    name: str
+    kind: str
+    tx_hash: str
+    block_number: int
+    block_hash: str
+    log_index: int
+    address: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Unique per log; subscribers use it to apply events idempotently"""
+        return f"{self.chain}:{self.tx_hash}:{self.log_index}"
+
+
+class EventDecoder:
+    """Maps topic0 to its ``EventSpec`` and turns raw logs into ``ChainEvent``"""
+
+    def __init__(self, specs: Iterable[EventSpec] = BRIDGE_AND_SETTLEMENT_EVENTS):
+        self.specs: Dict[str, EventSpec] = {event_topic(spec.signature): spec for spec in specs}
+
+    @property
+    def topics(self) -> List[str]:
+        return list(self.specs)
+
+    def decode(self, chain: str, log: Dict[str, Any]) -> Optional[ChainEvent]:
+        topics = [_hex(topic) for topic in log.get("topics", [])]
+        spec = self.specs.get(topics[0]) if topics else None
+        if spec is None:
+            return None
+        try:
+            args = spec.decode(topics, _hex(log.get("data", "0x")))
+        except ChainEventDecodeError as e:
+            logger.warning("chain_event_decode_failed", chain=chain, tx_hash=_hex(log.get("transactionHash")), error=str(e))
+            return None
+        return ChainEvent(
+            chain=chain,
+            name=spec.name,
+            kind=spec.kind,
+            tx_hash=_hex(log["transactionHash"]),
+            block_number=int(log["blockNumber"]),
+            block_hash=_hex(log["blockHash"]),
+            log_index=int(log.get("logIndex", 0)),
+            address=_hex(log.get("address", "0x")),
+            args=args,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Log sources
+# ---------------------------------------------------------------------------
+
+class LogSource(Protocol):
+    async def get_head(self) -> int: ...
+
+    async def get_block_hash(self, number: int) -> Optional[str]: ...
+
+    async def get_logs(self, from_block: int, to_block: int,
+                       addresses: Sequence[str], topics: Sequence[str]) -> List[Dict[str, Any]]: ...
+
+
+class Web3LogSource:
+    """``LogSource`` over a (synchronous) web3.py client, run off the event loop"""
+
+    # JSON-RPC errors providers use to reject oversized eth_getLogs queries
+    _RANGE_ERROR_CODES = {-32005, -32602}
+    _RANGE_ERROR_HINTS = ("range", "more than", "too many", "limit exceeded", "response size")
+
+    def __init__(self, web3: Any):
+        self.web3 = web3
+
+    async def get_head(self) -> int:
+        return int(await asyncio.to_thread(lambda: self.web3.eth.block_number))
+
+    async def get_block_hash(self, number: int) -> Optional[str]:
+        block = await asyncio.to_thread(self.web3.eth.get_block, number)
+        return _hex(block["hash"]) if block else None
+
+    async def get_logs(self, from_block: int, to_block: int,
+                       addresses: Sequence[str], topics: Sequence[str]) -> List[Dict[str, Any]]:
+        params = {
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "address": list(addresses),
+            "topics": [list(topics)],  # topic0 is any of the events we decode
+        }
+        try:
+            return list(await asyncio.to_thread(self.web3.eth.get_logs, params))
+        except Exception as e:
+            error = e.args[0] if e.args and isinstance(e.args[0], dict) else {}
+            message = str(error.get("message", e)).lower()
+            if error.get("code") in self._RANGE_ERROR_CODES or any(h in message for h in self._RANGE_ERROR_HINTS):
+                raise LogRangeTooLarge(message) from e
+            raise
+
+
+class RecordedBlockSource:
+    """
+    In-memory ``LogSource`` replaying recorded blocks.
+
+    Used in simulation mode and tests. ``max_range`` mimics a provider's
+    eth_getLogs block-range limit and ``reorg`` replaces the chain tip.
+    """
+
+    def __init__(self, blocks: Optional[List[Dict[str, Any]]] = None, max_range: Optional[int] = None):
+        # Each block: {"number", "hash", "logs": [raw log dicts]}
+        self.blocks: List[Dict[str, Any]] = []
+        self.max_range = max_range
+        self.get_logs_calls: List[Tuple[int, int]] = []
+        for block in blocks or []:
+            self.add_block(block.get("logs", []), block_hash=block.get("hash"))
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "RecordedBlockSource":
+        with open(path) as f:
+            return cls(json.load(f), **kwargs)
+
+    def add_block(self, logs: Sequence[Dict[str, Any]] = (), block_hash: Optional[str] = None) -> Dict[str, Any]:
+        number = len(self.blocks)
+        block_hash = block_hash or f"0x{number:064x}"
+        block = {
+            "number": number,
+            "hash": block_hash,
+            "logs": [
+                {**log, "blockNumber": number, "blockHash": block_hash, "logIndex": log.get("logIndex", i)}
+                for i, log in enumerate(logs)
+            ],
+        }
+        self.blocks.append(block)
+        return block
+
+    def reorg(self, depth: int, replacement: Sequence[Sequence[Dict[str, Any]]] = ()) -> None:
+        """Drop the last ``depth`` blocks and append ``replacement`` blocks with fresh hashes"""
+        del self.blocks[len(self.blocks) - depth:]
+        for logs in replacement:
+            number = len(self.blocks)
+            self.add_block(logs, block_hash=f"0x{number:032x}{'f' * 32}")
+
+    async def get_head(self) -> int:
+        return len(self.blocks) - 1
+
+    async def get_block_hash(self, number: int) -> Optional[str]:
+        if 0 <= number < len(self.blocks):
+            return self.blocks[number]["hash"]
+        return None
+
+    async def get_logs(self, from_block: int, to_block: int,
+                       addresses: Sequence[str], topics: Sequence[str]) -> List[Dict[str, Any]]:
+        if self.max_range is not None and to_block - from_block + 1 > self.max_range:
+            raise LogRangeTooLarge(f"block range {from_block}-{to_block} exceeds {self.max_range}")
+        self.get_logs_calls.append((from_block, to_block))
+        wanted_addresses = {a.lower() for a in addresses}
+        wanted_topics = {t.lower() for t in topics}
+        return [
+            log
+            for block in self.blocks[from_block:to_block + 1]
+            for log in block["logs"]
+            if (not wanted_addresses or log.get("address", "").lower() in wanted_addresses)
+            and (not wanted_topics or (log.get("topics") and log["topics"][0].lower() in wanted_topics))
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Indexer
+# ---------------------------------------------------------------------------
+
+Subscriber = Callable[[List[ChainEvent]], Awaitable[None]]
+
+
+@dataclass
+class IndexerCheckpoint:
+    """Last indexed block of a chain plus recent (block, hash) anchors"""
+    block: int
+    anchors: List[Tuple[int, str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"block": self.block, "anchors": [list(anchor) for anchor in self.anchors]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndexerCheckpoint":
+        return cls(block=int(data["block"]), anchors=[(int(n), h) for n, h in data.get("anchors", [])])
+
+
+class ChainEventIndexer:
+    """
+    Block-range log indexer for one chain.
+
+    ``poll()`` walks from the checkpoint towards ``head - confirmations`` in
+    ranges whose size adapts to the provider: a range that is refused (or
+    returns more than ``target_logs`` logs) halves the next one, a quiet range
+    doubles it up to ``max_range``. A refusal also caps growth at the size
+    that worked until ``RANGE_PROBE_AFTER`` ranges have gone through. Events of a range are dispatched to the
+    subscribers as one batch before the checkpoint moves past it, so delivery
+    is at-least-once; subscribers apply events idempotently (see
+    ``ChainEvent.key``).
+    """
+
+    CHECKPOINT_KEY = "indexer:checkpoint:{chain}"
+
+    def __init__(
+        self,
+        chain: str,
+        source: LogSource,
+        addresses: Sequence[str] = (),
+        decoder: Optional[EventDecoder] = None,
+        confirmations: int = 12,
+        initial_range: int = 2000,
+        max_range: int = 10000,
+        target_logs: int = 5000,
+        max_ranges_per_poll: int = 10,
+        start_block: Optional[int] = None,
+        cache: Any = None,
+    ):
+        self.chain = chain.upper()
+        self.source = source
+        self.addresses = list(addresses)
+        self.decoder = decoder or EventDecoder()
+        self.confirmations = confirmations
+        self.range_size = max(1, min(initial_range, max_range))
+        self.max_range = max_range
+        self._range_ceiling = max_range
+        self._ranges_since_refusal = 0
+        self.target_logs = target_logs
+        self.max_ranges_per_poll = max_ranges_per_poll
+        self.start_block = start_block
+        self.cache = cache if cache is not None else get_cache()
+        self.checkpoint_key = self.CHECKPOINT_KEY.format(chain=self.chain)
+
+        self._subscribers: List[Tuple[Subscriber, Optional[frozenset]]] = []
+        self._checkpoint: Optional[IndexerCheckpoint] = None
+        self.stats = {"ranges": 0, "logs": 0, "events": 0, "range_shrinks": 0, "reorgs": 0}
+
+    def subscribe(self, handler: Subscriber, kinds: Optional[Iterable[str]] = None) -> None:
+        """
+        Register a batch handler.
+
+        Args:
+            handler: Coroutine called with the list of events of one block range
+            kinds: Event kinds to receive ("bridge", "settlement"); all if None
+        """
+        self._subscribers.append((handler, frozenset(kinds) if kinds else None))
+
+    @property
+    def last_block(self) -> Optional[int]:
+        return self._checkpoint.block if self._checkpoint else None
+
+    async def poll(self) -> bool:
+        """
+        Index confirmed blocks past the checkpoint.
+
+        Returns:
+            True if the indexer caught up with the confirmed head
+        """
+        head = await self.source.get_head()
+        safe_head = head - self.confirmations
+        checkpoint = await self._load_checkpoint(safe_head)
+        await self._check_reorg(checkpoint)
+
+        for _ in range(self.max_ranges_per_poll):
+            from_block = checkpoint.block + 1
+            if from_block > safe_head:
+                return True
+            to_block = min(from_block + self.range_size - 1, safe_head)
+
+            try:
+                logs = await self.source.get_logs(from_block, to_block, self.addresses, self.decoder.topics)
+            except (LogRangeTooLarge, asyncio.TimeoutError) as e:
+                if self.range_size == 1:
+                    raise
+                self._shrink()
+                self._range_ceiling = self.range_size
+                self._ranges_since_refusal = 0
+                logger.info("chain_indexer_range_shrunk", chain=self.chain, range_size=self.range_size, error=str(e))
+                continue
+
+            events = [event for event in (self.decoder.decode(self.chain, log) for log in logs) if event]
+            await self._dispatch(events)
+
+            block_hash = await self.source.get_block_hash(to_block)
+            checkpoint.block = to_block
+            checkpoint.anchors = (checkpoint.anchors + [(to_block, block_hash)])[-MAX_ANCHORS:]
+            await self._save_checkpoint(checkpoint)
+
+            self.stats["ranges"] += 1
+            self.stats["logs"] += len(logs)
+            self.stats["events"] += len(events)
+            self._ranges_since_refusal += 1
+            if self._ranges_since_refusal >= RANGE_PROBE_AFTER:
+                self._range_ceiling = self.max_range
+            if len(logs) > self.target_logs:
+                self._shrink()
+            else:
+                self.range_size = min(self.range_size * 2, self._range_ceiling)
+
+        return checkpoint.block >= safe_head
+
+    async def _dispatch(self, events: List[ChainEvent]) -> None:
+        if not events:
+            return
+        batches = []
+        for handler, kinds in self._subscribers:
+            batch = events if kinds is None else [event for event in events if event.kind in kinds]
+            if batch:
+                batches.append(handler(batch))
+        # A failing subscriber stops the checkpoint so the range is retried
+        await asyncio.gather(*batches)
+
+    def _shrink(self) -> None:
+        self.range_size = max(1, self.range_size // 2)
+        self.stats["range_shrinks"] += 1
+
+    async def _check_reorg(self, checkpoint: IndexerCheckpoint) -> None:
+        """Rewind to the newest anchor still on the canonical chain"""
+        if not checkpoint.anchors:
+            return
+        number, stored_hash = checkpoint.anchors[-1]
+        if await self.source.get_block_hash(number) == stored_hash:
+            return
+
+        while checkpoint.anchors:
+            number, stored_hash = checkpoint.anchors.pop()
+            if await self.source.get_block_hash(number) == stored_hash:
+                checkpoint.anchors.append((number, stored_hash))
+                break
+
+        rewound_from = checkpoint.block
+        if checkpoint.anchors:
+            checkpoint.block = checkpoint.anchors[-1][0]
+        else:
+            # Deeper than every anchor: re-index the oldest window we know about
+            checkpoint.block = max(-1, number - 1)
+        self.stats["reorgs"] += 1
+        logger.warning(
+            "chain_reorg_detected",
+            chain=self.chain,
+            rewound_from=rewound_from,
+            rewound_to=checkpoint.block,
+        )
+        await self._save_checkpoint(checkpoint)
+
+    async def _load_checkpoint(self, safe_head: int) -> IndexerCheckpoint:
+        if self._checkpoint is None:
+            stored = await self.cache.get(self.checkpoint_key)
+            if stored:
+                self._checkpoint = IndexerCheckpoint.from_dict(stored)
+            else:
+                # First run: start from the configured block, else from now
+                start = self.start_block if self.start_block is not None else max(0, safe_head)
+                self._checkpoint = IndexerCheckpoint(block=start - 1)
+                logger.info("chain_indexer_initialized", chain=self.chain, start_block=start)
+        return self._checkpoint
+
+    async def _save_checkpoint(self, checkpoint: IndexerCheckpoint) -> None:
+        await self.cache.set(self.checkpoint_key, checkpoint.to_dict())
+
+
+# ---------------------------------------------------------------------------
+# Subscribers
+# ---------------------------------------------------------------------------
+
+async def update_oracle_index(events: List[ChainEvent]) -> None:
+    """Mirror bridge / settlement events into the public transaction oracle"""
+    from applications.capp.capp.services.oracle_service import OracleService, TransactionStatus
+
+    statuses = {
+        "TokensLocked": TransactionStatus.PENDING,
+        "TokensReleased": TransactionStatus.COMPLETED,
+        "SettlementConfirmed": TransactionStatus.COMPLETED,
+        "SettlementFailed": TransactionStatus.FAILED,
+    }
+    oracle = OracleService.get_instance()
+    await asyncio.gather(*(
+        oracle.update_index(
+            tx_hash=event.tx_hash,
+            status=statuses[event.name],
+            meta={"chain": event.chain, "event": event.name, "block_number": event.block_number},
+        )
+        for event in events
+        if event.name in statuses
+    ))
+
+
+class PaymentStatusSubscriber:
+    """
+    Applies settlement events to the ``settlements`` and ``payments`` tables.
+
+    One UPDATE per outcome and table for the whole batch, matched on the
+    settlement's transaction hash. Rows that already left ``pending`` /
+    ``settling`` are untouched, which makes replays after a restart or reorg
+    harmless.
+    """
+
+    _OUTCOMES = {"SettlementConfirmed": "confirmed", "SettlementFailed": "failed"}
+
+    def __init__(self, db_session_factory: Optional[Callable] = None, deadline_index: Any = None):
+        self.db_session_factory = db_session_factory
+        self.deadline_index = deadline_index
+
+    async def __call__(self, events: List[ChainEvent]) -> None:
+        by_outcome: Dict[str, Dict[str, int]] = {}
+        for event in events:
+            outcome = self._OUTCOMES.get(event.name)
+            if outcome:
+                by_outcome.setdefault(outcome, {})[event.tx_hash] = event.block_number
+        if not by_outcome:
+            return
+
+        from sqlalchemy import case, update
+        from applications.capp.capp.core.database import Settlement
+        from applications.capp.capp.repositories.payment import PaymentRepository
+
+        session_factory = self.db_session_factory
+        if session_factory is None:
+            from applications.capp.capp.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        now = datetime.utcnow()
+        resolved: List[str] = []
+        async with session_factory() as session:
+            for outcome, blocks in by_outcome.items():
+                values = {
+                    "status": outcome,
+                    "block_number": case(blocks, value=Settlement.blockchain_tx_hash),
+                }
+                if outcome == "confirmed":
+                    values["confirmed_at"] = now
+                result = await session.execute(
+                    update(Settlement)
+                    .where(Settlement.blockchain_tx_hash.in_(list(blocks)))
+                    .where(Settlement.status == "pending")
+                    .values(**values)
+                    .returning(Settlement.payment_id)
+                )
+                payment_ids = [row[0] for row in result.all()]
+                if not payment_ids:
+                    continue
+
+                payment_status = "completed" if outcome == "confirmed" else "failed"
+                payment_values = {}
+                if payment_status == "completed":
+                    payment_values["completed_at"] = now
+                # Through the repository so payment_stats_rollups follow the change
+                await PaymentRepository(session).transition_statuses(
+                    payment_ids, "settling", payment_status, commit=False, **payment_values
+                )
+                resolved.extend(str(pid) for pid in payment_ids)
+            await session.commit()
+
+        if resolved:
+            deadline_index = self.deadline_index
+            if deadline_index is None:
+                from applications.capp.capp.services.settlement_deadlines import SettlementDeadlineIndex
+                deadline_index = SettlementDeadlineIndex()
+            await deadline_index.clear(*resolved)
+            logger.info("settlement_events_applied", payments=len(resolved))
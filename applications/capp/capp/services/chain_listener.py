@@ -1,53 +1,118 @@
 import asyncio
+import json
 import structlog
-from datetime import datetime
+from typing import Dict, List, Optional
+
+from applications.capp.capp.config.settings import settings
+from applications.capp.capp.services.chain_indexer import (
+    ChainEventIndexer,
+    PaymentStatusSubscriber,
+    Web3LogSource,
+    update_oracle_index,
+)
 
 logger = structlog.get_logger(__name__)
 
+# Settings holding the RPC endpoint of each indexable EVM chain
+CHAIN_RPC_SETTINGS: Dict[str, str] = {
+    "POLYGON": "POLYGON_RPC_URL",
+    "BASE": "BASE_RPC_URL",
+    "ARBITRUM": "ARBITRUM_RPC_URL",
+}
+
+
+def build_indexers() -> List[ChainEventIndexer]:
+    """One indexer per chain listed in CHAIN_INDEXER_CONTRACTS"""
+    if not settings.CHAIN_INDEXER_CONTRACTS:
+        return []
+
+    from web3 import Web3
+
+    indexers = []
+    for chain, addresses in json.loads(settings.CHAIN_INDEXER_CONTRACTS).items():
+        rpc_setting = CHAIN_RPC_SETTINGS.get(chain.upper())
+        if rpc_setting is None:
+            logger.warning("chain_indexer_unsupported_chain", chain=chain)
+            continue
+        web3 = Web3(Web3.HTTPProvider(getattr(settings, rpc_setting)))
+        indexers.append(ChainEventIndexer(
+            chain,
+            Web3LogSource(web3),
+            addresses=addresses,
+            confirmations=settings.CHAIN_INDEXER_CONFIRMATIONS,
+            initial_range=settings.CHAIN_INDEXER_INITIAL_RANGE,
+            max_range=settings.CHAIN_INDEXER_MAX_RANGE,
+            target_logs=settings.CHAIN_INDEXER_TARGET_LOGS,
+        ))
+    return indexers
+
+
 class ChainListenerService:
     """
     Listens for on-chain events (e.g. Bridge Withdrawals).
-    Currently runs in simulation mode until real RPC is configured.
+
+    Drives one ``ChainEventIndexer`` per configured chain and routes decoded
+    events to the oracle index and payment status subscribers. Runs in
+    simulation mode (heartbeat only) when no contracts are configured.
     """
-    
-    def __init__(self):
+
+    def __init__(self, indexers: Optional[List[ChainEventIndexer]] = None):
         self.is_running = False
         self.last_block = 0
-    
+        self.indexers = indexers if indexers is not None else build_indexers()
+        self.poll_interval = settings.CHAIN_INDEXER_POLL_INTERVAL_SECONDS
+
+        payment_status = PaymentStatusSubscriber()
+        for indexer in self.indexers:
+            indexer.subscribe(update_oracle_index)
+            indexer.subscribe(payment_status, kinds=["settlement"])
+
     async def start_listening(self):
         """
         Start the background polling loop.
         """
         self.is_running = True
-        logger.info("ChainListenerService started", mode="SIMULATION")
-        
+        logger.info(
+            "ChainListenerService started",
+            mode="INDEXER" if self.indexers else "SIMULATION",
+            chains=[indexer.chain for indexer in self.indexers],
+        )
+
         while self.is_running:
             try:
-                await self.poll_events()
-                await asyncio.sleep(5) # Poll every 5 seconds
+                caught_up = await self.poll_events()
+                # Keep going without a pause while any chain is still backfilling
+                if caught_up:
+                    await asyncio.sleep(self.poll_interval)
             except Exception as e:
                 logger.error("ChainListener Error", error=str(e))
-                await asyncio.sleep(5)
+                await asyncio.sleep(self.poll_interval)
 
-    async def poll_events(self):
+    async def poll_events(self) -> bool:
         """
-        Check for new events.
-        In production, this would call web3.eth.getLogs.
+        Index new confirmed blocks on every chain.
+
+        Returns:
+            True once every chain has caught up with its confirmed head
         """
-        # Simulation Logic: 
-        # For now, we just log a heartbeat. 
-        # To verify Phase 2, we can look for this log.
-        logger.debug("Scanning blocks...", last_block=self.last_block)
-        
-        # MOCK: Randomly find an event (disabled by default to avoid spam)
-        # if random.random() < 0.05:
-        #    self.handle_event({"event": "WithdrawalInitiated", "tx": "0x..."})
-        
-        self.last_block += 1
+        if not self.indexers:
+            logger.debug("Scanning blocks...", last_block=self.last_block)
+            self.last_block += 1
+            return True
+
+        results = await asyncio.gather(*(indexer.poll() for indexer in self.indexers), return_exceptions=True)
+        caught_up = True
+        for indexer, result in zip(self.indexers, results):
+            if isinstance(result, Exception):
+                # One unreachable RPC must not stall the other chains
+                logger.error("chain_indexer_poll_failed", chain=indexer.chain, error=str(result))
+            else:
+                caught_up = caught_up and result
+        self.last_block = max((indexer.last_block or 0 for indexer in self.indexers), default=0)
+        return caught_up
 
     def handle_event(self, event):
         logger.info("Event Detected", event_type=event.get("event"), tx=event.get("tx"))
-        # In Phase 3, we will update the DB here.
 
     def stop(self):
         self.is_running = False
@@ -5,7 +5,7 @@ Handles regulatory compliance requirements across African countries including
 KYC/AML, sanctions screening, and country-specific regulations.
 """
 
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from pydantic import BaseModel
 import structlog
 
@@ -410,24 +410,52 @@ class ComplianceService:
         """
         Generate a compliance report (CSV or PDF/Text) for a user for a specific year.
         """
+        chunks = [chunk async for chunk in self.stream_report(user_id, report_type, year, session)]
+        return {"filename": self.report_filename(report_type, year), "content": "".join(chunks)}
+
+    @staticmethod
+    def report_filename(report_type: str, year: int) -> str:
+        """Download filename for a compliance report"""
+        extension = "csv" if report_type.upper() == "CSV" else "txt"
+        return f"capp_compliance_{year}.{extension}"
+
+    async def stream_report(
+        self,
+        user_id: UUID,
+        report_type: str,
+        year: int,
+        session: AsyncSession,
+        rows_per_chunk: int = 200
+    ) -> AsyncIterator[str]:
+        """
+        Stream a compliance report (CSV or PDF/Text) for a user for a specific year.
+
+        Payments are read over a server-side cursor bounded to the year and
+        written out in chunks of ``rows_per_chunk`` rows, so memory use does
+        not depend on how many payments the user has.
+        """
         repo = PaymentRepository(session)
-        # Fetch all payments for now, perform in-memory filtering for year for MVP convenience
-        # In prod, repo should support date range filtering
-        payments = await repo.get_by_user(user_id, limit=1000)
-        
-        filtered_payments = [
-            p for p in payments 
-            if p.created_at.year == year
-        ]
-        
+        payments = repo.stream_by_user(
+            user_id,
+            start_date=datetime.datetime(year, 1, 1),
+            end_date=datetime.datetime(year + 1, 1, 1)
+        )
+
+        output = io.StringIO()
         if report_type.upper() == "CSV":
-            filename = f"capp_compliance_{year}.csv"
-            output = io.StringIO()
             fieldnames = ["Date", "Payment ID", "Type", "Amount", "Currency", "Status", "Reference", "Description"]
             writer = csv.DictWriter(output, fieldnames=fieldnames)
-
             writer.writeheader()
-            for p in filtered_payments:
+        else:
+            # Mock PDF as Text
+            output.write(f"CAPP WALLET - COMPLIANCE REPORT {year}\n")
+            output.write(f"User ID: {user_id}\n")
+            output.write(f"Generated: {datetime.datetime.now()}\n")
+            output.write("="*50 + "\n\n")
+
+        rows = 0
+        async for p in payments:
+            if report_type.upper() == "CSV":
                 writer.writerow({
                     "Date": p.created_at.isoformat(),
                     "Payment ID": str(p.id), # Assuming ID matches model field roughly
@@ -438,22 +466,19 @@ class ComplianceService:
                     "Reference": p.reference_id,
                     "Description": p.description or ""
                 })
-            content = output.getvalue()
-            output.close()
+            else:
+                output.write(f"Transaction: {p.reference_id}\n")
+                output.write(f"Date: {p.created_at}\n")
+                output.write(f"Type: {p.payment_type}\n")
+                output.write(f"Amount: {p.amount} {p.from_currency}\n")
+                output.write(f"Status: {p.status}\n")
+                output.write("-"*30 + "\n")
 
-        else:
-            # Mock PDF as Text
-            filename = f"capp_compliance_{year}.txt"
-            content = f"CAPP WALLET - COMPLIANCE REPORT {year}\n"
-            content += f"User ID: {user_id}\n"
-            content += f"Generated: {datetime.datetime.now()}\n"
-            content += "="*50 + "\n\n"
-            for p in filtered_payments:
-                content += f"Transaction: {p.reference_id}\n"
-                content += f"Date: {p.created_at}\n"
-                content += f"Type: {p.payment_type}\n"
-                content += f"Amount: {p.amount} {p.from_currency}\n"
-                content += f"Status: {p.status}\n"
-                content += "-"*30 + "\n"
-                
-        return {"filename": filename, "content": content} 
\ No newline at end of file
+            rows += 1
+            if rows % rows_per_chunk == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+
+        yield output.getvalue()
+        output.close() 
\ No newline at end of file
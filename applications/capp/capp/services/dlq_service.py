@@ -1,92 +1,430 @@
 
+import asyncio
+import random
 import structlog
+import time
 import traceback
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
+from applications.capp.capp.config.settings import get_settings
 from applications.capp.capp.models.failed_tasks import FailedTask
-from applications.capp.capp.core.redis import get_redis_client, get_cache
+from applications.capp.capp.core.redis import get_redis_client
 
 logger = structlog.get_logger(__name__)
 
+DLQHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class NonRetryableError(Exception):
+    """Raised by a DLQ handler when a retry can never succeed; the task is quarantined"""
+
+
+@dataclass
+class DLQHandlerSpec:
+    """Retry handler for one task type"""
+    handler: DLQHandler
+    concurrency: int = 1
+    max_retries: Optional[int] = None  # None keeps the max_retries captured with the task
+
+
+# task_type -> handler, filled in by the services owning each task type
+_handlers: Dict[str, DLQHandlerSpec] = {}
+
+
+def register_dlq_handler(
+    task_type: str,
+    handler: DLQHandler,
+    concurrency: int = 1,
+    max_retries: Optional[int] = None
+) -> None:
+    """
+    Register the function that re-executes failed tasks of ``task_type``.
+
+    Args:
+        task_type: Task type passed to ``capture_failure`` (e.g. "YIELD_SWEEP")
+        handler: Awaited with the task payload; raising schedules another attempt
+        concurrency: Maximum retries of this type running at once per worker
+        max_retries: Overrides the attempt limit captured with each task
+    """
+    _handlers[task_type] = DLQHandlerSpec(handler=handler, concurrency=max(1, concurrency), max_retries=max_retries)
+
+
+def get_dlq_handler(task_type: str) -> Optional[DLQHandlerSpec]:
+    """Get the registered retry handler for a task type"""
+    return _handlers.get(task_type)
+
+
 class DLQService:
     """
     Dead Letter Queue Service.
-    Captures failures and manages retries.
-    Uses Redis to persist failed tasks (for MVP, ideally DB).
+    Captures failures and retries them automatically.
+
+    Each task is stored as JSON under ``dlq:task:<id>`` and referenced from
+    sorted sets: ``dlq:tasks`` (by capture time, for listing),
+    ``dlq:schedule`` (by next attempt time), ``dlq:inflight`` (by lease
+    deadline) and ``dlq:quarantine``. The retry worker polls the schedule for
+    due tasks, claims each with ZREM so only one worker runs it, and hands it
+    to the handler registered for its task type, respecting that type's
+    concurrency limit. Failures are rescheduled with exponential backoff and
+    jitter until ``max_retries``; then, or when the handler raises
+    ``NonRetryableError``, the task is quarantined for manual review. A
+    running handler keeps renewing its lease; leases left behind by a
+    crashed worker expire and are returned to the schedule.
     """
-    
+
     REDIS_PREFIX = "dlq:task:"
-    
-    def __init__(self):
-        self.redis = get_redis_client()
-        self.cache = get_cache()
+    INDEX_KEY = "dlq:tasks"
+    SCHEDULE_KEY = "dlq:schedule"
+    INFLIGHT_KEY = "dlq:inflight"
+    QUARANTINE_KEY = "dlq:quarantine"
+    # List index written before the retry scheduler existed
+    LEGACY_INDEX_KEY = "dlq:index"
+
+    def __init__(self, redis_client: Any = None, handlers: Optional[Dict[str, DLQHandlerSpec]] = None):
+        settings = get_settings()
+        self.redis = redis_client if redis_client is not None else get_redis_client()
+        self.handlers = handlers if handlers is not None else _handlers
+
+        self.enabled = settings.DLQ_RETRY_ENABLED
+        self.poll_interval = settings.DLQ_POLL_INTERVAL_MS / 1000.0
+        self.claim_batch_size = settings.DLQ_CLAIM_BATCH_SIZE
+        self.backoff_base = settings.DLQ_BACKOFF_BASE_SECONDS
+        self.backoff_max = settings.DLQ_BACKOFF_MAX_SECONDS
+        self.lease_seconds = settings.DLQ_LEASE_SECONDS
+
+        self._worker: Optional[asyncio.Task] = None
+        self._attempts: Set[asyncio.Task] = set()
+        self._running: Dict[str, int] = defaultdict(int)
+
+        self.attempted = 0
+        self.recovered = 0
+        self.rescheduled = 0
+        self.quarantined = 0
 
     async def capture_failure(
-        self, 
-        task_type: str, 
-        payload: Dict[str, Any], 
+        self,
+        task_type: str,
+        payload: Dict[str, Any],
         exception: Exception,
         max_retries: int = 3
     ) -> str:
         """
-        Log a failure to the DLQ.
+        Log a failure to the DLQ and schedule its first retry.
         """
+        now = time.time()
+        next_attempt = now + self.backoff_seconds(0)
         task = FailedTask(
             task_type=task_type,
             payload=payload,
             error_message=str(exception),
             stack_trace=traceback.format_exc(),
-            max_retries=max_retries
+            max_retries=max_retries,
+            next_attempt_at=datetime.utcfromtimestamp(next_attempt)
         )
-        
-        # Save to Redis
-        key = f"{self.REDIS_PREFIX}{task.task_id}"
-        await self.cache.set(key, task.dict())
-        
-        # Add to index list for retrieval
-        await self.redis.lpush("dlq:index", task.task_id)
-        
+
+        await self._write(
+            task,
+            add={self.INDEX_KEY: now, self.SCHEDULE_KEY: next_attempt},
+        )
+
         logger.error("task_moved_to_dlq", task_id=task.task_id, task_type=task_type, error=str(exception))
         return task.task_id
 
     async def get_failed_tasks(self, limit: int = 50) -> List[FailedTask]:
         """
-        Retrieve list of failed tasks.
+        Retrieve the most recently captured tasks.
         """
-        # Get IDs from index
-        task_ids = await self.redis.lrange("dlq:index", 0, limit - 1)
-        tasks = []
-        
-        for tid in task_ids:
-            task_data = await self.cache.get(f"{self.REDIS_PREFIX}{tid}")
-            if task_data:
-                tasks.append(FailedTask(**task_data))
-                
-        return tasks
+        task_ids = await self.redis.zrevrange(self.INDEX_KEY, 0, limit - 1)
+        return [task for _, task in await self._load_many(task_ids) if task is not None]
+
+    async def get_quarantined_tasks(self, limit: int = 50) -> List[FailedTask]:
+        """
+        Retrieve tasks that exhausted their retries or were rejected as poison.
+        """
+        task_ids = await self.redis.zrevrange(self.QUARANTINE_KEY, 0, limit - 1)
+        return [task for _, task in await self._load_many(task_ids) if task is not None]
 
     async def retry_task(self, task_id: str) -> bool:
         """
-        Attempt to retry a task. 
-        Note: The actual retry logic usually requires invoking the original service handler.
-        For MVP, we just mark it as RETRYING.
+        Re-execute a scheduled or quarantined task now.
+
+        A manual retry counts as an attempt; if it fails and the task has no
+        retries left it goes (back) to quarantine.
+
+        Returns:
+            bool: True if the handler succeeded
         """
-        key = f"{self.REDIS_PREFIX}{task_id}"
-        task_data = await self.cache.get(key)
-        
-        if not task_data:
+        loaded = await self._load_many([task_id])
+        task = loaded[0][1] if loaded else None
+        if task is None:
             logger.warning("retry_task_not_found", task_id=task_id)
             return False
-            
-        task = FailedTask(**task_data)
+
+        spec = self.handlers.get(task.task_type)
+        if spec is None:
+            logger.warning("retry_task_no_handler", task_id=task_id, task_type=task.task_type)
+            return False
+
+        # Only scheduled or quarantined tasks; running or recovered ones are left alone
+        claimed = await self.redis.zrem(self.SCHEDULE_KEY, task_id) + await self.redis.zrem(self.QUARANTINE_KEY, task_id)
+        if not claimed:
+            logger.warning("retry_task_not_pending", task_id=task_id, status=task.status)
+            return False
+
+        await self.redis.zadd(self.INFLIGHT_KEY, {task_id: time.time() + self.lease_seconds})
+        return await self._attempt(task, spec)
+
+    # ------------------------------------------------------------------
+    # Retry worker
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the background retry worker"""
+        if not self.enabled or (self._worker is not None and not self._worker.done()):
+            return
+        try:
+            await self.migrate_legacy_index()
+        except Exception as e:
+            logger.error("dlq_legacy_migration_failed", error=str(e))
+        self._worker = asyncio.create_task(self._poll_loop())
+        logger.info("dlq_retry_worker_started", handlers=sorted(self.handlers))
+
+    async def stop(self) -> None:
+        """Stop polling and wait for running retries to finish"""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        await self.drain()
+
+    async def drain(self) -> None:
+        """Wait for every retry started by this worker"""
+        while self._attempts:
+            await asyncio.gather(*list(self._attempts), return_exceptions=True)
+
+    async def migrate_legacy_index(self) -> int:
+        """
+        Move tasks listed in the old ``dlq:index`` list into the sorted sets.
+
+        Pending tasks are scheduled for an immediate retry (or quarantined if
+        they already used up their retries); recovered ones are only listed.
+        Safe to run from several workers at once: ZADD is idempotent and the
+        list is deleted once migrated.
+
+        Returns:
+            int: Number of tasks migrated
+        """
+        task_ids = await self.redis.lrange(self.LEGACY_INDEX_KEY, 0, -1)
+        if not task_ids:
+            return 0
+
+        now = time.time()
+        migrated = 0
+        for task_id, task in await self._load_many(list(dict.fromkeys(task_ids))):
+            if task is None:
+                continue
+
+            add = {self.INDEX_KEY: task.created_at.timestamp()}
+            if task.status in ("FAILED", "RETRYING"):
+                if task.retry_count >= task.max_retries:
+                    task.status = "QUARANTINED"
+                    add[self.QUARANTINE_KEY] = now
+                else:
+                    task.status = "FAILED"
+                    task.next_attempt_at = datetime.utcfromtimestamp(now)
+                    add[self.SCHEDULE_KEY] = now
+            elif task.status == "QUARANTINED":
+                add[self.QUARANTINE_KEY] = now
+
+            await self._write(task, add=add)
+            migrated += 1
+
+        await self.redis.delete(self.LEGACY_INDEX_KEY)
+        logger.info("dlq_legacy_index_migrated", tasks=migrated)
+        return migrated
+
+    async def run_due_tasks(self) -> int:
+        """
+        Claim and start every due task that has a free handler slot.
+
+        Returns:
+            int: Number of retries started
+        """
+        now = time.time()
+        await self._requeue_expired_leases(now)
+
+        task_ids = await self.redis.zrangebyscore(
+            self.SCHEDULE_KEY, "-inf", now, start=0, num=self.claim_batch_size
+        )
+        started = 0
+        for task_id, task in await self._load_many(task_ids):
+            if task is None:
+                # Body missing or unreadable: retrying it would fail forever
+                await self.redis.zrem(self.SCHEDULE_KEY, task_id)
+                await self.redis.zadd(self.QUARANTINE_KEY, {task_id: now})
+                self.quarantined += 1
+                logger.error("dlq_task_unreadable", task_id=task_id)
+                continue
+
+            spec = self.handlers.get(task.task_type)
+            if spec is None:
+                # Not retryable in this process; look again later without spending an attempt
+                await self.redis.zadd(self.SCHEDULE_KEY, {task_id: now + self.backoff_max})
+                logger.warning("dlq_no_handler", task_id=task_id, task_type=task.task_type)
+                continue
+
+            if self._running[task.task_type] >= spec.concurrency:
+                continue
+            if not await self._claim(task_id, now):
+                continue  # another worker got it first
+
+            started += 1
+            self._running[task.task_type] += 1
+            attempt = asyncio.create_task(self._attempt(task, spec))
+            self._attempts.add(attempt)
+            attempt.add_done_callback(lambda t, task_type=task.task_type: self._on_attempt_done(task_type, t))
+
+        return started
+
+    def backoff_seconds(self, retry_count: int) -> float:
+        """Exponential backoff with equal jitter for the attempt after ``retry_count`` retries"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** retry_count))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return {
+            "scheduled": await self.redis.zcard(self.SCHEDULE_KEY),
+            "in_flight": await self.redis.zcard(self.INFLIGHT_KEY),
+            "quarantined": await self.redis.zcard(self.QUARANTINE_KEY),
+            "attempted": self.attempted,
+            "recovered": self.recovered,
+            "rescheduled": self.rescheduled,
+            "quarantined_by_worker": self.quarantined,
+            "running": {task_type: n for task_type, n in self._running.items() if n},
+        }
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self.run_due_tasks()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("dlq_poll_failed", error=str(e))
+            await asyncio.sleep(self.poll_interval)
+
+    async def _claim(self, task_id: str, now: float) -> bool:
+        # ZREM is atomic, so exactly one worker sees 1 for a given schedule entry
+        if not await self.redis.zrem(self.SCHEDULE_KEY, task_id):
+            return False
+        await self.redis.zadd(self.INFLIGHT_KEY, {task_id: now + self.lease_seconds})
+        return True
+
+    async def _requeue_expired_leases(self, now: float) -> None:
+        expired = await self.redis.zrangebyscore(self.INFLIGHT_KEY, "-inf", now)
+        for task_id in expired:
+            if await self.redis.zrem(self.INFLIGHT_KEY, task_id):
+                await self.redis.zadd(self.SCHEDULE_KEY, {task_id: now})
+                logger.warning("dlq_lease_expired", task_id=task_id)
+
+    async def _attempt(self, task: FailedTask, spec: DLQHandlerSpec) -> bool:
+        now = time.time()
+        max_retries = spec.max_retries if spec.max_retries is not None else task.max_retries
         task.status = "RETRYING"
         task.retry_count += 1
-        task.last_retry_at = datetime.utcnow()
-        
-        await self.cache.set(key, task.dict())
-        logger.info("retrying_task", task_id=task_id, attempt=task.retry_count)
-        
-        # Here we would dispatch to the appropriate handler based on task_type
-        # e.g. if task.type == "YIELD_SWEEP": yield_service.execute(task.payload)
-        
+        task.last_retry_at = datetime.utcfromtimestamp(now)
+        self.attempted += 1
+        logger.info("retrying_task", task_id=task.task_id, task_type=task.task_type, attempt=task.retry_count)
+
+        renewal = asyncio.create_task(self._renew_lease(task.task_id))
+        try:
+            await spec.handler(task.payload)
+        except Exception as e:
+            task.error_message = str(e)
+            task.stack_trace = traceback.format_exc()
+            now = time.time()
+
+            if isinstance(e, NonRetryableError) or task.retry_count >= max_retries:
+                task.status = "QUARANTINED"
+                task.next_attempt_at = None
+                await self._write(task, add={self.QUARANTINE_KEY: now}, remove=[self.INFLIGHT_KEY])
+                self.quarantined += 1
+                logger.error("dlq_task_quarantined", task_id=task.task_id, task_type=task.task_type,
+                             attempts=task.retry_count, error=str(e))
+            else:
+                next_attempt = now + self.backoff_seconds(task.retry_count)
+                task.status = "FAILED"
+                task.next_attempt_at = datetime.utcfromtimestamp(next_attempt)
+                await self._write(task, add={self.SCHEDULE_KEY: next_attempt}, remove=[self.INFLIGHT_KEY])
+                self.rescheduled += 1
+                logger.warning("dlq_retry_failed", task_id=task.task_id, task_type=task.task_type,
+                               attempt=task.retry_count, next_attempt_at=task.next_attempt_at.isoformat(), error=str(e))
+            return False
+        finally:
+            renewal.cancel()
+
+        task.status = "RECOVERED"
+        task.next_attempt_at = None
+        await self._write(task, remove=[self.INFLIGHT_KEY])
+        self.recovered += 1
+        logger.info("dlq_task_recovered", task_id=task.task_id, task_type=task.task_type, attempts=task.retry_count)
         return True
+
+    async def _renew_lease(self, task_id: str) -> None:
+        # Extend the lease well before it runs out so a slow handler is never run twice
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if await self.redis.zscore(self.INFLIGHT_KEY, task_id) is None:
+                return  # lease already lost (requeued or finished)
+            await self.redis.zadd(self.INFLIGHT_KEY, {task_id: time.time() + self.lease_seconds})
+
+    def _on_attempt_done(self, task_type: str, attempt: asyncio.Task) -> None:
+        self._attempts.discard(attempt)
+        self._running[task_type] -= 1
+        if not attempt.cancelled() and attempt.exception() is not None:
+            logger.error("dlq_attempt_crashed", task_type=task_type, error=str(attempt.exception()))
+
+    async def _load_many(self, task_ids: List[str]) -> List[Tuple[str, Optional[FailedTask]]]:
+        # One MGET for the whole page instead of a GET per task
+        if not task_ids:
+            return []
+        raw_values = await self.redis.mget([f"{self.REDIS_PREFIX}{tid}" for tid in task_ids])
+
+        loaded = []
+        for task_id, raw in zip(task_ids, raw_values):
+            task = None
+            if raw is not None:
+                try:
+                    task = FailedTask.model_validate_json(raw)
+                except ValueError as e:
+                    logger.warning("dlq_task_corrupt", task_id=task_id, error=str(e))
+            loaded.append((task_id, task))
+        return loaded
+
+    async def _write(self, task: FailedTask, add: Optional[Dict[str, float]] = None,
+                     remove: Optional[List[str]] = None) -> None:
+        # Task body and its index entries change together in one round trip
+        key = f"{self.REDIS_PREFIX}{task.task_id}"
+        body = task.model_dump_json()
+        add = add or {}
+        remove = remove or []
+
+        if hasattr(self.redis, "pipeline"):
+            pipe = self.redis.pipeline(transaction=True)
+            pipe.set(key, body)
+            for index_key, score in add.items():
+                pipe.zadd(index_key, {task.task_id: score})
+            for index_key in remove:
+                pipe.zrem(index_key, task.task_id)
+            await pipe.execute()
+            return
+
+        # Clients without pipelines (mock/in-memory) get the same commands one by one
+        await self.redis.set(key, body)
+        for index_key, score in add.items():
+            await self.redis.zadd(index_key, {task.task_id: score})
+        for index_key in remove:
+            await self.redis.zrem(index_key, task.task_id)
@@ -6,42 +6,132 @@ Features:
 - Velocity Checks (frequency of transactions)
 - Structuring Detection (smurfing/split payments)
 - Anomaly Detection
+
+Velocity rules can cover several dimensions (sender, recipient, corridor,
+sender + amount bucket) and windows (1m / 1h / 24h). Only the daily sender
+limit is on by default; the others are opt-in through
+``FRAUD_EXTRA_VELOCITY_RULES``. Every configured counter is incremented and
+given its TTL by one server-side Lua script, so screening costs a single
+Redis round trip however many rules exist, and a counter can never be left
+without an expiry.
 """
 
-import asyncio
-from typing import Dict, Optional
-from decimal import Decimal
-from datetime import datetime, timedelta
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import structlog
-import json
 
 from ..core.redis import get_cache
 from ..config.settings import get_settings
 
 logger = structlog.get_logger(__name__)
 
+# KEYS: counter keys; ARGV[i]: TTL (seconds) for KEYS[i]. Returns the new counts.
+VELOCITY_SCRIPT = """
+local counts = {}
+for i, key in ipairs(KEYS) do
+    local count = redis.call('INCR', key)
+    if count == 1 then
+        redis.call('EXPIRE', key, ARGV[i])
+    end
+    counts[i] = count
+end
+return counts
+"""
+
+# Upper edges of the amount buckets used by the amount_bucket dimension
+AMOUNT_BUCKET_EDGES = (100.0, 1000.0, 5000.0, 9000.0, 10000.0, 50000.0)
+
+
+@dataclass(frozen=True)
+class VelocityRule:
+    """
+    Limit on transactions per fixed window for one dimension
+
+    Dimensions: ``sender``, ``recipient``, ``corridor`` and
+    ``amount_bucket`` (same sender, similar amounts). Counts above
+    ``warn_ratio * limit`` add ``warn_score`` without raising a flag.
+    """
+    name: str
+    dimension: str
+    window_seconds: int
+    limit: int
+    score: float = 0.8
+    warn_ratio: float = 0.7
+    warn_score: float = 0.2
+
+
+# Always applied: the original 10-per-day sender limit
+DEFAULT_VELOCITY_RULES: Tuple[VelocityRule, ...] = (
+    VelocityRule("HIGH_VELOCITY_DAILY_LIMIT_EXCEEDED", "sender", 86400, 10),
+)
+
+# Opt-in by name (or "all") through settings.FRAUD_EXTRA_VELOCITY_RULES
+EXTRA_VELOCITY_RULES: Tuple[VelocityRule, ...] = (
+    VelocityRule("SENDER_VELOCITY_1M", "sender", 60, 3, score=0.5, warn_score=0.0),
+    VelocityRule("SENDER_VELOCITY_1H", "sender", 3600, 6, score=0.5, warn_score=0.0),
+    VelocityRule("RECIPIENT_VELOCITY_1H", "recipient", 3600, 10, score=0.4, warn_score=0.0),
+    VelocityRule("RECIPIENT_VELOCITY_24H", "recipient", 86400, 25, score=0.5, warn_score=0.0),
+    VelocityRule("CORRIDOR_BURST_1M", "corridor", 60, 300, score=0.3, warn_score=0.0),
+    VelocityRule("REPEATED_AMOUNT_BUCKET_24H", "amount_bucket", 86400, 3, score=0.6, warn_score=0.0),
+)
+
+
+def configured_velocity_rules(settings: Any) -> Tuple[VelocityRule, ...]:
+    """Default rules plus the extra rules named in ``FRAUD_EXTRA_VELOCITY_RULES``"""
+    names = {name.strip() for name in settings.FRAUD_EXTRA_VELOCITY_RULES.split(",") if name.strip()}
+    unknown = names - {rule.name for rule in EXTRA_VELOCITY_RULES} - {"all"}
+    if unknown:
+        logger.warning("Unknown fraud velocity rules ignored", rules=sorted(unknown))
+    extra = tuple(rule for rule in EXTRA_VELOCITY_RULES if "all" in names or rule.name in names)
+    return DEFAULT_VELOCITY_RULES + extra
+
+
+def amount_bucket(amount: float) -> str:
+    """Label of the bucket ``amount`` falls in, e.g. ``"5000-9000"``"""
+    lower = 0.0
+    for edge in AMOUNT_BUCKET_EDGES:
+        if amount < edge:
+            return f"{lower:g}-{edge:g}"
+        lower = edge
+    return f"{lower:g}+"
+
 class FraudDetectionService:
     """Service for detecting fraudulent transaction patterns"""
     
-    def __init__(self):
+    def __init__(self, velocity_rules: Optional[Sequence[VelocityRule]] = None, cache: Any = None):
         self.logger = logger
-        self.cache = get_cache()
+        self.cache = cache if cache is not None else get_cache()
         self.settings = get_settings()
         
         # Configuration
-        self.MAX_DAILY_VELOCITY = 10  # Max tx per day
+        if velocity_rules is None:
+            velocity_rules = configured_velocity_rules(self.settings)
+        self.velocity_rules = tuple(velocity_rules)
         self.REPORTING_THRESHOLD = 10000.0
         self.STRUCTURING_RANGE = (9000.0, 9999.99) # Range suspicious of evading $10k limit
         
+        self._velocity_script = None
+        
     async def analyze_transaction(self, 
                                 user_id: str, 
                                 amount: float, 
-                                ip_address: Optional[str] = None) -> Dict[str, any]:
+                                ip_address: Optional[str] = None,
+                                recipient_id: Optional[str] = None,
+                                corridor: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze a transaction for risk factors.
+        
+        Args:
+            user_id: Sender identifier
+            amount: Transaction amount
+            ip_address: Sender IP (unused for now)
+            recipient_id: Recipient identifier (enables recipient rules)
+            corridor: e.g. ``"USD-KES"`` (enables corridor rules)
         """
         risk_score = 0.0
         flags = []
+        breaches: List[Dict[str, Any]] = []
         
         # 1. Structuring / Smurfing Check
         # Attempting to stay just below reporting limits
@@ -55,23 +145,29 @@ class FraudDetectionService:
             risk_score += 0.3
             flags.append("LARGE_TRANSACTION_EDD_REQUIRED")
             
-        # 3. Velocity Check (Redis)
-        # We track usage using a simple counter key pattern: fraud:velocity:user_id:date
+        # 3. Velocity Checks (Redis, one round trip for every rule)
         try:
-            today = datetime.now().strftime("%Y-%m-%d")
-            key = f"fraud:velocity:{user_id}:{today}"
+            dimensions = {
+                "sender": user_id,
+                "recipient": recipient_id,
+                "corridor": corridor,
+                "amount_bucket": f"{user_id}:{amount_bucket(amount)}",
+            }
+            counted = await self.count_velocity(dimensions)
             
-            # Increment and get new value
-            count = await self.cache.incr(key)
-            if count == 1:
-                # Set expiry for 24 hours
-                await self.cache.expire(key, 86400)
-                
-            if count > self.MAX_DAILY_VELOCITY:
-                risk_score += 0.8
-                flags.append(f"HIGH_VELOCITY_DAILY_LIMIT_EXCEEDED ({count}/{self.MAX_DAILY_VELOCITY})")
-            elif count > (self.MAX_DAILY_VELOCITY * 0.7):
-                risk_score += 0.2 # Warning territory
+            for rule, count in counted:
+                if count > rule.limit:
+                    risk_score += rule.score
+                    flags.append(f"{rule.name} ({count}/{rule.limit})")
+                    breaches.append({
+                        "rule": rule.name,
+                        "dimension": rule.dimension,
+                        "window_seconds": rule.window_seconds,
+                        "count": count,
+                        "limit": rule.limit,
+                    })
+                elif count > rule.limit * rule.warn_ratio:
+                    risk_score += rule.warn_score # Warning territory
                 
         except Exception as e:
             self.logger.warning("Redis velocity check failed, skipping", error=str(e))
@@ -82,5 +178,47 @@ class FraudDetectionService:
         return {
             "risk_score": risk_score,
             "is_high_risk": risk_score > 0.7,
-            "flags": flags
+            "flags": flags,
+            "velocity_breaches": breaches
         }
+    
+    async def count_velocity(self, dimensions: Dict[str, Optional[str]],
+                             now: Optional[float] = None) -> List[Tuple[VelocityRule, int]]:
+        """
+        Count this transaction against every applicable rule
+        
+        Rules whose dimension has no value are skipped. Windows are fixed
+        and epoch-aligned; each counter expires with its window.
+        
+        Returns:
+            (rule, count including this transaction) per applied rule
+        """
+        now = time.time() if now is None else now
+        rules, keys, ttls = [], [], []
+        for rule in self.velocity_rules:
+            value = dimensions.get(rule.dimension)
+            if not value:
+                continue
+            window_index = int(now // rule.window_seconds)
+            rules.append(rule)
+            keys.append(f"fraud:velocity:{rule.dimension}:{value}:{rule.window_seconds}:{window_index}")
+            ttls.append(rule.window_seconds)
+        
+        if not keys:
+            return []
+        
+        redis_client = self.cache.redis
+        if hasattr(redis_client, "register_script"):
+            if self._velocity_script is None:
+                self._velocity_script = redis_client.register_script(VELOCITY_SCRIPT)
+            counts = await self._velocity_script(keys=keys, args=ttls)
+        else:
+            # Clients without scripting (mock/in-memory) get the same commands one by one
+            counts = []
+            for key, ttl in zip(keys, ttls):
+                count = await redis_client.incr(key)
+                if count == 1:
+                    await redis_client.expire(key, ttl)
+                counts.append(count)
+        
+        return [(rule, int(count)) for rule, count in zip(rules, counts)]
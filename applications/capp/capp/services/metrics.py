@@ -13,6 +13,7 @@ import structlog
 
 from applications.capp.capp.config.settings import get_settings
 from applications.capp.capp.core.redis import get_cache
+from applications.capp.capp.services.metrics_buffer import MetricsWriteBuffer, get_metrics_buffer
 
 logger = structlog.get_logger(__name__)
 
@@ -26,6 +27,12 @@ class MetricsCollector:
     - Agent performance
     - System health
     - Business metrics
+    
+    Writes go through a shared MetricsWriteBuffer that aggregates them in
+    memory and flushes them as one Redis pipeline. The awaited ``record_*``
+    methods flush before returning (write-through); hot paths use the
+    ``*_nowait`` variants, which only buffer. Reads flush the buffer first
+    so they see this process's writes.
     """
     
     def __init__(self):
@@ -33,27 +40,45 @@ class MetricsCollector:
         self.cache = get_cache()
         self.logger = structlog.get_logger(__name__)
     
+    @property
+    def buffer(self) -> MetricsWriteBuffer:
+        """Write buffer shared by every collector using the same cache"""
+        return get_metrics_buffer(self.cache)
+    
+    async def flush(self) -> int:
+        """Flush buffered metric writes to Redis"""
+        if not self.settings.METRICS_BUFFER_ENABLED:
+            return 0
+        return await self.buffer.flush()
+    
     async def record_payment_metrics(self, payment_id: str, amount: Decimal, processing_time: float, success: bool, corridor: str):
-        """Record payment processing metrics"""
+        """Record payment processing metrics and write them through to Redis"""
+        self.record_payment_metrics_nowait(payment_id, amount, processing_time, success, corridor)
+        await self.buffer.flush()
+    
+    def record_payment_metrics_nowait(self, payment_id: str, amount: Decimal, processing_time: float, success: bool, corridor: str) -> None:
+        """Buffer payment processing metrics without waiting on Redis"""
         try:
+            buffer = self.buffer
+            volume = int(amount * 100)  # Store as cents
+            
             # Record basic payment metrics
-            await self.cache.hincrby("metrics:payments:total", "count", 1)
-            await self.cache.hincrby("metrics:payments:total", "volume", int(amount * 100))  # Store as cents
+            buffer.hincrby("metrics:payments:total", "count", 1)
+            buffer.hincrby("metrics:payments:total", "volume", volume)
             
             if success:
-                await self.cache.hincrby("metrics:payments:successful", "count", 1)
-                await self.cache.hincrby("metrics:payments:successful", "volume", int(amount * 100))
+                buffer.hincrby("metrics:payments:successful", "count", 1)
+                buffer.hincrby("metrics:payments:successful", "volume", volume)
             else:
-                await self.cache.hincrby("metrics:payments:failed", "count", 1)
-                await self.cache.hincrby("metrics:payments:failed", "volume", int(amount * 100))
+                buffer.hincrby("metrics:payments:failed", "count", 1)
+                buffer.hincrby("metrics:payments:failed", "volume", volume)
             
             # Record processing time
-            await self.cache.lpush("metrics:processing_times", processing_time)
-            await self.cache.ltrim("metrics:processing_times", 0, 999)  # Keep last 1000
+            buffer.push_capped("metrics:processing_times", processing_time, 1000)  # Keep last 1000
             
             # Record corridor metrics
-            await self.cache.hincrby(f"metrics:corridors:{corridor}", "count", 1)
-            await self.cache.hincrby(f"metrics:corridors:{corridor}", "volume", int(amount * 100))
+            buffer.hincrby(f"metrics:corridors:{corridor}", "count", 1)
+            buffer.hincrby(f"metrics:corridors:{corridor}", "volume", volume)
             
             self.logger.debug("Payment metrics recorded", payment_id=payment_id, amount=amount, processing_time=processing_time)
             
@@ -61,20 +86,26 @@ class MetricsCollector:
             self.logger.error("Failed to record payment metrics", error=str(e))
     
     async def record_agent_metrics(self, agent_id: str, agent_type: str, processing_time: float, success: bool, payment_amount: str):
-        """Record agent performance metrics"""
+        """Record agent performance metrics and write them through to Redis"""
+        self.record_agent_metrics_nowait(agent_id, agent_type, processing_time, success, payment_amount)
+        await self.buffer.flush()
+    
+    def record_agent_metrics_nowait(self, agent_id: str, agent_type: str, processing_time: float, success: bool, payment_amount: str) -> None:
+        """Buffer agent performance metrics without waiting on Redis"""
         try:
+            buffer = self.buffer
+            
             # Record agent performance
-            await self.cache.hincrby(f"metrics:agents:{agent_id}", "total_tasks", 1)
-            await self.cache.hincrby(f"metrics:agents:{agent_id}", "successful_tasks", 1 if success else 0)
-            await self.cache.hincrby(f"metrics:agents:{agent_id}", "failed_tasks", 0 if success else 1)
+            buffer.hincrby(f"metrics:agents:{agent_id}", "total_tasks", 1)
+            buffer.hincrby(f"metrics:agents:{agent_id}", "successful_tasks", 1 if success else 0)
+            buffer.hincrby(f"metrics:agents:{agent_id}", "failed_tasks", 0 if success else 1)
             
             # Record processing time
-            await self.cache.lpush(f"metrics:agents:{agent_id}:processing_times", processing_time)
-            await self.cache.ltrim(f"metrics:agents:{agent_id}:processing_times", 0, 99)  # Keep last 100
+            buffer.push_capped(f"metrics:agents:{agent_id}:processing_times", processing_time, 100)  # Keep last 100
             
             # Record agent type metrics
-            await self.cache.hincrby(f"metrics:agent_types:{agent_type}", "total_tasks", 1)
-            await self.cache.hincrby(f"metrics:agent_types:{agent_type}", "successful_tasks", 1 if success else 0)
+            buffer.hincrby(f"metrics:agent_types:{agent_type}", "total_tasks", 1)
+            buffer.hincrby(f"metrics:agent_types:{agent_type}", "successful_tasks", 1 if success else 0)
             
             self.logger.debug("Agent metrics recorded", agent_id=agent_id, agent_type=agent_type, success=success)
             
@@ -91,8 +122,8 @@ class MetricsCollector:
                 "tags": tags or {}
             }
             
-            await self.cache.lpush(f"metrics:system:{metric_name}", str(metric_data))
-            await self.cache.ltrim(f"metrics:system:{metric_name}", 0, 999)  # Keep last 1000
+            self.buffer.push_capped(f"metrics:system:{metric_name}", str(metric_data), 1000)  # Keep last 1000
+            await self.buffer.flush()
             
             self.logger.debug("System metrics recorded", metric_name=metric_name, value=value)
             
@@ -102,6 +133,8 @@ class MetricsCollector:
     async def get_payment_metrics(self, time_period: str = "24h") -> Dict:
         """Get payment processing metrics"""
         try:
+            await self.flush()
+            
             # Get total metrics
             total_count = await self.cache.hget("metrics:payments:total", "count") or 0
             total_volume = await self.cache.hget("metrics:payments:total", "volume") or 0
@@ -153,6 +186,8 @@ class MetricsCollector:
     async def get_agent_metrics(self, agent_id: str = None) -> Dict:
         """Get agent performance metrics"""
         try:
+            await self.flush()
+            
             if agent_id:
                 # Get specific agent metrics
                 total_tasks = await self.cache.hget(f"metrics:agents:{agent_id}", "total_tasks") or 0
@@ -190,6 +225,8 @@ class MetricsCollector:
     async def get_corridor_metrics(self) -> Dict:
         """Get payment corridor metrics"""
         try:
+            await self.flush()
+            
             # Get all corridor keys
             corridor_keys = await self.cache.keys("metrics:corridors:*")
             
@@ -213,6 +250,8 @@ class MetricsCollector:
     async def get_system_health_metrics(self) -> Dict:
         """Get system health metrics"""
         try:
+            await self.flush()
+            
             # Get system metrics
             system_metrics = {}
             
@@ -273,6 +312,8 @@ class MetricsCollector:
     async def reset_metrics(self, metric_type: str = None):
         """Reset metrics (for testing or maintenance)"""
         try:
+            await self.flush()
+            
             if metric_type == "payments" or metric_type is None:
                 await self.cache.delete("metrics:payments:total")
                 await self.cache.delete("metrics:payments:successful")
@@ -307,6 +348,8 @@ class MetricsCollector:
             Dict with keys p50, p95, p99 (all float, 0.0 when no data).
         """
         try:
+            await self.flush()
+            
             raw = await self.cache.lrange("metrics:processing_times", 0, -1)
             if not raw:
                 return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
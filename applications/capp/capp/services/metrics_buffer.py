@@ -0,0 +1,188 @@
+"""
+Metrics Write Buffer for CAPP
+
+Aggregates metric writes in-process and flushes them to Redis as a single
+pipelined transaction, so recording metrics never waits on Redis round
+trips on the payment path.
+"""
+
+import asyncio
+import weakref
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+import structlog
+
+from applications.capp.capp.config.settings import get_settings
+from packages.integrations.data.codec import encode
+
+logger = structlog.get_logger(__name__)
+
+
+class MetricsWriteBuffer:
+    """
+    Write-behind buffer for Redis metrics
+
+    Hash increments for the same key/field are summed in memory and capped
+    lists keep only the most recent samples, so a flush issues at most one
+    HINCRBY per field and one LPUSH + LTRIM per list regardless of traffic.
+    A flush is scheduled ``flush_interval_ms`` after the first buffered write,
+    or immediately once ``max_pending_ops`` writes are waiting.
+    """
+
+    def __init__(self, cache: Any, flush_interval_ms: int = 250, max_pending_ops: int = 5000):
+        self.cache = cache
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending_ops = max_pending_ops
+
+        self._increments: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._lists: Dict[str, Deque[Any]] = {}
+        self._list_limits: Dict[str, int] = {}
+        self._pending_ops = 0
+
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.flush_count = 0
+        self.ops_flushed = 0
+
+    @property
+    def pending_ops(self) -> int:
+        return self._pending_ops
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> None:
+        """Buffer a hash field increment"""
+        if amount == 0:
+            return
+        self._increments[(key, field)] += amount
+        self._on_write()
+
+    def push_capped(self, key: str, value: Any, max_len: int) -> None:
+        """Buffer an LPUSH onto a list that is trimmed to ``max_len`` entries"""
+        samples = self._lists.get(key)
+        if samples is None:
+            samples = deque(maxlen=max_len)
+            self._lists[key] = samples
+            self._list_limits[key] = max_len
+        samples.append(value)
+        self._on_write()
+
+    async def flush(self) -> int:
+        """
+        Write all buffered metrics to Redis
+
+        Returns:
+            int: Number of Redis commands issued
+        """
+        async with self._flush_lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+
+            if not self._pending_ops:
+                return 0
+
+            increments, lists, limits = self._increments, self._lists, self._list_limits
+            self._increments = defaultdict(int)
+            self._lists = {}
+            self._list_limits = {}
+            self._pending_ops = 0
+
+            try:
+                commands = await self._write(increments, lists, limits)
+            except Exception as e:
+                # Counters are cheap to carry over; samples are best-effort
+                for field_key, amount in increments.items():
+                    self._increments[field_key] += amount
+                self._pending_ops += len(increments)
+                logger.error("Failed to flush metrics buffer", error=str(e), dropped_samples=sum(len(v) for v in lists.values()))
+                return 0
+
+            self.flush_count += 1
+            self.ops_flushed += commands
+            logger.debug("Metrics buffer flushed", commands=commands)
+            return commands
+
+    async def close(self) -> None:
+        """Flush any remaining metrics and stop scheduling flushes"""
+        await self.flush()
+        for task in list(self._tasks):
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _write(self, increments: Dict[Tuple[str, str], int],
+                     lists: Dict[str, Deque[Any]], limits: Dict[str, int]) -> int:
+        redis_client = getattr(self.cache, "redis", None)
+        if redis_client is not None and hasattr(redis_client, "pipeline"):
+            pipe = redis_client.pipeline(transaction=True)
+            commands = self._queue(pipe, increments, lists, limits)
+            await pipe.execute()
+            return commands
+
+        # Clients without pipelines (mock/in-memory caches) get the same commands one by one
+        commands = 0
+        for (key, field), amount in increments.items():
+            await self.cache.hincrby(key, field, amount)
+            commands += 1
+        for key, samples in lists.items():
+            for value in samples:
+                await self.cache.lpush(key, value)
+            await self.cache.ltrim(key, 0, limits[key] - 1)
+            commands += len(samples) + 1
+        return commands
+
+    @staticmethod
+    def _queue(pipe: Any, increments: Dict[Tuple[str, str], int],
+               lists: Dict[str, Deque[Any]], limits: Dict[str, int]) -> int:
+        for (key, field), amount in increments.items():
+            pipe.hincrby(key, field, amount)
+        for key, samples in lists.items():
+            # Serialize the same way RedisCache.lpush does
+            pipe.lpush(key, *(encode(value) for value in samples))
+            pipe.ltrim(key, 0, limits[key] - 1)
+        return len(increments) + 2 * len(lists)
+
+    def _on_write(self) -> None:
+        self._pending_ops += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (sync caller); the next flush from async code picks it up
+            return
+
+        if self._pending_ops >= self.max_pending_ops:
+            if not self._tasks:
+                self._spawn_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._spawn_flush)
+
+    def _spawn_flush(self) -> None:
+        self._flush_handle = None
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# One buffer per cache so every collector sharing a cache shares its batches
+_buffers: "weakref.WeakKeyDictionary[Any, MetricsWriteBuffer]" = weakref.WeakKeyDictionary()
+
+
+def get_metrics_buffer(cache: Any) -> MetricsWriteBuffer:
+    """Get the write buffer for a cache instance"""
+    buffer = _buffers.get(cache)
+    if buffer is None:
+        settings = get_settings()
+        buffer = MetricsWriteBuffer(
+            cache,
+            flush_interval_ms=settings.METRICS_FLUSH_INTERVAL_MS,
+            max_pending_ops=settings.METRICS_MAX_PENDING_OPS,
+        )
+        _buffers[cache] = buffer
+    return buffer
+
+
+async def flush_all_metrics() -> None:
+    """Flush every metrics buffer (called on application shutdown)"""
+    for buffer in list(_buffers.values()):
+        await buffer.close()
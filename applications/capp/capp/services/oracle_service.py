@@ -1,30 +1,76 @@
+"""
+Transaction Oracle Index
 
-import structlog
-from typing import Dict, Optional, Any
+Each transaction is a Redis hash (``oracle:tx:<hash>``) with one field per
+attribute: ``status``, ``updated_at`` and ``meta.<name>`` (JSON values).
+Updates touch only the fields they carry and run in one Lua script that
+keeps a per-field timestamp (``ts:<field>``), so a late or replayed push
+can never overwrite newer data and concurrent writers never lose each
+other's fields. Readers can fetch just the fields they need.
+"""
+
+import json
+from datetime import datetime, timezone
 from enum import Enum
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+from redis.exceptions import ResponseError
+
+from applications.capp.capp.core.redis import get_redis_client
 
 logger = structlog.get_logger(__name__)
 
+META_PREFIX = "meta."
+TS_PREFIX = "ts:"
+
+# KEYS[1]: index hash. ARGV: ttl, timestamp (us), then field/value pairs.
+# A field is written only if its stored timestamp is not newer. Entries
+# still stored as a legacy JSON string are converted to a hash first.
+UPDATE_INDEX_SCRIPT = """
+local key = KEYS[1]
+if redis.call('TYPE', key).ok == 'string' then
+    local legacy = cjson.decode(redis.call('GET', key))
+    redis.call('DEL', key)
+    redis.call('HSET', key, 'status', legacy.status or '', 'updated_at', legacy.updated_at or '')
+    if type(legacy.meta) == 'table' then
+        for name, value in pairs(legacy.meta) do
+            redis.call('HSET', key, 'meta.' .. name, cjson.encode(value))
+        end
+    end
+end
+
+local ts = tonumber(ARGV[2])
+local applied = 0
+for i = 3, #ARGV, 2 do
+    local field = ARGV[i]
+    local current = tonumber(redis.call('HGET', key, 'ts:' .. field))
+    if current == nil or current <= ts then
+        redis.call('HSET', key, field, ARGV[i + 1], 'ts:' .. field, ARGV[2])
+        applied = applied + 1
+    end
+end
+redis.call('EXPIRE', key, ARGV[1])
+return applied
+"""
+
+
 class TransactionStatus(str, Enum):
     PENDING = "PENDING"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
 
-class OracleService:
-    _instance: Optional['OracleService'] = None
-    
-import json
-from applications.capp.capp.core.redis import get_redis_client
 
 class OracleService:
     _instance: Optional['OracleService'] = None
-    
-    def __init__(self):
+
+    def __init__(self, redis_client: Any = None):
         # Redis Key Prefix
         self.KEY_PREFIX = "oracle:tx:"
         self.TTL_SECONDS = 60 * 60 * 24 * 30 # 30 Days
         self.logger = structlog.get_logger(__name__)
+        self._redis = redis_client
+        self._update_script = None
 
     @classmethod
     def get_instance(cls) -> 'OracleService':
@@ -33,45 +79,32 @@ class OracleService:
         return cls._instance
 
     def _get_redis(self):
-        """Helper to get redis client lazily or handle mock context"""
-        try:
-            return get_redis_client()
-        except RuntimeError:
-            # Fallback for tests if init_redis() wasn't called (though it should be)
-            self.logger.warning("Redis client not initialized, using in-memory mock dict for safety.")
-            if not hasattr(self, "_mock_store"): self._mock_store = {}
-            return None
-
-    async def update_index(self, tx_hash: str, status: TransactionStatus, meta: Optional[Dict] = None):
+        """Text-mode Redis client (the mock client when Redis is unavailable)"""
+        return self._redis if self._redis is not None else get_redis_client()
+
+    async def update_index(self, tx_hash: str, status: TransactionStatus, meta: Optional[Dict] = None,
+                           observed_at: Optional[datetime] = None) -> int:
         """
         Internal Hook: Updates the status of a transaction in the index (Redis).
+
+        Args:
+            tx_hash: Transaction hash
+            status: New status
+            meta: Metadata fields to set (other stored fields are kept)
+            observed_at: When the update was observed; fields already
+                written with a later time are left alone (defaults to now)
+
+        Returns:
+            int: Number of fields written
         """
-        redis = self._get_redis()
-        
-        entry = {
-            "status": status.value,
-            "updated_at": datetime.utcnow().isoformat(),
-            "meta": meta or {}
-        }
-        
-        # Merge if exists
-        key = f"{self.KEY_PREFIX}{tx_hash}"
-        
-        if redis: # Redis Mode
-            raw_existing = await redis.get(key)
-            if raw_existing:
-                existing = json.loads(raw_existing)
-                entry["meta"] = {**existing.get("meta", {}), **entry["meta"]}
-            
-            await redis.setex(key, self.TTL_SECONDS, json.dumps(entry))
-            
-        else: # Mock Mode
-            if key in self._mock_store:
-                existing = self._mock_store[key]
-                entry["meta"] = {**existing.get("meta", {}), **entry["meta"]}
-            self._mock_store[key] = entry
-            
-        self.logger.info(f"Oracle Index Updated: {tx_hash} -> {status}", meta=entry["meta"])
+        observed_at = observed_at or datetime.utcnow()
+        fields = {"status": status.value, "updated_at": observed_at.isoformat()}
+        for name, value in (meta or {}).items():
+            fields[f"{META_PREFIX}{name}"] = json.dumps(value)
+
+        applied = await self._apply(f"{self.KEY_PREFIX}{tx_hash}", fields, _timestamp_us(observed_at))
+        self.logger.info(f"Oracle Index Updated: {tx_hash} -> {status}", meta=meta or {}, fields_applied=applied)
+        return applied
 
     async def get_status(self, tx_hash: str) -> Dict[str, Any]:
         """
@@ -79,18 +112,68 @@ class OracleService:
         """
         redis = self._get_redis()
         key = f"{self.KEY_PREFIX}{tx_hash}"
-        
-        if redis:
-            raw = await redis.get(key)
-            if raw:
-                return json.loads(raw)
-        else:
-            if key in self._mock_store:
-                return self._mock_store[key]
-                
-        return {"status": "UNKNOWN", "message": "Transaction not found in Oracle Index."}
+
+        try:
+            raw = await redis.hgetall(key)
+        except ResponseError:
+            # WRONGTYPE: entry not yet converted from the legacy JSON document
+            legacy = await redis.get(key)
+            return json.loads(legacy) if legacy else _not_found()
+
+        if not raw:
+            return _not_found()
+
+        entry: Dict[str, Any] = {"status": raw.get("status"), "updated_at": raw.get("updated_at"), "meta": {}}
+        for field, value in raw.items():
+            if field.startswith(META_PREFIX):
+                entry["meta"][field[len(META_PREFIX):]] = json.loads(value)
+        return entry
+
+    async def get_fields(self, tx_hash: str, fields: Sequence[str]) -> Dict[str, Any]:
+        """
+        Fetch only the named fields (e.g. ``["status", "meta.chain"]``)
+        in one HMGET; missing fields are omitted.
+        """
+        redis = self._get_redis()
+        values = await redis.hmget(f"{self.KEY_PREFIX}{tx_hash}", list(fields))
+        result = {}
+        for field, value in zip(fields, values):
+            if value is not None:
+                result[field] = json.loads(value) if field.startswith(META_PREFIX) else value
+        return result
 
     def get_all_transactions(self) -> Dict[str, Dict[str, Any]]:
         """Debug helper - Scan not efficient for Redis but okay for debug"""
         return {} # Disable scan for now to avoid perf issues
 
+    async def _apply(self, key: str, fields: Dict[str, str], ts: int) -> int:
+        redis = self._get_redis()
+        if hasattr(redis, "register_script"):
+            if self._update_script is None:
+                self._update_script = redis.register_script(UPDATE_INDEX_SCRIPT)
+            args: List[Any] = [self.TTL_SECONDS, ts]
+            for field, value in fields.items():
+                args.extend((field, value))
+            return int(await self._update_script(keys=[key], args=args))
+
+        # Clients without scripting (mock/in-memory) get the same guard one field at a time
+        applied = 0
+        for field, value in fields.items():
+            current = await redis.hget(key, f"{TS_PREFIX}{field}")
+            if current is None or int(current) <= ts:
+                await redis.hset(key, field, value)
+                await redis.hset(key, f"{TS_PREFIX}{field}", str(ts))
+                applied += 1
+        await redis.expire(key, self.TTL_SECONDS)
+        return applied
+
+
+def _timestamp_us(moment: datetime) -> int:
+    # Naive datetimes are UTC (datetime.utcnow())
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1_000_000)
+
+
+def _not_found() -> Dict[str, Any]:
+    return {"status": "UNKNOWN", "message": "Transaction not found in Oracle Index."}
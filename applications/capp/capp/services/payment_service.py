@@ -6,7 +6,7 @@ for route optimization, compliance checking, and settlement.
 """
 
 import asyncio
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 
@@ -372,22 +372,52 @@ class PaymentService:
         Returns:
             List[CrossBorderPayment]: List of payments
         """
+        payments, _ = await self.get_user_payments_page(user_id, limit, offset=offset, status=status)
+        return payments
+
+    async def get_user_payments_page(
+        self,
+        user_id: UUID,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        offset: int = 0
+    ) -> Tuple[List[CrossBorderPayment], Optional[str]]:
+        """
+        Get one keyset-paginated page of payments for a user
+
+        Args:
+            user_id: The user ID
+            limit: Maximum number of payments
+            cursor: Cursor returned with the previous page
+            status: Optional status filter
+            offset: Number of payments to skip (legacy offset pagination)
+
+        Returns:
+            Tuple of the payments and the cursor for the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
         try:
             async with AsyncSessionLocal() as session:
                 repo = PaymentRepository(session)
 
                 # Get payments from database
-                db_payments = await repo.get_by_user(user_id, limit, offset, status)
+                db_payments = await repo.get_by_user(user_id, limit, offset, status, cursor=cursor)
+                next_cursor = repo.next_cursor(db_payments, limit)
 
                 # Convert SQLAlchemy models to Pydantic models
                 payments = [db_payment_to_crossborder(p) for p in db_payments]
 
                 self.logger.info("User payments retrieved", user_id=user_id, count=len(payments))
-                return payments
+                return payments, next_cursor
 
+        except ValueError:
+            raise
         except Exception as e:
             self.logger.error("Failed to get user payments", user_id=user_id, error=str(e))
-            return []
+            return [], None
 
     
     async def cancel_payment(self, payment_id: UUID) -> PaymentResult:
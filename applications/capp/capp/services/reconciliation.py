@@ -1,8 +1,12 @@
 
+import asyncio
+import json
+import time
 import structlog
+from dataclasses import dataclass, field
 from decimal import Decimal
-from datetime import datetime, timezone
-from typing import Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from applications.capp.capp.core.aptos import get_aptos_client
 from applications.capp.capp.core.polygon import PolygonSettlementService
@@ -11,125 +15,229 @@ from applications.capp.capp.config.settings import settings
 
 logger = structlog.get_logger(__name__)
 
+POLYGON_USDC_ADDRESS = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
 class ReconciliationError(Exception):
     pass
 
+
+@dataclass(frozen=True)
+class HotWallet:
+    """A treasury / hot wallet whose balance is reconciled"""
+    chain: str                                # APTOS, POLYGON, ...
+    address: str
+    token: str                                # ledger currency, e.g. APT, USDC
+    token_address: Optional[str] = None       # token contract; None for the native asset
+    opening_balance: Decimal = Decimal("0")   # balance when the ledger started tracking it
+
+    @property
+    def key(self) -> str:
+        return f"{self.chain}|{self.token}|{self.address}"
+
+
+def load_hot_wallets() -> List[HotWallet]:
+    """Hot wallets from RECONCILIATION_WALLETS, or the configured treasury accounts"""
+    if settings.RECONCILIATION_WALLETS:
+        return [
+            HotWallet(
+                chain=entry["chain"].upper(),
+                address=entry["address"],
+                token=entry["token"].upper(),
+                token_address=entry.get("token_address"),
+                opening_balance=Decimal(str(entry.get("opening_balance", "0"))),
+            )
+            for entry in json.loads(settings.RECONCILIATION_WALLETS)
+        ]
+
+    return [
+        HotWallet("APTOS", settings.APTOS_ACCOUNT_ADDRESS or "0x0", "APT",
+                  opening_balance=Decimal("100.00")),
+        HotWallet("POLYGON", getattr(settings, "POLYGON_ACCOUNT_ADDRESS", None) or "0x0", "USDC",
+                  token_address=POLYGON_USDC_ADDRESS, opening_balance=Decimal("2000.00")),
+    ]
+
+
+@dataclass
+class LedgerCheckpoint:
+    """Running sums of confirmed settlement outflows up to ``watermark``"""
+    watermark: datetime = _EPOCH
+    settled: Dict[str, Decimal] = field(default_factory=dict)  # HotWallet.key -> total
+    rows_applied: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "watermark": self.watermark.isoformat(),
+            "settled": {key: str(total) for key, total in self.settled.items()},
+            "rows_applied": self.rows_applied,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LedgerCheckpoint":
+        return cls(
+            watermark=datetime.fromisoformat(data["watermark"]),
+            settled={key: Decimal(total) for key, total in data.get("settled", {}).items()},
+            rows_applied=int(data.get("rows_applied", 0)),
+        )
+
+
 class ReconciliationService:
     """
     Watchdog service that verifies System Integrity.
-    Compares Internal Ledger (DB/Redis) vs On-Chain State.
+    Compares Internal Ledger (DB/Redis) vs On-Chain State, per hot wallet.
+
+    The internal balance of a wallet is its opening balance minus the
+    confirmed settlements paid out of it. Those sums are kept as a
+    checkpoint in Redis: each run only aggregates settlements confirmed
+    since the checkpoint's watermark (one grouped query over
+    ``idx_settlements_status_confirmed``), so the cost of a run does not grow
+    with table size. On-chain balances for every wallet are fetched
+    concurrently, each under a timeout, so a slow RPC degrades one wallet's
+    check instead of the whole report.
     """
-    
+
     DRIFT_THRESHOLD = Decimal("0.0001") # 0.01%
-    
-    def __init__(self):
+    CHECKPOINT_KEY = "reconciliation:ledger_checkpoint"
+
+    def __init__(self, wallets: Optional[List[HotWallet]] = None, db_session_factory: Optional[Callable] = None):
         self.redis = get_redis_client()
         self.cache = get_cache()
         self.aptos = get_aptos_client()
         self.polygon = PolygonSettlementService()
 
-    async def get_internal_ledger_balance(self, chain: str) -> Decimal:
+        self.wallets = wallets if wallets is not None else load_hot_wallets()
+        self.db_session_factory = db_session_factory
+        self.fetch_timeout = settings.RECONCILIATION_FETCH_TIMEOUT_SECONDS
+        self.max_concurrent_fetches = settings.RECONCILIATION_MAX_CONCURRENT_FETCHES
+        # Rows confirmed in the last few seconds may still be committing
+        self.confirmation_lag = timedelta(seconds=settings.RECONCILIATION_CONFIRMATION_LAG_SECONDS)
+
+    async def get_internal_ledger_balances(self) -> Dict[str, Decimal]:
         """
-        Mock: Fetch total user balances from DB for a specific chain.
-        In a real system, this would be `SELECT SUM(balance) FROM wallets WHERE chain=...`
+        Expected balance of every hot wallet, keyed by ``HotWallet.key``.
         """
-        # For this demo, we assume the internal ledger should track X amount.
-        # We'll use a Redis key 'ledger:total:{chain}' or return a mock value that 
-        # is INTENTIONALLY usually correct but we can drift it for testing.
-        
-        ledger_key = f"ledger:total:{chain}"
-        val = await self.cache.get(ledger_key)
-        if val:
-            return Decimal(str(val))
-            
-        # Default mock values if not set
-        if chain == "APTOS":
-            return Decimal("100.00") 
-        elif chain == "POLYGON":
-            return Decimal("2000.00")
-        
-        return Decimal("0")
-
-    async def get_on_chain_balance(self, chain: str) -> Decimal:
+        checkpoint, openings = await asyncio.gather(
+            self.advance_ledger_checkpoint(),
+            asyncio.gather(*(self._opening_balance(wallet) for wallet in self.wallets)),
+        )
+        return {
+            wallet.key: opening - checkpoint.settled.get(wallet.key, Decimal("0"))
+            for wallet, opening in zip(self.wallets, openings)
+        }
+
+    async def advance_ledger_checkpoint(self) -> LedgerCheckpoint:
         """
-        Fetch real on-chain balance of the Treasury/Hot Wallet.
+        Fold settlements confirmed since the last watermark into the running
+        sums and persist the new checkpoint.
+        """
+        stored = await self.cache.get(self.CHECKPOINT_KEY)
+        checkpoint = LedgerCheckpoint.from_dict(stored) if stored else LedgerCheckpoint()
+
+        high = datetime.now(timezone.utc) - self.confirmation_lag
+        if high <= checkpoint.watermark:
+            return checkpoint
+
+        rows = await self._settled_between(checkpoint.watermark, high)
+        for network, currency, source_address, total, count in rows:
+            key = self._attribute(network, currency, source_address)
+            checkpoint.settled[key] = checkpoint.settled.get(key, Decimal("0")) + Decimal(str(total))
+            checkpoint.rows_applied += int(count)
+
+        checkpoint.watermark = high
+        await self.cache.set(self.CHECKPOINT_KEY, checkpoint.to_dict())
+        return checkpoint
+
+    async def get_on_chain_balance(self, wallet: HotWallet) -> Decimal:
+        """
+        Fetch real on-chain balance of a Treasury/Hot Wallet.
         """
         try:
-            if chain == "APTOS":
-                # We use the configured account
-                addr = settings.APTOS_ACCOUNT_ADDRESS
-                bal = await self.aptos.get_account_balance(addr)
+            if wallet.chain == "APTOS":
+                bal = await self.aptos.get_account_balance(wallet.address)
                 return Decimal(str(bal))
-                
-            elif chain == "POLYGON":
-                # We use the configured polygon account (or a hardcoded one for MVP)
-                # Check if attribute exists, else use default
-                if hasattr(settings, "POLYGON_ACCOUNT_ADDRESS"):
-                    addr = settings.POLYGON_ACCOUNT_ADDRESS
+
+            elif wallet.chain == "POLYGON":
+                if wallet.token_address:
+                    bal = await self.polygon.get_token_balance(wallet.token_address, wallet.address)
                 else:
-                    addr = "0x0"
-                    
-                # Check USDC
-                usdc = await self.polygon.get_token_balance("0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359", addr)
-                return Decimal(str(usdc))
-                
+                    bal = await self.polygon.get_account_balance(wallet.address)
+                return Decimal(str(bal))
+
         except Exception as e:
-            logger.error("failed_to_fetch_chain_balance", chain=chain, error=str(e))
+            logger.error("failed_to_fetch_chain_balance", chain=wallet.chain, address=wallet.address, error=str(e))
             raise ReconciliationError(f"Chain Fetch Error: {e}")
-            
-        return Decimal("0")
+
+        raise ReconciliationError(f"Unsupported chain {wallet.chain}")
 
     async def check_integrity(self) -> Dict[str, Any]:
         """
         Run the reconciliation process.
-        Returns a report.
+        Returns a report with one check per hot wallet.
         """
+        started = time.perf_counter()
         report = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "status": "HEALTHY",
             "checks": []
         }
-        
-        chains = ["APTOS", "POLYGON"]
+
+        # Ledger catch-up and chain reads are independent, so overlap them
+        internal_result, on_chain = await asyncio.gather(
+            self.get_internal_ledger_balances(),
+            self._fetch_on_chain_balances(),
+            return_exceptions=True,
+        )
+        if isinstance(internal_result, Exception):
+            logger.error("reconciliation_ledger_failed", error=str(internal_result))
+            report["status"] = "ERROR"
+            report["error"] = f"Internal ledger unavailable: {internal_result}"
+            report["elapsed_ms"] = (time.perf_counter() - started) * 1000
+            return report
+
         drift_detected = False
-        
-        for chain in chains:
-            try:
-                internal = await self.get_internal_ledger_balance(chain)
-                on_chain = await self.get_on_chain_balance(chain)
-                
-                # Check Drift
-                # Avoid division by zero
-                if internal == 0:
-                     diff_pct = Decimal("0") if on_chain == 0 else Decimal("1.0") # 100% drift if internal 0 but chain has funds
-                else:
-                    diff_pct = abs((on_chain - internal) / internal)
-                
-                check = {
-                    "chain": chain,
-                    "internal_balance": float(internal),
-                    "on_chain_balance": float(on_chain),
-                    "drift_pct": float(diff_pct),
-                    "status": "OK"
-                }
-                
-                if diff_pct > self.DRIFT_THRESHOLD:
-                    check["status"] = "DRIFT_DETECTED"
-                    drift_detected = True
-                    self.trigger_alert(chain, internal, on_chain, diff_pct)
-                    
+        errors = 0
+        for wallet in self.wallets:
+            check = {
+                "chain": wallet.chain,
+                "token": wallet.token,
+                "address": wallet.address,
+            }
+            balance = on_chain[wallet.key]
+            if isinstance(balance, Exception):
+                errors += 1
+                check.update(error=str(balance) or type(balance).__name__, status="ERROR")
                 report["checks"].append(check)
-                
-            except Exception as e:
-                report["checks"].append({
-                    "chain": chain,
-                    "error": str(e),
-                    "status": "ERROR"
-                })
-        
+                continue
+
+            internal = internal_result[wallet.key]
+            # Avoid division by zero
+            if internal == 0:
+                diff_pct = Decimal("0") if balance == 0 else Decimal("1.0") # 100% drift if internal 0 but chain has funds
+            else:
+                diff_pct = abs((balance - internal) / internal)
+
+            check.update(
+                internal_balance=float(internal),
+                on_chain_balance=float(balance),
+                drift=float(balance - internal),
+                drift_pct=float(diff_pct),
+                status="OK",
+            )
+            if diff_pct > self.DRIFT_THRESHOLD:
+                check["status"] = "DRIFT_DETECTED"
+                drift_detected = True
+                self.trigger_alert(f"{wallet.chain}:{wallet.address}", internal, balance, diff_pct)
+
+            report["checks"].append(check)
+
         if drift_detected:
             report["status"] = "CRITICAL_DRIFT"
-            
+        elif errors:
+            report["status"] = "DEGRADED"
+
+        report["elapsed_ms"] = (time.perf_counter() - started) * 1000
         return report
 
     def trigger_alert(self, chain: str, internal: Decimal, on_chain: Decimal, drift: Decimal):
@@ -139,3 +247,58 @@ class ReconciliationService:
         msg = f"🚨 INTEGRITY BREACH: {chain} Drift > 0.01%! Internal: {internal}, Chain: {on_chain}, Drift: {drift:.2%}"
         logger.critical(msg)
         # requests.post(settings.SLACK_WEBHOOK, json={"text": msg})
+
+    async def _fetch_on_chain_balances(self) -> Dict[str, Any]:
+        """Balance (or the exception raised) for every wallet, fetched concurrently"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+
+        async def fetch(wallet: HotWallet) -> Decimal:
+            async with semaphore:
+                return await asyncio.wait_for(self.get_on_chain_balance(wallet), self.fetch_timeout)
+
+        results = await asyncio.gather(*(fetch(wallet) for wallet in self.wallets), return_exceptions=True)
+        return {wallet.key: result for wallet, result in zip(self.wallets, results)}
+
+    async def _opening_balance(self, wallet: HotWallet) -> Decimal:
+        # Treasury ops can re-base a wallet (e.g. after a top-up) without a deploy
+        val = await self.cache.get(f"ledger:opening:{wallet.key}")
+        if val is not None:
+            return Decimal(str(val))
+        return wallet.opening_balance
+
+    async def _settled_between(self, low: datetime, high: datetime) -> List[Tuple[str, str, Optional[str], Any, int]]:
+        """Confirmed settlement totals in (low, high], grouped by chain / currency / wallet"""
+        from sqlalchemy import func, select
+        from applications.capp.capp.core.database import Settlement
+
+        session_factory = self.db_session_factory
+        if session_factory is None:
+            from applications.capp.capp.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        stmt = (
+            select(
+                Settlement.blockchain_network,
+                Settlement.settlement_currency,
+                Settlement.source_address,
+                func.sum(Settlement.settlement_amount),
+                func.count(),
+            )
+            .where(Settlement.status == "confirmed")
+            .where(Settlement.confirmed_at > low)
+            .where(Settlement.confirmed_at <= high)
+            .group_by(Settlement.blockchain_network, Settlement.settlement_currency, Settlement.source_address)
+        )
+        async with session_factory() as session:
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+
+    def _attribute(self, network: str, currency: str, source_address: Optional[str]) -> str:
+        """Map a settlement group onto the hot wallet it was paid from"""
+        chain, token = network.upper(), currency.upper()
+        candidates = [w for w in self.wallets if w.chain == chain and w.token == token]
+        for wallet in candidates:
+            if source_address is None or wallet.address.lower() == source_address.lower():
+                return wallet.key
+        # Not a tracked wallet; still recorded so it is not lost if the wallet is added later
+        return f"{chain}|{token}|{source_address or ''}"
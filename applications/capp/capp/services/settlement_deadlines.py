@@ -0,0 +1,78 @@
+"""
+Settlement Deadline Index for CAPP
+
+Redis sorted set of payments currently in SETTLING, scored by the time at
+which they count as stuck. The PaymentWatchdog reads only the entries that
+are due instead of scanning the payments table.
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+import structlog
+
+from applications.capp.capp.core.redis import get_redis_client
+
+logger = structlog.get_logger(__name__)
+
+SETTLING_TIMEOUT_MINUTES = 30
+
+
+class SettlementDeadlineIndex:
+    """
+    Sorted set ``payment_id -> settlement deadline (epoch seconds)``
+
+    Entries are added when a payment enters SETTLING and removed when it
+    leaves, so ``due()`` returns exactly the payments whose settlement has
+    overrun. Redis errors are logged and swallowed: the watchdog's periodic
+    full scan still catches anything the index missed.
+    """
+
+    KEY = "watchdog:settlement_deadlines"
+
+    def __init__(self, redis_client: Any = None, key: str = KEY,
+                 timeout_minutes: int = SETTLING_TIMEOUT_MINUTES):
+        self.redis = redis_client if redis_client is not None else get_redis_client()
+        self.key = key
+        self.timeout_seconds = timeout_minutes * 60
+
+    async def track(self, payment_id: str, settling_since: Optional[datetime] = None) -> None:
+        """Record that ``payment_id`` entered SETTLING (now, unless given)"""
+        if settling_since is None:
+            started = time.time()
+        else:
+            # Payment timestamps are stored as naive UTC
+            if settling_since.tzinfo is None:
+                settling_since = settling_since.replace(tzinfo=timezone.utc)
+            started = settling_since.timestamp()
+        try:
+            await self.redis.zadd(self.key, {str(payment_id): started + self.timeout_seconds})
+        except Exception as e:
+            logger.warning("Failed to track settlement deadline", payment_id=str(payment_id), error=str(e))
+
+    async def clear(self, *payment_ids: str) -> None:
+        """Forget payments that left SETTLING"""
+        if not payment_ids:
+            return
+        try:
+            await self.redis.zrem(self.key, *[str(pid) for pid in payment_ids])
+        except Exception as e:
+            logger.warning("Failed to clear settlement deadlines", count=len(payment_ids), error=str(e))
+
+    async def due(self, now: Optional[float] = None, offset: int = 0, limit: int = 500) -> List[str]:
+        """
+        Payment ids whose deadline has passed, most overdue first
+
+        Args:
+            now: Epoch seconds to compare deadlines against (default: now)
+            offset: Number of due entries to skip
+            limit: Maximum ids to return
+        """
+        try:
+            return await self.redis.zrangebyscore(
+                self.key, "-inf", now if now is not None else time.time(), start=offset, num=limit
+            )
+        except Exception as e:
+            logger.warning("Failed to read settlement deadlines", error=str(e))
+            return []
@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 
 from applications.capp.capp.models.payments import PaymentStatus
 from applications.capp.capp.core.redis import get_redis_client
+from applications.capp.capp.services.settlement_deadlines import SettlementDeadlineIndex
 
 logger = structlog.get_logger(__name__)
 
@@ -59,6 +60,7 @@ class StatusManager:
 
     def __init__(self):
         self.redis = get_redis_client()
+        self.settlement_deadlines = SettlementDeadlineIndex(self.redis)
 
     async def validate_transition(self, current_status: PaymentStatus, new_status: PaymentStatus) -> bool:
         """
@@ -90,6 +92,12 @@ class StatusManager:
             raise InvalidStateTransitionError(f"Cannot transition from {current_status} to {new_status}")
             
         logger.info("payment_status_transition", payment_id=payment_id, from_status=current_status, to_status=new_status)
+
+        # Keep the watchdog's deadline index in step with SETTLING
+        if new_status == PaymentStatus.SETTLING and current_status != PaymentStatus.SETTLING:
+            await self.settlement_deadlines.track(payment_id)
+        elif current_status == PaymentStatus.SETTLING and new_status != PaymentStatus.SETTLING:
+            await self.settlement_deadlines.clear(payment_id)
         
         # Here we would typically update the DB. 
         # Since this is a service helper, the caller usually updates DB.
@@ -15,6 +15,7 @@ import structlog
 from applications.capp.capp.config.settings import get_settings
 from applications.capp.capp.core.redis import get_cache
 from applications.capp.capp.models.payments import Chain, Currency
+from applications.capp.capp.services.dlq_service import register_dlq_handler, DLQService
 
 logger = structlog.get_logger(__name__)
 
@@ -169,20 +170,29 @@ class YieldService:
     async def _execute_sweep(self, wallet_address: str, amount: Decimal, currency: str):
         """Mock execution of sweeping funds to Aave for a specific wallet"""
         try:
-            self.logger.info(f"Sweeping {amount} {currency} for {wallet_address} to Strategy (Aave V3)...")
-            await asyncio.sleep(0.5)
-            
-            # Initialize wallet dict if not exists
-            if wallet_address not in self._mock_yield_balances:
-                self._mock_yield_balances[wallet_address] = {}
-                
-            current_yield = self._mock_yield_balances[wallet_address].get(currency, Decimal("0"))
-            self._mock_yield_balances[wallet_address][currency] = current_yield + amount
-            
-            self.logger.info(f"Sweep completed for {wallet_address}. New Yield Balance: {self._mock_yield_balances[wallet_address][currency]}")
-            
+            await self._sweep_to_strategy(wallet_address, amount, currency)
         except Exception as e:
             self.logger.error(f"Sweep Failure for {wallet_address}: {e}")
+            # Hand the sweep to the DLQ so the retry worker re-runs it with backoff
+            await DLQService().capture_failure(
+                "YIELD_SWEEP",
+                {"wallet_address": wallet_address, "amount": str(amount), "currency": currency},
+                e,
+            )
+
+    async def _sweep_to_strategy(self, wallet_address: str, amount: Decimal, currency: str):
+        """Move funds into the yield strategy; raises on failure"""
+        self.logger.info(f"Sweeping {amount} {currency} for {wallet_address} to Strategy (Aave V3)...")
+        await asyncio.sleep(0.5)
+
+        # Initialize wallet dict if not exists
+        if wallet_address not in self._mock_yield_balances:
+            self._mock_yield_balances[wallet_address] = {}
+
+        current_yield = self._mock_yield_balances[wallet_address].get(currency, Decimal("0"))
+        self._mock_yield_balances[wallet_address][currency] = current_yield + amount
+
+        self.logger.info(f"Sweep completed for {wallet_address}. New Yield Balance: {self._mock_yield_balances[wallet_address][currency]}")
 
     async def request_liquidity(self, wallet_address: str, amount: Decimal, currency: str) -> bool:
         """
@@ -214,3 +224,12 @@ class YieldService:
         self._mock_yield_balances[wallet_address][currency] -= shortfall
         self.logger.info(f"Liquidity Unwound for {wallet_address}.")
         return True
+
+
+async def _retry_sweep(payload: Dict[str, Any]) -> None:
+    await YieldService()._sweep_to_strategy(
+        payload["wallet_address"], Decimal(payload["amount"]), payload["currency"]
+    )
+
+
+register_dlq_handler("YIELD_SWEEP", _retry_sweep, concurrency=2)
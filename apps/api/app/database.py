@@ -1,5 +1,6 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -21,9 +22,70 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Alembic only covers the capp core tables; the models in app/models.py have
+# no migrations yet, so their tables are still created on startup for every
+# database. create_all skips existing tables, and it runs from the app
+# lifespan rather than at import time so it does not slow down worker boot.
+# Set AUTO_CREATE_SCHEMA=false once those tables are migration-managed.
+AUTO_CREATE_SCHEMA = os.environ.get("AUTO_CREATE_SCHEMA", "true").lower() in ("1", "true", "yes")
+
+def create_schema():
+    Base.metadata.create_all(bind=engine)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# --- Async engine ---------------------------------------------------------
+# Async routes and background services must not run blocking queries on the
+# event loop: one slow query would stall every in-flight request on the worker.
+# They use this engine instead, which points at the same database through an
+# async driver (asyncpg for Postgres, aiosqlite for local SQLite).
+
+def _to_async_url(url: str) -> str:
+    if url.startswith("sqlite"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1) if "+aiosqlite" not in url else url
+    if url.startswith("postgres"):
+        scheme, rest = url.split("://", 1)
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+ASYNC_DATABASE_URL = _to_async_url(SQL_ALCHEMY_DATABASE_URL)
+
+# Pool sizing: each worker keeps DB_POOL_SIZE warm connections and may burst to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW. Keep (workers x burst) below Postgres max_connections.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "5"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    # SQLite serialises writers anyway; pool sizing options do not apply.
+    _async_engine_kwargs = {}
+else:
+    _async_engine_kwargs = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, future=True, **_async_engine_kwargs)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+async def close_async_engine():
+    await async_engine.dispose()
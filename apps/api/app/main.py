@@ -13,12 +13,14 @@ load_dotenv()
 from applications.capp.capp.config.settings import settings
 from applications.capp.capp.core.limiter import limiter
 from applications.capp.capp.core.redis import init_redis
-from applications.capp.capp.core.aptos import init_aptos_client
-from applications.capp.capp.core.polygon import init_polygon_client
 from applications.capp.capp.services.chain_listener import ChainListenerService
+from applications.capp.capp.services.dlq_service import DLQService
+from applications.capp.capp.services.approval import get_approval_service
 from .services.webhook_dispatcher import WebhookDispatcherService
+from .services.anomaly_detection import anomaly_detector
 
-from .database import engine, Base
+from . import warmup
+from .database import AUTO_CREATE_SCHEMA, create_schema, close_async_engine
 from .routers import wallet, agents, chain_data, bridge, starknet, routing, system, admin_dlq, identity, compliance, sandbox, market, events, corridors, admin_anomalies, compliance_reports, yield_api
 
 logger = structlog.get_logger(__name__)
@@ -26,9 +28,6 @@ logger = structlog.get_logger(__name__)
 # Fix path to allow importing from applications (Legacy support)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
 
-# Create DB Tables
-Base.metadata.create_all(bind=engine)
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -37,9 +36,15 @@ async def lifespan(app: FastAPI):
         await init_redis()
     except Exception as e:
         logger.warning("redis_unavailable", error=str(e))
-    
-    await init_aptos_client()
-    await init_polygon_client()
+
+    # app/models.py tables have no migrations yet; create any that are missing
+    if AUTO_CREATE_SCHEMA:
+        await asyncio.to_thread(create_schema)
+
+    # Heavy integrations load on first use; initialise / preload only the enabled ones
+    features = warmup.enabled_features()
+    await warmup.initialize(features)
+    warmup_task = asyncio.create_task(warmup.preload(features))
     
     # Background Tasks
     listener = ChainListenerService()
@@ -49,10 +54,18 @@ async def lifespan(app: FastAPI):
     webhook_dispatcher = WebhookDispatcherService()
     asyncio.create_task(webhook_dispatcher.start_listening())
     logger.info("webhook_dispatcher_service_started")
+
+    dlq_worker = DLQService()
+    await dlq_worker.start()
     
     yield
     # Shutdown
     logger.info("system_shutdown")
+    warmup_task.cancel()
+    await dlq_worker.stop()
+    await anomaly_detector.close()
+    await get_approval_service().close()
+    await close_async_engine()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -33,3 +33,19 @@ async def retry_task(task_id: str, background_tasks: BackgroundTasks):
     background_tasks.add_task(dlq.retry_task, task_id)
     
     return {"status": "Retry Initiated", "task_id": task_id}
+
+@router.get("/quarantine", response_model=List[FailedTask])
+async def get_quarantined_tasks(limit: int = 50):
+    """
+    Get tasks that exhausted their retries or were rejected as poison messages.
+    """
+    dlq = DLQService()
+    return await dlq.get_quarantined_tasks(limit)
+
+@router.get("/stats")
+async def get_dlq_stats() -> Dict[str, Any]:
+    """
+    Get scheduled / in-flight / quarantined task counts.
+    """
+    dlq = DLQService()
+    return await dlq.get_stats()
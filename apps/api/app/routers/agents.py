@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from .. import schemas, database, models
 from datetime import datetime
+from typing import Optional
 import sys
 import os
 
@@ -9,10 +10,6 @@ import os
 # In production, this should be handled by proper packaging (setup.py)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
 
-from packages.intelligence.market.analyst import MarketAnalysisAgent
-from packages.intelligence.compliance.agent import AIComplianceAgent
-from packages.intelligence.compliance.agent import AIComplianceAgent
-from packages.intelligence.core.gemini_provider import GeminiProvider
 from applications.capp.capp.services.activity_log import get_activity_log
 from applications.capp.capp.config.settings import settings
 from applications.capp.capp.models.payments import (
@@ -44,9 +41,12 @@ from .. import state
 def get_market_agent():
     global _market_agent
     if not _market_agent:
+        from packages.intelligence.market.analyst import MarketAnalysisAgent
         # Check for Gemini Key
         if settings.GEMINI_API_KEY:
             try:
+                # google.generativeai is only loaded when a key is configured
+                from packages.intelligence.core.gemini_provider import GeminiProvider
                 provider = GeminiProvider(api_key=settings.GEMINI_API_KEY, model_name=settings.GEMINI_MODEL)
                 _market_agent = MarketAnalysisAgent(provider=provider)
                 print("Market Agent initialized with Real Gemini Provider")
@@ -60,6 +60,7 @@ def get_market_agent():
 def get_compliance_agent():
     global _compliance_agent
     if not _compliance_agent:
+        from packages.intelligence.compliance.agent import AIComplianceAgent
         _compliance_agent = AIComplianceAgent()
     return _compliance_agent
 
@@ -89,14 +90,22 @@ async def get_market_status():
 
 @router.post("/approve/{request_id}")
 async def approve_request(request_id: str, payload: schemas.SignedApprovalRequest):
-    success = get_approval_service().approve_request(request_id, signature=payload.signature)
+    success = await get_approval_service().approve_request(request_id, signature=payload.signature)
     if not success:
         raise HTTPException(status_code=404, detail="Request not found or invalid signature")
     return {"status": "success", "message": "Request approved"}
 
+@router.get("/approvals")
+async def list_approvals(status: Optional[str] = "PENDING", agent_id: Optional[str] = None, limit: int = 50):
+    """
+    Approval requests from the shared queue, newest first, by status and/or requester.
+    """
+    requests = await get_approval_service().list_requests(status=status, agent_id=agent_id, limit=limit)
+    return [req.dict() for req in requests]
+
 @router.post("/reject/{request_id}")
 async def reject_request(request_id: str):
-    success = get_approval_service().reject_request(request_id)
+    success = await get_approval_service().reject_request(request_id)
     if not success:
         raise HTTPException(status_code=404, detail="Request not found or already processed")
     return {"status": "success", "message": "Request rejected"}
@@ -288,7 +297,7 @@ async def scout_opportunities():
         }
 
     # 2. Create an approval request for this opportunity
-    req_id = get_approval_service().request_approval(
+    req_id = await get_approval_service().request_approval(
         agent_id="market_scout",
         action_type="OPPORTUNITY",
         description=f"Move 1000 USDC to {opportunity['protocol']} on {opportunity['chain']} for {opportunity['apy']:.2f}% APY",
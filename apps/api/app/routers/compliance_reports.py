@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from fastapi.responses import StreamingResponse
-import io
 import csv
 
 from .. import database, models
@@ -11,52 +10,100 @@ router = APIRouter(
     tags=["compliance_reports"]
 )
 
+# Rows fetched from the DB per round trip and written per response chunk
+EXPORT_BATCH_SIZE = 500
+
+# Records exported when the caller does not ask for more
+DEFAULT_EXPORT_LIMIT = 1000
+MAX_EXPORT_LIMIT = 1_000_000
+
+CSV_HEADER = ["Timestamp_UTC", "Transaction_Hash", "Corridor", "Target_Chain", "Amount_USD", "Execution_Time_ms", "Success", "Error_Reason"]
+
+
+class _LineBuffer:
+    """File-like sink that hands back whatever csv.writer writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_row(r: models.PaymentMemoryRecord) -> list:
+    return [
+        r.timestamp.isoformat() if r.timestamp else "",
+        r.tx_hash,
+        r.corridor,
+        r.target_chain,
+        f"{r.amount_usd:.2f}" if r.amount_usd else "0.00",
+        r.execution_time_ms,
+        r.success,
+        r.error_reason or ""
+    ]
+
+
+def _stream_csv_rows(limit: int):
+    """
+    Yield the report as CSV text, one batch of rows at a time.
+
+    Records are read over a server-side cursor (``yield_per``) on a session
+    owned by the generator, so neither the ORM objects nor the CSV text for
+    the whole report are ever held in memory at once.
+    """
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(CSV_HEADER)
+
+    db = database.SessionLocal()
+    try:
+        query = (
+            db.query(models.PaymentMemoryRecord)
+            .order_by(models.PaymentMemoryRecord.timestamp.desc(), models.PaymentMemoryRecord.id.desc())
+            .yield_per(EXPORT_BATCH_SIZE)
+        )
+        query = query.limit(limit)
+
+        chunk = []
+        for r in query:
+            chunk.append(writer.writerow(_csv_row(r)))
+            if len(chunk) >= EXPORT_BATCH_SIZE:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+    finally:
+        db.close()
+
+
 @router.get("/csv")
 def generate_csv_report(
     organization_id: str = Query(..., description="Organization UUID to generate report for"),
+    limit: int = Query(
+        DEFAULT_EXPORT_LIMIT, ge=1, le=MAX_EXPORT_LIMIT,
+        description="Maximum number of records (newest first); raise it explicitly for larger exports"
+    ),
     db: Session = Depends(database.get_db)
 ):
     """
     Generate a CSV export of all payment executions for an organization.
     This simulates joining an organization's Agent pool against the PaymentMemory logs.
+
+    Rows are streamed to the client as they are read, so export size is
+    not bounded by worker memory.
     """
     # 1. In a real app we'd query db.query(models.AgentCredential).filter(org_id=...)
     # and then filter the PaymentMemoryRecord by those exact agent tx_hashes.
     # For this sandbox, we simply stream all recent payment memory records, simulating an org subset.
-    
-    records = db.query(models.PaymentMemoryRecord).order_by(models.PaymentMemoryRecord.timestamp.desc()).limit(1000).all()
-    
-    if not records:
+
+    has_records = db.query(models.PaymentMemoryRecord.id).limit(1).first() is not None
+
+    if not has_records:
          raise HTTPException(status_code=404, detail="No transaction records found for this organization.")
 
-    # 2. Build the CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write Headers
-    writer.writerow(["Timestamp_UTC", "Transaction_Hash", "Corridor", "Target_Chain", "Amount_USD", "Execution_Time_ms", "Success", "Error_Reason"])
-    
-    # Write Rows
-    for r in records:
-        writer.writerow([
-            r.timestamp.isoformat() if r.timestamp else "",
-            r.tx_hash,
-            r.corridor,
-            r.target_chain,
-            f"{r.amount_usd:.2f}" if r.amount_usd else "0.00",
-            r.execution_time_ms,
-            r.success,
-            r.error_reason or ""
-        ])
-    
-    output.seek(0)
-    
+    # 2. Stream the CSV as it is generated
     headers = {
         'Content-Disposition': f'attachment; filename="capp_compliance_report_{organization_id}.csv"'
     }
-    
+
     return StreamingResponse(
-        iter([output.getvalue()]), 
-        media_type="text/csv", 
+        _stream_csv_rows(limit),
+        media_type="text/csv",
         headers=headers
     )
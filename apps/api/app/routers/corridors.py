@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from datetime import datetime, timedelta
 
@@ -15,7 +16,7 @@ router = APIRouter(
 async def get_corridor_feed(
     corridor: str,
     lookback_days: int = Query(7, ge=1, le=30),
-    db: Session = Depends(database.get_db)
+    db: AsyncSession = Depends(database.get_async_db)
 ):
     """
     Get a real-time data hose of the liquidity and fee conditions within a specific CAPP network corridor.
@@ -25,12 +26,14 @@ async def get_corridor_feed(
         # 1. Fetch historical metrics from TimescaleDB table
         cutoff_date = datetime.utcnow() - timedelta(days=lookback_days)
         
-        metrics = db.query(models.CorridorMetricsHistory)\
-            .filter(models.CorridorMetricsHistory.corridor == corridor)\
-            .filter(models.CorridorMetricsHistory.timestamp >= cutoff_date)\
-            .order_by(models.CorridorMetricsHistory.timestamp.desc())\
-            .limit(100)\
-            .all()
+        result = await db.execute(
+            select(models.CorridorMetricsHistory)
+            .where(models.CorridorMetricsHistory.corridor == corridor)
+            .where(models.CorridorMetricsHistory.timestamp >= cutoff_date)
+            .order_by(models.CorridorMetricsHistory.timestamp.desc())
+            .limit(100)
+        )
+        metrics = result.scalars().all()
             
         # 2. Add AI Context 
         market_data = await market_context.get_market_stress_indicator()
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from .. import schemas
-from applications.capp.capp.core.router import PaymentRouter, RouteOption
 import structlog
 from applications.capp.capp.core.limiter import limiter
 
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
 from .. import schemas
-from applications.capp.capp.core.starknet import get_starknet_client
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -10,13 +9,18 @@ router = APIRouter(
     tags=["starknet"]
 )
 
+def _starknet_client():
+    # starknet-py is slow to import; load it on the first Starknet request
+    from applications.capp.capp.core.starknet import get_starknet_client
+    return get_starknet_client()
+
 @router.post("/address", response_model=schemas.StarknetAddressResponse)
 async def compute_address(request: schemas.StarknetAddressRequest):
     """
     Compute the counterfactual address for a given public key without deploying.
     """
     try:
-        client = get_starknet_client()
+        client = _starknet_client()
         # Convert hex string to int
         pub_int = int(request.public_key, 16)
         
@@ -37,7 +41,7 @@ async def deploy_account(request: schemas.StarknetDeployRequest):
     WARNING: The address MUST be funded with ETH before calling this.
     """
     try:
-        client = get_starknet_client()
+        client = _starknet_client()
         pub_int = int(request.public_key, 16)
         priv_int = int(request.private_key, 16)
         
@@ -58,7 +62,7 @@ async def get_balance(address: str):
     Get the ETH balance of a Starknet address.
     """
     try:
-        client = get_starknet_client()
+        client = _starknet_client()
 
         # Guard: read-only clients (no credentials) cannot query balances
         if not getattr(client, "account", None):
@@ -87,7 +91,7 @@ async def transfer_funds(request: schemas.StarknetTransferRequest):
     Transfer funds from the SYSTEM ACCOUNT (configured in .env).
     """
     try:
-        client = get_starknet_client()
+        client = _starknet_client()
         
         # Convert amount to Wei (assuming input is ETH)
         amount_wei = int(request.amount * 1e18)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from .. import schemas, database, models
-from ..database import SessionLocal
+from ..database import AsyncSessionLocal
 from datetime import datetime
 import sys
 import os
@@ -11,12 +11,6 @@ from decimal import Decimal
 # Ad-hoc path fix
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
 
-from applications.capp.capp.core.aptos import get_aptos_client
-from applications.capp.capp.core.starknet import get_starknet_client
-from applications.capp.capp.core.polygon import PolygonSettlementService
-from applications.capp.capp.core.solana import get_solana_client
-from applications.capp.capp.core.stellar import get_stellar_client
-from applications.capp.capp.agents.settlement.settlement_agent import SettlementAgent, SettlementConfig
 from applications.capp.capp.models.payments import (
     PaymentBatch, CrossBorderPayment, PaymentStatus, Currency,
     PaymentType, PaymentMethod, SenderInfo, RecipientInfo, Country, SettlementBatch
@@ -24,7 +18,7 @@ from applications.capp.capp.models.payments import (
 from .. import state
 from applications.capp.capp.services.approval import get_approval_service
 from applications.capp.capp.config.settings import settings
-from applications.capp.capp.services.anomaly_detection import anomaly_detector
+from ..services.anomaly_detection import anomaly_detector
 from ..services.price_oracle import get_oracle
 
 router = APIRouter(
@@ -38,12 +32,18 @@ _settlement_agent = None
 def get_settlement_agent():
     global _settlement_agent
     if not _settlement_agent:
+        # Pulls in every chain SDK; loaded on the first settlement, not at worker boot
+        from applications.capp.capp.agents.settlement.settlement_agent import SettlementAgent, SettlementConfig
         config = SettlementConfig(agent_type="SETTLEMENT")
         _settlement_agent = SettlementAgent(config)
     return _settlement_agent
 
 @router.get("/balance/{address}")
 async def get_balance(address: str):
+    from applications.capp.capp.core.aptos import get_aptos_client
+    from applications.capp.capp.core.polygon import PolygonSettlementService
+    from applications.capp.capp.core.starknet import get_starknet_client
+
     try:
         # Aptos Balance
         client = get_aptos_client() 
@@ -149,17 +149,25 @@ async def send_transaction(request: schemas.TransactionRequest):
         anomaly_detector.analyze_transaction(agent_id=active_agent_id, tx_req=request)
 
         if requires_approval:
-            req_id = get_approval_service().request_approval(
+            approvals = get_approval_service()
+            req_id = await approvals.request_approval(
                 agent_id="settlement_agent",
                 action_type="PAYMENT", # Special type that triggers Payment Card in UI
                 description=approval_reason + f" Send {request.amount} to {request.recipient_name}",
                 payload=request.dict()
             )
-            return schemas.TransactionResponse(
-                tx_hash="WAITING_FOR_APPROVAL",
-                status="PENDING_APPROVAL",
-                timestamp=datetime.utcnow()
-            )
+            # Held open for up to APPROVAL_WAIT_SECONDS; resumes as soon as any worker
+            # records the decision, otherwise answers PENDING_APPROVAL
+            decision = "PENDING"
+            if settings.APPROVAL_WAIT_SECONDS > 0:
+                decision = await approvals.wait_for_decision(req_id, timeout=settings.APPROVAL_WAIT_SECONDS)
+            if decision != "APPROVED":
+                return schemas.TransactionResponse(
+                    tx_hash="WAITING_FOR_APPROVAL" if decision == "PENDING" else "NOT_EXECUTED",
+                    status="PENDING_APPROVAL" if decision == "PENDING" else decision or "UNKNOWN",
+                    timestamp=datetime.utcnow()
+                )
+            evt_logger.info("approval_granted_resuming_payment", request_id=req_id)
         
         # Determine Enums safely
         try:
@@ -222,22 +230,20 @@ async def send_transaction(request: schemas.TransactionRequest):
         tx_hash = await agent.execute_settlement(batch)
 
         # 3. Write to Payment Memory Layer
-        db = SessionLocal()
         try:
-            memory_record = models.PaymentMemoryRecord(
-                tx_hash=tx_hash,
-                corridor=f"{request.from_currency}-{request.to_currency}",
-                target_chain=request.target_chain or "UNKNOWN",
-                amount_usd=float(request.amount),
-                execution_time_ms=1200, # Mock execution time
-                success=True
-            )
-            db.add(memory_record)
-            db.commit()
+            async with AsyncSessionLocal() as db:
+                memory_record = models.PaymentMemoryRecord(
+                    tx_hash=tx_hash,
+                    corridor=f"{request.from_currency}-{request.to_currency}",
+                    target_chain=request.target_chain or "UNKNOWN",
+                    amount_usd=float(request.amount),
+                    execution_time_ms=1200, # Mock execution time
+                    success=True
+                )
+                db.add(memory_record)
+                await db.commit()
         except Exception as e:
             evt_logger.error("failed_to_write_payment_memory", error=str(e))
-        finally:
-            db.close()
         
         return schemas.TransactionResponse(
             tx_hash=tx_hash,
@@ -260,6 +266,12 @@ async def get_wallet_stats():
     Asset prices are fetched from the PriceOracle (Redis-cached, upstream feed,
     then hardcoded fallback). No prices are hardcoded in this function.
     """
+    from applications.capp.capp.core.aptos import get_aptos_client
+    from applications.capp.capp.core.polygon import PolygonSettlementService
+    from applications.capp.capp.core.starknet import get_starknet_client
+    from applications.capp.capp.core.solana import get_solana_client
+    from applications.capp.capp.core.stellar import get_stellar_client
+
     try:
         oracle = get_oracle()
         prices = await oracle.get_prices(["APT", "MATIC", "USDC", "ETH", "SOL", "XLM"])
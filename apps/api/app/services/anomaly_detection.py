@@ -1,95 +1,333 @@
+import asyncio
 import json
+import os
+import time
+from array import array
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
 import structlog
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
 
-from sqlalchemy.orm import Session
-from ..database import SessionLocal
+from packages.core.performance.sketch import QuantileSketch
+
+from ..database import AsyncSessionLocal
 from ..models import AnomalyEvent
 from ..schemas import TransactionRequest
 
 logger = structlog.get_logger(__name__)
 
+# Wallets tracked in memory; the least recently active is evicted beyond this
+ANOMALY_MAX_WALLETS = int(os.environ.get("ANOMALY_MAX_WALLETS", "10000"))
+# Recent amounts per wallet used for mean / variance / percentiles
+ANOMALY_AMOUNT_WINDOW = int(os.environ.get("ANOMALY_AMOUNT_WINDOW", "128"))
+ANOMALY_Z_THRESHOLD = float(os.environ.get("ANOMALY_Z_THRESHOLD", "4.0"))
+ANOMALY_MIN_SAMPLES = int(os.environ.get("ANOMALY_MIN_SAMPLES", "20"))
+ANOMALY_FLUSH_INTERVAL_MS = int(os.environ.get("ANOMALY_FLUSH_INTERVAL_MS", "500"))
+ANOMALY_WRITE_BATCH_SIZE = int(os.environ.get("ANOMALY_WRITE_BATCH_SIZE", "200"))
+ANOMALY_MAX_PENDING = int(os.environ.get("ANOMALY_MAX_PENDING", "10000"))
+
+
+class TimestampRing:
+    """
+    The last ``capacity`` event times.
+
+    "More than N events in the last W seconds" holds exactly when a ring of
+    capacity N + 1 is full and its oldest entry is inside the window, so the
+    check is O(1) however busy the wallet is.
+    """
+
+    __slots__ = ("_times", "_next", "_size")
+
+    def __init__(self, capacity: int):
+        self._times = array("d", [0.0]) * capacity
+        self._next = 0
+        self._size = 0
+
+    def push(self, t: float) -> None:
+        self._times[self._next] = t
+        self._next = (self._next + 1) % len(self._times)
+        self._size = min(self._size + 1, len(self._times))
+
+    def full_within(self, now: float, window: float) -> bool:
+        # When full, the next slot to overwrite holds the oldest time
+        return self._size == len(self._times) and self._times[self._next] > now - window
+
+
+class SlidingStats:
+    """
+    Mean, variance and percentiles of the last ``capacity`` values.
+
+    Values live in a ring buffer and feed a ``QuantileSketch``; the value
+    falling out of the window is removed from the sketch, so every ``push``
+    is O(1).
+    """
+
+    __slots__ = ("_values", "_next", "sketch")
+
+    def __init__(self, capacity: int):
+        self._values = array("d", [0.0]) * capacity
+        self._next = 0
+        self.sketch = QuantileSketch()
+
+    @property
+    def count(self) -> int:
+        return self.sketch.count
+
+    @property
+    def mean(self) -> float:
+        return self.sketch.mean
+
+    @property
+    def variance(self) -> float:
+        return self.sketch.std_dev ** 2
+
+    @property
+    def stddev(self) -> float:
+        return self.sketch.std_dev
+
+    def push(self, value: float) -> None:
+        if self.sketch.count == len(self._values):
+            self.sketch.remove(self._values[self._next])
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        self.sketch.add(value)
+
+
+class WalletWindow:
+    """Per-wallet streaming state; fixed size regardless of history length"""
+
+    __slots__ = ("velocity", "amounts")
+
+    def __init__(self, max_tx_per_minute: int, amount_window: int):
+        self.velocity = TimestampRing(max_tx_per_minute + 1)
+        self.amounts = SlidingStats(amount_window)
+
+
+class AnomalyWriter:
+    """
+    Write-behind persistence for anomaly events
+
+    Records are buffered in memory and inserted in batches, one session and
+    commit per ``batch_size`` rows. A flush is scheduled ``flush_interval_ms``
+    after the first buffered record, or immediately once ``batch_size``
+    records are waiting. At most ``max_pending`` records are held; beyond
+    that the oldest are dropped and counted.
+    """
+
+    def __init__(self, session_factory: Callable = AsyncSessionLocal,
+                 flush_interval_ms: int = ANOMALY_FLUSH_INTERVAL_MS,
+                 batch_size: int = ANOMALY_WRITE_BATCH_SIZE,
+                 max_pending: int = ANOMALY_MAX_PENDING):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.batch_size = batch_size
+
+        self._pending: Deque[Dict[str, Any]] = deque(maxlen=max_pending)
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called outside an event loop (scripts/tests): persist inline
+            asyncio.run(self._write([record]))
+            return
+
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(record)
+
+        if len(self._pending) >= self.batch_size:
+            if not self._tasks:
+                self._spawn_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._spawn_flush)
+
+    async def flush(self) -> int:
+        """
+        Persist every buffered record
+
+        Returns:
+            int: Number of records written
+        """
+        async with self._flush_lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+
+            written = 0
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                try:
+                    await self._write(batch)
+                except Exception as e:
+                    # Keep the batch for the next flush (oldest first)
+                    self._pending.extendleft(reversed(batch))
+                    logger.error("anomaly_logging_failed", error=str(e), pending=len(self._pending))
+                    break
+                written += len(batch)
+
+            self.written += written
+            return written
+
+    async def close(self) -> None:
+        """Flush remaining records and wait for in-flight flushes"""
+        await self.flush()
+        for task in list(self._tasks):
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _write(self, records: List[Dict[str, Any]]) -> None:
+        async with self.session_factory() as db:
+            db.add_all([
+                AnomalyEvent(
+                    timestamp=record["timestamp"],
+                    agent_id=record["agent_id"],
+                    severity=record["severity"],
+                    rule_triggered=record["rule"],
+                    details=json.dumps(record["details"])
+                )
+                for record in records
+            ])
+            await db.commit()
+
+    def _spawn_flush(self) -> None:
+        self._flush_handle = None
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
 class AnomalyDetectionService:
     """
     Security Intelligence Agent.
-    Monitors incoming transaction streams for testnet abuse, routing loops, 
+    Monitors incoming transaction streams for testnet abuse, routing loops,
     and velocity spikes. Flags offending agents for suspension.
+
+    Each wallet keeps a fixed-size sliding window (event-time ring, amount
+    ring with incremental mean/variance and a percentile sketch), so every
+    transaction is checked in O(1) and memory is bounded by ``max_wallets``.
     """
-    def __init__(self):
+    def __init__(self, max_wallets: int = ANOMALY_MAX_WALLETS,
+                 amount_window: int = ANOMALY_AMOUNT_WINDOW,
+                 writer: Optional[AnomalyWriter] = None,
+                 clock: Callable[[], float] = time.monotonic):
         # Configuration for Testnet rules
         self.max_tx_per_minute = 100
         self.max_corridor_switches_per_5m = 30
-        
-        # In-memory rapid sliding window for extreme spikes (avoid DB hits on DDOS)
-        self._velocity_cache: Dict[str, List[datetime]] = {}
+        self.amount_z_threshold = ANOMALY_Z_THRESHOLD
+        self.amount_min_samples = ANOMALY_MIN_SAMPLES
+
+        self.max_wallets = max_wallets
+        self.amount_window = amount_window
+        self.writer = writer or AnomalyWriter()
+        self._clock = clock
+
+        # Least recently active wallet first
+        self._windows: "OrderedDict[str, WalletWindow]" = OrderedDict()
 
     def analyze_transaction(self, agent_id: str, tx_req: TransactionRequest):
         """
         Synchronous non-blocking hook fired on every routing/payment attempt.
         """
-        now = datetime.utcnow()
-        
-        # 1. Update Velocity Cache
-        if agent_id not in self._velocity_cache:
-            self._velocity_cache[agent_id] = []
-            
-        # Prune old txs > 1 minute
-        self._velocity_cache[agent_id] = [t for t in self._velocity_cache[agent_id] if t > now - timedelta(minutes=1)]
-        self._velocity_cache[agent_id].append(now)
-
-        # 2. Check Rule: Velocity Spike
-        if len(self._velocity_cache[agent_id]) > self.max_tx_per_minute:
-            self._flag_anomaly(
+        now = self._clock()
+        window = self._window(agent_id)
+        amount = float(tx_req.amount)
+
+        # 1. Check Rule: Velocity Spike (more than max_tx_per_minute in 60s)
+        window.velocity.push(now)
+        if window.velocity.full_within(now, 60.0):
+            self._schedule_flag(
                 agent_id=agent_id,
                 severity="HIGH",
                 rule="VELOCITY_SPIKE",
                 details={
-                    "tx_count_1m": len(self._velocity_cache[agent_id]),
+                    "tx_count_1m": self.max_tx_per_minute + 1,
                     "threshold": self.max_tx_per_minute,
                     "target_corridor": f"{tx_req.from_currency}-{tx_req.to_currency}"
                 }
             )
 
-        # 3. Check Rule: Unnatural Micro-Transactions (dust spam)
-        if tx_req.amount > 0 and tx_req.amount < 0.01:
-             self._flag_anomaly(
+        # 2. Check Rule: Unnatural Micro-Transactions (dust spam)
+        if amount > 0 and amount < 0.01:
+            self._schedule_flag(
                 agent_id=agent_id,
                 severity="MEDIUM",
                 rule="DUST_SPAM",
                 details={
-                    "amount": float(tx_req.amount),
+                    "amount": amount,
                     "currency": tx_req.from_currency
                 }
             )
 
-    def _flag_anomaly(self, agent_id: str, severity: str, rule: str, details: Dict[str, Any]):
-        """Persists the detection and logs securely"""
-        db = SessionLocal()
-        try:
-            event = AnomalyEvent(
-                agent_id=agent_id,
-                severity=severity,
-                rule_triggered=rule,
-                details=json.dumps(details)
-            )
-            db.add(event)
-            db.commit()
-            
-            logger.warn(
-                "security_anomaly_detected",
-                agent_id=agent_id,
-                severity=severity,
-                rule=rule,
-                details=details
-            )
-            
-            # Action logic: If CRITICAL or multiple HIGHs, we would 
-            # ideally flip AgentCredential.is_active = False here.
-            
-        except Exception as e:
-            logger.error("anomaly_logging_failed", error=str(e))
-        finally:
-            db.close()
+        # 3. Check Rule: Amount far outside this wallet's recent distribution
+        stats = window.amounts
+        if stats.count >= self.amount_min_samples:
+            # Floor keeps very regular wallets from flagging small deviations
+            stddev = max(stats.stddev, 0.1 * abs(stats.mean))
+            z_score = (amount - stats.mean) / stddev if stddev > 0 else 0.0
+            if z_score > self.amount_z_threshold:
+                p99 = stats.sketch.quantile(0.99)
+                if amount > p99:
+                    self._schedule_flag(
+                        agent_id=agent_id,
+                        severity="MEDIUM",
+                        rule="AMOUNT_OUTLIER",
+                        details={
+                            "amount": amount,
+                            "currency": tx_req.from_currency,
+                            "window_mean": round(stats.mean, 6),
+                            "window_p99": round(p99, 6),
+                            "z_score": round(z_score, 2)
+                        }
+                    )
+        stats.push(amount)
+
+    @property
+    def tracked_wallets(self) -> int:
+        return len(self._windows)
+
+    def _window(self, agent_id: str) -> WalletWindow:
+        window = self._windows.get(agent_id)
+        if window is None:
+            window = WalletWindow(self.max_tx_per_minute, self.amount_window)
+            self._windows[agent_id] = window
+            if len(self._windows) > self.max_wallets:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(agent_id)
+        return window
+
+    def _schedule_flag(self, agent_id: str, severity: str, rule: str, details: Dict[str, Any]):
+        """Hands the detection to the batched writer so the hook never waits on the DB"""
+        logger.warn(
+            "security_anomaly_detected",
+            agent_id=agent_id,
+            severity=severity,
+            rule=rule,
+            details=details
+        )
+        # Action logic: If CRITICAL or multiple HIGHs, we would
+        # ideally flip AgentCredential.is_active = False here.
+        self.writer.submit({
+            "timestamp": datetime.utcnow(),
+            "agent_id": agent_id,
+            "severity": severity,
+            "rule": rule,
+            "details": details,
+        })
+
+    async def close(self) -> None:
+        """Persist any buffered anomalies (called on application shutdown)"""
+        await self.writer.close()
 
 anomaly_detector = AnomalyDetectionService()
@@ -3,8 +3,8 @@ import structlog
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
-from sqlalchemy.orm import Session
-from ..database import SessionLocal
+from sqlalchemy import func, select
+from ..database import AsyncSessionLocal
 from ..models import CorridorMetricsHistory, PaymentMemoryRecord
 from .market_context import market_context
 
@@ -20,22 +20,33 @@ class CorridorForecastingService:
         forecast the reliability of a routing corridor.
         Returns a confidence score between 0.0 and 1.0.
         """
-        db = SessionLocal()
         try:
             # 1. Fetch historical volatility
             # In production, this would use TimescaleDB continuous aggregates 
             # e.g., SELECT time_bucket('1 day', timestamp), stddev(avg_fee_pct)
-            metrics = db.query(CorridorMetricsHistory).filter(
-                CorridorMetricsHistory.corridor == corridor,
-                CorridorMetricsHistory.timestamp >= datetime.utcnow() - timedelta(days=self.lookback_days)
-            ).order_by(CorridorMetricsHistory.timestamp.desc()).limit(10).all()
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(CorridorMetricsHistory.avg_fee_pct).where(
+                        CorridorMetricsHistory.corridor == corridor,
+                        CorridorMetricsHistory.timestamp >= datetime.utcnow() - timedelta(days=self.lookback_days)
+                    ).order_by(CorridorMetricsHistory.timestamp.desc()).limit(10)
+                )
+                recent_fees = result.scalars().all()
+
+                recent_failures = await db.scalar(
+                    select(func.count()).select_from(PaymentMemoryRecord).where(
+                        PaymentMemoryRecord.corridor == corridor,
+                        PaymentMemoryRecord.success == False,
+                        PaymentMemoryRecord.timestamp >= datetime.utcnow() - timedelta(hours=2)
+                    )
+                ) or 0
 
             base_confidence = 0.95
             volatility_penalty = 0.0
             
-            if metrics:
+            if recent_fees:
                 # Mock ARIMA standard deviation penalty
-                fees = [m.avg_fee_pct for m in metrics if m.avg_fee_pct]
+                fees = [fee for fee in recent_fees if fee]
                 if len(fees) > 1:
                     mean = sum(fees) / len(fees)
                     variance = sum((f - mean) ** 2 for f in fees) / len(fees)
@@ -54,12 +65,6 @@ class CorridorForecastingService:
             # Stress penalty is geometric
             stress_penalty = stress_score * 0.2
 
-            recent_failures = db.query(PaymentMemoryRecord).filter(
-                PaymentMemoryRecord.corridor == corridor,
-                PaymentMemoryRecord.success == False,
-                PaymentMemoryRecord.timestamp >= datetime.utcnow() - timedelta(hours=2)
-            ).count()
-            
             # Additional penalty: -5% confidence for every failure in the last 2 hours
             memory_penalty = min(recent_failures * 0.05, 0.40)
 
@@ -96,7 +101,5 @@ class CorridorForecastingService:
                 "valid_until": (datetime.utcnow() + timedelta(minutes=5)).isoformat(),
                 "error": True
             }
-        finally:
-            db.close()
 
 corridor_forecaster = CorridorForecastingService()
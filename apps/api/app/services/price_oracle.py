@@ -10,19 +10,25 @@ Fallback chain:
   2. Upstream HTTP price feed (CoinGecko simple-price endpoint)
   3. Hardcoded defaults (last resort — clearly logged)
 
+``get_prices`` resolves every symbol with one MGET, fetches all misses in a
+single upstream batch (shared with concurrent callers asking for the same
+symbols) and writes the results back in one pipeline. TTLs are jittered so
+a dashboard's worth of prices does not expire in the same second.
+
 Usage::
 
     oracle = PriceOracle()
     apt_price = await oracle.get_price("APT")   # e.g. 10.25
-    eth_price = await oracle.get_price("ETH")
+    prices = await oracle.get_prices(["APT", "ETH", "SOL"])
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
-from typing import Dict, Optional
+import random
+from typing import Dict, Iterable, List, Optional, Protocol
 
 import httpx
 import redis.asyncio as aioredis
@@ -59,27 +65,104 @@ _COINGECKO_IDS: Dict[str, str] = {
 
 _REDIS_KEY_PREFIX = "price_oracle:usd:"
 _DEFAULT_TTL = int(os.getenv("PRICE_ORACLE_CACHE_TTL_SECONDS", "60"))
+# Each write expires within ±this fraction of the TTL
+_TTL_JITTER = float(os.getenv("PRICE_ORACLE_TTL_JITTER", "0.2"))
 _FALLBACK_ENABLED = os.getenv("PRICE_ORACLE_FALLBACK_ENABLED", "true").lower() == "true"
 _REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 _COINGECKO_BASE = "https://api.coingecko.com/api/v3"
 
 
+class PriceSource(Protocol):
+    """Upstream price feed: USD prices for as many of *symbols* as it knows."""
+
+    async def fetch(self, symbols: List[str]) -> Dict[str, float]:
+        ...
+
+
+class CoinGeckoPriceSource:
+    """CoinGecko simple-price endpoint (free tier); one HTTP call per batch."""
+
+    def __init__(self, base_url: str = _COINGECKO_BASE, timeout: float = 5) -> None:
+        self._base_url = base_url
+        self._timeout = timeout
+
+    async def fetch(self, symbols: List[str]) -> Dict[str, float]:
+        # MATIC and POL share an id; ask for it once
+        ids = sorted({_COINGECKO_IDS[s] for s in symbols if s in _COINGECKO_IDS})
+        if not ids:
+            return {}
+
+        try:
+            async with httpx.AsyncClient(timeout=self._timeout) as client:
+                resp = await client.get(
+                    f"{self._base_url}/simple/price",
+                    params={"ids": ",".join(ids), "vs_currencies": "usd"},
+                )
+                if resp.status_code != 200:
+                    logger.warning(
+                        "price_oracle: upstream returned HTTP %s", resp.status_code
+                    )
+                    return {}
+
+                data: Dict = resp.json()
+                result: Dict[str, float] = {}
+                for sym in symbols:
+                    cg_id = _COINGECKO_IDS.get(sym)
+                    if cg_id and cg_id in data:
+                        price = data[cg_id].get("usd")
+                        if price is not None:
+                            result[sym] = float(price)
+                return result
+
+        except Exception as exc:
+            logger.warning("price_oracle: upstream fetch failed (%s)", exc)
+            return {}
+
+
+class StaticPriceSource:
+    """
+    Local price source for tests and offline development.
+
+    Serves fixed prices and records every batch it was asked for in
+    ``calls``; an optional ``delay`` simulates upstream latency.
+    """
+
+    def __init__(self, prices: Dict[str, float], delay: float = 0.0) -> None:
+        self.prices = {sym.upper(): price for sym, price in prices.items()}
+        self.delay = delay
+        self.calls: List[List[str]] = []
+
+    async def fetch(self, symbols: List[str]) -> Dict[str, float]:
+        self.calls.append(list(symbols))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return {sym: self.prices[sym] for sym in symbols if sym in self.prices}
+
+
 class PriceOracle:
     """
     Redis-cached asset price oracle.
 
     Thread-safe for async use; a single shared instance is recommended
-    per process (see module-level ``get_oracle()``).
+    per process (see module-level ``get_oracle()``). Upstream fetches are
+    single-flight per symbol within the instance.
     """
 
     def __init__(
         self,
         redis_url: str = _REDIS_URL,
         cache_ttl: int = _DEFAULT_TTL,
+        source: Optional[PriceSource] = None,
+        redis_client: Optional[aioredis.Redis] = None,
+        ttl_jitter: float = _TTL_JITTER,
     ) -> None:
         self._redis_url = redis_url
         self._cache_ttl = cache_ttl
-        self._redis: Optional[aioredis.Redis] = None
+        self._ttl_jitter = ttl_jitter
+        self._source: PriceSource = source or CoinGeckoPriceSource()
+        self._redis: Optional[aioredis.Redis] = redis_client
+        # symbol -> upstream batch currently fetching it
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -92,62 +175,76 @@ class PriceOracle:
         Checks Redis first, then falls back to upstream, then hardcoded.
         """
         symbol = symbol.upper()
+        return (await self.get_prices([symbol]))[symbol]
 
-        # 1. Try Redis cache
-        cached = await self._get_cached(symbol)
-        if cached is not None:
-            return cached
-
-        # 2. Try upstream price feed
-        fetched = await self._fetch_upstream(symbol)
-        if fetched is not None:
-            await self._set_cached(symbol, fetched)
-            return fetched
-
-        # 3. Hardcoded fallback
-        if _FALLBACK_ENABLED and symbol in _FALLBACK_PRICES:
-            logger.warning(
-                "price_oracle: using hardcoded fallback price for %s = %s USD",
-                symbol,
-                _FALLBACK_PRICES[symbol],
-            )
-            return _FALLBACK_PRICES[symbol]
-
-        logger.error("price_oracle: no price available for %s", symbol)
-        return 0.0
-
-    async def get_prices(self, symbols: list[str]) -> Dict[str, float]:
-        """Return USD prices for all requested symbols in one call."""
-        result: Dict[str, float] = {}
-        # Batch fetch: first populate from cache, then fetch missing from upstream.
-        missing = []
-        for sym in symbols:
-            sym = sym.upper()
-            cached = await self._get_cached(sym)
-            if cached is not None:
-                result[sym] = cached
-            else:
-                missing.append(sym)
+    async def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """
+        Return USD prices for all requested symbols in one call.
+
+        One Redis MGET for the whole set, one upstream batch for the
+        misses (joined by concurrent callers), one pipelined write-back.
+        """
+        wanted = list(dict.fromkeys(sym.upper() for sym in symbols))
+        if not wanted:
+            return {}
 
+        result = await self._get_cached_many(wanted)
+        missing = [sym for sym in wanted if sym not in result]
         if missing:
-            upstream = await self._fetch_upstream_batch(missing)
-            for sym, price in upstream.items():
-                result[sym] = price
-                await self._set_cached(sym, price)
-
-            # Fallback for any still-missing symbols
-            for sym in missing:
-                if sym not in result:
-                    if _FALLBACK_ENABLED and sym in _FALLBACK_PRICES:
-                        logger.warning(
-                            "price_oracle: using hardcoded fallback price for %s", sym
-                        )
-                        result[sym] = _FALLBACK_PRICES[sym]
-                    else:
-                        result[sym] = 0.0
+            result.update(await self._fetch_single_flight(missing))
 
+        # Fallback for any still-missing symbols
+        for sym in missing:
+            if sym not in result:
+                if _FALLBACK_ENABLED and sym in _FALLBACK_PRICES:
+                    logger.warning(
+                        "price_oracle: using hardcoded fallback price for %s = %s USD",
+                        sym,
+                        _FALLBACK_PRICES[sym],
+                    )
+                    result[sym] = _FALLBACK_PRICES[sym]
+                else:
+                    logger.error("price_oracle: no price available for %s", sym)
+                    result[sym] = 0.0
+
+        return {sym: result[sym] for sym in wanted}
+
+    # ------------------------------------------------------------------
+    # Upstream coalescing
+    # ------------------------------------------------------------------
+
+    async def _fetch_single_flight(self, symbols: List[str]) -> Dict[str, float]:
+        batches = {id(f): f for f in (self._inflight.get(sym) for sym in symbols) if f is not None}
+        to_fetch = [sym for sym in symbols if sym not in self._inflight]
+
+        if to_fetch:
+            batch = asyncio.ensure_future(self._load_batch(to_fetch))
+            for sym in to_fetch:
+                self._inflight[sym] = batch
+            batch.add_done_callback(lambda done, syms=to_fetch: self._release(syms, done))
+            batches[id(batch)] = batch
+
+        result: Dict[str, float] = {}
+        for batch in batches.values():
+            # Shielded: a caller giving up must not cancel the batch for others
+            prices = await asyncio.shield(batch)
+            result.update({sym: prices[sym] for sym in symbols if sym in prices})
         return result
 
+    def _release(self, symbols: List[str], batch: asyncio.Future) -> None:
+        for sym in symbols:
+            if self._inflight.get(sym) is batch:
+                del self._inflight[sym]
+
+    async def _load_batch(self, symbols: List[str]) -> Dict[str, float]:
+        try:
+            prices = await self._source.fetch(symbols)
+        except Exception as exc:
+            logger.warning("price_oracle: upstream fetch failed (%s)", exc)
+            return {}
+        await self._set_cached_many(prices)
+        return prices
+
     # ------------------------------------------------------------------
     # Redis helpers
     # ------------------------------------------------------------------
@@ -168,64 +265,34 @@ class PriceOracle:
                 self._redis = None
         return self._redis
 
-    async def _get_cached(self, symbol: str) -> Optional[float]:
+    async def _get_cached_many(self, symbols: List[str]) -> Dict[str, float]:
         client = await self._redis_client()
         if client is None:
-            return None
+            return {}
         try:
-            val = await client.get(f"{_REDIS_KEY_PREFIX}{symbol}")
-            return float(val) if val is not None else None
+            values = await client.mget([f"{_REDIS_KEY_PREFIX}{sym}" for sym in symbols])
         except Exception as exc:
-            logger.debug("price_oracle: cache get failed (%s)", exc)
-            return None
+            logger.debug("price_oracle: cache mget failed (%s)", exc)
+            return {}
+        return {sym: float(val) for sym, val in zip(symbols, values) if val is not None}
 
-    async def _set_cached(self, symbol: str, price: float) -> None:
+    async def _set_cached_many(self, prices: Dict[str, float]) -> None:
+        if not prices:
+            return
         client = await self._redis_client()
         if client is None:
             return
         try:
-            await client.setex(f"{_REDIS_KEY_PREFIX}{symbol}", self._cache_ttl, str(price))
+            pipe = client.pipeline(transaction=False)
+            for sym, price in prices.items():
+                pipe.setex(f"{_REDIS_KEY_PREFIX}{sym}", self._jittered_ttl(), str(price))
+            await pipe.execute()
         except Exception as exc:
             logger.debug("price_oracle: cache set failed (%s)", exc)
 
-    # ------------------------------------------------------------------
-    # Upstream price feed (CoinGecko free tier)
-    # ------------------------------------------------------------------
-
-    async def _fetch_upstream(self, symbol: str) -> Optional[float]:
-        prices = await self._fetch_upstream_batch([symbol])
-        return prices.get(symbol)
-
-    async def _fetch_upstream_batch(self, symbols: list[str]) -> Dict[str, float]:
-        ids = [_COINGECKO_IDS.get(s) for s in symbols if _COINGECKO_IDS.get(s)]
-        if not ids:
-            return {}
-
-        try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                resp = await client.get(
-                    f"{_COINGECKO_BASE}/simple/price",
-                    params={"ids": ",".join(ids), "vs_currencies": "usd"},
-                )
-                if resp.status_code != 200:
-                    logger.warning(
-                        "price_oracle: upstream returned HTTP %s", resp.status_code
-                    )
-                    return {}
-
-                data: Dict = resp.json()
-                result: Dict[str, float] = {}
-                for sym in symbols:
-                    cg_id = _COINGECKO_IDS.get(sym)
-                    if cg_id and cg_id in data:
-                        price = data[cg_id].get("usd")
-                        if price is not None:
-                            result[sym] = float(price)
-                return result
-
-        except Exception as exc:
-            logger.warning("price_oracle: upstream fetch failed (%s)", exc)
-            return {}
+    def _jittered_ttl(self) -> int:
+        spread = self._cache_ttl * self._ttl_jitter
+        return max(1, round(self._cache_ttl + random.uniform(-spread, spread)))
 
 
 # ---------------------------------------------------------------------------
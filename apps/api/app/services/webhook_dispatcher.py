@@ -4,8 +4,10 @@ import httpx
 import structlog
 from datetime import datetime
 
+from sqlalchemy import select
+
 from applications.capp.capp.core.redis import get_redis_client
-from ..database import SessionLocal
+from ..database import AsyncSessionLocal
 from ..models import WebhookSubscription
 
 logger = structlog.get_logger(__name__)
@@ -52,19 +54,18 @@ class WebhookDispatcherService:
         corridor = event.get("corridor")
         
         # Load active subscriptions for this event type and corridor
-        db = SessionLocal()
-        try:
-            subs = db.query(WebhookSubscription).filter(
-                WebhookSubscription.event_type == event_type,
-                WebhookSubscription.corridor == corridor,
-                WebhookSubscription.is_active == True
-            ).all()
-            
-            for sub in subs:
-                await self.evaluate_and_dispatch(sub, event)
-                
-        finally:
-            db.close()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(WebhookSubscription).where(
+                    WebhookSubscription.event_type == event_type,
+                    WebhookSubscription.corridor == corridor,
+                    WebhookSubscription.is_active == True
+                )
+            )
+            subs = result.scalars().all()
+
+        for sub in subs:
+            await self.evaluate_and_dispatch(sub, event)
             
     async def evaluate_and_dispatch(self, sub: WebhookSubscription, event: dict):
         # 1. Evaluate thresholds
@@ -0,0 +1,98 @@
+"""
+Startup warm-up for API workers.
+
+Routers import heavy integrations (chain SDKs, LLM clients, the settlement
+agent) on first use so a worker can start serving quickly. At startup only
+the integrations named in ``API_FEATURES`` are touched: clients that must be
+configured before the first request are initialised, and the remaining
+modules are preloaded in a background thread so their first request does not
+pay the import cost either.
+"""
+
+import asyncio
+import importlib
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+
+from applications.capp.capp.config.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Feature:
+    modules: Tuple[str, ...]
+    init: Optional[str] = None   # "module:coroutine" awaited before serving
+
+
+FEATURES: Dict[str, Feature] = {
+    "aptos": Feature(
+        ("applications.capp.capp.core.aptos",),
+        init="applications.capp.capp.core.aptos:init_aptos_client",
+    ),
+    "polygon": Feature(
+        ("applications.capp.capp.core.polygon",),
+        init="applications.capp.capp.core.polygon:init_polygon_client",
+    ),
+    "starknet": Feature(("applications.capp.capp.core.starknet",)),
+    "solana": Feature(("applications.capp.capp.core.solana",)),
+    "stellar": Feature(("applications.capp.capp.core.stellar",)),
+    "settlement": Feature(("applications.capp.capp.agents.settlement.settlement_agent",)),
+    "market_analysis": Feature(("packages.intelligence.market.analyst",)),
+    "compliance_ai": Feature(("packages.intelligence.compliance.agent",)),
+    "gemini": Feature(("packages.intelligence.core.gemini_provider",)),
+}
+
+
+def enabled_features(spec: Optional[str] = None) -> List[str]:
+    """
+    Parse a comma-separated feature list (default: ``settings.API_FEATURES``).
+
+    Unknown names are logged and ignored.
+    """
+    spec = settings.API_FEATURES if spec is None else spec
+    features = []
+    for name in (part.strip().lower() for part in spec.split(",")):
+        if not name:
+            continue
+        if name not in FEATURES:
+            logger.warning("unknown_api_feature", feature=name)
+            continue
+        if name not in features:
+            features.append(name)
+    return features
+
+
+async def initialize(features: List[str]) -> None:
+    """Run the startup hooks of enabled features (e.g. chain clients)"""
+    for name in features:
+        hook = FEATURES[name].init
+        if hook is None:
+            continue
+        module_name, func_name = hook.split(":")
+        module = await asyncio.to_thread(importlib.import_module, module_name)
+        await getattr(module, func_name)()
+
+
+async def preload(features: List[str]) -> Dict[str, float]:
+    """
+    Import the modules of enabled features off the event loop.
+
+    Returns:
+        Import time in milliseconds per module; failures are logged and skipped
+    """
+    timings: Dict[str, float] = {}
+    for name in features:
+        for module_name in FEATURES[name].modules:
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(importlib.import_module, module_name)
+            except Exception as e:
+                logger.warning("warmup_import_failed", feature=name, module=module_name, error=str(e))
+                continue
+            timings[module_name] = (time.perf_counter() - started) * 1000
+    logger.info("warmup_complete", features=features, total_ms=round(sum(timings.values()), 1))
+    return timings
@@ -11,14 +11,29 @@ Core orchestration logic for payment processing, including:
 __version__ = "0.1.0"
 __author__ = "Canza Team"
 
-from .orchestration import PaymentOrchestrator
-from .consensus import ConsensusEngine
-from .agents import BaseAgent
-from .performance import MetricsCollector
+import importlib
 
 __all__ = [
     "PaymentOrchestrator",
     "ConsensusEngine", 
     "BaseAgent",
     "MetricsCollector",
-] 
\ No newline at end of file
+]
+
+# Loaded on first access so standalone submodules (e.g. the quantile sketch)
+# import without pulling in the whole agent / orchestration stack
+_LAZY = {
+    "PaymentOrchestrator": ".orchestration",
+    "ConsensusEngine": ".consensus",
+    "BaseAgent": ".agents",
+    "MetricsCollector": ".performance",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -5,28 +5,7 @@ Financial agents for payment processing, optimization, and compliance.
 Includes reusable agent templates that extract proven logic from CAPP.
 """
 
-from .base import BaseFinancialAgent, AgentConfig
-from .financial_base import FinancialTransaction, TransactionResult
-from .agent_factory import AgentFactory
-from .agent_registry import AgentRegistry
-
-# Agent Templates
-from .templates import (
-    PaymentOptimizerAgent,
-    PaymentOptimizerConfig,
-    OptimizationStrategy,
-    RouteType,
-    RouteScore,
-    OptimizationResult,
-    ComplianceCheckerAgent,
-    ComplianceCheckerConfig,
-    ComplianceLevel,
-    CheckType,
-    ComplianceCheck,
-    ComplianceResult,
-    SanctionsResult,
-    RegulatoryReport
-)
+import importlib
 
 __all__ = [
     # Base classes
@@ -54,4 +33,25 @@ __all__ = [
     "ComplianceResult",
     "SanctionsResult",
     "RegulatoryReport",
-] 
\ No newline at end of file
+]
+
+# Loaded on first access: importing ``packages.core.agents.base`` (as the
+# consensus, orchestration and performance modules do) must not pull in
+# every template, which in turn import back into this package
+_LAZY = {
+    "BaseFinancialAgent": ".base",
+    "AgentConfig": ".base",
+    "FinancialTransaction": ".financial_base",
+    "TransactionResult": ".financial_base",
+    "AgentFactory": ".agent_factory",
+    "AgentRegistry": ".agent_registry",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name, ".templates" if name in __all__ else None)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
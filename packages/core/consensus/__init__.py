@@ -5,11 +5,14 @@ Handles multi-agent consensus mechanisms for payment decisions.
 """
 
 from .consensus_engine import ConsensusEngine
-from .voting import VotingMechanism
+from .voting import VotingEngine
 from .agreement import AgreementProtocol
+from .fanout import RoundStats, fan_out
 
 __all__ = [
     "ConsensusEngine",
-    "VotingMechanism",
+    "VotingEngine",
     "AgreementProtocol",
+    "RoundStats",
+    "fan_out",
 ] 
\ No newline at end of file
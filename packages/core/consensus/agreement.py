@@ -7,7 +7,7 @@ in distributed financial processing systems.
 
 import asyncio
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Set
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Sequence, Union, Set
 from enum import Enum
 import uuid
 
@@ -15,6 +15,10 @@ import structlog
 from pydantic import BaseModel, Field
 
 from packages.core.agents.base import ProcessingResult
+from .fanout import fan_out
+
+# Delivers a message to one participant and returns its reply (None for no reply)
+Transport = Callable[[str, "AgreementMessage"], Awaitable[Optional["AgreementMessage"]]]
 
 logger = structlog.get_logger(__name__)
 
@@ -60,6 +64,7 @@ class AgreementSession(BaseModel):
     coordinator_id: str
     participant_ids: List[str]
     timeout: float = 30.0
+    participant_timeouts: Dict[str, float] = Field(default_factory=dict)
     retry_attempts: int = 3
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
@@ -102,10 +107,13 @@ class AgreementEngine:
     multiple agents in distributed decision-making processes.
     """
     
-    def __init__(self):
+    def __init__(self, transport: Optional[Transport] = None):
         self.logger = structlog.get_logger(__name__)
         self.active_sessions: Dict[str, AgreementState] = {}
         self.completed_sessions: Dict[str, AgreementResult] = {}
+        # Without a transport, participants reply via receive_agreement_message
+        self.transport = transport
+        self._session_configs: Dict[str, AgreementSession] = {}
         
     async def start_agreement_session(self, session_config: AgreementSession) -> str:
         """
@@ -133,6 +141,7 @@ class AgreementEngine:
         )
         
         self.active_sessions[session_id] = state
+        self._session_configs[session_id] = session_config
         
         self.logger.info(
             "Agreement session started",
@@ -324,16 +333,78 @@ class AgreementEngine:
         """Send message to all participants in a session"""
         state = self.active_sessions[session_id]
         
-        for participant_id in state.participants.keys():
-            # In a real implementation, this would send the message to the participant
-            # For now, we'll simulate the message sending
-            self.logger.debug(
-                "Sending message to participant",
-                session_id=session_id,
-                participant_id=participant_id,
-                message_id=message.message_id,
-                phase=message.phase
-            )
+        if self.transport is None:
+            for participant_id in state.participants.keys():
+                # Simulated delivery; replies arrive through receive_agreement_message
+                self.logger.debug(
+                    "Sending message to participant",
+                    session_id=session_id,
+                    participant_id=participant_id,
+                    message_id=message.message_id,
+                    phase=message.phase
+                )
+            return
+        
+        await self._run_round(session_id, message)
+    
+    async def _run_round(self, session_id: str, message: AgreementMessage) -> None:
+        """
+        Deliver one phase to all participants concurrently
+        
+        The round ends once the phase has its quorum of acknowledgements or
+        can no longer reach it; outstanding deliveries are then cancelled.
+        Replies are processed in arrival order, which may start the next phase.
+        """
+        state = self.active_sessions[session_id]
+        config = self._session_configs[session_id]
+        quorum = self._phase_quorum(state)
+        participant_ids = list(state.participants.keys())
+        
+        def deliver(participant_id: str):
+            return lambda: self.transport(participant_id, message)
+        
+        def is_decided(replies: Dict[str, Optional[AgreementMessage]], pending: Sequence[str]) -> bool:
+            acks = sum(1 for reply in replies.values() if reply is not None and reply.phase != AgreementPhase.ABORT)
+            return acks >= quorum or acks + len(pending) < quorum
+        
+        replies, stats = await fan_out(
+            {participant_id: deliver(participant_id) for participant_id in participant_ids},
+            is_decided=is_decided,
+            timeout=config.timeout,
+            deadlines=config.participant_timeouts,
+        )
+        state.metadata.setdefault("rounds", []).append({"phase": message.phase.value, **stats.dict()})
+        
+        self.logger.info(
+            "Agreement round finished",
+            session_id=session_id,
+            phase=message.phase,
+            duration=stats.duration,
+            decided_early=stats.decided_early,
+            slow_participants=stats.slow
+        )
+        
+        acks = [reply for reply in replies.values() if reply is not None and reply.phase != AgreementPhase.ABORT]
+        if len(acks) < quorum:
+            await self._complete_agreement_session(session_id, False)
+            return
+        
+        for reply in acks:
+            if session_id not in self.active_sessions:
+                break
+            await self.receive_agreement_message(session_id, reply)
+    
+    def _phase_quorum(self, state: AgreementState) -> int:
+        """Acknowledgements a phase needs before the protocol can move on"""
+        participants = len(state.participants)
+        if state.protocol in (AgreementProtocol.TWO_PHASE_COMMIT, AgreementProtocol.THREE_PHASE_COMMIT):
+            return participants
+        if state.protocol in (AgreementProtocol.PAXOS, AgreementProtocol.RAFT):
+            return participants // 2 + 1
+        if state.protocol == AgreementProtocol.BYZANTINE_FAULT_TOLERANT:
+            return participants - (participants - 1) // 3
+        # Eventual consistency: the first acknowledgement is enough
+        return min(1, participants)
     
     async def receive_agreement_message(self, session_id: str, message: AgreementMessage) -> bool:
         """
@@ -426,7 +497,7 @@ class AgreementEngine:
             # Phase 1b: Prepare response
             # Check if majority has responded
             prepare_acks = [m for m in state.messages if m.phase == AgreementPhase.PREPARE_ACK]
-            if len(prepare_acks) >= (len(state.participants) // 2) + 1:
+            if state.phase == AgreementPhase.PREPARE and len(prepare_acks) >= (len(state.participants) // 2) + 1:
                 # Move to accept phase
                 state.phase = AgreementPhase.COMMIT
                 
@@ -474,11 +545,13 @@ class AgreementEngine:
             participants_agreed=sum(state.participants.values()),
             total_participants=len(state.participants),
             processing_time=processing_time,
-            final_decision="commit" if successful else "abort"
+            final_decision="commit" if successful else "abort",
+            metadata={"rounds": state.metadata.get("rounds", [])}
         )
         
         self.completed_sessions[session_id] = result
         del self.active_sessions[session_id]
+        self._session_configs.pop(session_id, None)
         
         self.logger.info(
             "Agreement session completed",
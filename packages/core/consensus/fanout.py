@@ -0,0 +1,118 @@
+"""
+Concurrent fan-out for consensus rounds
+
+Calls every participant at once, each under its own deadline, and ends the
+round as soon as the caller's decision check says the outcome can no longer
+change. Participants still running at that point are cancelled. Round
+latency therefore tracks the k-th fastest response rather than the sum (or
+the slowest) of all of them.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+import structlog
+from pydantic import BaseModel, Field
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Called with the responses so far (in arrival order) and the ids still running
+DecisionCheck = Callable[[Dict[str, T], Sequence[str]], bool]
+
+
+class RoundStats(BaseModel):
+    """Timing of one fan-out round"""
+    duration: float = 0.0
+    decided_early: bool = False
+    latencies: Dict[str, float] = Field(default_factory=dict)  # responders only
+    timed_out: List[str] = Field(default_factory=list)
+    failed: List[str] = Field(default_factory=list)
+    cancelled: List[str] = Field(default_factory=list)
+
+    @property
+    def slow(self) -> List[str]:
+        """Participants that missed their deadline or were cut off by an early decision"""
+        return self.timed_out + self.cancelled
+
+
+async def fan_out(
+    participants: Mapping[str, Callable[[], Awaitable[T]]],
+    is_decided: Optional[DecisionCheck] = None,
+    timeout: float = 30.0,
+    deadlines: Optional[Mapping[str, float]] = None,
+) -> Tuple[Dict[str, T], RoundStats]:
+    """
+    Run one round across all participants concurrently.
+
+    Args:
+        participants: Participant id -> zero-argument coroutine factory
+        is_decided: Checked after each response; True ends the round
+        timeout: Default per-participant deadline in seconds
+        deadlines: Per-participant overrides of ``timeout``
+
+    Returns:
+        Tuple of responses by participant id (arrival order) and round stats.
+        Participants that time out or raise are left out of the responses.
+    """
+    stats = RoundStats()
+    responses: Dict[str, T] = {}
+    started = time.perf_counter()
+
+    tasks: Dict[asyncio.Task, str] = {}
+    for participant_id, call in participants.items():
+        deadline = (deadlines or {}).get(participant_id, timeout)
+        tasks[asyncio.ensure_future(asyncio.wait_for(call(), deadline))] = participant_id
+
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                participant_id = tasks[task]
+                try:
+                    responses[participant_id] = task.result()
+                    stats.latencies[participant_id] = time.perf_counter() - started
+                except asyncio.TimeoutError:
+                    stats.timed_out.append(participant_id)
+                except Exception as e:
+                    stats.failed.append(participant_id)
+                    logger.warning("Participant failed", participant_id=participant_id, error=str(e))
+
+            if pending and is_decided is not None and is_decided(responses, [tasks[t] for t in pending]):
+                stats.decided_early = True
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+            stats.cancelled.append(tasks[task])
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    stats.duration = time.perf_counter() - started
+    return responses, stats
+
+
+def weighted_quorum_decided(
+    yes: float,
+    no: float,
+    pending: float,
+    threshold: float,
+) -> bool:
+    """
+    Whether a two-sided weighted vote is settled whatever the pending weight does.
+
+    The winner is the larger side and consensus needs ``winner / total >=
+    threshold``, with ``total = yes + no + pending``. The round is decided
+    once one side has reached the threshold outright and cannot be
+    overtaken, or once neither side can reach it even with all pending weight.
+    """
+    total = yes + no + pending
+    if total <= 0:
+        return False
+    for leader, other in ((yes, no), (no, yes)):
+        if leader / total >= threshold and leader > other + pending:
+            return True
+    return max(yes, no) + pending < threshold * total
@@ -6,8 +6,9 @@ in financial processing workflows.
 """
 
 import asyncio
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Union
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Any, Sequence, Union
 from enum import Enum
 import statistics
 
@@ -15,6 +16,7 @@ import structlog
 from pydantic import BaseModel, Field
 
 from packages.core.agents.base import ProcessingResult
+from .fanout import RoundStats, fan_out, weighted_quorum_decided
 
 
 logger = structlog.get_logger(__name__)
@@ -45,6 +47,9 @@ class ConsensusConfig(BaseModel):
     success_threshold: float = 0.8
     failure_threshold: float = 0.2
 
+    # Per-agent deadlines for collect_consensus (default: timeout)
+    agent_timeouts: Dict[str, float] = Field(default_factory=dict)
+
 
 class ConsensusResult(BaseModel):
     """Result of consensus mechanism"""
@@ -68,9 +73,75 @@ class ConsensusEngine:
     def __init__(self, config: ConsensusConfig):
         self.config = config
         self.logger = structlog.get_logger(__name__)
+        self.round_history: Deque[RoundStats] = deque(maxlen=100)
         
         self.logger.info("Consensus engine initialized", config=config.dict())
     
+    async def collect_consensus(
+        self,
+        agents: Dict[str, Callable[[], Awaitable[ProcessingResult]]],
+    ) -> ProcessingResult:
+        """
+        Ask all agents concurrently and reach consensus on their results
+        
+        The round ends as soon as the outcome is decided (consensus certain
+        or unreachable); agents still running are cancelled, and agents
+        missing their deadline are left out.
+        
+        Args:
+            agents: Agent id -> coroutine factory producing its result
+            
+        Returns:
+            ProcessingResult: The consensus result
+        """
+        responses, stats = await fan_out(
+            agents,
+            is_decided=self._is_decided,
+            timeout=self.config.timeout,
+            deadlines=self.config.agent_timeouts,
+        )
+        self.round_history.append(stats)
+        self.logger.info(
+            "Consensus round finished",
+            duration=stats.duration,
+            responses=len(responses),
+            decided_early=stats.decided_early,
+            slow_agents=stats.slow,
+            failed_agents=stats.failed
+        )
+        
+        for agent_id, result in responses.items():
+            result.metadata = {**(result.metadata or {}), "agent_id": agent_id}
+        return await self.reach_consensus(list(responses.values()))
+    
+    def _is_decided(self, responses: Dict[str, ProcessingResult], pending: Sequence[str]) -> bool:
+        """Whether the consensus outcome is settled whatever the pending agents return"""
+        if len(responses) < self.config.min_agents:
+            return False
+        
+        consensus_type = self.config.consensus_type
+        if consensus_type == ConsensusType.UNANIMOUS:
+            # One dissent makes unanimity unreachable; agreement needs everyone
+            return len({r.success for r in responses.values()}) > 1
+        
+        weights = self.config.agent_weights if consensus_type == ConsensusType.WEIGHTED else {}
+        yes = sum(weights.get(agent_id, 1.0) for agent_id, r in responses.items() if r.success)
+        no = sum(weights.get(agent_id, 1.0) for agent_id, r in responses.items() if not r.success)
+        open_weight = sum(weights.get(agent_id, 1.0) for agent_id in pending)
+        
+        if consensus_type in (ConsensusType.MAJORITY, ConsensusType.WEIGHTED):
+            return weighted_quorum_decided(yes, no, open_weight, self.config.threshold)
+        if consensus_type == ConsensusType.THRESHOLD:
+            total = yes + no + open_weight
+            needed = self.config.success_threshold * total
+            return (
+                yes >= needed
+                or (no >= needed and yes + open_weight < needed)
+                or max(yes, no) + open_weight < needed
+            )
+        # MEDIAN / AVERAGE depend on every result
+        return False
+    
     async def reach_consensus(self, results: List[ProcessingResult]) -> ProcessingResult:
         """
         Reach consensus among multiple agent results
@@ -203,7 +274,7 @@ class ConsensusEngine:
             
             for result in results:
                 # Get agent weight (default to 1.0 if not specified)
-                agent_id = getattr(result, 'agent_id', 'default')
+                agent_id = getattr(result, 'agent_id', None) or (result.metadata or {}).get('agent_id', 'default')
                 weight = self.config.agent_weights.get(agent_id, 1.0)
                 
                 if result.success:
@@ -404,13 +475,23 @@ class ConsensusEngine:
     async def get_consensus_metrics(self) -> Dict[str, Any]:
         """Get consensus engine metrics"""
         try:
+            rounds = list(self.round_history)
+            slow_counts: Dict[str, int] = {}
+            for stats in rounds:
+                for agent_id in stats.slow:
+                    slow_counts[agent_id] = slow_counts.get(agent_id, 0) + 1
+            
             return {
                 "consensus_type": self.config.consensus_type,
                 "threshold": self.config.threshold,
                 "timeout": self.config.timeout,
                 "min_agents": self.config.min_agents,
                 "max_agents": self.config.max_agents,
-                "agent_weights": self.config.agent_weights
+                "agent_weights": self.config.agent_weights,
+                "rounds": len(rounds),
+                "average_round_duration": statistics.mean(r.duration for r in rounds) if rounds else 0.0,
+                "early_decisions": sum(1 for r in rounds if r.decided_early),
+                "slow_agents": slow_counts
             }
         except Exception as e:
             self.logger.error("Failed to get consensus metrics", error=str(e))
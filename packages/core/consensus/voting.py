@@ -7,7 +7,7 @@ in financial processing workflows.
 
 import asyncio
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Union
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Sequence, Union
 from enum import Enum
 import statistics
 
@@ -15,6 +15,7 @@ import structlog
 from pydantic import BaseModel, Field
 
 from packages.core.agents.base import ProcessingResult
+from .fanout import RoundStats, fan_out
 
 logger = structlog.get_logger(__name__)
 
@@ -75,6 +76,7 @@ class VotingEngine:
         self.logger = structlog.get_logger(__name__)
         self.active_sessions: Dict[str, VotingSession] = {}
         self.vote_history: Dict[str, List[Vote]] = {}
+        self.round_history: Dict[str, RoundStats] = {}
         
     async def create_voting_session(self, session_config: VotingSession) -> str:
         """
@@ -134,6 +136,73 @@ class VotingEngine:
         
         return True
     
+    async def collect_votes(
+        self,
+        session_id: str,
+        voters: Dict[str, Callable[[], Awaitable[Vote]]],
+        deadlines: Optional[Dict[str, float]] = None,
+    ) -> Optional[VotingResult]:
+        """
+        Ask all voters concurrently and tally the session
+        
+        Each voter gets the session timeout (or its entry in ``deadlines``).
+        Voting stops as soon as the result can no longer change; votes
+        still outstanding are cancelled.
+        
+        Args:
+            session_id: ID of the voting session
+            voters: Agent id -> coroutine factory producing its vote
+            deadlines: Per-voter deadline overrides in seconds
+            
+        Returns:
+            VotingResult: Result of the voting session, with round timing
+            under ``metadata["round"]``
+        """
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            self.logger.error("Voting session not found", session_id=session_id)
+            return None
+        
+        def is_decided(votes: Dict[str, Vote], pending: Sequence[str]) -> bool:
+            return self._is_decided(session, list(votes.values()), len(pending))
+        
+        votes, stats = await fan_out(voters, is_decided=is_decided, timeout=session.timeout, deadlines=deadlines)
+        for vote in votes.values():
+            await self.cast_vote(session_id, vote)
+        self.round_history[session_id] = stats
+        
+        self.logger.info(
+            "Voting round finished",
+            session_id=session_id,
+            duration=stats.duration,
+            votes=len(votes),
+            decided_early=stats.decided_early,
+            slow_voters=stats.slow
+        )
+        
+        result = await self.get_voting_result(session_id)
+        result.metadata["round"] = stats.dict()
+        return result
+    
+    def _is_decided(self, session: VotingSession, votes: List[Vote], pending: int) -> bool:
+        """Whether the voting result is settled whatever the pending votes are"""
+        if len(votes) < session.min_votes:
+            return False
+        
+        if session.strategy == VotingStrategy.UNANIMOUS:
+            return any(vote.vote_value is not True for vote in votes)
+        
+        if session.strategy in (VotingStrategy.SIMPLE_MAJORITY, VotingStrategy.SUPER_MAJORITY):
+            threshold = session.threshold
+            if session.strategy == VotingStrategy.SUPER_MAJORITY:
+                threshold = max(session.threshold, 0.67)
+            needed = threshold * (len(votes) + pending)
+            true_votes = sum(1 for vote in votes if vote.vote_value is True)
+            return true_votes >= needed or true_votes + pending < needed
+        
+        # Weighted (confidence-scaled), ranked and approval tallies need every vote
+        return False
+    
     async def get_voting_result(self, session_id: str) -> Optional[VotingResult]:
         """
         Get the result of a voting session
@@ -16,7 +16,7 @@ from pydantic import BaseModel, Field
 
 from packages.core.agents.base import BaseFinancialAgent, AgentRegistry, ProcessingResult
 from packages.core.agents.financial_base import FinancialTransaction, FinancialProcessingResult
-from packages.core.consensus.mechanisms import ConsensusEngine
+from packages.core.consensus.mechanisms import ConsensusConfig, ConsensusEngine
 from packages.core.orchestration.coordinator import AgentCoordinator
 from packages.core.orchestration.task_manager import TaskManager
 from packages.core.performance.tracker import PerformanceTracker
@@ -106,10 +106,10 @@ class FinancialOrchestrator:
         
         # Core components
         self.agent_registry = AgentRegistry()
-        self.consensus_engine = ConsensusEngine(
+        self.consensus_engine = ConsensusEngine(ConsensusConfig(
             threshold=config.consensus_threshold,
             timeout=config.consensus_timeout
-        )
+        ))
         self.coordinator = AgentCoordinator(self.agent_registry)
         self.task_manager = TaskManager(
             max_concurrent=config.max_concurrent_transactions
@@ -432,28 +432,15 @@ class FinancialOrchestrator:
     ) -> ProcessingResult:
         """Execute a step with multiple agents using consensus"""
         try:
-            # Create tasks for all agents
-            tasks = []
-            for agent in agents:
-                task = agent.process_transaction_with_retry(transaction)
-                tasks.append(task)
-            
-            # Execute all agents
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results
-            valid_results = []
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    self.logger.warning(
-                        "Agent execution failed",
-                        agent_id=agents[i].agent_id,
-                        error=str(result)
-                    )
-                else:
-                    valid_results.append(result)
-            
-            if not valid_results:
+            # Agents run concurrently; the round ends once the outcome is decided
+            calls = {
+                agent.agent_id: (lambda agent=agent: agent.process_transaction_with_retry(transaction))
+                for agent in agents
+            }
+            consensus_result = await self.consensus_engine.collect_consensus(calls)
+            
+            last_round = self.consensus_engine.round_history[-1]
+            if len(last_round.failed) + len(last_round.timed_out) == len(calls):
                 return ProcessingResult(
                     success=False,
                     transaction_id=transaction.id,
@@ -462,9 +449,6 @@ class FinancialOrchestrator:
                     error_code="ALL_AGENTS_FAILED"
                 )
             
-            # Apply consensus
-            consensus_result = await self.consensus_engine.reach_consensus(valid_results)
-            
             return consensus_result
             
         except Exception as e:
@@ -20,12 +20,27 @@ The watchdog requires:
   1. A ``PaymentWorkflowOrchestrator`` instance (for rollback_payment).
   2. An async SQLAlchemy session factory (``AsyncSessionLocal`` from
      ``applications.capp.capp.core.database``).
+
+Optionally pass a ``SettlementDeadlineIndex`` (Redis sorted set of
+settlement deadlines maintained by ``StatusManager``); cycles then only
+read the payments that are actually due, with a full table scan every
+``full_scan_every`` cycles as a safety net.
+
+Scaling
+-------
+Full scans page through the ``idx_payments_settling_settled_at`` partial
+index by (settled_at, id) keyset, selecting only the columns a refund
+needs. Each page is refunded concurrently (at most
+``max_concurrent_refunds`` at once) and each outcome is written back as
+soon as its rollback finishes, so a failed write never leaves already
+compensated payments waiting to be compensated again.
 """
 
 import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
 
 import structlog
 
@@ -44,6 +59,9 @@ logger = structlog.get_logger(__name__)
 
 WATCHDOG_INTERVAL_SECONDS: int = 300          # 5 minutes
 SETTLING_TIMEOUT_MINUTES: int = 30            # payments stuck longer than this get refunded
+WATCHDOG_PAGE_SIZE: int = 500                 # stuck payments loaded per query
+MAX_CONCURRENT_REFUNDS: int = 20              # rollbacks in flight at once
+FULL_SCAN_EVERY: int = 12                     # with a deadline index, full scan every N cycles
 
 # Steps that are guaranteed to have been completed before a payment reaches
 # SETTLING — rolled back in reverse order by rollback_payment().
@@ -92,6 +110,10 @@ class PaymentWatchdog:
         db_session_factory: Callable,
         interval_seconds: int = WATCHDOG_INTERVAL_SECONDS,
         settling_timeout_minutes: int = SETTLING_TIMEOUT_MINUTES,
+        page_size: int = WATCHDOG_PAGE_SIZE,
+        max_concurrent_refunds: int = MAX_CONCURRENT_REFUNDS,
+        deadline_index: Optional[Any] = None,
+        full_scan_every: int = FULL_SCAN_EVERY,
     ) -> None:
         """
         Args:
@@ -102,15 +124,26 @@ class PaymentWatchdog:
             interval_seconds:        Seconds to sleep between scans.
             settling_timeout_minutes: Payments in SETTLING older than this
                                      many minutes are treated as stuck.
+            page_size:               Stuck payments loaded and refunded per page.
+            max_concurrent_refunds:  Upper bound on rollbacks running at once.
+            deadline_index:          Optional ``SettlementDeadlineIndex``; when
+                                     given, cycles only touch due payments.
+            full_scan_every:         With a deadline index, run a full table
+                                     scan every this many cycles anyway.
         """
         self.orchestrator = orchestrator
         self.db_session_factory = db_session_factory
         self.interval_seconds = interval_seconds
         self.settling_timeout_minutes = settling_timeout_minutes
+        self.page_size = page_size
+        self.max_concurrent_refunds = max_concurrent_refunds
+        self.deadline_index = deadline_index
+        self.full_scan_every = full_scan_every
         self.logger = structlog.get_logger(__name__)
 
         self._running: bool = False
         self._task: Optional[asyncio.Task] = None
+        self._cycles: int = 0
 
     # ------------------------------------------------------------------
     # Public lifecycle API
@@ -141,13 +174,13 @@ class PaymentWatchdog:
                 pass
         self.logger.info("PaymentWatchdog stopped")
 
-    async def run_once(self) -> None:
+    async def run_once(self) -> Dict[str, int]:
         """
         Trigger a single scan-and-refund cycle synchronously.
 
         Useful for one-shot cron invocations or integration tests.
         """
-        await self._scan_and_refund()
+        return await self._scan_and_refund()
 
     # ------------------------------------------------------------------
     # Internal loop
@@ -171,63 +204,139 @@ class PaymentWatchdog:
     # Scan helpers
     # ------------------------------------------------------------------
 
-    async def _scan_and_refund(self) -> None:
+    async def _scan_and_refund(self) -> Dict[str, int]:
         """
         1. Calculate the cutoff timestamp (now − settling_timeout_minutes).
-        2. Query for payments with status='settling' older than the cutoff.
-        3. Attempt a refund for each stuck payment.
+        2. Page through payments with status='settling' older than the cutoff
+           (from the deadline index when available, else the partial index).
+        3. Refund each page concurrently, saving each outcome as it completes.
+
+        Returns:
+            Counts of ``found``, ``refunded`` and ``refund_failed`` payments.
         """
         cutoff = datetime.now(timezone.utc) - timedelta(minutes=self.settling_timeout_minutes)
+        use_index = self.deadline_index is not None and self._cycles % max(1, self.full_scan_every) != 0
+        self._cycles += 1
 
         self.logger.info(
             "Watchdog scanning for stuck payments",
             cutoff=cutoff.isoformat(),
             target_status="settling",
+            source="deadline_index" if use_index else "table_scan",
         )
 
-        stuck_payments = await self._find_stuck_payments(cutoff)
+        totals = {"found": 0, "refunded": 0, "refund_failed": 0}
+        if use_index:
+            await self._refund_due(cutoff, totals)
+        else:
+            await self._refund_scan(cutoff, totals)
 
-        if not stuck_payments:
+        if not totals["found"]:
             self.logger.info("Watchdog scan complete: no stuck payments found")
-            return
-
-        self.logger.warning(
-            "Stuck payments detected — initiating refunds",
-            count=len(stuck_payments),
-            payment_ids=[p.payment_id for p in stuck_payments],
-        )
-
-        for stuck in stuck_payments:
-            try:
-                await self._refund_stuck_payment(stuck)
-            except Exception as exc:
-                self.logger.error(
-                    "Failed to process refund for stuck payment",
-                    payment_id=stuck.payment_id,
-                    error=str(exc),
-                    exc_info=True,
-                )
+        else:
+            self.logger.warning("Watchdog scan complete: stuck payments processed", **totals)
+        return totals
+
+    async def _refund_scan(self, cutoff: datetime, totals: Dict[str, int]) -> None:
+        """Keyset-page through every stuck payment on (settled_at, id)."""
+        after: Optional[Tuple[datetime, str]] = None
+        while True:
+            page = await self._find_stuck_payments(cutoff, after=after, limit=self.page_size)
+            if not page:
+                return
+            await self._refund_page(page, totals)
+            if len(page) < self.page_size:
+                return
+            after = (page[-1].settled_at, page[-1].payment_id)
+
+    async def _refund_due(self, cutoff: datetime, totals: Dict[str, int]) -> None:
+        """
+        Page through the deadline index.
 
-    async def _find_stuck_payments(self, cutoff: datetime) -> List[StuckPayment]:
+        Resolved payments leave the index, so each page starts after only
+        the entries this cycle could not resolve.
+        """
+        unresolved = 0
+        while True:
+            payment_ids = await self.deadline_index.due(offset=unresolved, limit=self.page_size)
+            if not payment_ids:
+                return
+
+            valid_ids = []
+            for pid in payment_ids:
+                try:
+                    UUID(pid)
+                except (TypeError, ValueError):
+                    self.logger.warning("Dropping malformed payment id from deadline index", payment_id=pid)
+                    await self.deadline_index.clear(pid)
+                else:
+                    valid_ids.append(pid)
+
+            page = await self._find_stuck_payments(cutoff, payment_ids=valid_ids) if valid_ids else []
+            if page is None:
+                # Query failed: keep every entry for the next cycle
+                return
+            found = {stuck.payment_id for stuck in page}
+            # Entries whose payment already left 'settling' are stale
+            stale = [pid for pid in valid_ids if pid not in found]
+            if stale:
+                await self.deadline_index.clear(*stale)
+
+            if page:
+                unresolved += await self._refund_page(page, totals)
+            if len(payment_ids) < self.page_size:
+                return
+
+    async def _find_stuck_payments(
+        self,
+        cutoff: datetime,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: Optional[int] = None,
+        payment_ids: Optional[List[str]] = None,
+    ) -> Optional[List[StuckPayment]]:
         """
         Query the database for payments with:
           - status  = 'settling'
           - settled_at <= cutoff   (has been settling for too long)
 
-        Returns an empty list if the DB is unreachable or the query fails.
+        Only the columns a refund needs are selected. Results are ordered by
+        (settled_at, id) and start after the ``after`` keyset when given;
+        ``payment_ids`` restricts the query to those payments.
+
+        Returns None if the DB is unreachable or the query fails.
         """
-        from sqlalchemy import select
+        from sqlalchemy import literal, select, tuple_
         from applications.capp.capp.core.database import Payment
 
         try:
-            async with self.db_session_factory() as session:
-                stmt = (
-                    select(Payment)
-                    .where(Payment.status == "settling")
-                    .where(Payment.settled_at <= cutoff)
+            stmt = (
+                select(
+                    Payment.id,
+                    Payment.settled_at,
+                    Payment.reference_id,
+                    Payment.amount,
+                    Payment.from_currency,
+                    Payment.to_currency,
+                    Payment.status,
                 )
+                .where(Payment.status == "settling")
+                .where(Payment.settled_at <= cutoff)
+                .order_by(Payment.settled_at, Payment.id)
+            )
+            if after is not None:
+                boundary = tuple_(
+                    literal(after[0], Payment.settled_at.type),
+                    literal(UUID(after[1]), Payment.id.type),
+                )
+                stmt = stmt.where(tuple_(Payment.settled_at, Payment.id) > boundary)
+            if payment_ids is not None:
+                stmt = stmt.where(Payment.id.in_([UUID(pid) for pid in payment_ids]))
+            if limit is not None:
+                stmt = stmt.limit(limit)
+
+            async with self.db_session_factory() as session:
                 result = await session.execute(stmt)
-                rows = result.scalars().all()
+                rows = result.all()
 
             return [
                 StuckPayment(
@@ -250,7 +359,58 @@ class PaymentWatchdog:
                 error=str(exc),
                 exc_info=True,
             )
-            return []
+            return None
+
+    async def _refund_page(self, page: List[StuckPayment], totals: Dict[str, int]) -> int:
+        """
+        Roll back a page of stuck payments concurrently, persisting each
+        outcome as soon as its rollback finishes, then drop the resolved
+        payments from the deadline index.
+
+        Saving per payment keeps one failed UPDATE from leaving the rest of
+        the page in 'settling', where the next cycle would compensate them
+        a second time.
+
+        Returns:
+            Number of payments left unresolved (rollback raised or the
+            status update failed); they stay eligible for the next cycle.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_refunds)
+
+        async def refund(stuck: StuckPayment) -> Optional[RollbackResult]:
+            async with semaphore:
+                try:
+                    result = await self._rollback_stuck_payment(stuck)
+                except Exception as exc:
+                    self.logger.error(
+                        "Failed to process refund for stuck payment",
+                        payment_id=stuck.payment_id,
+                        error=str(exc),
+                        exc_info=True,
+                    )
+                    return None
+                if not await self._persist_refund_status(stuck.payment_id, result):
+                    return None
+                return result
+
+        results = await asyncio.gather(*(refund(stuck) for stuck in page))
+        outcomes = {
+            stuck.payment_id: result
+            for stuck, result in zip(page, results)
+            if result is not None
+        }
+
+        totals["found"] += len(page)
+        if not outcomes:
+            return len(page)
+
+        if self.deadline_index is not None:
+            await self.deadline_index.clear(*outcomes)
+
+        refunded = sum(1 for result in outcomes.values() if result.success)
+        totals["refunded"] += refunded
+        totals["refund_failed"] += len(outcomes) - refunded
+        return len(page) - len(outcomes)
 
     # ------------------------------------------------------------------
     # Refund helpers
@@ -258,15 +418,21 @@ class PaymentWatchdog:
 
     async def _refund_stuck_payment(self, stuck: StuckPayment) -> RollbackResult:
         """
-        Orchestrate compensating transactions for a single stuck payment.
+        Orchestrate compensating transactions for a single stuck payment and
+        persist the new status ('refunded' or 'refund_failed').
+        """
+        result = await self._rollback_stuck_payment(stuck)
+        await self._persist_refund_status(stuck.payment_id, result)
+        return result
+
+    async def _rollback_stuck_payment(self, stuck: StuckPayment) -> RollbackResult:
+        """
+        Run the saga rollback for a single stuck payment.
 
         Builds a minimal PaymentStepContext (without live step results — those
         are unavailable for a payment that never finished), then delegates to
         ``rollback_payment()`` with the ordered list of steps that must have
         been completed before reaching SETTLING.
-
-        After the rollback attempt, persists the new status ('refunded' or
-        'refund_failed') back to the database.
         """
         self.logger.warning(
             "Initiating rollback for stuck payment",
@@ -291,8 +457,6 @@ class PaymentWatchdog:
             agents=[],
         )
 
-        await self._persist_refund_status(stuck.payment_id, result)
-
         self.logger.info(
             "Stuck payment refund attempt complete",
             payment_id=stuck.payment_id,
@@ -307,41 +471,47 @@ class PaymentWatchdog:
         self,
         payment_id: str,
         rollback_result: RollbackResult,
-    ) -> None:
+    ) -> bool:
+        """Persist the outcome of a single refund attempt."""
+        return await self._persist_refund_statuses({payment_id: rollback_result})
+
+    async def _persist_refund_statuses(self, outcomes: Dict[str, RollbackResult]) -> bool:
         """
-        Update the ``payments`` row with the outcome of the refund attempt:
+        Update the ``payments`` rows with the outcome of their refund attempt,
+        one UPDATE per status in a single transaction:
           - 'refunded'      if all compensating transactions succeeded
           - 'refund_failed' if one or more compensating transactions failed
                             (requires manual intervention)
+
+        Returns False if the DB update failed.
         """
-        from sqlalchemy import update
-        from applications.capp.capp.core.database import Payment
+        from applications.capp.capp.repositories.payment import PaymentRepository
 
-        new_status = "refunded" if rollback_result.success else "refund_failed"
+        by_status: Dict[str, List[UUID]] = {}
+        for payment_id, result in outcomes.items():
+            new_status = "refunded" if result.success else "refund_failed"
+            by_status.setdefault(new_status, []).append(UUID(payment_id))
 
         try:
             async with self.db_session_factory() as session:
-                stmt = (
-                    update(Payment)
-                    .where(Payment.id == payment_id)
-                    .values(
-                        status=new_status,
-                        updated_at=datetime.now(timezone.utc),
+                # Through the repository so payment_stats_rollups follow the change
+                repository = PaymentRepository(session)
+                for new_status, payment_ids in by_status.items():
+                    await repository.transition_statuses(
+                        payment_ids, "settling", new_status, commit=False
                     )
-                )
-                await session.execute(stmt)
                 await session.commit()
 
             self.logger.info(
-                "Payment status updated after refund attempt",
-                payment_id=payment_id,
-                new_status=new_status,
+                "Payment statuses updated after refund attempts",
+                **{status: len(ids) for status, ids in by_status.items()},
             )
+            return True
         except Exception as exc:
             self.logger.error(
                 "Failed to persist refund status — DB update failed",
-                payment_id=payment_id,
-                intended_status=new_status,
+                payment_ids=list(outcomes),
                 error=str(exc),
                 exc_info=True,
             )
+            return False
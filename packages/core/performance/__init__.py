@@ -4,12 +4,39 @@ Performance Module
 Performance monitoring, metrics collection, and optimization tools.
 """
 
-from .metrics_collector import MetricsCollector
-from .performance_monitor import PerformanceMonitor
-from .optimizer import PerformanceOptimizer
+import importlib
 
 __all__ = [
     "MetricsCollector",
     "PerformanceMonitor",
     "PerformanceOptimizer",
-] 
\ No newline at end of file
+    "QuantileSketch",
+    "LoadGenerator",
+    "LoadMode",
+    "LoadProfile",
+    "LoadReport",
+    "run_load",
+]
+
+# Loaded on first access so ``packages.core.performance.sketch`` stays
+# importable on its own (the API's anomaly detector uses it)
+_LAZY = {
+    "MetricsCollector": ".metrics_collector",
+    "PerformanceMonitor": ".performance_monitor",
+    "PerformanceOptimizer": ".optimizer",
+    "QuantileSketch": ".sketch",
+    "LoadGenerator": ".loadgen",
+    "LoadMode": ".loadgen",
+    "LoadProfile": ".loadgen",
+    "LoadReport": ".loadgen",
+    "run_load": ".loadgen",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value 
\ No newline at end of file
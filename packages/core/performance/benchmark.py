@@ -0,0 +1,385 @@
+"""
+Payment path benchmark suite
+
+Runs the load generator against the real routing, payment orchestration,
+settlement batching and MMO bridge code with every external dependency
+replaced by a local stand-in (see ``standins``), Redis by ``MockRedisClient``
+and Kafka by a ``BatchingEventProducer`` over an ``InMemoryEventBroker``.
+Each completed request publishes one event, as the application would.
+
+Usage:
+    python -m packages.core.performance.benchmark --scenario routing \\
+        --mode open --rate 200 --duration 10 --warmup 1 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import zlib
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import structlog
+
+from .loadgen import ArrivalProcess, LoadGenerator, LoadMode, LoadProfile, LoadReport, summarize
+from .standins import (
+    LatencyModel, NullMetricsCollector, SimulatedChain, SimulatedComplianceService,
+    SimulatedExchangeRates, SimulatedMMO, SimulatedMMOAvailability, SimulatedRail,
+    SimulatedRouteAgent, SimulatedYieldService,
+)
+
+logger = structlog.get_logger(__name__)
+
+_CAPP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "applications", "capp"))
+
+
+class BenchmarkScenario:
+    """
+    One benchmarked code path
+
+    Subclasses build their target with stand-ins in ``setup``, issue one
+    request per ``run_once`` call (raising on failure) and undo any global
+    changes in ``teardown``. Stand-in latencies are ``(base_ms, jitter_ms)``
+    pairs scaled by ``latency_scale``; a scale of 0 measures code overhead
+    alone.
+    """
+
+    name = ""
+    description = ""
+    event_topic = "benchmark_events"
+
+    def __init__(self, seed: int = 0, latency_scale: float = 1.0, failure_rate: float = 0.0):
+        self.seed = seed
+        self.latency_scale = latency_scale
+        self.failure_rate = failure_rate
+        self.events = None
+        self._models: Dict[str, LatencyModel] = {}
+
+    def latency(self, label: str, base_ms: float, jitter_ms: float = 0.0) -> LatencyModel:
+        """Seeded latency model for one stand-in (distinct stream per label)"""
+        model = LatencyModel(
+            base_ms=base_ms * self.latency_scale,
+            jitter_ms=jitter_ms * self.latency_scale,
+            failure_rate=self.failure_rate,
+            seed=zlib.crc32(f"{self.seed}:{label}".encode()),
+        )
+        self._models[label] = model
+        return model
+
+    async def setup(self) -> None:
+        from applications.capp.capp.core.kafka import BatchingEventProducer, InMemoryEventBroker
+
+        self.events = BatchingEventProducer(InMemoryEventBroker())
+
+    async def run_once(self, seq: int) -> None:
+        raise NotImplementedError
+
+    async def teardown(self) -> None:
+        if self.events is not None:
+            await self.events.close()
+
+    def extras(self) -> Dict[str, Any]:
+        """Scenario-specific counters added to the report"""
+        extras: Dict[str, Any] = {
+            "stand_in_calls": {label: model.calls for label, model in self._models.items()},
+        }
+        if self.events is not None:
+            extras["events"] = self.events.get_stats()
+        return extras
+
+    def publish(self, seq: int, **fields: Any) -> None:
+        self.events.publish(self.event_topic, {"seq": seq, **fields}, key=str(seq))
+
+    def redis_cache(self):
+        from applications.capp.capp.core.redis import MockRedisClient, RedisCache
+
+        return RedisCache(MockRedisClient())
+
+
+class RoutingScenario(BenchmarkScenario):
+    name = "routing"
+    description = "RoutingService.calculate_best_route over two simulated rails"
+    event_topic = "route_events"
+
+    async def setup(self) -> None:
+        await super().setup()
+        from applications.capp.capp.adapters.mock_rails import create_cheap_rail, create_fast_rail
+        from applications.capp.capp.services.routing_service import RoutingService
+
+        self.service = RoutingService()
+        # The adapter registry is a process-wide singleton: swap its rails for the run
+        self._saved_rails = dict(self.service.registry.payment_rails)
+        self.service.registry.payment_rails.clear()
+        self.service.registry.register_payment_rail(SimulatedRail(create_fast_rail(), self.latency("fast_rail", 15, 10)))
+        self.service.registry.register_payment_rail(SimulatedRail(create_cheap_rail(), self.latency("cheap_rail", 40, 20)))
+
+    async def run_once(self, seq: int) -> None:
+        route = await self.service.calculate_best_route(Decimal(50 + seq % 950), "USDC", "KE")
+        if route is None:
+            raise RuntimeError("No route found")
+        self.publish(seq, rail=route["rail"], score=route["score"])
+
+    async def teardown(self) -> None:
+        self.service.registry.payment_rails.clear()
+        self.service.registry.payment_rails.update(self._saved_rails)
+        await super().teardown()
+
+
+class PaymentFlowScenario(BenchmarkScenario):
+    name = "payment_flow"
+    description = "PaymentOrchestrationService.process_payment_flow end to end"
+    event_topic = "payment_events"
+
+    async def setup(self) -> None:
+        await super().setup()
+        # payment_orchestration imports the app as the top-level ``capp`` package
+        if _CAPP_ROOT not in sys.path:
+            sys.path.insert(0, _CAPP_ROOT)
+        from capp.agents.base import AgentConfig, AgentRegistry
+        from capp.config.settings import get_settings
+        from capp.services import payment_orchestration
+        from capp.services.payment_orchestration import PaymentOrchestrationService
+
+        # Built without __init__ so no real service clients are created
+        service = PaymentOrchestrationService.__new__(PaymentOrchestrationService)
+        service.settings = get_settings()
+        service.cache = self.redis_cache()
+        service.logger = structlog.get_logger(payment_orchestration.__name__)
+        service.payment_service = None
+        service.exchange_rate_service = SimulatedExchangeRates(self.latency("exchange_rates", 5, 5))
+        service.compliance_service = SimulatedComplianceService(self.latency("compliance", 20, 15))
+        service.mmo_availability_service = SimulatedMMOAvailability(self.latency("mmo_availability", 2, 2))
+        service.metrics_collector = NullMetricsCollector()
+        service.yield_service = SimulatedYieldService(self.latency("liquidity", 10, 5))
+        self.service = service
+
+        # Route agents come from the module's registry: give the run its own
+        registry = AgentRegistry()
+        registry.register_agent_type("route_optimization", SimulatedRouteAgent)
+        agent = registry.create_agent("route_optimization", AgentConfig(agent_type="route_optimization"))
+        agent.latency = self.latency("route_optimization", 25, 15)
+        self._module = payment_orchestration
+        self._saved_registry = payment_orchestration.agent_registry
+        payment_orchestration.agent_registry = registry
+
+    async def run_once(self, seq: int) -> None:
+        result = await self.service.process_payment_flow({
+            "reference_id": f"load_{self.seed}_{seq}",
+            "amount": str(100 + seq % 900),
+            "from_currency": "USD",
+            "to_currency": "KES",
+            "sender_name": "Load Sender",
+            "sender_phone": "+2348000000001",
+            "sender_country": "NG",
+            "recipient_name": "Load Recipient",
+            "recipient_phone": "+2547000000001",
+            "recipient_country": "KE",
+        })
+        if not result.success:
+            raise RuntimeError(result.error_code or result.message)
+        self.publish(seq, payment_id=str(result.payment_id), status=result.status.value)
+
+    async def teardown(self) -> None:
+        self._module.agent_registry = self._saved_registry
+        await super().teardown()
+
+
+class SettlementBatchingScenario(BenchmarkScenario):
+    name = "settlement_batching"
+    description = "SettlementAgent queueing and batch settlement on a simulated chain"
+    event_topic = "settlement_events"
+    batch_size = 10
+
+    async def setup(self) -> None:
+        await super().setup()
+        from applications.capp.capp.agents.settlement.settlement_agent import SettlementAgent, SettlementConfig
+
+        # Built without __init__: the constructor starts a background batch
+        # loop and connects to the real chains
+        agent = SettlementAgent.__new__(SettlementAgent)
+        agent.config = SettlementConfig(
+            agent_type="settlement",
+            min_batch_size=self.batch_size,
+            max_batch_size=self.batch_size,
+        )
+        agent.agent_id = agent.config.agent_id
+        agent.agent_type = agent.config.agent_type
+        agent.logger = structlog.get_logger("settlement.benchmark")
+        agent.cache = self.redis_cache()
+        self.chain = SimulatedChain("POLYGON", self.latency("chain_submit", 80, 40), self.latency("chain_confirm", 250, 100))
+        agent.services = {"APTOS": self.chain, "POLYGON": self.chain, "SOLANA": self.chain, "STELLAR": self.chain}
+        agent.pending_batches = {}
+        agent.processing_batches = {}
+        agent.completed_batches = {}
+        agent.payment_queue = []
+        agent.last_batch_time = datetime.now(timezone.utc)
+        self.agent = agent
+
+    async def run_once(self, seq: int) -> None:
+        from applications.capp.capp.models.payments import CrossBorderPayment, PaymentStatus
+
+        payment = CrossBorderPayment(
+            reference_id=f"load_{self.seed}_{seq}",
+            payment_type="personal_remittance",
+            payment_method="mobile_money",
+            amount=Decimal(100 + seq % 900),
+            from_currency="USD",
+            to_currency="KES",
+            sender={"name": "Load Sender", "phone_number": "+2348000000001", "country": "NG"},
+            recipient={"name": "Load Recipient", "phone_number": "+2547000000001", "country": "KE"},
+            status=PaymentStatus.SETTLING,
+            blockchain_tx_hash=f"0x{seq:064x}",
+        )
+        result = await self.agent.process_payment(payment)
+        if not result.success:
+            raise RuntimeError(result.error_code or result.message)
+        self.publish(seq, payment_id=str(payment.payment_id))
+
+    async def teardown(self) -> None:
+        # Settle whatever is still queued so batch counts cover every payment
+        while self.agent.payment_queue:
+            await self.agent._create_and_process_batch()
+        await super().teardown()
+
+    def extras(self) -> Dict[str, Any]:
+        extras = super().extras()
+        settled = list(self.agent.completed_batches.values())
+        extras["settlement"] = {
+            "batches": len(settled),
+            "payments_settled": sum(len(b.payments) for b in settled),
+            "chain_submissions": len(self.chain.batches),
+        }
+        return extras
+
+
+class MMOBridgeScenario(BenchmarkScenario):
+    name = "mmo_bridge"
+    description = "MMOBridge.initiate_transaction with provider selection and fallback"
+    event_topic = "mmo_events"
+
+    async def setup(self) -> None:
+        await super().setup()
+        from packages.integrations.mobile_money.base_mmo import MMOProvider
+        from packages.integrations.mobile_money.bridge import MMOBridge, MMOBridgeConfig
+
+        # Raise the global limits so the run measures the bridge, not its throttle
+        bridge = MMOBridge(MMOBridgeConfig(
+            global_rate_limit_per_minute=1_000_000_000,
+            global_rate_limit_per_hour=1_000_000_000,
+        ))
+        self.primary = MMOProvider.MPESA
+        self.fallback = MMOProvider.MTN_MOBILE_MONEY
+        bridge.providers = {
+            self.primary: SimulatedMMO(self.primary.value, self.latency("mpesa", 120, 80)),
+            self.fallback: SimulatedMMO(self.fallback.value, self.latency("mtn_momo", 150, 100)),
+        }
+        # Providers count as unhealthy until a first success is recorded
+        for provider in bridge.providers:
+            await bridge._update_health_metrics(provider, True)
+        self.bridge = bridge
+
+    async def run_once(self, seq: int) -> None:
+        from packages.integrations.mobile_money.base_mmo import MMOTransaction, TransactionStatus, TransactionType
+
+        transaction = MMOTransaction(
+            transaction_id=f"load_{self.seed}_{seq}",
+            transaction_type=TransactionType.TRANSFER,
+            amount=Decimal(100 + seq % 900),
+            phone_number="+2547000000001",
+            description="load test transfer",
+        )
+        result = await self.bridge.initiate_transaction(
+            transaction, preferred_provider=self.primary, fallback_providers=[self.fallback]
+        )
+        if result.status == TransactionStatus.FAILED:
+            raise RuntimeError(result.error_message or "MMO transaction failed")
+        self.publish(seq, transaction_id=result.transaction_id, external_id=result.external_id)
+
+
+SCENARIOS: Dict[str, Type[BenchmarkScenario]] = {
+    scenario.name: scenario
+    for scenario in (RoutingScenario, PaymentFlowScenario, SettlementBatchingScenario, MMOBridgeScenario)
+}
+
+
+async def run_scenario(
+    name: str,
+    profile: LoadProfile,
+    latency_scale: float = 1.0,
+    failure_rate: float = 0.0,
+) -> LoadReport:
+    """
+    Run one registered scenario under ``profile``.
+
+    Raises:
+        KeyError: If no scenario is registered under ``name``
+    """
+    scenario = SCENARIOS[name](seed=profile.seed, latency_scale=latency_scale, failure_rate=failure_rate)
+    await scenario.setup()
+    try:
+        report = await LoadGenerator(profile).run(scenario.run_once, scenario=name)
+    finally:
+        await scenario.teardown()
+    report.extras = scenario.extras()
+    return report
+
+
+async def run_suite(
+    names: Sequence[str],
+    profile: LoadProfile,
+    latency_scale: float = 1.0,
+    failure_rate: float = 0.0,
+) -> List[LoadReport]:
+    """Run scenarios one after another with the same profile"""
+    return [await run_scenario(name, profile, latency_scale, failure_rate) for name in names]
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the payment path against local stand-ins")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--mode", choices=[m.value for m in LoadMode], default=LoadMode.CLOSED.value)
+    parser.add_argument("--rate", type=float, default=100.0, help="Open loop arrivals per second")
+    parser.add_argument("--arrival", choices=[a.value for a in ArrivalProcess], default=ArrivalProcess.POISSON.value)
+    parser.add_argument("--concurrency", type=int, default=10, help="Closed loop workers")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario, including warmup")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests instead")
+    parser.add_argument("--warmup", type=float, default=0.0, help="Seconds excluded from the results")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request deadline in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier for stand-in latencies (0 measures code overhead only)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Injected stand-in failure rate")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    profile = LoadProfile(
+        mode=args.mode,
+        rate=args.rate,
+        arrival=args.arrival,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        requests=args.requests,
+        warmup=args.warmup,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    reports = asyncio.run(run_suite(args.scenario or list(SCENARIOS), profile, args.latency_scale, args.failure_rate))
+    document = json.dumps(summarize(reports), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(document + "\n")
+    else:
+        print(document)
+    return 0 if all(report.errors == 0 for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
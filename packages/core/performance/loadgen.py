@@ -0,0 +1,231 @@
+"""
+In-process load generator
+
+Drives an async operation at a configured load and reports throughput and
+latency percentiles as JSON. Two load models are supported:
+
+- **Open loop**: requests arrive on a schedule (Poisson or constant rate)
+  whether or not earlier ones have finished, like independent users.
+  Latency is measured from each request's *scheduled* start, so a stalled
+  system shows up as queueing delay instead of silently lowering the
+  offered load (coordinated omission).
+- **Closed loop**: a fixed number of workers each issue the next request
+  as soon as the previous one completes, like a connection pool.
+
+Arrival times are drawn from a seeded generator so runs are reproducible.
+"""
+
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+from pydantic import BaseModel, Field
+
+from .sketch import QuantileSketch
+
+logger = structlog.get_logger(__name__)
+
+# Called with the request's sequence number
+Operation = Callable[[int], Awaitable[Any]]
+
+REPORT_PERCENTILES = (50, 95, 99)
+
+
+class LoadMode(str, Enum):
+    OPEN = "open"
+    CLOSED = "closed"
+
+
+class ArrivalProcess(str, Enum):
+    POISSON = "poisson"
+    CONSTANT = "constant"
+
+
+class LoadProfile(BaseModel):
+    """Shape of the load applied to an operation"""
+    mode: LoadMode = LoadMode.CLOSED
+    rate: float = Field(default=100.0, gt=0)  # arrivals per second (open loop)
+    arrival: ArrivalProcess = ArrivalProcess.POISSON
+    concurrency: int = Field(default=10, ge=1)  # workers (closed loop)
+    duration: float = Field(default=10.0, gt=0)  # seconds, including warmup
+    requests: Optional[int] = Field(default=None, ge=1)  # stop after this many instead
+    warmup: float = Field(default=0.0, ge=0)  # seconds excluded from the results
+    max_in_flight: int = Field(default=10000, ge=1)  # open loop: arrivals beyond this are dropped
+    timeout: float = Field(default=30.0, gt=0)  # per-request deadline in seconds
+    seed: int = 0
+
+
+class LoadReport(BaseModel):
+    """Results of one load run (requests started during warmup are excluded)"""
+    scenario: str
+    profile: LoadProfile
+    started_at: datetime
+    duration: float = 0.0  # measured window in seconds
+    requests: int = 0
+    succeeded: int = 0
+    errors: int = 0
+    error_types: Dict[str, int] = Field(default_factory=dict)
+    dropped: int = 0
+    throughput_rps: float = 0.0
+    latency_ms: Dict[str, float] = Field(default_factory=dict)
+    extras: Dict[str, Any] = Field(default_factory=dict)
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.model_dump(mode="json"), indent=indent)
+
+
+class LoadGenerator:
+    """
+    Apply a ``LoadProfile`` to an async operation.
+
+    The operation is called with a sequence number; it succeeds by
+    returning and fails by raising. Failures and timeouts are counted by
+    exception type and their latency is still recorded.
+    """
+
+    def __init__(self, profile: LoadProfile, clock: Callable[[], float] = time.perf_counter):
+        self.profile = profile
+        self.clock = clock
+        self._rng = random.Random(profile.seed)
+        self._sketch = QuantileSketch()
+        self._error_types: Dict[str, int] = {}
+        self._succeeded = 0
+        self._dropped = 0
+        self._started = 0.0
+
+    async def run(self, operation: Operation, scenario: str = "operation") -> LoadReport:
+        """Run the profile to completion and return its report"""
+        started_at = datetime.now(timezone.utc)
+        self._started = self.clock()
+
+        if self.profile.mode == LoadMode.OPEN:
+            await self._run_open(operation)
+        else:
+            await self._run_closed(operation)
+
+        ended = self.clock()
+        return self._report(scenario, started_at, ended)
+
+    # ------------------------------------------------------------------
+    # Load models
+    # ------------------------------------------------------------------
+
+    async def _run_open(self, operation: Operation) -> None:
+        profile = self.profile
+        in_flight: set = set()
+        scheduled = 0.0
+        seq = 0
+
+        while profile.requests is None or seq < profile.requests:
+            if profile.arrival == ArrivalProcess.POISSON:
+                scheduled += self._rng.expovariate(profile.rate)
+            else:
+                scheduled += 1.0 / profile.rate
+            if profile.requests is None and scheduled >= profile.duration:
+                break
+
+            delay = self._started + scheduled - self.clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if len(in_flight) >= profile.max_in_flight:
+                if scheduled >= profile.warmup:
+                    self._dropped += 1
+            else:
+                task = asyncio.ensure_future(self._call(operation, seq, self._started + scheduled))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            seq += 1
+
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def _run_closed(self, operation: Operation) -> None:
+        profile = self.profile
+        deadline = self._started + profile.duration
+        issued = 0
+
+        async def worker():
+            nonlocal issued
+            while profile.requests is None or issued < profile.requests:
+                if profile.requests is None and self.clock() >= deadline:
+                    return
+                seq = issued
+                issued += 1
+                await self._call(operation, seq, self.clock())
+
+        await asyncio.gather(*(worker() for _ in range(profile.concurrency)))
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    async def _call(self, operation: Operation, seq: int, scheduled_at: float) -> None:
+        error: Optional[str] = None
+        try:
+            await asyncio.wait_for(operation(seq), self.profile.timeout)
+        except asyncio.TimeoutError:
+            error = "TimeoutError"
+        except Exception as e:
+            error = type(e).__name__
+            logger.debug("Load request failed", seq=seq, error=str(e))
+
+        if scheduled_at - self._started < self.profile.warmup:
+            return
+        self._sketch.add((self.clock() - scheduled_at) * 1000.0)
+        if error is None:
+            self._succeeded += 1
+        else:
+            self._error_types[error] = self._error_types.get(error, 0) + 1
+
+    def _report(self, scenario: str, started_at: datetime, ended: float) -> LoadReport:
+        window = max(ended - self._started - self.profile.warmup, 1e-9)
+        sketch = self._sketch
+
+        latency: Dict[str, float] = {}
+        if sketch.count:
+            latency = {key: round(value, 3) for key, value in sketch.percentiles(REPORT_PERCENTILES).items()}
+            latency["mean"] = round(sketch.mean, 3)
+            latency["max"] = round(sketch.max, 3)
+
+        report = LoadReport(
+            scenario=scenario,
+            profile=self.profile,
+            started_at=started_at,
+            duration=round(window, 6),
+            requests=sketch.count,
+            succeeded=self._succeeded,
+            errors=sketch.count - self._succeeded,
+            error_types=dict(self._error_types),
+            dropped=self._dropped,
+            throughput_rps=round(self._succeeded / window, 3),
+            latency_ms=latency,
+        )
+        logger.info(
+            "Load run completed",
+            scenario=scenario,
+            mode=self.profile.mode.value,
+            requests=report.requests,
+            errors=report.errors,
+            throughput_rps=report.throughput_rps,
+            **{f"{k}_ms": v for k, v in latency.items() if k.startswith("p")},
+        )
+        return report
+
+
+async def run_load(operation: Operation, profile: LoadProfile, scenario: str = "operation") -> LoadReport:
+    """Convenience wrapper: ``LoadGenerator(profile).run(operation, scenario)``"""
+    return await LoadGenerator(profile).run(operation, scenario)
+
+
+def summarize(reports: List[LoadReport]) -> Dict[str, Any]:
+    """Combine several reports into one JSON-ready document keyed by scenario"""
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "scenarios": {report.scenario: report.model_dump(mode="json") for report in reports},
+    }
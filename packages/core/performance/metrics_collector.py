@@ -6,6 +6,7 @@ for the orchestration system performance monitoring.
 """
 
 import asyncio
+from enum import Enum
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Union, Callable
 from collections import defaultdict, deque
@@ -15,6 +16,7 @@ import json
 import structlog
 from pydantic import BaseModel, Field
 
+from packages.core.performance.sketch import DEFAULT_PERCENTILES, QuantileSketch
 from packages.core.performance.tracker import PerformanceMetrics, PerformanceSummary
 from packages.core.agents.financial_base import TransactionType
 
@@ -74,6 +76,9 @@ class MetricsCollectorConfig(BaseModel):
     aggregation_enabled: bool = True
     export_enabled: bool = True
     export_format: str = "json"  # json, prometheus, influxdb
+    sketch_relative_accuracy: float = 0.01
+    sketch_max_bins: int = 2048
+    retain_distribution_samples: bool = False  # also keep raw timer/histogram samples for get_metric_data
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -94,6 +99,9 @@ class MetricsCollector:
         self.metric_definitions: Dict[str, MetricDefinition] = {}
         self.aggregations: Dict[str, MetricAggregation] = {}
         
+        # Streaming quantile sketches for timers and histograms
+        self.sketches: Dict[str, QuantileSketch] = {}
+        
         # Performance tracking integration
         self.performance_tracker = None
         
@@ -188,7 +196,7 @@ class MetricsCollector:
             value: Histogram value
             labels: Optional labels
         """
-        self.record_metric(name, value, labels, {"metric_type": "histogram"})
+        self._record_distribution(name, value, labels, "histogram")
     
     def record_timer(self, name: str, duration: float,
                     labels: Optional[Dict[str, str]] = None) -> None:
@@ -200,7 +208,57 @@ class MetricsCollector:
             duration: Duration in seconds
             labels: Optional labels
         """
-        self.record_metric(name, duration, labels, {"metric_type": "timer"})
+        self._record_distribution(name, duration, labels, "timer")
+    
+    def _record_distribution(self, name: str, value: float,
+                             labels: Optional[Dict[str, str]], metric_type: str) -> None:
+        """Record a timer/histogram sample into its quantile sketch"""
+        if not self.config.enabled:
+            return
+        
+        sketch = self.sketches.get(name)
+        if sketch is None:
+            sketch = QuantileSketch(
+                relative_accuracy=self.config.sketch_relative_accuracy,
+                max_bins=self.config.sketch_max_bins
+            )
+            self.sketches[name] = sketch
+        sketch.add(value)
+        
+        if self.config.retain_distribution_samples:
+            self.record_metric(name, value, labels, {"metric_type": metric_type})
+    
+    def get_sketch(self, name: str) -> Optional[QuantileSketch]:
+        """
+        Get the quantile sketch for a timer or histogram
+        
+        Args:
+            name: Metric name
+            
+        Returns:
+            QuantileSketch: Sketch if the metric has been recorded
+        """
+        return self.sketches.get(name)
+    
+    def merge_sketches(self, sketches: Dict[str, Union[QuantileSketch, Dict[str, Any]]]) -> None:
+        """
+        Merge sketches collected by other workers into this collector
+        
+        Args:
+            sketches: Sketches (or their ``to_dict`` form) keyed by metric name
+        """
+        for name, other in sketches.items():
+            if isinstance(other, dict):
+                other = QuantileSketch.from_dict(other)
+            
+            sketch = self.sketches.get(name)
+            if sketch is None:
+                sketch = QuantileSketch(
+                    relative_accuracy=other.relative_accuracy,
+                    max_bins=other.max_bins
+                )
+                self.sketches[name] = sketch
+            sketch.merge(other)
     
     async def record_transaction_metrics(self, metrics: PerformanceMetrics) -> None:
         """
@@ -261,8 +319,26 @@ class MetricsCollector:
         
         aggregations = {}
         
+        for name, sketch in self.sketches.items():
+            if sketch.count == 0:
+                continue
+            
+            definition = self.metric_definitions.get(name)
+            aggregations[name] = MetricAggregation(
+                name=name,
+                type=definition.type if definition else MetricType.HISTOGRAM,
+                count=sketch.count,
+                sum=sketch.sum,
+                min=sketch.min,
+                max=sketch.max,
+                mean=sketch.mean,
+                median=sketch.quantile(0.5),
+                std_dev=sketch.std_dev,
+                percentiles=sketch.percentiles(DEFAULT_PERCENTILES)
+            )
+        
         for name, values in self.metrics.items():
-            if not values:
+            if not values or name in aggregations:
                 continue
             
             # Filter numeric values for aggregation
@@ -283,13 +359,12 @@ class MetricsCollector:
             median_val = statistics.median(numeric_values)
             std_dev = statistics.stdev(numeric_values) if len(numeric_values) > 1 else 0.0
             
-            # Calculate percentiles
-            percentiles = {}
-            for p in [50, 75, 90, 95, 99]:
-                try:
-                    percentiles[f"p{p}"] = statistics.quantiles(numeric_values, n=100)[p-1]
-                except (IndexError, ValueError):
-                    percentiles[f"p{p}"] = max_val
+            # Calculate percentiles (one sort for all of them)
+            try:
+                cut_points = statistics.quantiles(numeric_values, n=100)
+                percentiles = {f"p{p}": cut_points[p-1] for p in DEFAULT_PERCENTILES}
+            except (IndexError, ValueError):
+                percentiles = {f"p{p}": max_val for p in DEFAULT_PERCENTILES}
             
             # Get metric definition
             definition = self.metric_definitions.get(name, MetricDefinition(
@@ -324,7 +399,7 @@ class MetricsCollector:
             Dict[str, Any]: Metrics summary
         """
         summary = {
-            "total_metrics": len(self.metrics),
+            "total_metrics": len(self.metrics.keys() | self.sketches.keys()),
             "total_definitions": len(self.metric_definitions),
             "total_aggregations": len(self.aggregations),
             "collection_enabled": self.config.enabled,
@@ -430,7 +505,8 @@ class MetricsCollector:
             self.logger.info(
                 "Metrics exported",
                 format=format_name,
-                metrics_count=len(self.metrics)
+                metrics_count=len(self.metrics),
+                sketches_count=len(self.sketches)
             )
             
             return result
@@ -456,6 +532,9 @@ class MetricsCollector:
             },
             "definitions": {
                 name: def_.dict() for name, def_ in definitions.items()
+            },
+            "sketches": {
+                name: sketch.to_dict() for name, sketch in self.sketches.items()
             }
         }
         
@@ -480,6 +559,17 @@ class MetricsCollector:
                 
                 lines.append(f"{name}{labels_str} {value.value}")
         
+        # Timers and histograms are exposed as summaries built from their sketches
+        for name, sketch in self.sketches.items():
+            if sketch.count == 0:
+                continue
+            if name not in definitions:
+                lines.append(f"# TYPE {name} summary")
+            for p in DEFAULT_PERCENTILES:
+                lines.append(f'{name}{{quantile="{p / 100.0}"}} {sketch.quantile(p / 100.0)}')
+            lines.append(f"{name}_sum {sketch.sum}")
+            lines.append(f"{name}_count {sketch.count}")
+        
         return "\n".join(lines)
     
     def _start_collection_task(self) -> None:
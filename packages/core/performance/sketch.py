@@ -0,0 +1,324 @@
+"""
+Streaming quantile sketch for performance metrics
+
+This module provides a DDSketch-style quantile sketch backed by dense
+bucket arrays. Recording a value is constant time, memory is bounded by
+``max_bins`` regardless of traffic, and sketches recorded on different
+workers can be merged into one without losing accuracy. Observations can
+also be removed again, so a sketch can follow a sliding window.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_PERCENTILES: Tuple[int, ...] = (50, 75, 90, 95, 99)
+
+
+class _DenseStore:
+    """
+    Contiguous array of bucket counts indexed by logarithmic key
+
+    When the number of buckets would exceed ``max_bins`` the lowest buckets
+    are collapsed together, so accuracy is only lost on the small end of
+    the distribution (which matters least for latency percentiles).
+    """
+
+    def __init__(self, max_bins: int):
+        self.max_bins = max_bins
+        self.bins: List[int] = []
+        self.offset = 0
+        self.count = 0
+
+    def add(self, key: int, weight: int = 1) -> None:
+        """Add ``weight`` observations to the bucket for ``key``"""
+        self.bins[self._index(key)] += weight
+        self.count += weight
+
+    def remove(self, key: int, weight: int = 1) -> None:
+        """Remove up to ``weight`` observations from the bucket for ``key``"""
+        if not self.bins:
+            return
+        # Keys below the store were collapsed into the lowest bucket
+        index = min(max(key - self.offset, 0), len(self.bins) - 1)
+        removed = min(weight, self.bins[index])
+        self.bins[index] -= removed
+        self.count -= removed
+
+    def key_at_rank(self, rank: float) -> int:
+        """Return the key of the bucket holding the observation at ``rank``"""
+        running = 0
+        for i, bin_count in enumerate(self.bins):
+            running += bin_count
+            if running > rank:
+                return i + self.offset
+        return len(self.bins) - 1 + self.offset
+
+    def items(self) -> Iterable[Tuple[int, int]]:
+        """Iterate over non-empty ``(key, count)`` buckets"""
+        for i, bin_count in enumerate(self.bins):
+            if bin_count:
+                yield i + self.offset, bin_count
+
+    def merge(self, other: "_DenseStore") -> None:
+        """Merge the buckets of another store into this one"""
+        for key, bin_count in other.items():
+            self.add(key, bin_count)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"offset": self.offset, "bins": list(self.bins)}
+
+    def load(self, data: Dict[str, Any]) -> None:
+        self.offset = int(data.get("offset", 0))
+        self.bins = [int(c) for c in data.get("bins", [])]
+        self.count = sum(self.bins)
+
+    def _index(self, key: int) -> int:
+        if not self.bins:
+            self.offset = key
+            self.bins.append(0)
+            return 0
+
+        max_key = self.offset + len(self.bins) - 1
+        if key > max_key:
+            self.bins.extend([0] * (key - max_key))
+            if len(self.bins) > self.max_bins:
+                self._collapse_lowest(len(self.bins) - self.max_bins)
+        elif key < self.offset:
+            # Keys that would push the store past max_bins land in the lowest bucket
+            key = max(key, max_key - self.max_bins + 1)
+            if key < self.offset:
+                self.bins[0:0] = [0] * (self.offset - key)
+                self.offset = key
+        return key - self.offset
+
+    def _collapse_lowest(self, n: int) -> None:
+        collapsed = sum(self.bins[:n + 1])
+        self.bins = self.bins[n:]
+        self.bins[0] = collapsed
+        self.offset += n
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch with relative-error guarantees
+
+    Every quantile returned is within ``relative_accuracy`` of the true
+    value (as long as the lowest buckets have not been collapsed). Count,
+    sum, min, max, mean and variance are tracked exactly alongside the
+    buckets using a parallel-mergeable Welford accumulator.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048,
+                 min_indexable_value: float = 1e-9):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_bins < 1:
+            raise ValueError("max_bins must be positive")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.min_indexable_value = min_indexable_value
+
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self._positive = _DenseStore(max_bins)
+        self._negative = _DenseStore(max_bins)
+        self.zero_count = 0
+
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def add(self, value: float) -> None:
+        """
+        Record a single observation
+
+        Args:
+            value: Observed value (e.g. a duration in seconds)
+        """
+        value = float(value)
+        if value > self.min_indexable_value:
+            self._positive.add(self._key(value))
+        elif value < -self.min_indexable_value:
+            self._negative.add(self._key(-value))
+        else:
+            self.zero_count += 1
+
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def remove(self, value: float) -> None:
+        """
+        Forget one earlier observation of ``value``
+
+        Quantiles, count, sum, mean and variance follow the removal. Min and
+        max cannot be recovered from the buckets, so they stay the bounds of
+        everything recorded since the sketch was last empty.
+
+        Args:
+            value: A value previously passed to ``add``
+        """
+        if self.count == 0:
+            return
+        value = float(value)
+        if value > self.min_indexable_value:
+            self._positive.remove(self._key(value))
+        elif value < -self.min_indexable_value:
+            self._negative.remove(self._key(-value))
+        else:
+            self.zero_count = max(0, self.zero_count - 1)
+
+        self.count -= 1
+        if self.count == 0:
+            self.sum = 0.0
+            self.min = math.inf
+            self.max = -math.inf
+            self._mean = self._m2 = 0.0
+            return
+
+        self.sum -= value
+        delta = value - self._mean
+        self._mean -= delta / self.count
+        # Clamp float drift from repeated removals
+        self._m2 = max(0.0, self._m2 - delta * (value - self._mean))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Merge another sketch into this one
+
+        Args:
+            other: Sketch recorded elsewhere (e.g. on another worker)
+
+        Raises:
+            ValueError: If the sketches were built with different accuracy
+        """
+        if not math.isclose(self._gamma, other._gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if other.count == 0:
+            return
+
+        self._positive.merge(other._positive)
+        self._negative.merge(other._negative)
+        self.zero_count += other.zero_count
+
+        total = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self._mean += delta * other.count / total
+
+        self.count = total
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.count else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        """Sample standard deviation (matches ``statistics.stdev``)"""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the value at quantile ``q``
+
+        Args:
+            q: Quantile in the range [0, 1]
+
+        Returns:
+            Optional[float]: Estimated value, or None if the sketch is empty
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("quantile must be between 0 and 1")
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        if rank < self._negative.count:
+            key = self._negative.key_at_rank(self._negative.count - 1 - rank)
+            value = -self._value(key)
+        elif rank < self._negative.count + self.zero_count:
+            value = 0.0
+        else:
+            key = self._positive.key_at_rank(rank - self._negative.count - self.zero_count)
+            value = self._value(key)
+
+        return min(max(value, self.min), self.max)
+
+    def percentiles(self, percentiles: Iterable[int] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        """Return estimated percentiles keyed as ``p50``, ``p95`` and so on"""
+        if self.count == 0:
+            return {}
+        return {f"p{p}": self.quantile(p / 100.0) for p in percentiles}
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the sketch so it can be shipped to another worker"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "min_indexable_value": self.min_indexable_value,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self._mean,
+            "m2": self._m2,
+            "zero_count": self.zero_count,
+            "positive": self._positive.to_dict(),
+            "negative": self._negative.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch serialized with ``to_dict``"""
+        sketch = cls(
+            relative_accuracy=data["relative_accuracy"],
+            max_bins=data.get("max_bins", 2048),
+            min_indexable_value=data.get("min_indexable_value", 1e-9),
+        )
+        sketch._positive.load(data.get("positive", {}))
+        sketch._negative.load(data.get("negative", {}))
+        sketch.zero_count = int(data.get("zero_count", 0))
+        sketch.count = int(data.get("count", 0))
+        sketch.sum = float(data.get("sum", 0.0))
+        if sketch.count:
+            sketch.min = float(data["min"])
+            sketch.max = float(data["max"])
+        sketch._mean = float(data.get("mean", 0.0))
+        sketch._m2 = float(data.get("m2", 0.0))
+        return sketch
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2.0 * self._gamma ** key / (self._gamma + 1.0)
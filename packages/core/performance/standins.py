@@ -0,0 +1,249 @@
+"""
+Deterministic local stand-ins for load runs
+
+Chains, payment rails, mobile money operators and the external services of
+the payment flow are replaced by in-process objects with the same call
+surface. Each one waits for a latency drawn from a seeded ``LatencyModel``
+and fails at a configured rate, so a benchmark exercises the real
+orchestration code without any network access and repeats from run to run.
+Redis and Kafka are not stood in here: the repo's own ``MockRedisClient``
+and ``InMemoryEventBroker`` already serve that purpose.
+"""
+
+import asyncio
+import itertools
+import random
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class StandInError(Exception):
+    """Injected failure from a stand-in"""
+
+
+class LatencyModel:
+    """
+    Seeded service-time distribution
+
+    Each call takes ``base_ms`` plus an exponentially distributed tail with
+    mean ``jitter_ms``, which gives the long right tail real network calls
+    have. ``failure_rate`` of calls raise ``StandInError`` after waiting.
+    """
+
+    def __init__(self, base_ms: float = 0.0, jitter_ms: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError("failure_rate must be between 0 and 1")
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    def sample(self) -> float:
+        """Draw the next service time in seconds"""
+        ms = self.base_ms
+        if self.jitter_ms > 0:
+            ms += self._rng.expovariate(1.0 / self.jitter_ms)
+        return ms / 1000.0
+
+    async def call(self, what: str = "call") -> None:
+        """Wait one service time, then raise if this call is drawn to fail"""
+        self.calls += 1
+        delay = self.sample()
+        failed = self.failure_rate > 0 and self._rng.random() < self.failure_rate
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if failed:
+            raise StandInError(f"Injected {what} failure")
+
+
+class SimulatedRail:
+    """Payment rail whose quotes come from a wrapped rail after a simulated round trip"""
+
+    def __init__(self, rail: Any, latency: LatencyModel):
+        self.rail = rail
+        self.config = rail.config
+        self.latency = latency
+
+    async def quote_transfer(self, token: str, amount: Decimal, destination: str) -> Dict[str, Any]:
+        await self.latency.call(f"{self.config.name} quote")
+        return await self.rail.quote_transfer(token, amount, destination)
+
+    async def execute_transfer(self, token: str, amount: Decimal, destination: str) -> str:
+        await self.latency.call(f"{self.config.name} transfer")
+        return await self.rail.execute_transfer(token, amount, destination)
+
+    async def verify_status(self, reference_id: str) -> str:
+        return await self.rail.verify_status(reference_id)
+
+
+class SimulatedChain:
+    """
+    Settlement chain with separate submit and confirmation latencies
+
+    Covers the call surface ``SettlementAgent`` uses across its chain
+    services (batch submit + confirm, and single transfers/payments).
+    """
+
+    def __init__(self, name: str, submit: LatencyModel, confirm: LatencyModel):
+        self.name = name
+        self.submit = submit
+        self.confirm = confirm
+        self._nonce = itertools.count(1)
+        self.batches: List[Dict[str, Any]] = []
+        self.confirmed: Dict[str, bool] = {}
+
+    async def submit_settlement_batch(self, settlement_data: Dict[str, Any]) -> str:
+        await self.submit.call(f"{self.name} submit")
+        self.batches.append(settlement_data)
+        return self._tx_hash()
+
+    async def wait_for_confirmation(self, tx_hash: str) -> bool:
+        try:
+            await self.confirm.call(f"{self.name} confirmation")
+        except StandInError:
+            self.confirmed[tx_hash] = False
+            return False
+        self.confirmed[tx_hash] = True
+        return True
+
+    async def execute_transfer(self, address: Any, amount: float) -> str:
+        await self.submit.call(f"{self.name} transfer")
+        return self._tx_hash()
+
+    async def execute_payment(self, address: Any, amount: float) -> str:
+        return await self.execute_transfer(address, amount)
+
+    async def get_transaction_status(self, tx_hash: str) -> str:
+        return "confirmed" if self.confirmed.get(tx_hash, True) else "failed"
+
+    def _tx_hash(self) -> str:
+        return f"0x{next(self._nonce):064x}"
+
+
+class SimulatedMMO:
+    """Mobile money operator integration that completes transactions after a simulated call"""
+
+    def __init__(self, provider: Any, latency: LatencyModel):
+        self.provider = provider
+        self.latency = latency
+        self._ids = itertools.count(1)
+
+    async def initiate_transaction(self, transaction: Any) -> Any:
+        # Imported here so the module stays usable without the integrations package
+        from packages.integrations.mobile_money.base_mmo import TransactionStatus
+
+        await self.latency.call(f"{self.provider} transaction")
+        transaction.external_id = f"{self.provider}-{next(self._ids)}"
+        transaction.status = TransactionStatus.COMPLETED
+        return transaction
+
+    async def check_transaction_status(self, transaction_id: str) -> Any:
+        return None
+
+
+class ComplianceCheck(BaseModel):
+    """Result shape returned by the compliance stand-in"""
+    is_compliant: bool = True
+    risk_level: str = "low"
+    violations: List[str] = Field(default_factory=list)
+
+
+class SimulatedComplianceService:
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    async def check_kyc_compliance(self, *args, **kwargs) -> ComplianceCheck:
+        await self.latency.call("kyc")
+        return ComplianceCheck()
+
+    async def check_sanctions(self, *args, **kwargs) -> ComplianceCheck:
+        await self.latency.call("sanctions")
+        return ComplianceCheck()
+
+    async def check_travel_rule(self, *args, **kwargs) -> bool:
+        return True
+
+
+class SimulatedExchangeRates:
+    def __init__(self, latency: LatencyModel, rate: Decimal = Decimal("129.5")):
+        self.latency = latency
+        self.rate = rate
+
+    async def get_exchange_rate(self, from_currency: Any, to_currency: Any) -> Decimal:
+        await self.latency.call("exchange rate")
+        return self.rate
+
+
+class SimulatedYieldService:
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    async def request_liquidity(self, amount: Decimal, currency: str) -> bool:
+        await self.latency.call("liquidity")
+        return True
+
+
+class SimulatedMMOAvailability:
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    async def is_available(self, provider: Any) -> bool:
+        await self.latency.call("availability")
+        return True
+
+
+class NullMetricsCollector:
+    """Discards payment metrics so the run measures the flow, not the collector"""
+
+    async def record_payment_metrics(self, **kwargs) -> None:
+        return None
+
+    async def get_payment_metrics(self) -> Dict[str, Any]:
+        return {}
+
+    async def get_business_metrics(self) -> Dict[str, Any]:
+        return {}
+
+
+class SimulatedRouteAgent:
+    """
+    Route optimization agent that quotes a fixed mobile money route
+
+    Registered in an ``AgentRegistry`` as the ``route_optimization`` type,
+    so it is constructed from an agent config like the real agent.
+    """
+
+    def __init__(self, config: Any, latency: Optional[LatencyModel] = None):
+        self.config = config
+        self.agent_id = config.agent_id
+        self.agent_type = config.agent_type
+        self.latency = latency or LatencyModel()
+
+    async def process_payment_with_retry(self, payment: Any) -> Any:
+        from capp.models.payments import MMOProvider, PaymentResult, PaymentRoute, PaymentStatus
+
+        await self.latency.call("route optimization")
+        payment.selected_route = PaymentRoute(
+            from_country=payment.sender.country,
+            to_country=payment.recipient.country,
+            from_currency=payment.from_currency,
+            to_currency=payment.to_currency,
+            to_mmo=MMOProvider.MPESA,
+            exchange_rate=Decimal("129.5"),
+            fees=Decimal("1.50"),
+            estimated_delivery_time=5,
+            success_rate=0.99,
+            cost_score=0.8,
+            speed_score=0.9,
+            reliability_score=0.95,
+            total_score=0.88,
+        )
+        return PaymentResult(
+            success=True,
+            payment_id=payment.payment_id,
+            status=PaymentStatus.PROCESSING,
+            message="Route selected",
+        )
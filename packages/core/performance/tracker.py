@@ -14,7 +14,7 @@ import statistics
 import structlog
 from pydantic import BaseModel, Field
 
-from packages.core.agents.financial_base import TransactionType
+from packages.core.performance.sketch import QuantileSketch
 
 
 logger = structlog.get_logger(__name__)
@@ -47,6 +47,27 @@ class PerformanceSummary(BaseModel):
     last_updated: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class _RunningStats:
+    """Constant-memory running totals for a stream of transaction metrics"""
+    
+    __slots__ = ("count", "success_count", "total_amount", "processing_times", "amounts")
+    
+    def __init__(self):
+        self.count = 0
+        self.success_count = 0
+        self.total_amount = 0.0
+        self.processing_times = QuantileSketch()
+        self.amounts = QuantileSketch()
+    
+    def add(self, metric: PerformanceMetrics) -> None:
+        self.count += 1
+        if metric.success:
+            self.success_count += 1
+        self.total_amount += metric.amount
+        self.processing_times.add(metric.processing_time)
+        self.amounts.add(metric.amount)
+
+
 class PerformanceTracker:
     """
     Performance tracker for monitoring orchestration performance
@@ -55,6 +76,10 @@ class PerformanceTracker:
     including processing times, success rates, throughput, and amounts.
     """
     
+    # How long per-bucket summaries and sketches are kept
+    HOURLY_RETENTION_HOURS = 24
+    DAILY_RETENTION_DAYS = 7
+    
     def __init__(self, enabled: bool = True, sampling_rate: float = 1.0, max_samples: int = 10000):
         self.enabled = enabled
         self.sampling_rate = sampling_rate
@@ -68,6 +93,12 @@ class PerformanceTracker:
         self._hourly_summaries: Dict[str, PerformanceSummary] = {}
         self._daily_summaries: Dict[str, PerformanceSummary] = {}
         
+        # Running statistics so reads never rescan the sample buffer
+        self._totals = _RunningStats()
+        self._type_totals: Dict[str, _RunningStats] = defaultdict(_RunningStats)
+        self._hourly_sketches: Dict[str, QuantileSketch] = {}
+        self._daily_sketches: Dict[str, QuantileSketch] = {}
+        
         # Real-time counters
         self._current_hour_count = 0
         self._current_day_count = 0
@@ -118,6 +149,8 @@ class PerformanceTracker:
             
             async with self._metrics_lock:
                 self._metrics.append(metric)
+                self._totals.add(metric)
+                self._type_totals[metric.transaction_type].add(metric)
                 await self._update_summaries(metric)
             
             self.logger.debug(
@@ -136,6 +169,7 @@ class PerformanceTracker:
             # Update hourly summary
             hour_key = metric.timestamp.strftime("%Y-%m-%d-%H")
             if hour_key not in self._hourly_summaries:
+                self._evict_expired_buckets(datetime.now(timezone.utc))
                 self._hourly_summaries[hour_key] = PerformanceSummary(
                     total_transactions=0,
                     successful_transactions=0,
@@ -163,18 +197,12 @@ class PerformanceTracker:
             summary.average_amount = summary.total_amount_processed / summary.total_transactions
             
             # Update processing time statistics
-            processing_times = [m.processing_time for m in self._get_metrics_for_hour(hour_key)]
-            if processing_times:
-                summary.average_processing_time = statistics.mean(processing_times)
-                summary.median_processing_time = statistics.median(processing_times)
-                summary.min_processing_time = min(processing_times)
-                summary.max_processing_time = max(processing_times)
+            hour_sketch = self._bucket_sketch(self._hourly_sketches, hour_key)
+            hour_sketch.add(metric.processing_time)
+            self._apply_sketch(summary, hour_sketch)
             
             # Calculate throughput (transactions per minute)
-            hour_start = datetime.strptime(hour_key, "%Y-%m-%d-%H").replace(tzinfo=timezone.utc)
-            hour_end = hour_start + timedelta(hours=1)
-            hour_metrics = [m for m in self._metrics if hour_start <= m.timestamp < hour_end]
-            summary.throughput_per_minute = len(hour_metrics) / 60.0
+            summary.throughput_per_minute = summary.total_transactions / 60.0
             
             summary.last_updated = datetime.now(timezone.utc)
             
@@ -208,24 +236,49 @@ class PerformanceTracker:
             daily_summary.average_amount = daily_summary.total_amount_processed / daily_summary.total_transactions
             
             # Update daily processing time statistics
-            daily_processing_times = [m.processing_time for m in self._get_metrics_for_day(day_key)]
-            if daily_processing_times:
-                daily_summary.average_processing_time = statistics.mean(daily_processing_times)
-                daily_summary.median_processing_time = statistics.median(daily_processing_times)
-                daily_summary.min_processing_time = min(daily_processing_times)
-                daily_summary.max_processing_time = max(daily_processing_times)
+            day_sketch = self._bucket_sketch(self._daily_sketches, day_key)
+            day_sketch.add(metric.processing_time)
+            self._apply_sketch(daily_summary, day_sketch)
             
             # Calculate daily throughput
-            day_start = datetime.strptime(day_key, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-            day_end = day_start + timedelta(days=1)
-            day_metrics = [m for m in self._metrics if day_start <= m.timestamp < day_end]
-            daily_summary.throughput_per_minute = len(day_metrics) / (24 * 60.0)
+            daily_summary.throughput_per_minute = daily_summary.total_transactions / (24 * 60.0)
             
             daily_summary.last_updated = datetime.now(timezone.utc)
             
         except Exception as e:
             self.logger.error("Failed to update performance summaries", error=str(e))
     
+    @staticmethod
+    def _bucket_sketch(sketches: Dict[str, QuantileSketch], key: str) -> QuantileSketch:
+        """Get (or create) the sketch for a time bucket"""
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = QuantileSketch()
+            sketches[key] = sketch
+        return sketch
+    
+    def _evict_expired_buckets(self, now: datetime) -> None:
+        """Drop hourly/daily summaries and their sketches once they leave the retention window"""
+        hour_cutoff = (now - timedelta(hours=self.HOURLY_RETENTION_HOURS)).strftime("%Y-%m-%d-%H")
+        day_cutoff = (now - timedelta(days=self.DAILY_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        
+        # Keys are zero-padded timestamps, so string order is chronological order
+        for summaries, sketches, cutoff in (
+            (self._hourly_summaries, self._hourly_sketches, hour_cutoff),
+            (self._daily_summaries, self._daily_sketches, day_cutoff),
+        ):
+            for key in [k for k in summaries.keys() | sketches.keys() if k < cutoff]:
+                summaries.pop(key, None)
+                sketches.pop(key, None)
+    
+    @staticmethod
+    def _apply_sketch(summary: PerformanceSummary, sketch: QuantileSketch) -> None:
+        """Copy processing time statistics from a sketch into a summary"""
+        summary.average_processing_time = sketch.mean
+        summary.median_processing_time = sketch.quantile(0.5)
+        summary.min_processing_time = sketch.min
+        summary.max_processing_time = sketch.max
+    
     def _get_metrics_for_hour(self, hour_key: str) -> List[PerformanceMetrics]:
         """Get metrics for a specific hour"""
         try:
@@ -279,24 +332,25 @@ class PerformanceTracker:
     async def _get_all_metrics(self) -> Dict[str, Any]:
         """Get metrics for all time"""
         try:
-            if not self._metrics:
+            totals = self._totals
+            if not totals.count:
                 return {"total_transactions": 0}
             
-            processing_times = [m.processing_time for m in self._metrics]
-            amounts = [m.amount for m in self._metrics]
-            success_count = sum(1 for m in self._metrics if m.success)
+            processing_times = totals.processing_times
             
             return {
-                "total_transactions": len(self._metrics),
-                "successful_transactions": success_count,
-                "failed_transactions": len(self._metrics) - success_count,
-                "success_rate": success_count / len(self._metrics) if self._metrics else 0.0,
-                "average_processing_time": statistics.mean(processing_times) if processing_times else 0.0,
-                "median_processing_time": statistics.median(processing_times) if processing_times else 0.0,
-                "min_processing_time": min(processing_times) if processing_times else 0.0,
-                "max_processing_time": max(processing_times) if processing_times else 0.0,
-                "total_amount_processed": sum(amounts),
-                "average_amount": statistics.mean(amounts) if amounts else 0.0,
+                "total_transactions": totals.count,
+                "successful_transactions": totals.success_count,
+                "failed_transactions": totals.count - totals.success_count,
+                "success_rate": totals.success_count / totals.count,
+                "average_processing_time": processing_times.mean,
+                "median_processing_time": processing_times.quantile(0.5),
+                "p95_processing_time": processing_times.quantile(0.95),
+                "p99_processing_time": processing_times.quantile(0.99),
+                "min_processing_time": processing_times.min,
+                "max_processing_time": processing_times.max,
+                "total_amount_processed": totals.total_amount,
+                "average_amount": totals.amounts.mean,
                 "last_updated": datetime.now(timezone.utc).isoformat()
             }
         except Exception as e:
@@ -362,38 +416,23 @@ class PerformanceTracker:
     async def get_transaction_type_metrics(self) -> Dict[str, Any]:
         """Get metrics broken down by transaction type"""
         try:
-            if not self.enabled or not self._metrics:
+            if not self.enabled or not self._type_totals:
                 return {}
             
-            type_metrics = defaultdict(lambda: {
-                "count": 0,
-                "success_count": 0,
-                "total_amount": 0.0,
-                "processing_times": []
-            })
-            
-            for metric in self._metrics:
-                type_metrics[metric.transaction_type]["count"] += 1
-                type_metrics[metric.transaction_type]["total_amount"] += metric.amount
-                type_metrics[metric.transaction_type]["processing_times"].append(metric.processing_time)
-                
-                if metric.success:
-                    type_metrics[metric.transaction_type]["success_count"] += 1
-            
             # Calculate statistics for each type
             result = {}
-            for tx_type, metrics in type_metrics.items():
-                processing_times = metrics["processing_times"]
+            for tx_type, totals in self._type_totals.items():
+                processing_times = totals.processing_times
                 result[tx_type] = {
-                    "count": metrics["count"],
-                    "success_count": metrics["success_count"],
-                    "success_rate": metrics["success_count"] / metrics["count"] if metrics["count"] > 0 else 0.0,
-                    "total_amount": metrics["total_amount"],
-                    "average_amount": metrics["total_amount"] / metrics["count"] if metrics["count"] > 0 else 0.0,
-                    "average_processing_time": statistics.mean(processing_times) if processing_times else 0.0,
-                    "median_processing_time": statistics.median(processing_times) if processing_times else 0.0,
-                    "min_processing_time": min(processing_times) if processing_times else 0.0,
-                    "max_processing_time": max(processing_times) if processing_times else 0.0
+                    "count": totals.count,
+                    "success_count": totals.success_count,
+                    "success_rate": totals.success_count / totals.count if totals.count > 0 else 0.0,
+                    "total_amount": totals.total_amount,
+                    "average_amount": totals.total_amount / totals.count if totals.count > 0 else 0.0,
+                    "average_processing_time": processing_times.mean,
+                    "median_processing_time": processing_times.quantile(0.5) or 0.0,
+                    "min_processing_time": processing_times.min if totals.count else 0.0,
+                    "max_processing_time": processing_times.max if totals.count else 0.0
                 }
             
             return result
@@ -409,6 +448,10 @@ class PerformanceTracker:
                 self._metrics.clear()
                 self._hourly_summaries.clear()
                 self._daily_summaries.clear()
+                self._hourly_sketches.clear()
+                self._daily_sketches.clear()
+                self._totals = _RunningStats()
+                self._type_totals.clear()
             
             self.logger.info("Performance metrics cleared")
             
@@ -10,12 +10,27 @@ Payment system integrations including:
 __version__ = "0.1.0"
 __author__ = "Canza Team"
 
-from .mobile_money import MobileMoneyIntegration
-from .blockchain import BlockchainIntegration
-from .banking import BankingIntegration
+import importlib
 
 __all__ = [
     "MobileMoneyIntegration",
     "BlockchainIntegration",
     "BankingIntegration",
-] 
\ No newline at end of file
+]
+
+# Integrations load on first access so light submodules such as
+# ``packages.integrations.data.codec`` import without the provider SDKs
+_LAZY = {
+    "MobileMoneyIntegration": ".mobile_money",
+    "BlockchainIntegration": ".blockchain",
+    "BankingIntegration": ".banking",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value 
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Typed Binary Codec
+
+Compact, type-preserving serialization for values stored in Redis.
+Payloads are msgpack with registered extension types for Decimal, UUID,
+datetime, date, Enum and integers outside msgpack's 64-bit range (wei
+amounts), behind a two-byte header (marker + version) so the
+format can evolve and legacy JSON values can still be read. Nothing is ever
+unpickled.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Tuple, Type, Union
+from uuid import UUID
+
+import msgpack
+
+
+# 0xC1 is never used by msgpack and never starts valid UTF-8, so a stored
+# value is unambiguously either a codec payload or legacy text
+CODEC_MARKER = 0xC1
+CODEC_VERSION = 1
+_HEADER = bytes((CODEC_MARKER, CODEC_VERSION))
+
+EXT_DECIMAL = 1
+EXT_UUID = 2
+EXT_DATETIME = 3
+EXT_DATE = 4
+EXT_ENUM = 5
+EXT_BIGINT = 6
+
+# msgpack packs integers natively only within this range
+_INT_MIN = -(1 << 63)
+_INT_MAX = (1 << 64) - 1
+
+# Subclasses of these are stored as the base type
+_PLAIN_BASES = (bool, int, float, str, bytes, dict, list)
+
+
+class CodecError(ValueError):
+    """Raised when a stored payload cannot be decoded"""
+
+
+class TypedCodec:
+    """
+    msgpack codec with pluggable extension types.
+
+    Each extension maps a Python type to an ext code and a pair of
+    ``bytes`` converters. Enums must be registered by class so decoding
+    never imports arbitrary names from stored data.
+    """
+
+    def __init__(self):
+        self._encoders: Dict[type, Tuple[int, Callable[[Any], bytes]]] = {}
+        self._decoders: Dict[int, Callable[[bytes], Any]] = {}
+        self._enums: Dict[str, Type[Enum]] = {}
+
+    def register(self, type_: type, code: int,
+                 encode: Callable[[Any], bytes], decode: Callable[[bytes], Any]) -> None:
+        """Register an extension type (``code`` in 0-127)"""
+        if code in self._decoders:
+            raise ValueError(f"Extension code {code} already registered")
+        self._encoders[type_] = (code, encode)
+        self._decoders[code] = decode
+
+    def register_enum(self, enum_cls: Type[Enum]) -> Type[Enum]:
+        """Register an Enum so it round-trips as itself (usable as a decorator)"""
+        self._enums[f"{enum_cls.__module__}.{enum_cls.__qualname__}"] = enum_cls
+        return enum_cls
+
+    def encode(self, value: Any) -> bytes:
+        return _HEADER + self._pack(value)
+
+    def decode(self, data: Union[bytes, str, None]) -> Any:
+        """
+        Decode a stored value.
+
+        Codec payloads are unpacked; anything else is treated as legacy
+        text: JSON if it parses, otherwise returned as a plain string.
+        """
+        if data is None:
+            return None
+        if isinstance(data, (bytes, bytearray)) and data[:1] == _HEADER[:1]:
+            if data[1:2] != _HEADER[1:2]:
+                raise CodecError(f"Unsupported codec version {data[1] if len(data) > 1 else None}")
+            try:
+                return msgpack.unpackb(data[2:], ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+            except (ValueError, msgpack.UnpackException) as e:
+                raise CodecError(f"Corrupt codec payload: {e}") from e
+        return decode_legacy(data)
+
+    def _default(self, value: Any) -> Any:
+        # Packing is strict about types, so subclasses (str-based enums,
+        # OrderedDict, tuples, ...) arrive here rather than being flattened
+        if isinstance(value, Enum):
+            name = f"{type(value).__module__}.{type(value).__qualname__}"
+            if name in self._enums:
+                return msgpack.ExtType(EXT_ENUM, self._pack([name, value.value]))
+            return value.value
+
+        # msgpack hands over integers it cannot pack; keep them as decimal text
+        if isinstance(value, int) and not isinstance(value, bool) and not _INT_MIN <= value <= _INT_MAX:
+            return msgpack.ExtType(EXT_BIGINT, str(int(value)).encode())
+
+        encoder = self._encoders.get(type(value))
+        if encoder is None:
+            for type_, candidate in self._encoders.items():
+                if isinstance(value, type_):
+                    encoder = candidate
+                    break
+        if encoder is not None:
+            code, encode = encoder
+            return msgpack.ExtType(code, encode(value))
+
+        for base in _PLAIN_BASES:
+            if isinstance(value, base):
+                return base(value)
+        if isinstance(value, (tuple, set, frozenset)):
+            return list(value)
+        raise TypeError(f"Object of type {type(value).__name__} is not serializable by TypedCodec")
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == EXT_BIGINT:
+            return int(data.decode())
+        if code == EXT_ENUM:
+            name, value = msgpack.unpackb(data, ext_hook=self._ext_hook, raw=False)
+            enum_cls = self._enums.get(name)
+            return enum_cls(value) if enum_cls is not None else value
+        decode = self._decoders.get(code)
+        if decode is None:
+            raise CodecError(f"Unknown extension code {code}")
+        return decode(data)
+
+    def _pack(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=self._default, use_bin_type=True, strict_types=True)
+
+
+def decode_legacy(data: Union[bytes, str]) -> Any:
+    """Read a value written before the codec (JSON or plain text)"""
+    if isinstance(data, (bytes, bytearray)):
+        try:
+            data = data.decode("utf-8")
+        except UnicodeDecodeError:
+            # Pre-codec pickle payloads are not loaded
+            raise CodecError("Undecodable legacy payload")
+    try:
+        return json.loads(data)
+    except ValueError:
+        return data
+
+
+def _build_default_codec() -> TypedCodec:
+    codec = TypedCodec()
+    codec.register(Decimal, EXT_DECIMAL, lambda v: str(v).encode(), lambda b: Decimal(b.decode()))
+    codec.register(UUID, EXT_UUID, lambda v: v.bytes, lambda b: UUID(bytes=b))
+    # datetime before date: datetime is a date subclass
+    codec.register(datetime, EXT_DATETIME, lambda v: v.isoformat().encode(),
+                   lambda b: datetime.fromisoformat(b.decode()))
+    codec.register(date, EXT_DATE, lambda v: v.isoformat().encode(), lambda b: date.fromisoformat(b.decode()))
+    return codec
+
+
+default_codec = _build_default_codec()
+
+
+def encode(value: Any) -> bytes:
+    return default_codec.encode(value)
+
+
+def decode(data: Union[bytes, str, None]) -> Any:
+    return default_codec.decode(data)
+
+
+def register_enum(enum_cls: Type[Enum]) -> Type[Enum]:
+    return default_codec.register_enum(enum_cls)
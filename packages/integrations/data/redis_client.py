@@ -8,7 +8,7 @@ with support for serialization, connection pooling, and fallback mechanisms.
 import asyncio
 import json
 import pickle
-from typing import Optional, Any, List, Dict, Union
+from typing import Optional, Any, Iterable, List, Dict, Mapping, Union
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -16,6 +16,8 @@ import redis.asyncio as redis
 import structlog
 from pydantic import BaseModel, Field
 
+from .codec import CodecError, default_codec
+
 
 logger = structlog.get_logger(__name__)
 
@@ -25,6 +27,8 @@ class SerializationFormat(str, Enum):
     JSON = "json"
     PICKLE = "pickle"
     STRING = "string"
+    # Typed binary codec (msgpack); AUTO writes it and also reads legacy JSON/text
+    TYPED = "typed"
     AUTO = "auto"
 
 
@@ -58,7 +62,8 @@ class RedisClient:
     Redis client with advanced features
     
     Provides a unified interface for Redis operations with:
-    - Automatic serialization/deserialization
+    - Automatic serialization/deserialization (typed binary codec by default)
+    - Bulk get/set/delete in a single round trip
     - Connection pooling and health checks
     - Mock fallback for development
     - Error handling and retry logic
@@ -82,8 +87,8 @@ class RedisClient:
             # Create Redis client
             self._redis_client = redis.from_url(
                 self.config.url,
-                encoding="utf-8",
-                decode_responses=True,
+                # Values are binary codec payloads; text is decoded per format
+                decode_responses=False,
                 socket_connect_timeout=self.config.socket_connect_timeout,
                 socket_timeout=self.config.socket_timeout,
                 retry_on_timeout=self.config.retry_on_timeout,
@@ -150,59 +155,44 @@ class RedisClient:
         else:
             raise RuntimeError("No Redis client available")
     
-    def _serialize(self, value: Any, format: SerializationFormat = None) -> str:
-        """Serialize value to string"""
-        try:
-            serialization_format = format or self.config.default_serialization
-            
-            if serialization_format == SerializationFormat.JSON:
-                return json.dumps(value)
-            elif serialization_format == SerializationFormat.PICKLE:
-                return pickle.dumps(value).decode('latin1')
-            elif serialization_format == SerializationFormat.STRING:
-                return str(value)
-            elif serialization_format == SerializationFormat.AUTO:
-                # Try JSON first, fallback to pickle
-                try:
-                    return json.dumps(value)
-                except (TypeError, ValueError):
-                    return pickle.dumps(value).decode('latin1')
-            else:
-                raise ValueError(f"Unknown serialization format: {serialization_format}")
-                
-        except Exception as e:
-            self.logger.error("Failed to serialize value", error=str(e))
+    def _serialize(self, value: Any, format: SerializationFormat = None) -> Union[bytes, str]:
+        """Serialize value for storage"""
+        serialization_format = format or self.config.default_serialization
+        
+        if serialization_format in (SerializationFormat.AUTO, SerializationFormat.TYPED):
+            return default_codec.encode(value)
+        elif serialization_format == SerializationFormat.JSON:
+            return json.dumps(value)
+        elif serialization_format == SerializationFormat.PICKLE:
+            return pickle.dumps(value)
+        elif serialization_format == SerializationFormat.STRING:
             return str(value)
+        else:
+            raise ValueError(f"Unknown serialization format: {serialization_format}")
     
-    def _deserialize(self, value: str, format: SerializationFormat = None) -> Any:
-        """Deserialize value from string"""
+    def _deserialize(self, value: Optional[bytes], format: SerializationFormat = None) -> Any:
+        """Deserialize a stored value"""
         try:
             if value is None:
                 return None
             
             serialization_format = format or self.config.default_serialization
             
-            if serialization_format == SerializationFormat.JSON:
+            if serialization_format in (SerializationFormat.AUTO, SerializationFormat.TYPED):
+                return default_codec.decode(value)
+            elif serialization_format == SerializationFormat.JSON:
                 return json.loads(value)
             elif serialization_format == SerializationFormat.PICKLE:
-                return pickle.loads(value.encode('latin1'))
+                # Explicit opt-in only; never used for AUTO
+                return pickle.loads(value if isinstance(value, bytes) else value.encode('latin1'))
             elif serialization_format == SerializationFormat.STRING:
-                return value
-            elif serialization_format == SerializationFormat.AUTO:
-                # Try JSON first, fallback to pickle
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    try:
-                        return pickle.loads(value.encode('latin1'))
-                    except Exception:
-                        return value
+                return _text(value)
             else:
                 raise ValueError(f"Unknown serialization format: {serialization_format}")
                 
-        except Exception as e:
+        except (CodecError, ValueError, pickle.UnpicklingError) as e:
             self.logger.error("Failed to deserialize value", error=str(e))
-            return value
+            return None
     
     async def get(self, key: str, default: Any = None, format: SerializationFormat = None) -> Any:
         """Get value from Redis"""
@@ -234,6 +224,66 @@ class RedisClient:
             self.logger.warning("Failed to set in Redis", key=key, error=str(e))
             return False
     
+    async def get_many(self, keys: Iterable[str], format: SerializationFormat = None) -> Dict[str, Any]:
+        """
+        Get several values in one round trip (MGET)
+        
+        Returns:
+            Mapping of the keys that were found to their values
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            client = self._get_client()
+            values = await client.mget(keys)
+            
+        except Exception as e:
+            self.logger.warning("Failed to get many from Redis", count=len(keys), error=str(e))
+            return {}
+        
+        result = {}
+        for key, raw in zip(keys, values):
+            if raw is not None:
+                value = self._deserialize(raw, format)
+                if value is not None:
+                    result[key] = value
+        return result
+    
+    async def set_many(self, mapping: Mapping[str, Any], ttl: Optional[int] = None,
+                       format: SerializationFormat = None) -> bool:
+        """Set several values in one round trip (MSET, or a pipeline of SET EX when ``ttl`` is given)"""
+        if not mapping:
+            return True
+        try:
+            client = self._get_client()
+            serialized = {key: self._serialize(value, format) for key, value in mapping.items()}
+            
+            if not ttl:
+                return bool(await client.mset(serialized))
+            
+            pipe = client.pipeline(transaction=False)
+            for key, value in serialized.items():
+                pipe.set(key, value, ex=ttl)
+            return all(await pipe.execute())
+            
+        except Exception as e:
+            self.logger.warning("Failed to set many in Redis", count=len(mapping), error=str(e))
+            return False
+    
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys in one round trip; returns how many existed"""
+        keys = list(keys)
+        if not keys:
+            return 0
+        try:
+            client = self._get_client()
+            return await client.delete(*keys)
+            
+        except Exception as e:
+            self.logger.warning("Failed to delete many from Redis", count=len(keys), error=str(e))
+            return 0
+    
     async def delete(self, key: str) -> bool:
         """Delete value from Redis"""
         try:
@@ -330,7 +380,7 @@ class RedisClient:
             result = {}
             
             for field, value in data.items():
-                result[field] = self._deserialize(value, format)
+                result[_text(field)] = self._deserialize(value, format)
             
             return result
             
@@ -352,7 +402,7 @@ class RedisClient:
         """Get keys matching pattern"""
         try:
             client = self._get_client()
-            return await client.keys(pattern)
+            return [_text(key) for key in await client.keys(pattern)]
             
         except Exception as e:
             self.logger.warning("Failed to get keys from Redis", pattern=pattern, error=str(e))
@@ -454,6 +504,10 @@ class RedisClient:
             return {"error": str(e)}
 
 
+def _text(value: Union[bytes, str]) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
 class MockRedisClient:
     """Mock Redis client for development and testing"""
     
@@ -490,14 +544,29 @@ class MockRedisClient:
         self._expiry[key] = asyncio.get_event_loop().time() + ex
         return True
     
-    async def delete(self, key: str) -> int:
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Mock mget"""
+        return [await self.get(key) for key in keys]
+    
+    async def mset(self, mapping: dict) -> bool:
+        """Mock mset"""
+        for key, value in mapping.items():
+            await self.set(key, value)
+        return True
+    
+    def pipeline(self, transaction: bool = True) -> "MockPipeline":
+        """Mock pipeline"""
+        return MockPipeline(self)
+    
+    async def delete(self, *keys: str) -> int:
         """Mock delete"""
-        if key in self._data:
-            del self._data[key]
-            if key in self._expiry:
-                del self._expiry[key]
-            return 1
-        return 0
+        deleted = 0
+        for key in keys:
+            if key in self._data:
+                del self._data[key]
+                self._expiry.pop(key, None)
+                deleted += 1
+        return deleted
     
     async def exists(self, key: str) -> int:
         """Mock exists"""
@@ -605,4 +674,24 @@ class MockRedisClient:
         """Mock close"""
         self._data.clear()
         self._expiry.clear()
-        self.logger.info("Mock Redis client closed") 
\ No newline at end of file
+        self.logger.info("Mock Redis client closed") 
+
+
+class MockPipeline:
+    """Queues commands against a MockRedisClient until ``execute``"""
+    
+    def __init__(self, client: MockRedisClient):
+        self._client = client
+        self._commands = []
+    
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+        
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+        return queue
+    
+    async def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]
@@ -6,6 +6,7 @@ from decimal import Decimal
 from .prompts import TRANSACTION_SCREENING_PROMPT, COMPLIANCE_ANALYSIS_SYSTEM_PROMPT
 from ..core.llm_provider import LLMProvider
 from ..core.mock_provider import MockLLMProvider
+from ..core.caching_provider import CachingLLMProvider
 from applications.capp.capp.models.payments import CrossBorderPayment, PaymentResult
 
 logger = structlog.get_logger(__name__)
@@ -19,7 +20,7 @@ class AIComplianceAgent:
     """
     
     def __init__(self, provider: Optional[LLMProvider] = None):
-        self.provider = provider or MockLLMProvider()
+        self.provider = CachingLLMProvider.wrap(provider or MockLLMProvider())
         self.logger = structlog.get_logger(__name__)
         
     async def evaluate_transaction(self, payment: CrossBorderPayment) -> Dict[str, Any]:
@@ -53,7 +54,8 @@ class AIComplianceAgent:
             response = await self.provider.generate_json(
                 prompt=prompt,
                 schema={}, # Schema is implicit in prompt for Mock
-                system_prompt=COMPLIANCE_ANALYSIS_SYSTEM_PROMPT
+                system_prompt=COMPLIANCE_ANALYSIS_SYSTEM_PROMPT,
+                use_case="compliance_screening"
             )
             
             self.logger.info("AI Compliance Decision", decision=response)
@@ -0,0 +1,312 @@
+"""
+Caching LLM Provider
+
+Wraps any LLMProvider with a two-level response cache, single-flight
+coalescing of identical in-flight prompts, per-use-case token/latency
+accounting and a hard latency budget.
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+from pydantic import BaseModel
+
+from .llm_provider import LLMProvider, LLMResponse
+
+logger = structlog.get_logger(__name__)
+
+_MISS = object()
+
+
+class LLMUseCasePolicy(BaseModel):
+    """Caching and latency policy for one feature calling the LLM"""
+    ttl_seconds: int = 300                          # 0 disables caching (coalescing still applies)
+    latency_budget_seconds: Optional[float] = None  # None waits for the provider indefinitely
+
+
+DEFAULT_USE_CASE = "default"
+
+DEFAULT_USE_CASE_POLICIES: Dict[str, LLMUseCasePolicy] = {
+    DEFAULT_USE_CASE: LLMUseCasePolicy(),
+    # Same parties/amount/context always get the same screening answer; on the payment path
+    "compliance_screening": LLMUseCasePolicy(ttl_seconds=3600, latency_budget_seconds=8.0),
+    # Risk for a symbol is re-asked constantly and only moves with the market
+    "market_risk": LLMUseCasePolicy(ttl_seconds=180, latency_budget_seconds=5.0),
+    "analyst_chat": LLMUseCasePolicy(ttl_seconds=60, latency_budget_seconds=15.0),
+    # Decisions trigger swaps, so never replay them from cache
+    "liquidity_decision": LLMUseCasePolicy(ttl_seconds=0, latency_budget_seconds=10.0),
+}
+
+
+class LLMLatencyBudgetExceeded(asyncio.TimeoutError):
+    """Raised when a call exceeds its use case's latency budget and no fallback was given"""
+
+
+class LLMUseCaseStats:
+    """Counters for one use case"""
+
+    def __init__(self):
+        self.requests = 0
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.coalesced = 0
+        self.provider_calls = 0
+        self.provider_errors = 0
+        self.budget_exceeded = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.provider_latency_total = 0.0
+        self.provider_latency_max = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.redis_hits
+        return {
+            "requests": self.requests,
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "coalesced": self.coalesced,
+            "hit_rate": hits / self.requests if self.requests else 0.0,
+            "provider_calls": self.provider_calls,
+            "provider_errors": self.provider_errors,
+            "budget_exceeded": self.budget_exceeded,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_provider_latency_ms": (self.provider_latency_total / self.provider_calls * 1000) if self.provider_calls else 0.0,
+            "max_provider_latency_ms": self.provider_latency_max * 1000,
+        }
+
+
+def _estimate_tokens(text: Optional[str]) -> int:
+    # ~4 characters per token; only used when the provider reports no usage
+    return (len(text) + 3) // 4 if text else 0
+
+
+class CachingLLMProvider(LLMProvider):
+    """
+    LLMProvider decorator adding caching, coalescing, accounting and budgets.
+
+    Responses are keyed by a SHA-256 of the model, call kind, system prompt,
+    schema and prompt (or an explicit ``cache_key``), held in an in-process
+    LRU and in Redis so every worker shares them. Identical prompts already
+    in flight are awaited rather than re-sent. If a call exceeds the use
+    case's latency budget the caller gets ``fallback`` (or
+    ``LLMLatencyBudgetExceeded``) immediately while the provider call keeps
+    running in the background and fills the cache for the next caller.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        cache: Any = None,
+        policies: Optional[Dict[str, LLMUseCasePolicy]] = None,
+        max_memory_entries: int = 1024,
+        namespace: str = "llm:cache",
+        enabled: bool = True,
+    ):
+        self.provider = provider
+        self.policies = {**DEFAULT_USE_CASE_POLICIES, **(policies or {})}
+        self.max_memory_entries = max_memory_entries
+        self.namespace = namespace
+        self.enabled = enabled
+
+        self._cache = cache
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, LLMUseCaseStats] = {}
+
+    @classmethod
+    def wrap(cls, provider: LLMProvider, **kwargs) -> "CachingLLMProvider":
+        """Wrap ``provider`` unless it already is a caching provider"""
+        if isinstance(provider, cls):
+            return provider
+        from applications.capp.capp.config.settings import get_settings
+        settings = get_settings()
+        kwargs.setdefault("enabled", settings.LLM_CACHE_ENABLED)
+        kwargs.setdefault("max_memory_entries", settings.LLM_CACHE_MAX_ENTRIES)
+        return cls(provider, **kwargs)
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.provider, "model_name", type(self.provider).__name__)
+
+    # ------------------------------------------------------------------
+    # LLMProvider API
+    # ------------------------------------------------------------------
+
+    async def generate_text(self, prompt: str, system_prompt: Optional[str] = None, *,
+                            use_case: str = DEFAULT_USE_CASE, cache_key: Optional[str] = None,
+                            fallback: Optional[str] = None) -> LLMResponse:
+        """Generate text completion (cached per ``use_case``)"""
+        async def call() -> Dict[str, Any]:
+            response = await self.provider.generate_text(prompt=prompt, system_prompt=system_prompt)
+            return {"content": response.content, "usage": dict(response.usage or {})}
+
+        result = await self._cached_call(
+            "text", use_case, prompt, system_prompt, None, cache_key, call,
+            None if fallback is None else {"content": fallback, "usage": {}, "fallback": True},
+        )
+        raw = {"fallback": True} if result.get("fallback") else {"cached": True}
+        return LLMResponse(content=result["content"], raw_response=raw, usage=result.get("usage", {}))
+
+    async def generate_json(self, prompt: str, schema: Dict[str, Any], system_prompt: Optional[str] = None, *,
+                            use_case: str = DEFAULT_USE_CASE, cache_key: Optional[str] = None,
+                            fallback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Generate structured JSON response (cached per ``use_case``)"""
+        async def call() -> Dict[str, Any]:
+            return await self.provider.generate_json(prompt=prompt, schema=schema, system_prompt=system_prompt)
+
+        return await self._cached_call("json", use_case, prompt, system_prompt, schema, cache_key, call, fallback)
+
+    # ------------------------------------------------------------------
+    # Accounting
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-use-case cache, token and latency counters"""
+        return {use_case: stats.to_dict() for use_case, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        """Drop the in-process cache (Redis entries expire on their own)"""
+        self._memory.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _policy(self, use_case: str) -> LLMUseCasePolicy:
+        return self.policies.get(use_case) or self.policies[DEFAULT_USE_CASE]
+
+    def _key(self, kind: str, use_case: str, prompt: str, system_prompt: Optional[str],
+             schema: Optional[Dict[str, Any]], cache_key: Optional[str]) -> str:
+        material = json.dumps({
+            "model": self.model_name,
+            "kind": kind,
+            "system": system_prompt,
+            "schema": schema,
+            "prompt": prompt if cache_key is None else None,
+            "key": cache_key,
+        }, sort_keys=True, default=str)
+        return f"{self.namespace}:{use_case}:{hashlib.sha256(material.encode()).hexdigest()}"
+
+    async def _cached_call(self, kind: str, use_case: str, prompt: str, system_prompt: Optional[str],
+                           schema: Optional[Dict[str, Any]], cache_key: Optional[str],
+                           call: Callable[[], Awaitable[Any]], fallback: Any) -> Any:
+        policy = self._policy(use_case)
+        stats = self._stats.setdefault(use_case, LLMUseCaseStats())
+        stats.requests += 1
+
+        key = self._key(kind, use_case, prompt, system_prompt, schema, cache_key)
+        cacheable = self.enabled and policy.ttl_seconds > 0
+
+        if cacheable:
+            value = self._memory_get(key)
+            if value is not _MISS:
+                stats.memory_hits += 1
+                return copy.deepcopy(value)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, prompt, policy, stats, call, cacheable))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_load_done(key, t))
+        else:
+            stats.coalesced += 1
+
+        try:
+            # shield: a caller giving up must not cancel the shared provider call
+            if policy.latency_budget_seconds:
+                value = await asyncio.wait_for(asyncio.shield(task), policy.latency_budget_seconds)
+            else:
+                value = await asyncio.shield(task)
+        except asyncio.TimeoutError:
+            stats.budget_exceeded += 1
+            logger.warning("LLM latency budget exceeded", use_case=use_case, budget_s=policy.latency_budget_seconds)
+            if fallback is not None:
+                return copy.deepcopy(fallback)
+            raise LLMLatencyBudgetExceeded(
+                f"LLM call for '{use_case}' exceeded {policy.latency_budget_seconds}s budget"
+            )
+
+        return copy.deepcopy(value)
+
+    async def _load(self, key: str, prompt: str, policy: LLMUseCasePolicy, stats: LLMUseCaseStats,
+                    call: Callable[[], Awaitable[Any]], cacheable: bool) -> Any:
+        cache = self._get_cache() if cacheable else None
+        if cache is not None:
+            value = await cache.get(key)
+            if value is not None:
+                stats.redis_hits += 1
+                self._memory_set(key, value, policy.ttl_seconds)
+                return value
+
+        started = time.perf_counter()
+        try:
+            value = await call()
+        except Exception:
+            stats.provider_errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.provider_calls += 1
+            stats.provider_latency_total += elapsed
+            stats.provider_latency_max = max(stats.provider_latency_max, elapsed)
+
+        self._account_tokens(stats, prompt, value)
+
+        if cacheable:
+            self._memory_set(key, value, policy.ttl_seconds)
+            if cache is not None:
+                await cache.set(key, value, ttl=policy.ttl_seconds)
+        return value
+
+    def _on_load_done(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every waiter already timed out
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    def _account_tokens(stats: LLMUseCaseStats, prompt: str, value: Any) -> None:
+        usage = value.get("usage") if isinstance(value, dict) and isinstance(value.get("usage"), dict) else {}
+        prompt_tokens = usage.get("prompt_tokens") or usage.get("prompt_token_count")
+        completion_tokens = usage.get("completion_tokens") or usage.get("candidates_token_count")
+        if prompt_tokens is None:
+            prompt_tokens = _estimate_tokens(prompt)
+        if completion_tokens is None:
+            content = value.get("content") if isinstance(value, dict) and "content" in value else json.dumps(value, default=str)
+            completion_tokens = _estimate_tokens(content)
+        stats.prompt_tokens += int(prompt_tokens)
+        stats.completion_tokens += int(completion_tokens)
+
+    def _memory_get(self, key: str) -> Any:
+        entry = self._memory.get(key)
+        if entry is None:
+            return _MISS
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._memory[key]
+            return _MISS
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self._memory[key] = (time.monotonic() + ttl_seconds, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _get_cache(self) -> Any:
+        if self._cache is None:
+            try:
+                from applications.capp.capp.core.redis import get_cache
+                self._cache = get_cache()
+            except Exception as e:
+                logger.warning("LLM cache running without Redis", error=str(e))
+                self._cache = False
+        return self._cache or None
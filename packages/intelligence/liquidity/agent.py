@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional
 from .prompts import LIQUIDITY_MANAGEMENT_SYSTEM_PROMPT, REBALANCE_DECISION_PROMPT
 from ..core.llm_provider import LLMProvider
 from ..core.mock_provider import MockLLMProvider
+from ..core.caching_provider import CachingLLMProvider
 from ..market.analyst import MarketAnalysisAgent
 from applications.capp.capp.core.aptos import get_aptos_client, AptosClient
 from applications.capp.capp.config.settings import get_settings
@@ -19,7 +20,7 @@ class LiquidityManagementAgent:
     
     def __init__(self, provider: Optional[LLMProvider] = None):
         self.settings = get_settings()
-        self.provider = provider or MockLLMProvider()
+        self.provider = CachingLLMProvider.wrap(provider or MockLLMProvider())
         self.market_agent = MarketAnalysisAgent(provider=self.provider)
         self.logger = structlog.get_logger(__name__)
         
@@ -64,7 +65,8 @@ class LiquidityManagementAgent:
             decision = await self.provider.generate_json(
                 prompt=prompt,
                 schema={},
-                system_prompt=LIQUIDITY_MANAGEMENT_SYSTEM_PROMPT
+                system_prompt=LIQUIDITY_MANAGEMENT_SYSTEM_PROMPT,
+                use_case="liquidity_decision"
             )
             
             # 5. Execute Action (if SWAP)
@@ -6,6 +6,7 @@ from decimal import Decimal
 from .prompts import MARKET_ANALYSIS_SYSTEM_PROMPT, VOLATILITY_ANALYSIS_PROMPT
 from ..core.llm_provider import LLMProvider
 from ..core.mock_provider import MockLLMProvider
+from ..core.caching_provider import CachingLLMProvider
 from applications.capp.capp.services.market_data import RealTimeMarketService
 from applications.capp.capp.services.chain_metrics import ChainMetricsService
 from applications.capp.capp.config.settings import get_settings
@@ -23,7 +24,7 @@ class MarketAnalysisAgent:
     
     def __init__(self, provider: Optional[LLMProvider] = None):
         self.settings = get_settings()
-        self.provider = provider or MockLLMProvider()
+        self.provider = CachingLLMProvider.wrap(provider or MockLLMProvider())
         self.market_service = RealTimeMarketService()
         self.chain_service = ChainMetricsService()
         self.logger = structlog.get_logger(__name__)
@@ -81,7 +82,7 @@ class MarketAnalysisAgent:
         # 3. Construct Prompt with Real Data
         prompt = VOLATILITY_ANALYSIS_PROMPT.format(
             symbol=symbol,
-            price=market_data["price"],
+            price=market_data.get("price"),
             currency="USD",
             percent_change_24h=market_data["percent_change_24h"],
             volume_24h=market_data["volume_24h"],
@@ -89,12 +90,21 @@ class MarketAnalysisAgent:
             settlement_amount=settlement_amount_usd
         )
         
+        # Price to 3 significant figures: small ticks reuse the cached assessment
+        current_price = market_data.get("price")
+        try:
+            price_key = f"{current_price:.3g}"
+        except (TypeError, ValueError):
+            price_key = str(current_price)
+        
         # 4. Call LLM
         try:
             response = await self.provider.generate_json(
                 prompt=prompt,
                 schema={},
-                system_prompt=MARKET_ANALYSIS_SYSTEM_PROMPT
+                system_prompt=MARKET_ANALYSIS_SYSTEM_PROMPT,
+                use_case="market_risk",
+                cache_key=f"{symbol}|{price_key}|{settlement_amount_usd:.0f}|{congestion}|{gas_price}"
             )
             
             self.logger.info("Market Analysis Completed", recommendation=response.get("recommendation"))
@@ -113,7 +123,7 @@ class MarketAnalysisAgent:
         Interactively chat with the analyst about market conditions.
         """
         # 1. Fetch Context (Market + Chain) for 'Current Awareness'
-        # For efficiency, we might cache this, but for now we fetch fresh.
+        # The LLM assessment is served from the market_risk cache while it is fresh.
         # We default to APT/USD context for general questions if not specified.
         params = await self.analyze_settlement_risk("APT", 1000)
         
@@ -139,7 +149,8 @@ class MarketAnalysisAgent:
         # 3. Call LLM
         response = await self.provider.generate_text(
             prompt=query,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            use_case="analyst_chat"
         )
         return response.content
 
@@ -4,5 +4,7 @@ ML Configuration
 
 class MLConfig:
     MODEL_PATH = "packages/ml/models/route_optimization_model.zip"
+    # NumPy export of the policy network used for inference (see inference/policy_export.py)
+    POLICY_WEIGHTS_PATH = "packages/ml/models/route_optimization_policy.npz"
     MAX_CANDIDATE_ROUTES = 5
     OBSERVATION_DIM = 20  # Dimension of the observation vector
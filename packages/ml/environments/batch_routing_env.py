@@ -0,0 +1,113 @@
+import numpy as np
+import structlog
+from gymnasium import spaces
+from typing import Any, List, Optional, Sequence, Type, Union
+
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvIndices
+
+from .payment_routing_env import (
+    CONTEXT_FEATURES,
+    FEATURES_PER_ROUTE,
+    build_observations,
+    compute_rewards,
+    sample_synthetic_episodes,
+)
+from .replay import PaymentMemoryReplay
+
+logger = structlog.get_logger(__name__)
+
+
+class BatchPaymentRoutingEnv(VecEnv):
+    """
+    NumPy-vectorized version of PaymentRoutingEnv.
+
+    Steps ``num_envs`` one-step routing episodes at once as arrays: episode
+    generation, observations and rewards are computed with whole-batch NumPy
+    operations instead of per-env Python objects. It plugs straight into
+    stable-baselines3 in place of a DummyVecEnv/SubprocVecEnv of
+    PaymentRoutingEnv instances and produces identically shaped observations.
+    """
+
+    metadata = {'render_modes': []}
+
+    def __init__(self, num_envs: int = 64, max_candidate_routes: int = 5,
+                 replay: Optional[Union[PaymentMemoryReplay, str]] = None, seed: Optional[int] = None):
+        self.max_candidate_routes = max_candidate_routes
+        self.render_mode = None
+
+        if isinstance(replay, str):
+            replay = PaymentMemoryReplay(replay, max_candidate_routes=max_candidate_routes)
+        self.replay = replay
+
+        total_obs_dim = (max_candidate_routes * FEATURES_PER_ROUTE) + CONTEXT_FEATURES
+        observation_space = spaces.Box(low=0, high=1, shape=(total_obs_dim,), dtype=np.float32)
+        action_space = spaces.Discrete(max_candidate_routes)
+        super().__init__(num_envs, observation_space, action_space)
+
+        self._rng = np.random.default_rng(seed)
+        self._actions: Optional[np.ndarray] = None
+        self._obs = np.zeros((num_envs, total_obs_dim), dtype=np.float32)
+        self._features = np.zeros((num_envs, max_candidate_routes, 4), dtype=np.float32)
+        self._valid = np.zeros((num_envs, max_candidate_routes), dtype=bool)
+        self._known_route: Optional[np.ndarray] = None
+        self._known_success: Optional[np.ndarray] = None
+
+    def reset(self) -> np.ndarray:
+        seed = self._seeds[0]
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._reset_seeds()
+        self._new_episodes()
+        return self._obs.copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        rewards, success, selected_valid = compute_rewards(
+            self._rng, self._actions, self._features, self._valid,
+            known_route=self._known_route, known_success=self._known_success,
+        )
+        terminal_obs = self._obs
+
+        # One-step episodes: every env terminates and is immediately reset
+        dones = np.ones(self.num_envs, dtype=bool)
+        infos = [
+            {"is_success": bool(success[i]), "terminal_observation": terminal_obs[i], "TimeLimit.truncated": False}
+            for i in range(self.num_envs)
+        ]
+        for i in np.flatnonzero(~selected_valid):
+            infos[i]["reason"] = "invalid_selection"
+
+        self._new_episodes()
+        return self._obs.copy(), rewards, dones, infos
+
+    def _new_episodes(self) -> None:
+        if self.replay is not None:
+            amounts, self._features, self._valid, self._known_route, self._known_success = self.replay.sample(self._rng, self.num_envs)
+        else:
+            amounts, self._features, self._valid = sample_synthetic_episodes(self._rng, self.num_envs, self.max_candidate_routes)
+        self._obs = build_observations(amounts, self._features, self._valid)
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        return [getattr(self, attr_name)] * len(self._get_indices(indices))
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> List[Any]:
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result] * len(self._get_indices(indices))
+
+    def env_is_wrapped(self, wrapper_class: Type, indices: VecEnvIndices = None) -> List[bool]:
+        return [False] * len(self._get_indices(indices))
+
+    def _get_indices(self, indices: VecEnvIndices) -> Sequence[int]:
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
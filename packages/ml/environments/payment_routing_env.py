@@ -1,13 +1,93 @@
 import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import structlog
 
 from applications.capp.capp.models.payments import CrossBorderPayment, PaymentRoute
 
 logger = structlog.get_logger(__name__)
 
+# Per-route feature layout shared by the scalar env, the batch env and the scorer.
+# Route arrays hold ROUTE_FEATURES; the observation appends an IsValid flag per route.
+ROUTE_FEATURES = ("fees", "time", "reliability", "compliance")
+FEATURES_PER_ROUTE = len(ROUTE_FEATURES) + 1
+CONTEXT_FEATURES = 1
+
+
+def sample_synthetic_episodes(rng: np.random.Generator, n: int, max_candidate_routes: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generate ``n`` random payments and candidate routes as arrays.
+
+    Returns:
+        Tuple of ``amounts`` (n,), route ``features`` (n, R, 4) ordered as
+        ROUTE_FEATURES and a ``valid`` mask (n, R).
+    """
+    shape = (n, max_candidate_routes)
+    amounts = rng.uniform(100, 5000, size=n).astype(np.float32)
+
+    num_routes = rng.integers(1, max_candidate_routes + 1, size=n)
+    valid = np.arange(max_candidate_routes)[None, :] < num_routes[:, None]
+
+    # Inverse correlation between cost and speed usually
+    features = np.empty(shape + (len(ROUTE_FEATURES),), dtype=np.float32)
+    features[..., 0] = rng.uniform(0.001, 0.05, size=shape)
+    features[..., 1] = rng.uniform(0, 1.0, size=shape)
+    features[..., 2] = rng.uniform(0.8, 1.0, size=shape)
+    features[..., 3] = 1.0
+
+    # Better routes are rare
+    features[rng.random(shape) < 0.1] = (0.005, 0.1, 0.99, 1.0)
+    features[~valid] = 0.0
+
+    return amounts, features, valid
+
+
+def build_observations(amounts: np.ndarray, features: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Construct a batch of observation vectors (n, R * 5 + 1) from episode arrays"""
+    n, max_candidate_routes = valid.shape
+
+    routes = np.zeros((n, max_candidate_routes, FEATURES_PER_ROUTE), dtype=np.float32)
+    routes[..., :len(ROUTE_FEATURES)] = features
+    routes[..., -1] = valid
+
+    obs = np.empty((n, CONTEXT_FEATURES + max_candidate_routes * FEATURES_PER_ROUTE), dtype=np.float32)
+    obs[:, 0] = np.minimum(amounts / 10000.0, 1.0)
+    obs[:, CONTEXT_FEATURES:] = routes.reshape(n, -1)
+    return obs
+
+
+def compute_rewards(rng: np.random.Generator, actions: np.ndarray, features: np.ndarray, valid: np.ndarray,
+                    known_route: Optional[np.ndarray] = None,
+                    known_success: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Resolve a batch of route selections.
+
+    Outcomes are sampled from each route's reliability. When ``known_route``
+    and ``known_success`` are given (replayed history), selecting the route
+    that was actually used yields the recorded outcome instead.
+
+    Returns:
+        Tuple of ``rewards`` (float32), ``success`` and ``selected_valid`` masks
+    """
+    rows = np.arange(len(actions))
+    actions = np.asarray(actions, dtype=np.int64)
+
+    selected_valid = valid[rows, actions]
+    selected = features[rows, actions]
+
+    success = rng.random(len(actions)) < selected[:, 2]
+    if known_route is not None and known_success is not None:
+        replayed = actions == known_route
+        success = np.where(replayed, known_success, success)
+    success &= selected_valid
+
+    # R = Success + (w_cost * -cost) + (w_time * -time)
+    rewards = np.where(success, 10.0 - selected[:, 0] * 100 - selected[:, 1] * 2, -5.0)
+    rewards[~selected_valid] = -10.0
+
+    return rewards.astype(np.float32), success, selected_valid
+
 class PaymentRoutingEnv(gym.Env):
     """
     Custom Environment that follows gym interface.
@@ -15,10 +95,17 @@ class PaymentRoutingEnv(gym.Env):
     """
     metadata = {'render.modes': ['human']}
 
-    def __init__(self, max_candidate_routes: int = 5):
+    def __init__(self, max_candidate_routes: int = 5, replay_path: Optional[str] = None):
         super(PaymentRoutingEnv, self).__init__()
         
         self.max_candidate_routes = max_candidate_routes
+
+        # Optional historical episodes (memory-mapped, so every worker process
+        # shares the same pages instead of holding its own copy)
+        self.replay = None
+        if replay_path:
+            from .replay import PaymentMemoryReplay
+            self.replay = PaymentMemoryReplay(replay_path, max_candidate_routes=max_candidate_routes)
         
         # Define action space: Select one of N routes
         self.action_space = spaces.Discrete(max_candidate_routes)
@@ -30,8 +117,8 @@ class PaymentRoutingEnv(gym.Env):
         
         # Simplified Feature Vector per Route: [Fees (%), Time (norm), Reliability (0-1), Compliance (0-1), IsValid (0/1)]
         # Total Dimension = (N * 5) + Context Features (Amount norm)
-        self.features_per_route = 5
-        self.context_features = 1
+        self.features_per_route = FEATURES_PER_ROUTE
+        self.context_features = CONTEXT_FEATURES
         
         total_obs_dim = (self.max_candidate_routes * self.features_per_route) + self.context_features
         
@@ -44,6 +131,7 @@ class PaymentRoutingEnv(gym.Env):
         
         self.current_routes: List[Dict[str, float]] = []
         self.current_payment: Optional[Dict[str, Any]] = None
+        self._known_outcome: Optional[Tuple[int, bool]] = None
 
     def reset(self, seed: Optional[int] = None, options: Optional[Dict[str, Any]] = None):
         """
@@ -51,11 +139,14 @@ class PaymentRoutingEnv(gym.Env):
         For RL training, this usually involves generating a random transaction and random potential routes.
         """
         super().reset(seed=seed)
+        self._known_outcome = None
         
         # Generate synthetic data if not provided in options
         if options and 'payment' in options and 'routes' in options:
             self.current_payment = options['payment']
             self.current_routes = options['routes']
+        elif self.replay is not None:
+            self._load_replayed_episode()
         else:
             self._generate_synthetic_episode()
             
@@ -82,8 +173,12 @@ class PaymentRoutingEnv(gym.Env):
         # Calculate Reward
         # R = Success + (w_cost * -cost) + (w_time * -time) + Reliability
         
-        # Synthetic outcome based on reliability
-        is_success = np.random.random() < route['reliability']
+        # Replayed history: choosing the route actually taken gives the recorded outcome
+        if self._known_outcome is not None and self._known_outcome[0] == selected_route_idx:
+            is_success = self._known_outcome[1]
+        else:
+            # Synthetic outcome based on reliability
+            is_success = self.np_random.random() < route['reliability']
         
         if not is_success:
             reward = -5.0
@@ -132,31 +227,22 @@ class PaymentRoutingEnv(gym.Env):
 
     def _generate_synthetic_episode(self):
         """Generate random payment and routes for training"""
-        self.current_payment = {
-            'amount': np.random.uniform(100, 5000)
-        }
-        
-        num_routes = np.random.randint(1, self.max_candidate_routes + 1)
-        self.current_routes = []
-        
-        for _ in range(num_routes):
-            # Inverse correlation between cost and speed usually
-            fees = np.random.uniform(0.001, 0.05)
-            time = np.random.uniform(0, 1.0)
-            reliability = np.random.uniform(0.8, 1.0)
-            
-            # Better routes are rare
-            if np.random.random() < 0.1:
-                fees = 0.005
-                time = 0.1
-                reliability = 0.99
-                
-            self.current_routes.append({
-                'fees': fees,
-                'time': time,
-                'reliability': reliability,
-                'compliance': 1.0
-            })
+        amounts, features, valid = sample_synthetic_episodes(self.np_random, 1, self.max_candidate_routes)
+        self._set_episode(amounts[0], features[0], valid[0])
+
+    def _load_replayed_episode(self):
+        """Sample a historical payment and its corridor's candidate routes"""
+        amounts, features, valid, known_route, known_success = self.replay.sample(self.np_random, 1)
+        self._set_episode(amounts[0], features[0], valid[0])
+        if known_route[0] >= 0:
+            self._known_outcome = (int(known_route[0]), bool(known_success[0]))
+
+    def _set_episode(self, amount: float, features: np.ndarray, valid: np.ndarray):
+        self.current_payment = {'amount': float(amount)}
+        self.current_routes = [
+            dict(zip(ROUTE_FEATURES, (float(v) for v in features[i])))
+            for i in np.flatnonzero(valid)
+        ]
             
     def render(self, mode='human'):
         pass
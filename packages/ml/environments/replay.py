@@ -0,0 +1,249 @@
+"""
+Columnar replay of historical payments for routing-agent training
+
+``PaymentMemoryRecord`` rows are exported once into a directory of ``.npy``
+columns plus a small route table, then opened with ``mmap_mode="r"`` by every
+training process. Sampling a batch of episodes only touches the pages for the
+sampled rows, and parallel workers share the OS page cache instead of each
+loading the whole history.
+
+Layout::
+
+    <path>/meta.json             vocabularies and export parameters
+    <path>/amount_usd.npy        float32 per payment
+    <path>/corridor.npy          int32 corridor id per payment
+    <path>/route.npy             int8 index of the route actually taken (-1 if not a candidate)
+    <path>/success.npy           bool recorded outcome per payment
+    <path>/route_features.npy    float32 (corridors, R, 4) candidate route features
+    <path>/route_valid.npy       bool (corridors, R)
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from .payment_routing_env import ROUTE_FEATURES
+
+logger = structlog.get_logger(__name__)
+
+REPLAY_FORMAT_VERSION = 1
+
+# Payment memory does not record fees; routes use this unless estimates are given per chain
+DEFAULT_FEE_ESTIMATE = 0.01
+
+# Execution times are normalised against this ceiling, like the scorer's 1440-minute cap
+DEFAULT_MAX_EXECUTION_TIME_MS = 60_000
+
+
+def _field(record: Any, name: str) -> Any:
+    if isinstance(record, dict):
+        return record.get(name)
+    try:
+        return record[name]
+    except (TypeError, KeyError):
+        return getattr(record, name, None)
+
+
+def write_payment_memory_replay(
+    records: Iterable[Any],
+    path: str,
+    max_candidate_routes: int = 5,
+    fee_estimates: Optional[Dict[str, float]] = None,
+    max_execution_time_ms: float = DEFAULT_MAX_EXECUTION_TIME_MS,
+    chunk_size: int = 100_000,
+) -> Dict[str, Any]:
+    """
+    Export payment memory rows into a memory-mappable replay directory.
+
+    Args:
+        records: Iterable of ``PaymentMemoryRecord`` objects or row mappings with
+            ``corridor``, ``target_chain``, ``amount_usd``, ``execution_time_ms``
+            and ``success``
+        path: Output directory
+        max_candidate_routes: Routes offered per episode (top chains by volume per corridor)
+        fee_estimates: Optional fee fraction per target chain
+        max_execution_time_ms: Execution time mapped to the worst ``time`` feature
+        chunk_size: Rows converted to arrays at a time
+
+    Returns:
+        Dict[str, Any]: The metadata written to ``meta.json``
+    """
+    fee_estimates = fee_estimates or {}
+    corridors: Dict[str, int] = {}
+    chains: Dict[str, int] = {}
+
+    columns: Dict[str, List[np.ndarray]] = {"amount_usd": [], "corridor": [], "chain": [], "execution_time_ms": [], "success": []}
+    buffer: Dict[str, list] = {name: [] for name in columns}
+
+    def flush_chunk():
+        if not buffer["corridor"]:
+            return
+        columns["amount_usd"].append(np.asarray(buffer["amount_usd"], dtype=np.float32))
+        columns["corridor"].append(np.asarray(buffer["corridor"], dtype=np.int32))
+        columns["chain"].append(np.asarray(buffer["chain"], dtype=np.int32))
+        columns["execution_time_ms"].append(np.asarray(buffer["execution_time_ms"], dtype=np.float32))
+        columns["success"].append(np.asarray(buffer["success"], dtype=bool))
+        for values in buffer.values():
+            values.clear()
+
+    for record in records:
+        corridor = _field(record, "corridor") or "UNKNOWN"
+        chain = _field(record, "target_chain") or "UNKNOWN"
+        buffer["amount_usd"].append(float(_field(record, "amount_usd") or 0.0))
+        buffer["corridor"].append(corridors.setdefault(corridor, len(corridors)))
+        buffer["chain"].append(chains.setdefault(chain, len(chains)))
+        buffer["execution_time_ms"].append(float(_field(record, "execution_time_ms") or 0.0))
+        buffer["success"].append(bool(_field(record, "success")))
+        if len(buffer["corridor"]) >= chunk_size:
+            flush_chunk()
+    flush_chunk()
+
+    if not columns["corridor"]:
+        raise ValueError("No payment memory records to export")
+
+    data = {name: np.concatenate(chunks) for name, chunks in columns.items()}
+    num_corridors, num_chains = len(corridors), len(chains)
+
+    # Per (corridor, chain) volume, successes and total execution time
+    pair = data["corridor"].astype(np.int64) * num_chains + data["chain"]
+    volume = np.bincount(pair, minlength=num_corridors * num_chains).reshape(num_corridors, num_chains)
+    successes = np.bincount(pair, weights=data["success"], minlength=num_corridors * num_chains).reshape(num_corridors, num_chains)
+    exec_time = np.bincount(pair, weights=data["execution_time_ms"], minlength=num_corridors * num_chains).reshape(num_corridors, num_chains)
+
+    # Candidate routes per corridor: the most used chains, busiest first
+    top = np.argsort(-volume, axis=1, kind="stable")[:, :max_candidate_routes]
+    top_volume = np.take_along_axis(volume, top, axis=1)
+    route_valid = np.zeros((num_corridors, max_candidate_routes), dtype=bool)
+    route_valid[:, :top.shape[1]] = top_volume > 0
+
+    chain_names = [None] * num_chains
+    for name, idx in chains.items():
+        chain_names[idx] = name
+    chain_fees = np.array([fee_estimates.get(name, DEFAULT_FEE_ESTIMATE) for name in chain_names], dtype=np.float32)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        reliability = np.where(volume > 0, successes / volume, 0.0)
+        mean_time = np.where(volume > 0, exec_time / volume, 0.0)
+
+    route_features = np.zeros((num_corridors, max_candidate_routes, len(ROUTE_FEATURES)), dtype=np.float32)
+    width = top.shape[1]
+    route_features[:, :width, 0] = chain_fees[top]
+    route_features[:, :width, 1] = np.minimum(np.take_along_axis(mean_time, top, axis=1) / max_execution_time_ms, 1.0)
+    route_features[:, :width, 2] = np.take_along_axis(reliability, top, axis=1)
+    route_features[:, :width, 3] = 1.0
+    route_features[~route_valid] = 0.0
+
+    # Position of each payment's chain among its corridor's candidates (-1 if not offered)
+    position = np.full((num_corridors, num_chains), -1, dtype=np.int8)
+    rows = np.repeat(np.arange(num_corridors), width)
+    slots = np.tile(np.arange(width), num_corridors)
+    keep = route_valid[:, :width].ravel()
+    position[rows[keep], top.ravel()[keep]] = slots[keep]
+    taken_route = position[data["corridor"], data["chain"]]
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "amount_usd.npy"), data["amount_usd"])
+    np.save(os.path.join(path, "corridor.npy"), data["corridor"])
+    np.save(os.path.join(path, "route.npy"), taken_route)
+    np.save(os.path.join(path, "success.npy"), data["success"])
+    np.save(os.path.join(path, "route_features.npy"), route_features)
+    np.save(os.path.join(path, "route_valid.npy"), route_valid)
+
+    corridor_names = [None] * num_corridors
+    for name, idx in corridors.items():
+        corridor_names[idx] = name
+
+    meta = {
+        "version": REPLAY_FORMAT_VERSION,
+        "rows": int(len(data["corridor"])),
+        "max_candidate_routes": max_candidate_routes,
+        "max_execution_time_ms": max_execution_time_ms,
+        "corridors": corridor_names,
+        "chains": chain_names,
+        "routes": [[chain_names[c] for c, ok in zip(top[i], route_valid[i]) if ok] for i in range(num_corridors)],
+    }
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    logger.info("Payment memory replay exported", path=path, rows=meta["rows"], corridors=num_corridors, chains=num_chains)
+    return meta
+
+
+def export_payment_memory(database_url: str, path: str, batch_size: int = 5000, **kwargs) -> Dict[str, Any]:
+    """
+    Stream the ``payment_memory`` table into a replay directory.
+
+    Rows are fetched over a server-side cursor so the export never holds the
+    table in Python objects. Extra keyword arguments go to
+    :func:`write_payment_memory_replay`.
+    """
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(text(
+                "SELECT corridor, target_chain, amount_usd, execution_time_ms, success "
+                "FROM payment_memory ORDER BY id"
+            ))
+            return write_payment_memory_replay(result.mappings(), path, chunk_size=batch_size * 20, **kwargs)
+    finally:
+        engine.dispose()
+
+
+class PaymentMemoryReplay:
+    """
+    Read-only, memory-mapped view over an exported replay directory.
+
+    Each episode is one historical payment: its amount, the candidate routes
+    of its corridor, and (when the route taken was one of the candidates) the
+    recorded outcome.
+    """
+
+    def __init__(self, path: str, max_candidate_routes: Optional[int] = None):
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != REPLAY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported replay format version: {self.meta.get('version')}")
+
+        stored_routes = self.meta["max_candidate_routes"]
+        if max_candidate_routes is not None and max_candidate_routes != stored_routes:
+            raise ValueError(
+                f"Replay was exported with {stored_routes} candidate routes, environment expects {max_candidate_routes}"
+            )
+
+        self.path = path
+        self.max_candidate_routes = stored_routes
+        self.amount_usd = np.load(os.path.join(path, "amount_usd.npy"), mmap_mode="r")
+        self.corridor = np.load(os.path.join(path, "corridor.npy"), mmap_mode="r")
+        self.route = np.load(os.path.join(path, "route.npy"), mmap_mode="r")
+        self.success = np.load(os.path.join(path, "success.npy"), mmap_mode="r")
+
+        # The route table is tiny (one row per corridor); keep it resident
+        self.route_features = np.load(os.path.join(path, "route_features.npy"))
+        self.route_valid = np.load(os.path.join(path, "route_valid.npy"))
+
+    def __len__(self) -> int:
+        return int(self.meta["rows"])
+
+    def sample(self, rng: np.random.Generator, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw ``n`` historical episodes uniformly at random.
+
+        Returns:
+            Tuple of ``amounts`` (n,), route ``features`` (n, R, 4), ``valid``
+            mask (n, R), ``known_route`` (n,) and ``known_success`` (n,)
+        """
+        # Sorted indices turn the gathers into forward scans over the mapped pages
+        idx = np.sort(rng.integers(0, len(self), size=n))
+        corridor = np.asarray(self.corridor[idx])
+        return (
+            np.asarray(self.amount_usd[idx], dtype=np.float32),
+            self.route_features[corridor],
+            self.route_valid[corridor],
+            np.asarray(self.route[idx], dtype=np.int64),
+            np.asarray(self.success[idx], dtype=bool),
+        )
@@ -0,0 +1,99 @@
+import numpy as np
+import structlog
+from typing import Any, Dict, List, Optional
+
+logger = structlog.get_logger(__name__)
+
+POLICY_FORMAT_VERSION = 1
+
+_ACTIVATIONS = {
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "identity": lambda x: x,
+}
+
+
+class NumpyPolicy:
+    """
+    Dependency-free runtime for an exported PPO actor network.
+
+    Evaluates the MLP policy head as plain matrix multiplies over NumPy
+    weight arrays written by ``packages.ml.inference.policy_export``, so
+    scoring routes does not need torch, gymnasium or stable_baselines3.
+    """
+
+    def __init__(self, weights: List[np.ndarray], biases: List[np.ndarray], activations: List[str]):
+        if not (len(weights) == len(biases) == len(activations) + 1):
+            raise ValueError("Policy needs one activation per hidden layer plus an output layer")
+        unknown = set(activations) - set(_ACTIVATIONS)
+        if unknown:
+            raise ValueError(f"Unsupported activation(s): {sorted(unknown)}")
+
+        # Stored as (in, out) so a batch of observations is a single left-multiply
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+
+    @property
+    def observation_dim(self) -> int:
+        return self.weights[0].shape[0]
+
+    @property
+    def n_actions(self) -> int:
+        return self.weights[-1].shape[1]
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyPolicy":
+        """Load a policy written by ``export_policy``"""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            if version != POLICY_FORMAT_VERSION:
+                raise ValueError(f"Unsupported policy format version: {version}")
+            n_layers = int(data["n_layers"])
+            weights = [data[f"w{i}"] for i in range(n_layers)]
+            biases = [data[f"b{i}"] for i in range(n_layers)]
+            activations = [str(a) for a in data["activations"]]
+        return cls(weights, biases, activations)
+
+    def save(self, path: str) -> None:
+        arrays: Dict[str, Any] = {
+            "format_version": np.array(POLICY_FORMAT_VERSION),
+            "n_layers": np.array(len(self.weights)),
+            "activations": np.array(self.activations, dtype=str),
+        }
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)
+
+    def logits(self, observations: np.ndarray) -> np.ndarray:
+        """
+        Compute action logits for a batch of observations.
+
+        Args:
+            observations: Array of shape (batch, observation_dim) or (observation_dim,)
+
+        Returns:
+            np.ndarray: Logits of shape (batch, n_actions)
+        """
+        x = np.atleast_2d(np.asarray(observations, dtype=np.float32))
+        for w, b, activation in zip(self.weights, self.biases, self.activations):
+            x = _ACTIVATIONS[activation](x @ w + b)
+        return x @ self.weights[-1] + self.biases[-1]
+
+    def predict(self, observations: np.ndarray, valid_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Deterministic (argmax) actions for a batch of observations.
+
+        Args:
+            observations: Array of shape (batch, observation_dim) or (observation_dim,)
+            valid_mask: Optional boolean mask (batch, n_actions); masked-out
+                actions are never selected
+
+        Returns:
+            np.ndarray: Action index per observation
+        """
+        logits = self.logits(observations)
+        if valid_mask is not None:
+            logits = np.where(np.atleast_2d(valid_mask), logits, -np.inf)
+        return np.argmax(logits, axis=1)
@@ -0,0 +1,87 @@
+import argparse
+import os
+from typing import Any, Union
+
+import structlog
+
+from packages.ml.config import MLConfig
+from packages.ml.inference.numpy_policy import NumpyPolicy
+
+logger = structlog.get_logger(__name__)
+
+_TORCH_ACTIVATIONS = {
+    "Tanh": "tanh",
+    "ReLU": "relu",
+    "Identity": "identity",
+}
+
+
+def policy_from_sb3(model: Any) -> NumpyPolicy:
+    """
+    Extract the actor network of a trained stable_baselines3 PPO MlpPolicy.
+
+    The deterministic action only depends on the policy branch of the MLP
+    extractor followed by ``action_net``; the value head is dropped.
+    """
+    import torch.nn as nn
+
+    policy = model.policy
+    if type(policy.features_extractor).__name__ != "FlattenExtractor":
+        raise ValueError("Only policies with a flatten features extractor can be exported")
+
+    weights, biases, activations = [], [], []
+    for module in policy.mlp_extractor.policy_net:
+        if isinstance(module, nn.Linear):
+            weights.append(module.weight.detach().cpu().numpy().T)
+            biases.append(module.bias.detach().cpu().numpy())
+        else:
+            name = type(module).__name__
+            if name not in _TORCH_ACTIVATIONS:
+                raise ValueError(f"Unsupported layer in policy network: {name}")
+            activations.append(_TORCH_ACTIVATIONS[name])
+
+    # Hidden layers without an explicit activation module (e.g. an empty net_arch)
+    while len(activations) < len(weights):
+        activations.append("identity")
+
+    weights.append(policy.action_net.weight.detach().cpu().numpy().T)
+    biases.append(policy.action_net.bias.detach().cpu().numpy())
+    return NumpyPolicy(weights, biases, activations)
+
+
+def export_policy(model: Union[str, Any] = MLConfig.MODEL_PATH,
+                  output_path: str = MLConfig.POLICY_WEIGHTS_PATH) -> str:
+    """
+    Convert a trained PPO model (object or saved ``.zip`` path) to NumPy weights.
+
+    Returns:
+        str: Path of the written ``.npz`` file
+    """
+    if isinstance(model, str):
+        from stable_baselines3 import PPO
+        model = PPO.load(model, device="cpu")
+
+    numpy_policy = policy_from_sb3(model)
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    numpy_policy.save(output_path)
+    # np.savez appends .npz when missing
+    if not output_path.endswith(".npz"):
+        output_path += ".npz"
+
+    logger.info(
+        "Exported policy weights",
+        path=output_path,
+        observation_dim=numpy_policy.observation_dim,
+        n_actions=numpy_policy.n_actions,
+        layers=len(numpy_policy.weights),
+    )
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a trained PPO routing policy to NumPy weights")
+    parser.add_argument("--model", default=MLConfig.MODEL_PATH)
+    parser.add_argument("--output", default=MLConfig.POLICY_WEIGHTS_PATH)
+    args = parser.parse_args()
+    export_policy(args.model, args.output)
@@ -1,52 +1,98 @@
+import os
 import numpy as np
 import structlog
-from typing import List, Optional, Dict, Any
-from stable_baselines3 import PPO
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 
 from applications.capp.capp.models.payments import CrossBorderPayment, PaymentRoute
 from packages.ml.config import MLConfig
+from packages.ml.inference.numpy_policy import NumpyPolicy
 
 logger = structlog.get_logger(__name__)
 
 class RLRouteScorer:
     """
     Scorer that uses a trained RL model to select the optimal route.
+
+    Inference runs on the NumPy export of the policy network, so the API
+    process never imports torch or stable_baselines3. If no export exists
+    the full PPO model is loaded as a fallback.
     """
     
-    def __init__(self, model_path: str = MLConfig.MODEL_PATH):
+    def __init__(self, model_path: str = MLConfig.MODEL_PATH, weights_path: str = MLConfig.POLICY_WEIGHTS_PATH):
+        self.policy: Optional[NumpyPolicy] = None
         self.model = None
         self.model_path = model_path
+        self.weights_path = weights_path
         self._load_model()
         
     def _load_model(self):
+        if os.path.exists(self.weights_path):
+            try:
+                self.policy = NumpyPolicy.load(self.weights_path)
+                logger.info(f"Loaded RL policy weights from {self.weights_path}")
+                return
+            except Exception as e:
+                logger.warning(f"Could not load RL policy weights from {self.weights_path}", error=str(e))
+
         try:
+            # Slow path: pulls in torch. Run packages/ml/inference/policy_export.py to avoid it.
+            from stable_baselines3 import PPO
             self.model = PPO.load(self.model_path)
-            logger.info(f"Loaded RL model from {self.model_path}")
+            logger.info(f"Loaded RL model from {self.model_path}", hint="export NumPy weights to skip torch at startup")
         except Exception as e:
             logger.warning(f"Could not load RL model from {self.model_path}. Using fallback.", error=str(e))
             self.model = None
 
+    @property
+    def is_loaded(self) -> bool:
+        return self.policy is not None or self.model is not None
+
     def select_best_route_index(self, payment: CrossBorderPayment, routes: List[PaymentRoute]) -> int:
         """
         Predict the best route index using the RL model.
         """
-        if not self.model or not routes:
-            return 0 # Fallback to first route
-            
-        # Construct Observation
-        obs = self._construct_observation(payment, routes)
-        
+        return self.select_best_route_indices([(payment, routes)])[0]
+
+    def select_best_route_indices(self, candidates: Sequence[Tuple[CrossBorderPayment, List[PaymentRoute]]]) -> List[int]:
+        """
+        Predict the best route index for many payments with one forward pass.
+
+        Args:
+            candidates: ``(payment, routes)`` pairs
+
+        Returns:
+            List[int]: Selected route index per pair (0 when no model is loaded)
+        """
+        if not candidates:
+            return []
+        if not self.is_loaded:
+            return [0] * len(candidates) # Fallback to first route
+
+        scored = [i for i, (_, routes) in enumerate(candidates) if routes]
+        selected = [0] * len(candidates)
+        if not scored:
+            return selected
+
+        # Construct Observations
+        obs = np.stack([self._construct_observation(*candidates[i]) for i in scored])
+
         # Predict
-        action, _states = self.model.predict(obs, deterministic=True)
-        
-        selected_idx = int(action)
-        
-        # Safety check
-        if selected_idx >= len(routes):
-            logger.warning("Agent selected invalid route index", index=selected_idx, num_routes=len(routes))
-            return 0
-            
-        return selected_idx
+        if self.policy is not None:
+            actions = self.policy.predict(obs)
+        else:
+            actions, _states = self.model.predict(obs, deterministic=True)
+
+        for i, action in zip(scored, np.atleast_1d(actions)):
+            selected_idx = int(action)
+            num_routes = len(candidates[i][1])
+
+            # Safety check
+            if selected_idx >= num_routes:
+                logger.warning("Agent selected invalid route index", index=selected_idx, num_routes=num_routes)
+                selected_idx = 0
+            selected[i] = selected_idx
+
+        return selected
 
     def _construct_observation(self, payment: CrossBorderPayment, routes: List[PaymentRoute]) -> np.ndarray:
         """
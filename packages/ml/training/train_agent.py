@@ -1,36 +1,201 @@
+import argparse
 import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
 import structlog
 from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import BaseCallback
 from stable_baselines3.common.env_checker import check_env
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv, VecMonitor
 
+from packages.ml.config import MLConfig
+from packages.ml.environments.batch_routing_env import BatchPaymentRoutingEnv
 from packages.ml.environments.payment_routing_env import PaymentRoutingEnv
+from packages.ml.inference.policy_export import export_policy
 
 logger = structlog.get_logger(__name__)
 
-def train_agent(total_timesteps: int = 10000, save_path: str = "packages/ml/models/route_optimization_model"):
+VEC_BACKENDS = ("batch", "subproc", "dummy")
+
+
+class ThroughputCallback(BaseCallback):
     """
-    Train the PPO agent on the PaymentRoutingEnv
+    Logs environment steps per second while training.
+
+    Rates are reported every ``log_interval_steps`` timesteps (to structlog and
+    to the SB3 logger as ``time/steps_per_sec``) and once for the whole run.
     """
-    logger.info("Starting training...")
-    
-    # Create environment
-    env = PaymentRoutingEnv()
-    
+
+    def __init__(self, log_interval_steps: int = 50_000, verbose: int = 0):
+        super().__init__(verbose)
+        self.log_interval_steps = log_interval_steps
+        self.steps_per_sec = 0.0
+        self.elapsed = 0.0
+        self._start = 0.0
+        self._start_steps = 0
+        self._window_start = 0.0
+        self._window_steps = 0
+
+    def _on_training_start(self) -> None:
+        self._start = self._window_start = time.perf_counter()
+        self._start_steps = self._window_steps = self.num_timesteps
+
+    def _on_step(self) -> bool:
+        if self.num_timesteps - self._window_steps >= self.log_interval_steps:
+            now = time.perf_counter()
+            rate = (self.num_timesteps - self._window_steps) / max(now - self._window_start, 1e-9)
+            self.logger.record("time/steps_per_sec", rate)
+            logger.info("training_throughput", timesteps=self.num_timesteps, steps_per_sec=round(rate, 1))
+            self._window_start, self._window_steps = now, self.num_timesteps
+        return True
+
+    def _on_training_end(self) -> None:
+        self.elapsed = time.perf_counter() - self._start
+        self.steps_per_sec = (self.num_timesteps - self._start_steps) / max(self.elapsed, 1e-9)
+
+
+def _scalar_env_factory(rank: int, seed: Optional[int], replay_path: Optional[str]) -> Callable[[], PaymentRoutingEnv]:
+    def _init() -> PaymentRoutingEnv:
+        env = PaymentRoutingEnv(max_candidate_routes=MLConfig.MAX_CANDIDATE_ROUTES, replay_path=replay_path)
+        env.reset(seed=None if seed is None else seed + rank)
+        return env
+    return _init
+
+
+def make_training_env(backend: str = "batch", n_envs: int = 64, replay_path: Optional[str] = None,
+                      seed: Optional[int] = None) -> VecEnv:
+    """
+    Build the vectorized training environment.
+
+    Args:
+        backend: ``batch`` steps all envs as NumPy arrays in-process (fastest for
+            this cheap one-step env); ``subproc`` runs one PaymentRoutingEnv per
+            worker process; ``dummy`` runs them sequentially in-process
+        n_envs: Number of parallel episodes
+        replay_path: Optional exported payment memory replay directory to train
+            on instead of synthetic episodes
+        seed: Optional base seed
+    """
+    if backend not in VEC_BACKENDS:
+        raise ValueError(f"Unknown vec env backend '{backend}', expected one of {VEC_BACKENDS}")
+
+    if backend == "batch":
+        env = BatchPaymentRoutingEnv(
+            num_envs=n_envs,
+            max_candidate_routes=MLConfig.MAX_CANDIDATE_ROUTES,
+            replay=replay_path,
+            seed=seed,
+        )
+    else:
+        factories = [_scalar_env_factory(rank, seed, replay_path) for rank in range(n_envs)]
+        env = SubprocVecEnv(factories) if backend == "subproc" else DummyVecEnv(factories)
+
+    return VecMonitor(env)
+
+
+def measure_env_throughput(env: VecEnv, steps: int = 1000, seed: Optional[int] = None) -> float:
+    """Step ``env`` with random actions and return environment steps per second"""
+    rng = np.random.default_rng(seed)
+    n_actions = env.action_space.n
+    env.reset()
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(rng.integers(0, n_actions, size=env.num_envs))
+    elapsed = time.perf_counter() - start
+    return steps * env.num_envs / max(elapsed, 1e-9)
+
+
+def train_agent(total_timesteps: int = 10000, save_path: str = "packages/ml/models/route_optimization_model",
+                backend: str = "batch", n_envs: int = 64, replay_path: Optional[str] = None,
+                seed: Optional[int] = None, n_steps: int = 128, batch_size: int = 1024,
+                log_interval_steps: int = 50_000, weights_path: str = MLConfig.POLICY_WEIGHTS_PATH) -> Dict[str, Any]:
+    """
+    Train the PPO agent on PaymentRoutingEnv episodes
+
+    Returns:
+        Dict[str, Any]: Timesteps trained, wall time, throughput and save path
+    """
+    logger.info("Starting training...", backend=backend, n_envs=n_envs, replay_path=replay_path)
+
     # Check custom environment
-    check_env(env)
+    check_env(PaymentRoutingEnv(max_candidate_routes=MLConfig.MAX_CANDIDATE_ROUTES, replay_path=replay_path))
     logger.info("Environment check passed")
-    
-    # Initialize PPO agent
-    model = PPO("MlpPolicy", env, verbose=1)
-    
+
+    env = make_training_env(backend=backend, n_envs=n_envs, replay_path=replay_path, seed=seed)
+
+    # Initialize PPO agent; each rollout collects n_steps * n_envs transitions
+    model = PPO("MlpPolicy", env, n_steps=n_steps, batch_size=min(batch_size, n_steps * n_envs), seed=seed, verbose=1)
+
     # Train
-    model.learn(total_timesteps=total_timesteps)
-    logger.info("Training completed")
-    
+    throughput = ThroughputCallback(log_interval_steps=log_interval_steps)
+    model.learn(total_timesteps=total_timesteps, callback=throughput)
+    env.close()
+    logger.info("Training completed", elapsed_s=round(throughput.elapsed, 2), steps_per_sec=round(throughput.steps_per_sec, 1))
+
     # Save model
     os.makedirs(os.path.dirname(save_path), exist_ok=True)
     model.save(save_path)
     logger.info(f"Model saved to {save_path}")
 
+    # NumPy weights for the torch-free inference runtime
+    weights_path = export_policy(model, weights_path)
+
+    return {
+        "timesteps": model.num_timesteps,
+        "elapsed_s": throughput.elapsed,
+        "steps_per_sec": throughput.steps_per_sec,
+        "save_path": save_path,
+        "weights_path": weights_path,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Train the payment routing PPO agent")
+    parser.add_argument("--timesteps", type=int, default=1_000_000)
+    parser.add_argument("--save-path", default="packages/ml/models/route_optimization_model")
+    parser.add_argument("--weights-path", default=MLConfig.POLICY_WEIGHTS_PATH,
+                        help="Where to export NumPy policy weights for inference")
+    parser.add_argument("--backend", choices=VEC_BACKENDS, default="batch")
+    parser.add_argument("--n-envs", type=int, default=64)
+    parser.add_argument("--n-steps", type=int, default=128, help="Rollout length per env")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--replay", dest="replay_path", default=None,
+                        help="Replay directory of exported payment memory to train on")
+    parser.add_argument("--export-from", dest="database_url", default=None,
+                        help="Export payment_memory from this database URL into --replay before training")
+    parser.add_argument("--benchmark-env", type=int, default=0, metavar="STEPS",
+                        help="Only measure raw environment throughput for STEPS vector steps")
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        if not args.replay_path:
+            parser.error("--export-from requires --replay")
+        from packages.ml.environments.replay import export_payment_memory
+        export_payment_memory(args.database_url, args.replay_path, max_candidate_routes=MLConfig.MAX_CANDIDATE_ROUTES)
+
+    if args.benchmark_env:
+        env = make_training_env(backend=args.backend, n_envs=args.n_envs, replay_path=args.replay_path, seed=args.seed)
+        rate = measure_env_throughput(env, steps=args.benchmark_env, seed=args.seed)
+        env.close()
+        print(f"{args.backend} x{args.n_envs}: {rate:,.0f} env steps/sec")
+        return
+
+    stats = train_agent(
+        total_timesteps=args.timesteps,
+        save_path=args.save_path,
+        backend=args.backend,
+        n_envs=args.n_envs,
+        replay_path=args.replay_path,
+        seed=args.seed,
+        n_steps=args.n_steps,
+        batch_size=args.batch_size,
+        weights_path=args.weights_path,
+    )
+    print(f"Trained {stats['timesteps']:,} steps in {stats['elapsed_s']:.1f}s ({stats['steps_per_sec']:,.0f} steps/sec)")
+
+
 if __name__ == "__main__":
-    train_agent()
+    main()
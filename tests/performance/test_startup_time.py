@@ -0,0 +1,70 @@
+"""
+Startup-time budget for API workers (apps/api/app/main.py).
+
+Covers:
+  - importing the app does not load chain SDKs, LLM clients or ML stacks
+  - the app module imports within STARTUP_IMPORT_BUDGET_MS (``-X importtime``)
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Loaded on first use (or by the warm-up hook), never by `import app.main`
+HEAVY_MODULES = (
+    "aptos_sdk",
+    "starknet_py",
+    "web3",
+    "eth_account",
+    "google.generativeai",
+    "sklearn",
+    "torch",
+    "stable_baselines3",
+    "solana",
+    "stellar_sdk",
+)
+
+STARTUP_IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", "2500"))
+
+
+def _importtime(module: str):
+    """Run ``python -X importtime -c 'import module'`` and parse its report"""
+    env = {
+        **os.environ,
+        "ALCHEMY_API_KEY": os.environ.get("ALCHEMY_API_KEY", "test"),
+        "DATABASE_URL": "sqlite:///:memory:",
+    }
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    cumulative_us = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            cumulative_us[name.strip()] = int(cumulative)
+    return cumulative_us
+
+
+class TestStartupTime:
+
+    def test_app_import_skips_heavy_integrations_and_meets_budget(self):
+        modules = _importtime("apps.api.app.main")
+
+        loaded = sorted(
+            name for name in modules
+            if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+        )
+        assert loaded == []
+
+        total_ms = modules["apps.api.app.main"] / 1000
+        assert total_ms < STARTUP_IMPORT_BUDGET_MS, f"app import took {total_ms:.0f}ms"
@@ -0,0 +1,90 @@
+"""
+Unit tests for agent API key authentication (applications/capp/capp/core/agent_api_keys.py).
+
+Covers:
+  - a key is checked against the one credential its prefix points to
+  - repeat callers are served from the verified-key cache without hashing
+  - deleting or rotating a credential invalidates its cached keys
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from applications.capp.capp.core.agent_api_keys import (
+    AgentKeyAuthenticator,
+    VerifiedKeyCache,
+    generate_agent_api_key,
+    parse_key_prefix,
+)
+from applications.capp.capp.models.agent_credential import AgentCredentialInDB
+
+
+def _issue(store, prefixes, scheme="capp_agent_"):
+    raw_key, key_prefix = generate_agent_api_key(scheme)
+    cred = AgentCredentialInDB(
+        agent_id=f"agent-{key_prefix}",
+        organization_id=uuid4(),
+        hashed_api_key=f"hash:{raw_key}",
+        key_prefix=key_prefix,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=1),
+    )
+    store[cred.id] = cred
+    prefixes[key_prefix] = cred.id
+    return raw_key, cred
+
+
+@pytest.fixture()
+def auth():
+    store, prefixes, verified = {}, {}, []
+
+    def verify(raw_key, hashed):
+        verified.append(raw_key)
+        return hashed == f"hash:{raw_key}"
+
+    authenticator = AgentKeyAuthenticator(
+        find_by_prefix=lambda p: store.get(prefixes.get(p)),
+        get_by_id=store.get,
+        verify=verify,
+        cache=VerifiedKeyCache(ttl_seconds=60, max_entries=100),
+        executor=ThreadPoolExecutor(max_workers=2),
+    )
+    authenticator.store, authenticator.prefixes, authenticator.verified = store, prefixes, verified
+    return authenticator
+
+
+class TestAgentKeyAuthenticator:
+
+    @pytest.mark.asyncio
+    async def test_prefix_lookup_and_cache(self, auth):
+        keys = [_issue(auth.store, auth.prefixes) for _ in range(50)]
+        raw_key, cred = keys[17]
+
+        assert parse_key_prefix(raw_key) == cred.key_prefix
+        assert await auth.authenticate(raw_key) is cred
+        assert await auth.authenticate(raw_key) is cred
+        assert auth.verified == [raw_key]  # one bcrypt check, then cached
+
+        # Right prefix, wrong secret: rejected after a single check
+        forged = f"capp_agent_{cred.key_prefix}_not-the-secret"
+        assert await auth.authenticate(forged) is None
+        assert await auth.authenticate("capp_agent_unknownprefix") is None
+        assert len(auth.verified) == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_key_is_revocation_aware(self, auth):
+        raw_key, cred = _issue(auth.store, auth.prefixes, scheme="capp_subagent_")
+        assert await auth.authenticate(raw_key) is cred
+
+        # Deactivation is visible on the next hit since the credential is re-read
+        cred.is_active = False
+        assert (await auth.authenticate(raw_key)).is_active is False
+
+        # Rotation: the cached hash no longer matches
+        cred.hashed_api_key = "hash:rotated"
+        assert await auth.authenticate(raw_key) is None
+
+        del auth.store[cred.id]
+        assert await auth.authenticate(raw_key) is None
+        assert len(auth.cache) == 0
@@ -0,0 +1,99 @@
+"""
+Unit tests for the streaming anomaly detector (apps/api/app/services/anomaly_detection.py).
+
+Covers:
+  - sliding-window mean / variance / percentiles match a full recomputation
+  - velocity and amount-outlier rules fire from O(1) per-wallet state
+  - wallet state is bounded; anomalies are persisted in batches off the hot path
+"""
+import random
+import statistics
+from types import SimpleNamespace
+
+import pytest
+
+from apps.api.app.services.anomaly_detection import (
+    AnomalyDetectionService,
+    AnomalyWriter,
+    SlidingStats,
+)
+
+
+def _tx(amount):
+    return SimpleNamespace(amount=amount, from_currency="USD", to_currency="KES")
+
+
+class _FakeSession:
+    def __init__(self, commits):
+        self.commits = commits
+        self.rows = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def add_all(self, rows):
+        self.rows.extend(rows)
+
+    async def commit(self):
+        self.commits.append(self.rows)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSlidingStats:
+
+    def test_matches_full_recomputation(self):
+        rng = random.Random(7)
+        stats = SlidingStats(capacity=128)
+        values = [rng.lognormvariate(3, 1) for _ in range(5000)]
+        for value in values:
+            stats.push(value)
+
+        window = values[-128:]
+        assert stats.count == 128
+        assert stats.mean == pytest.approx(statistics.fmean(window), rel=1e-9)
+        assert stats.variance == pytest.approx(statistics.variance(window), rel=1e-6)
+        true_p90 = sorted(window)[int(0.9 * 127)]
+        assert stats.sketch.quantile(0.9) == pytest.approx(true_p90, rel=0.02)
+
+
+class TestAnomalyDetection:
+
+    @pytest.mark.asyncio
+    async def test_rules_bounded_state_and_batched_writes(self):
+        commits = []
+        writer = AnomalyWriter(session_factory=lambda: _FakeSession(commits), batch_size=50)
+        clock = _Clock()
+        detector = AnomalyDetectionService(max_wallets=100, writer=writer, clock=clock)
+
+        # 100 tx in a minute is allowed, the 101st is a spike
+        for _ in range(100):
+            detector.analyze_transaction("wallet-1", _tx(20.0))
+            clock.now += 0.5
+        assert writer.pending == 0
+        detector.analyze_transaction("wallet-1", _tx(20.0))
+        assert [r["rule"] for r in writer._pending] == ["VELOCITY_SPIKE"]
+
+        # Amount far outside the wallet's recent window
+        clock.now += 120
+        detector.analyze_transaction("wallet-1", _tx(5000.0))
+        assert writer._pending[-1]["rule"] == "AMOUNT_OUTLIER"
+
+        # Thousands of wallets: state stays bounded to max_wallets
+        for i in range(5000):
+            detector.analyze_transaction(f"wallet-{i}", _tx(0.001))
+        assert detector.tracked_wallets == 100
+
+        await detector.close()
+        assert writer.pending == 0
+        assert sum(len(rows) for rows in commits) == writer.written == 5002
+        assert max(len(rows) for rows in commits) == 50
@@ -0,0 +1,160 @@
+"""
+Unit tests for the shared approval queue (applications/capp/capp/services/approval.py).
+
+Covers:
+  - a request made on one worker is visible, indexed and decidable on another
+  - a waiting payment resumes on the published decision, without polling
+  - a request is decided once; due requests expire without a scan
+  - an approval-gated /wallet/send executes once approved within the default wait
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from applications.capp.capp.core.redis import MockRedisClient
+from applications.capp.capp.services.approval import ApprovalService
+
+
+class _PubSubRedis(MockRedisClient):
+    """In-memory Redis shared by several services, with a minimal pub/sub broker."""
+
+    def __init__(self):
+        super().__init__()
+        self.channels = {}
+        self.published = 0
+
+    async def publish(self, channel, message):
+        self.published += 1
+        for queue in self.channels.get(channel, []):
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(self.channels.get(channel, []))
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return _PubSub(self)
+
+
+class _PubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.channels.setdefault(channel, []).append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def close(self):
+        for queues in self.redis.channels.values():
+            if self.queue in queues:
+                queues.remove(self.queue)
+
+
+@pytest.fixture()
+def workers():
+    redis = _PubSubRedis()
+    return ApprovalService(redis_client=redis), ApprovalService(redis_client=redis)
+
+
+class TestApprovalQueue:
+
+    @pytest.mark.asyncio
+    async def test_shared_across_workers_with_indexes(self, workers):
+        first, second = workers
+        req_id = await first.request_approval("settlement_agent", "PAYMENT", "Send 5000", {"amount": 5000})
+        await first.request_approval("market_scout", "OPPORTUNITY", "Move 1000 USDC")
+
+        pending = await second.list_requests()
+        assert {req.agent_id for req in pending} == {"settlement_agent", "market_scout"}
+        by_agent = await second.list_requests(agent_id="settlement_agent")
+        assert [req.id for req in by_agent] == [req_id]
+        assert by_agent[0].payload == {"amount": 5000}
+
+        assert await second.reject_request(req_id)
+        assert not await first.approve_request(req_id)
+        assert await first.get_request_status(req_id) == "REJECTED"
+        assert [req.id for req in await first.list_requests(status="REJECTED")] == [req_id]
+        assert [req.agent_id for req in await first.list_requests()] == ["market_scout"]
+
+    @pytest.mark.asyncio
+    async def test_waiter_resumes_on_decision_from_other_worker(self, workers):
+        first, second = workers
+        req_id = await first.request_approval("settlement_agent", "PAYMENT", "Send 5000")
+
+        waiter = asyncio.create_task(first.wait_for_decision(req_id, timeout=5))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        assert await second.approve_request(req_id)
+        assert await asyncio.wait_for(waiter, 0.5) == "APPROVED"
+        assert not first._waiters
+
+        await first.close()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_expiry_wakes_waiters(self, workers):
+        first, _ = workers
+        req_id = await first.request_approval("settlement_agent", "PAYMENT", "Send 5000", ttl_seconds=0.05)
+
+        assert await first.wait_for_decision(req_id, timeout=0.1) == "EXPIRED"
+        assert await first.expire_due() == 0
+        assert await first.list_requests() == []
+        assert await first.wait_for_decision("unknown", timeout=0.01) is None
+        await first.close()
+
+
+@pytest.fixture()
+def gated_send(workers, monkeypatch):
+    from apps.api.app import schemas, state
+    from apps.api.app.routers import wallet
+
+    first, _ = workers
+    settlement = MagicMock()
+    settlement.execute_settlement = AsyncMock(return_value="0xsettled")
+    monkeypatch.setattr(wallet, "get_settlement_agent", lambda: settlement)
+    monkeypatch.setattr(wallet, "get_approval_service", lambda: first)
+    monkeypatch.setattr(wallet.anomaly_detector, "analyze_transaction", lambda **kwargs: None)
+    monkeypatch.setattr(wallet, "AsyncSessionLocal", MagicMock(side_effect=RuntimeError("no database")))
+    monkeypatch.setattr(state.app_config, "autonomy_level", "COPILOT")
+
+    request = schemas.TransactionRequest(amount=5000, recipient_address="0xrecipient")
+    return wallet, request, settlement
+
+
+class TestApprovalGatedSend:
+
+    @pytest.mark.asyncio
+    async def test_payment_approved_within_default_wait_is_executed(self, workers, gated_send):
+        wallet, request, settlement = gated_send
+        first, second = workers
+        assert wallet.settings.APPROVAL_WAIT_SECONDS > 0
+
+        send = asyncio.create_task(wallet.send_transaction(request))
+        while not await second.list_requests():
+            await asyncio.sleep(0.01)
+        [pending] = await second.list_requests()
+        assert pending.payload["amount"] == 5000
+
+        assert await second.approve_request(pending.id)
+        response = await asyncio.wait_for(send, 1)
+
+        assert response.status == "SUBMITTED"
+        assert response.tx_hash == "0xsettled"
+        settlement.execute_settlement.assert_awaited_once()
+        await first.close()
+
+    @pytest.mark.asyncio
+    async def test_undecided_payment_answers_pending(self, workers, gated_send, monkeypatch):
+        wallet, request, settlement = gated_send
+        first, _ = workers
+        monkeypatch.setattr(wallet.settings, "APPROVAL_WAIT_SECONDS", 0.05)
+
+        response = await wallet.send_transaction(request)
+
+        assert response.status == "PENDING_APPROVAL"
+        assert response.tx_hash == "WAITING_FOR_APPROVAL"
+        settlement.execute_settlement.assert_not_awaited()
+        await first.close()
@@ -0,0 +1,93 @@
+"""
+Unit tests for the pure-ASGI request pipeline (applications/capp/capp/core/asgi_pipeline.py).
+
+Covers:
+  - validation rejections (415 / 400) are JSON responses that still carry security headers
+  - allowlisted path prefixes skip validation
+  - streamed response bodies pass through chunk by chunk
+  - request state set by stages is visible to the app
+"""
+import asyncio
+import json
+
+import pytest
+
+from applications.capp.capp.core.asgi_pipeline import ASGIPipeline
+from applications.capp.capp.core.middleware import RequestLoggingStage
+from applications.capp.capp.core.security_headers import SecurityHeadersStage
+from applications.capp.capp.core.validation import RequestValidationStage
+
+
+async def _call(app, path="/api/v1/ping", method="GET", headers=(), query=b""):
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": query,
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+        "client": ("127.0.0.1", 5000),
+    }
+    sent = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+def _streaming_app(seen_state):
+    async def app(scope, receive, send):
+        seen_state.update(scope["state"])
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"server", b"uvicorn")]})
+        for chunk in (b"a", b"b", b"c"):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    return app
+
+
+def _pipeline(seen_state):
+    return ASGIPipeline(
+        _streaming_app(seen_state),
+        stages=[RequestLoggingStage(), SecurityHeadersStage(), RequestValidationStage()],
+    )
+
+
+class TestASGIPipeline:
+
+    @pytest.mark.asyncio
+    async def test_rejections_are_json_with_headers(self):
+        app = _pipeline({})
+
+        sent = await _call(app, method="POST", headers=[("content-type", "text/plain")])
+        start, body = sent
+        headers = dict(start["headers"])
+        assert start["status"] == 415
+        assert json.loads(body["body"])["detail"] == "Content type 'text/plain' not supported"
+        assert headers[b"x-frame-options"] == b"DENY"
+        assert b"x-request-id" in headers
+
+        sent = await _call(app, query=b"q=1%20UNION%20SELECT%20*")
+        assert sent[0]["status"] == 400
+
+        sent = await _call(app, path="/api/v1/../etc/passwd")
+        assert sent[0]["status"] == 400
+
+        # /health* is allowlisted by prefix
+        sent = await _call(app, path="/health/ready", query=b"q=<script>")
+        assert sent[0]["status"] == 200
+
+    @pytest.mark.asyncio
+    async def test_streaming_passthrough_and_state(self):
+        seen_state = {}
+        sent = await _call(_pipeline(seen_state))
+
+        headers = dict(sent[0]["headers"])
+        assert b"server" not in headers
+        assert headers[b"x-request-id"].decode() == seen_state["request_id"]
+        assert [m["body"] for m in sent[1:]] == [b"a", b"b", b"c", b""]
@@ -0,0 +1,101 @@
+"""
+Unit tests for the async session layer of apps/api
+(apps/api/app/database.py, apps/api/app/routers/corridors.py).
+
+Covers:
+  - _to_async_url driver mapping for SQLite and Postgres URLs
+  - get_corridor_feed querying through get_async_db on an aiosqlite engine
+"""
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from apps.api.app import database, models
+from apps.api.app.database import _to_async_url
+from apps.api.app.routers import corridors
+
+
+class TestToAsyncUrl:
+
+    @pytest.mark.parametrize("url, expected", [
+        ("sqlite:///./capp.db", "sqlite+aiosqlite:///./capp.db"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("sqlite+aiosqlite:///./capp.db", "sqlite+aiosqlite:///./capp.db"),
+        ("postgresql://capp:pw@db:5432/capp", "postgresql+asyncpg://capp:pw@db:5432/capp"),
+        ("postgresql+psycopg2://capp:pw@db/capp", "postgresql+asyncpg://capp:pw@db/capp"),
+        ("postgres://capp:pw@db/capp", "postgresql+asyncpg://capp:pw@db/capp"),
+        ("mysql+aiomysql://capp@db/capp", "mysql+aiomysql://capp@db/capp"),
+    ])
+    def test_maps_to_async_driver(self, url, expected):
+        assert _to_async_url(url) == expected
+
+
+@pytest.fixture()
+async def async_session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(database.Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def client(async_session_factory, monkeypatch):
+    async def get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    async def calm_market():
+        return {"stress_score": 0.2}
+
+    monkeypatch.setattr(corridors.market_context, "get_market_stress_indicator", calm_market)
+
+    app = FastAPI()
+    app.include_router(corridors.router)
+    app.dependency_overrides[database.get_async_db] = get_async_db
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+class TestCorridorFeed:
+
+    async def test_reads_recent_metrics_newest_first(self, client, async_session_factory):
+        now = datetime.utcnow()
+        async with async_session_factory() as session:
+            session.add_all([
+                models.CorridorMetricsHistory(
+                    timestamp=now - timedelta(hours=2), corridor="USDC-NGN",
+                    liquidity_depth=1e6, avg_fee_pct=0.4, success_rate=0.90, tx_volume_usd=5e4,
+                ),
+                models.CorridorMetricsHistory(
+                    timestamp=now - timedelta(hours=1), corridor="USDC-NGN",
+                    liquidity_depth=1e6, avg_fee_pct=0.3, success_rate=0.99, tx_volume_usd=6e4,
+                ),
+                models.CorridorMetricsHistory(
+                    timestamp=now - timedelta(days=20), corridor="USDC-NGN",
+                    liquidity_depth=1e6, avg_fee_pct=0.9, success_rate=0.50, tx_volume_usd=1e4,
+                ),
+                models.CorridorMetricsHistory(
+                    timestamp=now, corridor="USDC-KES",
+                    liquidity_depth=1e6, avg_fee_pct=0.2, success_rate=0.10, tx_volume_usd=1e4,
+                ),
+            ])
+            await session.commit()
+
+        response = await client.get("/corridors/feed", params={"corridor": "USDC-NGN"})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["current_health"] == "HEALTHY"
+        assert [m["success_rate"] for m in body["metrics"]] == [0.99, 0.90]
+
+    async def test_unknown_corridor_has_no_data(self, client):
+        response = await client.get("/corridors/feed", params={"corridor": "EUR-GHS"})
+
+        assert response.status_code == 200
+        assert response.json()["current_health"] == "NO_DATA"
+        assert response.json()["metrics"] == []
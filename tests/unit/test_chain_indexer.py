@@ -0,0 +1,202 @@
+"""
+Unit tests for ChainEventIndexer (applications/capp/capp/services/chain_indexer.py).
+
+Covers:
+  - logs are fetched in block ranges that shrink when refused and grow when quiet
+  - only blocks ``confirmations`` deep are indexed, and the checkpoint survives restarts
+  - events are decoded once and dispatched per range, filtered by kind
+  - a reorg deeper than the confirmation depth rewinds to the fork point
+  - the relayer releases each lock once across redeliveries and reorg replays
+"""
+import pytest
+
+from applications.capp.capp.services.chain_indexer import (
+    ChainEventIndexer,
+    EventDecoder,
+    RecordedBlockSource,
+    event_topic,
+)
+
+BRIDGE = "0x00000000000000000000000000000000000b1d6e"
+LOCKED = event_topic("TokensLocked(address,bytes32,address,uint256)")
+CONFIRMED = event_topic("SettlementConfirmed(bytes32,uint256)")
+
+
+def _word(value) -> str:
+    if isinstance(value, int):
+        return f"{value:064x}"
+    return value[2:].rjust(64, "0")
+
+
+def _locked(tx: str, amount: int) -> dict:
+    return {
+        "address": BRIDGE,
+        "topics": [LOCKED, "0x" + _word("0x" + "aa" * 20)],
+        "data": "0x" + _word("0x" + "cc" * 32) + _word("0x" + "dd" * 20) + _word(amount),
+        "transactionHash": tx,
+    }
+
+
+def _confirmed(tx: str, amount: int) -> dict:
+    return {
+        "address": BRIDGE,
+        "topics": [CONFIRMED, "0x" + _word("0x" + "01" * 32)],
+        "data": "0x" + _word(amount),
+        "transactionHash": tx,
+    }
+
+
+class _DictCache:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key, default=None):
+        return self.store.get(key, default)
+
+    async def set(self, key, value, ttl=None):
+        self.store[key] = value
+        return True
+
+    async def setnx(self, key, value):
+        if key in self.store:
+            return False
+        self.store[key] = value
+        return True
+
+    async def exists(self, key):
+        return key in self.store
+
+    async def delete(self, key):
+        return self.store.pop(key, None) is not None
+
+
+def _indexer(source, cache, **kwargs):
+    kwargs.setdefault("confirmations", 2)
+    kwargs.setdefault("start_block", 0)
+    return ChainEventIndexer("polygon", source, addresses=[BRIDGE], decoder=EventDecoder(), cache=cache, **kwargs)
+
+
+class TestChainEventIndexer:
+
+    @pytest.mark.asyncio
+    async def test_adaptive_ranges_checkpoint_and_dispatch(self):
+        source = RecordedBlockSource(max_range=8)
+        for i in range(40):
+            logs = []
+            if i == 3:
+                logs = [_locked("0x" + "01" * 32, 500), _confirmed("0x" + "02" * 32, 42)]
+            elif i == 39:
+                logs = [_locked("0x" + "03" * 32, 7)]  # not yet confirmed
+            source.add_block(logs)
+        cache = _DictCache()
+        indexer = _indexer(source, cache, initial_range=16, max_range=64)
+        batches, bridge = [], []
+        indexer.subscribe(lambda events: _record(batches, events))
+        indexer.subscribe(lambda events: _record(bridge, events), kinds=["bridge"])
+
+        assert await indexer.poll() is True
+
+        assert indexer.last_block == 37
+        assert indexer.stats["range_shrinks"] == 1
+        assert all(high - low + 1 <= 8 for low, high in source.get_logs_calls)
+        assert len(batches) == 1 and [e.name for e in batches[0]] == ["TokensLocked", "SettlementConfirmed"]
+        locked = bridge[0][0]
+        assert locked.args["amount"] == 500
+        assert locked.args["sender"] == "0x" + "aa" * 20
+        assert locked.block_number == 3
+
+        # A restarted indexer resumes from the persisted checkpoint
+        source.add_block([])
+        source.add_block([])
+        restarted = _indexer(source, cache)
+        restarted.subscribe(lambda events: _record(bridge, events), kinds=["bridge"])
+        await restarted.poll()
+        assert source.get_logs_calls[-1] == (38, 39)
+        assert bridge[-1][0].args["amount"] == 7
+
+    @pytest.mark.asyncio
+    async def test_reorg_rewinds_to_fork_point(self):
+        source = RecordedBlockSource()
+        for _ in range(20):
+            source.add_block([])
+        indexer = _indexer(source, _DictCache(), initial_range=4, max_range=4)
+        seen = []
+        indexer.subscribe(lambda events: _record(seen, events))
+        await indexer.poll()
+        assert indexer.last_block == 17
+
+        # Replace the last 6 blocks; the replacement chain carries a settlement
+        source.reorg(6, [[], [_confirmed("0x" + "09" * 32, 1)], [], [], [], [], []])
+        await indexer.poll()
+
+        assert indexer.stats["reorgs"] == 1
+        assert indexer.last_block == 18
+        assert [e.block_number for batch in seen for e in batch] == [15]
+
+
+class _AptosClient:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.releases = []
+
+    async def release_funds(self, payment_id, recipient_address, amount):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("aptos node down")
+        self.releases.append((recipient_address, amount))
+        return f"0xrelease{len(self.releases)}"
+
+
+def _relayer(monkeypatch, indexer, aptos):
+    pytest.importorskip("starknet_py")
+    from applications.capp.capp.core import relayer
+
+    monkeypatch.setattr(relayer, "get_starknet_client", lambda: None)
+    monkeypatch.setattr(relayer, "get_aptos_client", lambda: aptos)
+    return relayer.RelayerService(indexer=indexer, cache=_DictCache())
+
+
+class TestRelayerIdempotency:
+
+    @pytest.mark.asyncio
+    async def test_redelivered_and_reorged_locks_release_once(self, monkeypatch):
+        source = RecordedBlockSource()
+        for i in range(20):
+            source.add_block([_locked("0x" + "0a" * 32, 500)] if i == 15 else [])
+        indexer = _indexer(source, _DictCache(), initial_range=4, max_range=4)
+        aptos = _AptosClient()
+        service = _relayer(monkeypatch, indexer, aptos)
+        delivered = []
+        indexer.subscribe(lambda events: _record(delivered, events), kinds=["bridge"])
+
+        await indexer.poll()
+        assert len(aptos.releases) == 1
+
+        # The same lock is mined again in the replacement chain and replayed
+        source.reorg(6, [[], [_locked("0x" + "0a" * 32, 500)], [], [], [], [], []])
+        await indexer.poll()
+        assert indexer.stats["reorgs"] == 1
+
+        # At-least-once delivery hands the batch over a second time
+        await service.handle_bridge_events(delivered[0])
+
+        assert len(aptos.releases) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_release_can_be_retried(self, monkeypatch):
+        source = RecordedBlockSource()
+        for i in range(8):
+            source.add_block([_locked("0x" + "0b" * 32, 700)] if i == 3 else [])
+        indexer = _indexer(source, _DictCache())
+        aptos = _AptosClient(failures=1)
+        _relayer(monkeypatch, indexer, aptos)
+
+        with pytest.raises(ConnectionError):
+            await indexer.poll()
+        await indexer.poll()
+
+        assert len(aptos.releases) == 1
+
+
+async def _record(sink, events):
+    sink.append(list(events))
@@ -0,0 +1,101 @@
+"""
+Unit tests for the streamed compliance CSV export
+(apps/api/app/routers/compliance_reports.py).
+
+Covers:
+  - header first, then rows newest first in EXPORT_BATCH_SIZE chunks
+  - the export limit
+  - the generator closing its own session
+"""
+import csv
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from apps.api.app import database, models
+from apps.api.app.routers import compliance_reports
+from apps.api.app.routers.compliance_reports import CSV_HEADER, _stream_csv_rows
+
+T0 = datetime(2026, 3, 1, 12, 0)
+
+
+@pytest.fixture()
+def session_factory(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    database.Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def _seed(factory, count):
+    db = factory()
+    db.add_all(
+        models.PaymentMemoryRecord(
+            timestamp=T0 + timedelta(seconds=i),
+            tx_hash=f"0x{i:04x}",
+            corridor="USD-KES",
+            target_chain="polygon",
+            amount_usd=10 + i,
+            execution_time_ms=120,
+            success=i % 2 == 0,
+            error_reason=None if i % 2 == 0 else "timeout",
+        )
+        for i in range(count)
+    )
+    db.commit()
+    db.close()
+
+
+def _rows(chunks):
+    return list(csv.reader(io.StringIO("".join(chunks))))
+
+
+class TestStreamCsvRows:
+
+    def test_rows_are_streamed_newest_first_in_batches(self, session_factory, monkeypatch):
+        monkeypatch.setattr(compliance_reports, "EXPORT_BATCH_SIZE", 2)
+        _seed(session_factory, 5)
+
+        chunks = list(_stream_csv_rows(limit=100))
+
+        # Header, two full batches, then the last row
+        assert len(chunks) == 4
+        rows = _rows(chunks)
+        assert rows[0] == CSV_HEADER
+        assert [row[1] for row in rows[1:]] == ["0x0004", "0x0003", "0x0002", "0x0001", "0x0000"]
+        assert rows[1][4] == "14.00" and rows[2][7] == "timeout"
+
+    def test_limit_caps_exported_rows(self, session_factory):
+        _seed(session_factory, 5)
+
+        rows = _rows(_stream_csv_rows(limit=3))
+
+        assert [row[1] for row in rows[1:]] == ["0x0004", "0x0003", "0x0002"]
+
+    def test_session_is_closed_when_client_disconnects(self, session_factory, monkeypatch):
+        _seed(session_factory, 3)
+        closed = []
+        opened = session_factory
+
+        def tracking_factory():
+            db = opened()
+            original_close = db.close
+            db.close = lambda: (closed.append(True), original_close())
+            return db
+
+        monkeypatch.setattr(database, "SessionLocal", tracking_factory)
+
+        stream = _stream_csv_rows(limit=10)
+        next(stream)
+        next(stream)
+        stream.close()
+
+        assert closed == [True]
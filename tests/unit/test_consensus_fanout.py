@@ -0,0 +1,113 @@
+"""
+Unit tests for concurrent consensus rounds (packages/core/consensus/).
+
+Covers:
+  - agents are asked concurrently; a round ends once the outcome is decided
+    and the slow agents still running are cancelled
+  - per-agent deadlines drop laggards; round timing and slow agents are recorded
+  - votes and agreement phases end early when the result cannot change
+"""
+import asyncio
+import time
+
+import pytest
+
+from packages.core.agents.base import ProcessingResult
+from packages.core.consensus.agreement import (
+    AgreementEngine,
+    AgreementMessage,
+    AgreementPhase,
+    AgreementProtocol,
+    AgreementSession,
+)
+from packages.core.consensus.mechanisms import ConsensusConfig, ConsensusEngine, ConsensusType
+from packages.core.consensus.voting import Vote, VotingEngine, VotingSession, VotingStrategy
+
+
+def _agent(delay: float, success: bool = True, cancelled: list = None, name: str = ""):
+    async def run():
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(name)
+            raise
+        return ProcessingResult(success=success, transaction_id="tx-1", status="ok", message="")
+    return run
+
+
+class TestConsensusFanOut:
+
+    @pytest.mark.asyncio
+    async def test_round_ends_at_quorum_and_cancels_stragglers(self):
+        engine = ConsensusEngine(ConsensusConfig(consensus_type=ConsensusType.MAJORITY, threshold=0.6))
+        cancelled = []
+        agents = {f"fast-{i}": _agent(0.01) for i in range(3)}
+        agents.update({f"slow-{i}": _agent(1.0, cancelled=cancelled, name=f"slow-{i}") for i in range(2)})
+
+        started = time.perf_counter()
+        result = await engine.collect_consensus(agents)
+        elapsed = time.perf_counter() - started
+
+        assert result.success
+        assert elapsed < 0.5
+        stats = engine.round_history[-1]
+        assert stats.decided_early
+        assert sorted(stats.cancelled) == sorted(cancelled) == ["slow-0", "slow-1"]
+        assert set(stats.latencies) == {"fast-0", "fast-1", "fast-2"}
+        assert (await engine.get_consensus_metrics())["slow_agents"] == {"slow-0": 1, "slow-1": 1}
+
+    @pytest.mark.asyncio
+    async def test_deadlines_and_unreachable_quorum(self):
+        engine = ConsensusEngine(ConsensusConfig(
+            consensus_type=ConsensusType.UNANIMOUS, timeout=0.05, agent_timeouts={"laggard": 0.02}
+        ))
+        agents = {"yes": _agent(0.0), "laggard": _agent(1.0), "no": _agent(0.03, success=False), "late": _agent(1.0)}
+
+        result = await engine.collect_consensus(agents)
+
+        stats = engine.round_history[-1]
+        assert stats.timed_out == ["laggard"]
+        # The dissent makes unanimity unreachable: no need to wait for "late"
+        assert stats.decided_early and stats.cancelled == ["late"]
+        assert stats.duration < 0.05
+        assert result.success  # not unanimous: fallback picks the first successful result
+
+    @pytest.mark.asyncio
+    async def test_votes_and_agreement_phases_end_early(self):
+        voting = VotingEngine()
+        await voting.create_voting_session(VotingSession(
+            session_id="s1", strategy=VotingStrategy.SIMPLE_MAJORITY, threshold=0.5, min_votes=2
+        ))
+
+        def voter(agent_id, delay, value):
+            async def run():
+                await asyncio.sleep(delay)
+                return Vote(agent_id=agent_id, agent_type="risk", vote_value=value)
+            return run
+
+        result = await voting.collect_votes("s1", {
+            "a": voter("a", 0.0, True), "b": voter("b", 0.01, True), "c": voter("c", 1.0, False), "d": voter("d", 1.0, False),
+        })
+        assert result.passed and result.total_votes == 2
+        assert sorted(result.metadata["round"]["cancelled"]) == ["c", "d"]
+
+        async def transport(participant_id, message):
+            if participant_id == "p3":
+                await asyncio.sleep(1.0)
+            phase = AgreementPhase.ABORT if participant_id == "p2" else AgreementPhase.PREPARE_ACK
+            return AgreementMessage(
+                protocol=message.protocol, phase=phase, transaction_id=message.transaction_id,
+                agent_id=participant_id, coordinator_id=message.coordinator_id
+            )
+
+        agreement = AgreementEngine(transport=transport)
+        session_id = await agreement.start_agreement_session(AgreementSession(
+            protocol=AgreementProtocol.TWO_PHASE_COMMIT, transaction_id="tx-1",
+            coordinator_id="coordinator", participant_ids=["p1", "p2", "p3"]
+        ))
+
+        outcome = await agreement.get_agreement_result(session_id)
+        assert not outcome.successful
+        assert outcome.processing_time < 0.5
+        assert outcome.metadata["rounds"][0]["cancelled"] == ["p3"]
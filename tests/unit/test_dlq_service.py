@@ -0,0 +1,186 @@
+"""
+Unit tests for DLQService (applications/capp/capp/services/dlq_service.py).
+
+Covers:
+  - captured tasks are retried through the registered handler
+  - failed retries back off and are quarantined after max_retries
+  - NonRetryableError quarantines immediately
+  - per-task-type concurrency limit
+  - listing fetches task bodies with a single MGET
+  - backoff grows exponentially and stays within the cap
+  - a long-running handler keeps its lease and is not run twice
+  - tasks in the legacy dlq:index list are migrated to the sorted sets
+"""
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from applications.capp.capp.core.redis import MockRedisClient
+from applications.capp.capp.services.dlq_service import (
+    DLQHandlerSpec,
+    DLQService,
+    NonRetryableError,
+)
+
+
+@pytest.fixture()
+def redis_client():
+    return MockRedisClient()
+
+
+def _service(redis_client, handlers):
+    dlq = DLQService(redis_client=redis_client, handlers=handlers)
+    dlq.backoff_base = 0  # every retry is due immediately
+    return dlq
+
+
+class TestDLQService:
+
+    @pytest.mark.asyncio
+    async def test_retry_runs_registered_handler(self, redis_client):
+        seen = []
+
+        async def handler(payload):
+            seen.append(payload)
+
+        dlq = _service(redis_client, {"YIELD_SWEEP": DLQHandlerSpec(handler)})
+        task_id = await dlq.capture_failure("YIELD_SWEEP", {"amount": "10"}, RuntimeError("rpc down"))
+
+        assert await dlq.run_due_tasks() == 1
+        await dlq.drain()
+
+        assert seen == [{"amount": "10"}]
+        [task] = await dlq.get_failed_tasks()
+        assert task.task_id == task_id
+        assert task.status == "RECOVERED"
+        assert (await dlq.get_stats())["scheduled"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_reschedule_then_quarantine(self, redis_client):
+        async def handler(payload):
+            raise RuntimeError("still down")
+
+        dlq = _service(redis_client, {"SETTLEMENT": DLQHandlerSpec(handler)})
+        task_id = await dlq.capture_failure("SETTLEMENT", {}, RuntimeError("down"), max_retries=2)
+
+        for _ in range(3):
+            await dlq.run_due_tasks()
+            await dlq.drain()
+
+        [task] = await dlq.get_quarantined_tasks()
+        assert task.task_id == task_id
+        assert task.retry_count == 2
+        assert task.status == "QUARANTINED"
+        assert dlq.rescheduled == 1
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_quarantines_immediately(self, redis_client):
+        async def handler(payload):
+            raise NonRetryableError("unknown wallet")
+
+        dlq = _service(redis_client, {"SETTLEMENT": DLQHandlerSpec(handler)})
+        await dlq.capture_failure("SETTLEMENT", {}, RuntimeError("down"), max_retries=5)
+
+        await dlq.run_due_tasks()
+        await dlq.drain()
+
+        [task] = await dlq.get_quarantined_tasks()
+        assert task.retry_count == 1
+
+    @pytest.mark.asyncio
+    async def test_per_type_concurrency(self, redis_client):
+        gate = asyncio.Event()
+
+        async def handler(payload):
+            await gate.wait()
+
+        dlq = _service(redis_client, {"YIELD_SWEEP": DLQHandlerSpec(handler, concurrency=2)})
+        for i in range(5):
+            await dlq.capture_failure("YIELD_SWEEP", {"i": i}, RuntimeError("down"))
+
+        assert await dlq.run_due_tasks() == 2
+        assert await dlq.run_due_tasks() == 0
+
+        gate.set()
+        await dlq.drain()
+        assert await dlq.run_due_tasks() == 2
+
+    @pytest.mark.asyncio
+    async def test_listing_uses_one_mget(self, redis_client):
+        dlq = _service(redis_client, {})
+        for i in range(10):
+            await dlq.capture_failure("YIELD_SWEEP", {"i": i}, RuntimeError("down"))
+
+        calls = []
+        original_mget = redis_client.mget
+
+        async def counting_mget(keys):
+            calls.append(len(keys))
+            return await original_mget(keys)
+
+        redis_client.mget = counting_mget
+        tasks = await dlq.get_failed_tasks(limit=10)
+
+        assert len(tasks) == 10
+        assert calls == [10]
+
+    def test_backoff_is_exponential_and_capped(self, redis_client):
+        dlq = DLQService(redis_client=redis_client, handlers={})
+        dlq.backoff_base, dlq.backoff_max = 2.0, 60.0
+
+        assert 1.0 <= dlq.backoff_seconds(0) <= 2.0
+        assert 8.0 <= dlq.backoff_seconds(3) <= 16.0
+        assert 30.0 <= dlq.backoff_seconds(20) <= 60.0
+
+    @pytest.mark.asyncio
+    async def test_long_handler_renews_lease(self, redis_client):
+        calls = 0
+        release = asyncio.Event()
+
+        async def handler(payload):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+
+        dlq = _service(redis_client, {"SLOW": DLQHandlerSpec(handler, concurrency=2)})
+        dlq.lease_seconds = 0.06
+        await dlq.capture_failure("SLOW", {}, RuntimeError("x"))
+
+        assert await dlq.run_due_tasks() == 1
+        # Several lease periods pass while the handler is still running
+        for _ in range(5):
+            await asyncio.sleep(0.03)
+            await dlq.run_due_tasks()
+
+        release.set()
+        await dlq.drain()
+
+        assert calls == 1
+        assert (await dlq.get_stats())["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_legacy_index_is_migrated(self, redis_client):
+        def legacy(task_id, status, retry_count=0):
+            body = {
+                "task_id": task_id, "task_type": "YIELD_SWEEP", "payload": {"n": task_id},
+                "error_message": "boom", "retry_count": retry_count, "max_retries": 3,
+                "created_at": str(datetime(2026, 1, 1)), "status": status,
+            }
+            return json.dumps(body)
+
+        for task_id, status, retries in [("a", "FAILED", 0), ("b", "RETRYING", 3), ("c", "RECOVERED", 1)]:
+            await redis_client.set(f"dlq:task:{task_id}", legacy(task_id, status, retries))
+            await redis_client.lpush("dlq:index", task_id)
+
+        dlq = _service(redis_client, {})
+
+        assert await dlq.migrate_legacy_index() == 3
+        assert await redis_client.lrange("dlq:index", 0, -1) == []
+        assert {t.task_id for t in await dlq.get_failed_tasks()} == {"a", "b", "c"}
+        assert await redis_client.zscore(DLQService.SCHEDULE_KEY, "a") is not None
+        assert [t.task_id for t in await dlq.get_quarantined_tasks()] == ["b"]
+        assert (await dlq.get_stats())["scheduled"] == 1
+        # Running it again is a no-op
+        assert await dlq.migrate_legacy_index() == 0
@@ -0,0 +1,167 @@
+"""
+Unit tests for BatchingEventProducer (applications/capp/capp/core/kafka.py).
+
+Covers:
+  - events are batched per topic after the linger time
+  - a full topic batch is flushed without waiting for the linger
+  - drop_oldest / drop_new backpressure and send() waiting for room
+  - delivery callbacks see delivered and failed batches
+  - a failing broker is retried, its batch requeued and delivered on recovery
+  - file broker round trip with compression
+"""
+import asyncio
+
+import pytest
+
+from applications.capp.capp.core.kafka import (
+    BatchingEventProducer,
+    FileEventBroker,
+    InMemoryEventBroker,
+)
+
+
+class _FailingBroker(InMemoryEventBroker):
+    async def send_batch(self, topic, payload, count, compression):
+        raise ConnectionError("broker down")
+
+
+class _FlakyBroker(InMemoryEventBroker):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.attempts = 0
+
+    async def send_batch(self, topic, payload, count, compression):
+        self.attempts += 1
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("broker down")
+        await super().send_batch(topic, payload, count, compression)
+
+
+class TestBatchingEventProducer:
+
+    @pytest.mark.asyncio
+    async def test_batches_per_topic_after_linger(self):
+        broker = InMemoryEventBroker()
+        producer = BatchingEventProducer(broker, linger_ms=10)
+
+        for i in range(5):
+            assert producer.publish("capp.payments", {"n": i}, key=f"p{i}")
+        producer.publish("capp.settlements", {"n": 99})
+        assert broker.batches == {}
+
+        await asyncio.sleep(0.05)
+
+        assert len(broker.batches["capp.payments"]) == 1
+        assert [m["value"]["n"] for m in broker.messages("capp.payments")] == [0, 1, 2, 3, 4]
+        assert broker.messages("capp.payments")[0]["key"] == "p0"
+        assert producer.get_stats()["batches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_immediately(self):
+        broker = InMemoryEventBroker()
+        producer = BatchingEventProducer(broker, linger_ms=10_000, max_batch_size=3)
+
+        for i in range(3):
+            producer.publish("capp.payments", {"n": i})
+        await asyncio.sleep(0)
+
+        assert len(broker.messages("capp.payments")) == 3
+        await producer.close()
+
+    @pytest.mark.asyncio
+    async def test_backpressure_policies(self):
+        broker = InMemoryEventBroker()
+        oldest = BatchingEventProducer(broker, linger_ms=10_000, max_buffered=2)
+        for i in range(3):
+            assert oldest.publish("a", {"n": i})
+        await oldest.flush()
+        assert [m["value"]["n"] for m in broker.messages("a")] == [1, 2]
+        assert oldest.dropped == 1
+
+        newest = BatchingEventProducer(InMemoryEventBroker(), linger_ms=10_000, max_buffered=2, backpressure="drop_new")
+        assert newest.publish("a", {"n": 0})
+        assert newest.publish("a", {"n": 1})
+        assert not newest.publish("a", {"n": 2})
+
+        # send() waits for a flush to make room instead of dropping
+        assert await newest.send("a", {"n": 3})
+        await newest.flush()
+        assert [m["value"]["n"] for m in newest.broker.messages("a")] == [0, 1, 3]
+
+    @pytest.mark.asyncio
+    async def test_delivery_callbacks(self):
+        delivered = []
+        producer = BatchingEventProducer(InMemoryEventBroker(), linger_ms=10_000)
+        producer.add_delivery_callback(lambda topic, count, error: delivered.append((topic, count, error)))
+        producer.publish("a", {})
+        producer.publish("a", {})
+        await producer.flush()
+
+        failures = []
+        failing = BatchingEventProducer(_FailingBroker(), linger_ms=10_000, max_retries=0)
+        failing.add_delivery_callback(lambda topic, count, error: failures.append(error))
+        failing.publish("a", {})
+        await failing.flush()
+
+        assert delivered == [("a", 2, None)]
+        assert isinstance(failures[0], ConnectionError)
+        assert failing.get_stats()["failed"] == 0
+        assert failing.buffered == 1
+
+        await failing.close()
+        assert failing.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_broker_retries_then_requeues(self):
+        broker = _FlakyBroker(failures=2)
+        producer = BatchingEventProducer(broker, linger_ms=10_000, max_retries=1, retry_backoff_ms=1)
+        for i in range(3):
+            producer.publish("a", {"n": i})
+
+        # Both attempts fail: the batch goes back to the buffer instead of being dropped
+        assert await producer.flush() == 0
+        assert broker.attempts == 2
+        assert producer.buffered == 3
+        producer.publish("a", {"n": 3})
+
+        assert await producer.flush() == 4
+        assert [m["value"]["n"] for m in broker.messages("a")] == [0, 1, 2, 3]
+        stats = producer.get_stats()
+        assert stats["failed"] == 0 and stats["requeued"] == 3 and stats["delivered"] == 4
+        await producer.close()
+
+    @pytest.mark.asyncio
+    async def test_requeue_respects_buffer_limit(self):
+        producer = None
+
+        class _BusyFailingBroker(InMemoryEventBroker):
+            async def send_batch(self, topic, payload, count, compression):
+                # New events arrive while the failing batch is in flight
+                producer.publish("b", {"n": "new"})
+                producer.publish("b", {"n": "new"})
+                raise ConnectionError("broker down")
+
+        producer = BatchingEventProducer(_BusyFailingBroker(), linger_ms=10_000, max_buffered=3, max_retries=0)
+        for i in range(3):
+            producer.publish("a", {"n": i})
+        await producer.flush()
+
+        # Only one of the three failed events fits next to the two new ones
+        assert producer.buffered == 3
+        assert producer.get_stats()["requeued"] == 1
+        assert producer.get_stats()["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_file_broker_round_trip(self, tmp_path):
+        broker = FileEventBroker(str(tmp_path))
+        producer = BatchingEventProducer(broker, linger_ms=10_000, compression="gzip")
+        for i in range(50):
+            producer.publish("capp.payments", {"payment_id": f"p{i}", "event_type": "PAYMENT_INITIATED"})
+        await producer.close()
+
+        messages = list(broker.messages("capp.payments"))
+        assert len(messages) == 50
+        assert messages[-1]["value"]["payment_id"] == "p49"
+        assert producer.get_stats()["compression_ratio"] < 0.5
@@ -0,0 +1,110 @@
+"""
+Unit tests for multi-window fraud velocity checks (applications/capp/capp/services/fraud.py).
+
+Covers:
+  - every velocity rule is evaluated in one script call (one round trip)
+  - each counter gets its window TTL inside the same call
+  - breached rules are all reported; rules without a dimension value are skipped
+  - default rules keep the original 10-per-day decisions; extra rules are opt-in
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from applications.capp.capp.services.fraud import (
+    DEFAULT_VELOCITY_RULES,
+    EXTRA_VELOCITY_RULES,
+    FraudDetectionService,
+    VELOCITY_SCRIPT,
+    configured_velocity_rules,
+)
+
+
+class _ScriptingRedis:
+    """Runs VELOCITY_SCRIPT's INCR + EXPIRE semantics in-process and counts calls."""
+
+    def __init__(self):
+        self.counts = {}
+        self.ttls = {}
+        self.script_calls = 0
+
+    def register_script(self, script):
+        assert script == VELOCITY_SCRIPT
+
+        async def run(keys, args):
+            self.script_calls += 1
+            result = []
+            for key, ttl in zip(keys, args):
+                self.counts[key] = self.counts.get(key, 0) + 1
+                if self.counts[key] == 1:
+                    self.ttls[key] = int(ttl)
+                result.append(self.counts[key])
+            return result
+        return run
+
+
+class _Cache:
+    def __init__(self, redis):
+        self.redis = redis
+
+
+def _service(velocity_rules=None):
+    redis = _ScriptingRedis()
+    service = FraudDetectionService(velocity_rules=velocity_rules, cache=_Cache(redis))
+    service.redis = redis
+    return service
+
+
+@pytest.fixture()
+def fraud():
+    return _service(DEFAULT_VELOCITY_RULES + EXTRA_VELOCITY_RULES)
+
+
+class TestFraudVelocity:
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip_for_all_rules(self, fraud):
+        result = await fraud.analyze_transaction(
+            user_id="sender-1", amount=250.0, recipient_id="recipient-1", corridor="USD-KES"
+        )
+        assert fraud.redis.script_calls == 1
+        assert len(fraud.redis.counts) == len(fraud.velocity_rules)
+        assert sorted(set(fraud.redis.ttls.values())) == [60, 3600, 86400]
+        assert result["velocity_breaches"] == []
+
+    @pytest.mark.asyncio
+    async def test_reports_every_breached_rule(self, fraud):
+        for _ in range(4):
+            result = await fraud.analyze_transaction(user_id="sender-2", amount=9500.0)
+
+        assert fraud.redis.script_calls == 4
+        # No recipient or corridor given: those rules are never counted
+        assert not any(":recipient:" in k or ":corridor:" in k for k in fraud.redis.counts)
+
+        breached = {b["rule"] for b in result["velocity_breaches"]}
+        assert breached == {"SENDER_VELOCITY_1M", "REPEATED_AMOUNT_BUCKET_24H"}
+        assert "STRUCTURING_SUSPICION_AMOUNT_RANGE" in result["flags"]
+        assert result["is_high_risk"]
+
+    @pytest.mark.asyncio
+    async def test_defaults_keep_daily_limit_decisions(self):
+        fraud = _service()
+        assert fraud.velocity_rules == DEFAULT_VELOCITY_RULES
+
+        results = [
+            await fraud.analyze_transaction(user_id="sender-3", amount=50.0, recipient_id="shop", corridor="USD-KES")
+            for _ in range(11)
+        ]
+
+        # Same as the single daily counter: clean, warning above 7, flagged above 10
+        assert [r["risk_score"] for r in results] == [0.0] * 7 + [0.2] * 3 + [0.8]
+        assert [r["is_high_risk"] for r in results] == [False] * 10 + [True]
+        assert results[-1]["flags"] == ["HIGH_VELOCITY_DAILY_LIMIT_EXCEEDED (11/10)"]
+
+    def test_extra_rules_are_opt_in(self):
+        def rules(value):
+            return [r.name for r in configured_velocity_rules(SimpleNamespace(FRAUD_EXTRA_VELOCITY_RULES=value))]
+
+        assert rules("") == ["HIGH_VELOCITY_DAILY_LIMIT_EXCEEDED"]
+        assert rules("RECIPIENT_VELOCITY_1H, unknown") == ["HIGH_VELOCITY_DAILY_LIMIT_EXCEEDED", "RECIPIENT_VELOCITY_1H"]
+        assert len(rules("all")) == len(DEFAULT_VELOCITY_RULES) + len(EXTRA_VELOCITY_RULES)
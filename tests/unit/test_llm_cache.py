@@ -0,0 +1,161 @@
+"""
+Unit tests for CachingLLMProvider (packages/intelligence/core/caching_provider.py).
+
+Covers:
+  - repeated prompts are served from the in-process cache
+  - identical concurrent prompts share one provider call
+  - a second worker reuses responses through the shared (Redis) cache
+  - latency budget returns the fallback and the late answer fills the cache
+  - use cases with ttl 0 are never cached
+  - token / latency accounting
+  - the market analyst cache key tolerates a missing or non-numeric price
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+import pytest
+
+from packages.intelligence.core.caching_provider import (
+    CachingLLMProvider,
+    LLMLatencyBudgetExceeded,
+    LLMUseCasePolicy,
+)
+from packages.intelligence.core.llm_provider import LLMProvider, LLMResponse
+
+
+class _CountingProvider(LLMProvider):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def generate_text(self, prompt: str, system_prompt: Optional[str] = None) -> LLMResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return LLMResponse(content=f"answer:{prompt}", raw_response={}, usage={"prompt_tokens": 7, "completion_tokens": 3})
+
+    async def generate_json(self, prompt: str, schema: Dict[str, Any], system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"prompt": prompt, "risk_level": "LOW"}
+
+
+class _DictCache:
+    """Shared cache with the RedisCache get/set(ttl=) interface."""
+
+    def __init__(self):
+        self.store: Dict[str, Any] = {}
+
+    async def get(self, key, default=None):
+        return self.store.get(key, default)
+
+    async def set(self, key, value, ttl=None):
+        self.store[key] = value
+        return True
+
+
+class TestCachingLLMProvider:
+
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_hits_memory(self):
+        provider = _CountingProvider()
+        llm = CachingLLMProvider(provider, cache=_DictCache())
+
+        first = await llm.generate_json("APT risk", schema={}, use_case="market_risk")
+        first["risk_level"] = "MUTATED"
+        second = await llm.generate_json("APT risk", schema={}, use_case="market_risk")
+
+        assert provider.calls == 1
+        assert second["risk_level"] == "LOW"
+        assert llm.get_stats()["market_risk"]["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_prompts_are_coalesced(self):
+        provider = _CountingProvider(delay=0.05)
+        llm = CachingLLMProvider(provider, cache=_DictCache())
+
+        results = await asyncio.gather(*[
+            llm.generate_json("APT risk", schema={}, use_case="market_risk") for _ in range(10)
+        ])
+
+        assert provider.calls == 1
+        assert all(r == results[0] for r in results)
+        assert llm.get_stats()["market_risk"]["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_shared_cache_across_workers(self):
+        shared = _DictCache()
+        worker_a = CachingLLMProvider(_CountingProvider(), cache=shared)
+        provider_b = _CountingProvider()
+        worker_b = CachingLLMProvider(provider_b, cache=shared)
+
+        await worker_a.generate_text("hello", use_case="analyst_chat")
+        response = await worker_b.generate_text("hello", use_case="analyst_chat")
+
+        assert provider_b.calls == 0
+        assert response.content == "answer:hello"
+        assert worker_b.get_stats()["analyst_chat"]["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_budget_fallback_then_cached(self):
+        provider = _CountingProvider(delay=0.1)
+        llm = CachingLLMProvider(
+            provider,
+            cache=_DictCache(),
+            policies={"market_risk": LLMUseCasePolicy(ttl_seconds=60, latency_budget_seconds=0.01)},
+        )
+
+        result = await llm.generate_json("APT risk", schema={}, use_case="market_risk", fallback={"risk_level": "UNKNOWN"})
+        assert result == {"risk_level": "UNKNOWN"}
+
+        with pytest.raises(LLMLatencyBudgetExceeded):
+            await llm.generate_json("APT risk", schema={}, use_case="market_risk")
+
+        # The original call keeps running and fills the cache
+        await asyncio.sleep(0.15)
+        result = await llm.generate_json("APT risk", schema={}, use_case="market_risk")
+
+        assert result["risk_level"] == "LOW"
+        assert provider.calls == 1
+        assert llm.get_stats()["market_risk"]["budget_exceeded"] == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_zero_is_not_cached(self):
+        provider = _CountingProvider()
+        llm = CachingLLMProvider(provider, cache=_DictCache())
+
+        await llm.generate_json("rebalance?", schema={}, use_case="liquidity_decision")
+        await llm.generate_json("rebalance?", schema={}, use_case="liquidity_decision")
+
+        assert provider.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_token_accounting(self):
+        llm = CachingLLMProvider(_CountingProvider(), cache=_DictCache())
+
+        await llm.generate_text("hello", use_case="analyst_chat")
+        stats = llm.get_stats()["analyst_chat"]
+
+        assert stats["prompt_tokens"] == 7
+        assert stats["completion_tokens"] == 3
+        assert stats["provider_calls"] == 1
+
+
+class TestMarketAnalystCacheKey:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("price", [None, "LIVE", 10.4271])
+    async def test_cache_key_tolerates_missing_or_non_numeric_price(self, price):
+        from unittest.mock import AsyncMock, MagicMock
+        from packages.intelligence.market.analyst import MarketAnalysisAgent
+
+        provider = _CountingProvider()
+        agent = MarketAnalysisAgent.__new__(MarketAnalysisAgent)
+        agent.logger = MagicMock()
+        agent.provider = CachingLLMProvider(provider, cache=_DictCache())
+        agent.market_service = MagicMock(get_token_price=AsyncMock(return_value={"price": price}))
+        agent.chain_service = MagicMock(get_aptos_metrics=AsyncMock(return_value={}))
+
+        result = await agent.analyze_settlement_risk("APT", 1000)
+
+        assert provider.calls == 1
+        assert result["risk_level"] == "LOW"
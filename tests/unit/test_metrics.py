@@ -178,3 +178,64 @@ class TestP95P99Latency:
         assert percentiles["p50"] == 0.0
         assert percentiles["p95"] == 0.0
         assert percentiles["p99"] == 0.0
+
+
+# ---------------------------------------------------------------------------
+# Write-behind buffer
+# ---------------------------------------------------------------------------
+
+class _RecordingPipeline:
+    def __init__(self, sink):
+        self.sink = sink
+        self.commands = []
+
+    def hincrby(self, key, field, amount):
+        self.commands.append(("hincrby", key, field, amount))
+
+    def lpush(self, key, *values):
+        self.commands.append(("lpush", key, values))
+
+    def ltrim(self, key, start, end):
+        self.commands.append(("ltrim", key, start, end))
+
+    async def execute(self):
+        self.sink.append(self.commands)
+        return [True] * len(self.commands)
+
+
+class _PipelinedCache:
+    def __init__(self):
+        self.executed = []
+        self.redis = self
+
+    def pipeline(self, transaction=True):
+        return _RecordingPipeline(self.executed)
+
+
+class TestMetricsWriteBuffer:
+
+    @pytest.mark.asyncio
+    async def test_nowait_does_not_touch_cache_until_flush(self, collector):
+        collector.record_payment_metrics_nowait("p", Decimal("10"), 1.0, True, "KE-UG")
+        assert await collector.cache.hget("metrics:payments:total", "count") is None
+
+        await collector.flush()
+        assert int(await collector.cache.hget("metrics:payments:total", "count")) == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_aggregates_into_single_pipeline(self):
+        from applications.capp.capp.services.metrics_buffer import MetricsWriteBuffer
+
+        cache = _PipelinedCache()
+        buffer = MetricsWriteBuffer(cache, flush_interval_ms=10_000)
+        for _ in range(50):
+            buffer.hincrby("metrics:payments:total", "count", 1)
+            buffer.push_capped("metrics:processing_times", 0.5, 10)
+
+        commands = await buffer.flush()
+
+        assert len(cache.executed) == 1
+        assert commands == 3
+        assert ("hincrby", "metrics:payments:total", "count", 50) in cache.executed[0]
+        lpush = next(c for c in cache.executed[0] if c[0] == "lpush")
+        assert len(lpush[2]) == 10
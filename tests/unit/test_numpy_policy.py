@@ -0,0 +1,94 @@
+"""
+Unit tests for the torch-free policy runtime (packages/ml/inference/numpy_policy.py).
+
+Covers:
+  - forward pass matches a hand-written tanh MLP
+  - batched and single-observation predictions agree
+  - invalid actions are masked out
+  - save / load round trip
+  - the committed export loads by default and matches the PPO model
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from packages.ml.config import MLConfig
+from packages.ml.inference.numpy_policy import NumpyPolicy
+
+
+@pytest.fixture()
+def policy():
+    rng = np.random.default_rng(7)
+    weights = [rng.normal(size=(26, 64)), rng.normal(size=(64, 64)), rng.normal(size=(64, 5))]
+    biases = [rng.normal(size=64), rng.normal(size=64), rng.normal(size=5)]
+    return NumpyPolicy(weights, biases, ["tanh", "tanh"])
+
+
+@pytest.fixture()
+def observations():
+    return np.random.default_rng(11).random((32, 26), dtype=np.float32)
+
+
+class TestNumpyPolicy:
+
+    def test_logits_match_reference_mlp(self, policy, observations):
+        w, b = policy.weights, policy.biases
+        hidden = np.tanh(np.tanh(observations @ w[0] + b[0]) @ w[1] + b[1])
+        expected = hidden @ w[2] + b[2]
+
+        np.testing.assert_allclose(policy.logits(observations), expected, rtol=1e-5, atol=1e-5)
+
+    def test_batch_matches_single(self, policy, observations):
+        batched = policy.predict(observations)
+        single = [int(policy.predict(obs)[0]) for obs in observations]
+
+        assert batched.tolist() == single
+
+    def test_valid_mask(self, policy, observations):
+        mask = np.zeros((len(observations), policy.n_actions), dtype=bool)
+        mask[:, 3] = True
+
+        assert (policy.predict(observations, valid_mask=mask) == 3).all()
+
+    def test_round_trip(self, policy, observations, tmp_path):
+        path = str(tmp_path / "policy.npz")
+        policy.save(path)
+
+        restored = NumpyPolicy.load(path)
+
+        assert restored.activations == policy.activations
+        np.testing.assert_array_equal(restored.logits(observations), policy.logits(observations))
+
+    def test_rejects_unknown_activation(self):
+        with pytest.raises(ValueError):
+            NumpyPolicy([np.ones((2, 2)), np.ones((2, 2))], [np.zeros(2), np.zeros(2)], ["gelu"])
+
+
+class TestCommittedPolicy:
+
+    @pytest.fixture(autouse=True)
+    def repo_root(self, monkeypatch):
+        # MLConfig paths are relative to the repository root
+        monkeypatch.chdir(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+    def test_default_scorer_loads_without_stable_baselines3(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "stable_baselines3", None)
+        from packages.ml.inference.scorer import RLRouteScorer
+
+        scorer = RLRouteScorer()
+
+        assert scorer.policy is not None
+        assert scorer.model is None
+        assert scorer.policy.n_actions == MLConfig.MAX_CANDIDATE_ROUTES
+
+    def test_export_matches_checked_in_model(self, observations):
+        pytest.importorskip("stable_baselines3")
+        from stable_baselines3 import PPO
+
+        model = PPO.load(MLConfig.MODEL_PATH, device="cpu")
+        policy = NumpyPolicy.load(MLConfig.POLICY_WEIGHTS_PATH)
+
+        expected, _ = model.predict(observations, deterministic=True)
+        assert policy.predict(observations).tolist() == expected.tolist()
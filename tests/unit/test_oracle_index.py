@@ -0,0 +1,57 @@
+"""
+Unit tests for the hash-based oracle index (applications/capp/capp/services/oracle_service.py).
+
+Covers:
+  - updates merge field by field; earlier metadata is kept
+  - a stale update never overwrites newer fields (per-field timestamp guard)
+  - readers can fetch just the fields they need
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from applications.capp.capp.core.redis import MockRedisClient
+from applications.capp.capp.services.oracle_service import OracleService, TransactionStatus
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture()
+def oracle():
+    return OracleService(redis_client=MockRedisClient())
+
+
+class TestOracleIndex:
+
+    @pytest.mark.asyncio
+    async def test_updates_merge_per_field(self, oracle):
+        await oracle.update_index("0xabc", TransactionStatus.PENDING, {"chain": "aptos"}, observed_at=T0)
+        await oracle.update_index(
+            "0xabc", TransactionStatus.COMPLETED, {"block": 42}, observed_at=T0 + timedelta(seconds=5)
+        )
+
+        entry = await oracle.get_status("0xabc")
+        assert entry["status"] == "COMPLETED"
+        assert entry["meta"] == {"chain": "aptos", "block": 42}
+        assert (await oracle.get_status("0xmissing"))["status"] == "UNKNOWN"
+
+    @pytest.mark.asyncio
+    async def test_stale_update_does_not_overwrite(self, oracle):
+        await oracle.update_index("0xdef", TransactionStatus.COMPLETED, {"block": 7}, observed_at=T0)
+        applied = await oracle.update_index(
+            "0xdef", TransactionStatus.PENDING, {"block": 6, "relayer": "r1"}, observed_at=T0 - timedelta(seconds=1)
+        )
+
+        # Only the field never written before is applied
+        assert applied == 1
+        entry = await oracle.get_status("0xdef")
+        assert entry["status"] == "COMPLETED"
+        assert entry["updated_at"] == T0.isoformat()
+        assert entry["meta"] == {"block": 7, "relayer": "r1"}
+
+    @pytest.mark.asyncio
+    async def test_get_fields(self, oracle):
+        await oracle.update_index("0x123", TransactionStatus.FAILED, {"chain": "base", "gas": 21000}, observed_at=T0)
+
+        fields = await oracle.get_fields("0x123", ["status", "meta.gas", "meta.absent"])
+        assert fields == {"status": "FAILED", "meta.gas": 21000}
@@ -0,0 +1,212 @@
+"""
+Unit tests for keyset pagination and streamed exports over payments
+(applications/capp/capp/repositories/payment.py,
+applications/capp/capp/services/compliance.py).
+
+Covers:
+  - cursor encode/decode round-trip and rejection of malformed cursors
+  - next_cursor only issued for full pages
+  - walking get_by_user page by page across created_at ties
+  - the sent/received UNION in get_by_user, including self-transfers
+  - stream_by_user date bounds and oldest-first order
+  - ComplianceService.stream_report CSV output in chunks
+"""
+import csv
+import io
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from applications.capp.capp.core.database import Base, Payment
+from applications.capp.capp.repositories.payment import (
+    PaymentRepository,
+    decode_cursor,
+    encode_cursor,
+)
+from applications.capp.capp.services.compliance import ComplianceService
+
+USER = uuid4()
+OTHER = uuid4()
+T0 = datetime(2026, 3, 1, 12, 0)
+
+
+def _payment(sender, recipient, created_at, status="completed", amount="10.00"):
+    return Payment(
+        id=uuid4(),
+        reference_id=f"ref-{uuid4().hex[:12]}",
+        amount=Decimal(amount),
+        from_currency="USD",
+        to_currency="KES",
+        fees=Decimal("0.10"),
+        total_cost=Decimal(amount) + Decimal("0.10"),
+        sender_id=sender,
+        recipient_id=recipient,
+        sender_name="Alice",
+        sender_phone="+2348000000001",
+        sender_country="NG",
+        recipient_name="Bob",
+        recipient_phone="+2547000000001",
+        recipient_country="KE",
+        payment_type="personal_remittance",
+        payment_method="mobile_money",
+        status=status,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+def _listing_key(payment):
+    return (payment.created_at, payment.id)
+
+
+@pytest.fixture()
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def payments(session):
+    rows = [
+        # Three payments share a timestamp so pages must break ties on id
+        _payment(USER, OTHER, T0),
+        _payment(OTHER, USER, T0),
+        _payment(USER, OTHER, T0, status="failed"),
+        _payment(USER, OTHER, T0 - timedelta(minutes=5)),
+        _payment(OTHER, USER, T0 - timedelta(minutes=10)),
+        _payment(USER, USER, T0 - timedelta(minutes=15)),
+        _payment(OTHER, USER, T0 - timedelta(days=400)),
+        # Not the user's payment
+        _payment(OTHER, uuid4(), T0 - timedelta(minutes=1)),
+    ]
+    session.add_all(rows)
+    await session.commit()
+    return rows
+
+
+def _users_payments(rows, status=None):
+    mine = [p for p in rows if USER in (p.sender_id, p.recipient_id)]
+    if status:
+        mine = [p for p in mine if p.status == status]
+    return sorted(mine, key=_listing_key, reverse=True)
+
+
+class TestCursor:
+
+    def test_round_trip(self):
+        payment_id = uuid4()
+        created_at = datetime(2026, 3, 1, 12, 0, 0, 123456)
+        cursor = encode_cursor(created_at, payment_id)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (created_at, payment_id)
+
+    def test_same_timestamp_cursors_differ_by_id(self):
+        low, high = UUID(int=1), UUID(int=2)
+        assert encode_cursor(T0, low) != encode_cursor(T0, high)
+        assert decode_cursor(encode_cursor(T0, high))[1] == high
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor(T0, uuid4())[:-4]])
+    def test_malformed_cursor_raises_value_error(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestNextCursor:
+
+    def _page(self, size):
+        return [SimpleNamespace(created_at=T0 - timedelta(minutes=i), id=uuid4()) for i in range(size)]
+
+    def test_full_page_points_at_last_row(self):
+        page = self._page(3)
+        assert decode_cursor(PaymentRepository.next_cursor(page, 3)) == (page[-1].created_at, page[-1].id)
+
+    def test_short_or_empty_page_is_last(self):
+        assert PaymentRepository.next_cursor(self._page(2), 3) is None
+        assert PaymentRepository.next_cursor([], 3) is None
+
+    def test_unbounded_listing_has_no_next_page(self):
+        assert PaymentRepository.next_cursor(self._page(3), None) is None
+
+
+class TestGetByUser:
+
+    async def test_pages_cover_every_payment_once_in_order(self, session, payments):
+        repository = PaymentRepository(session)
+        seen, cursor = [], None
+        while True:
+            page = await repository.get_by_user(USER, limit=2, cursor=cursor)
+            seen.extend(page)
+            cursor = PaymentRepository.next_cursor(page, 2)
+            if cursor is None:
+                break
+
+        assert [p.id for p in seen] == [p.id for p in _users_payments(payments)]
+
+    async def test_page_boundary_inside_a_timestamp_tie(self, session, payments):
+        repository = PaymentRepository(session)
+        tied = sorted((p for p in payments if p.created_at == T0), key=_listing_key, reverse=True)
+
+        first = await repository.get_by_user(USER, limit=1)
+        second = await repository.get_by_user(USER, limit=2, cursor=PaymentRepository.next_cursor(first, 1))
+
+        assert [p.id for p in first + second] == [p.id for p in tied]
+
+    async def test_union_merges_sent_and_received_without_duplicates(self, session, payments):
+        page = await PaymentRepository(session).get_by_user(USER, limit=50)
+        ids = [p.id for p in page]
+
+        assert len(ids) == len(set(ids)) == 7
+        assert {p.id for p in payments if p.sender_id == p.recipient_id == USER} <= set(ids)
+        assert any(p.sender_id == USER for p in page) and any(p.recipient_id == USER for p in page)
+
+    async def test_status_filter_and_offset(self, session, payments):
+        repository = PaymentRepository(session)
+        failed = await repository.get_by_user(USER, status="failed")
+        assert [p.id for p in failed] == [p.id for p in _users_payments(payments, "failed")]
+
+        skipped = await repository.get_by_user(USER, limit=2, offset=3)
+        assert [p.id for p in skipped] == [p.id for p in _users_payments(payments)[3:5]]
+
+
+class TestStreamByUser:
+
+    async def test_streams_oldest_first_within_bounds(self, session, payments):
+        start, end = T0 - timedelta(days=1), T0
+        streamed = [
+            p async for p in PaymentRepository(session).stream_by_user(USER, start, end, batch_size=2)
+        ]
+
+        expected = sorted(
+            (p for p in payments if USER in (p.sender_id, p.recipient_id) and start <= p.created_at < end),
+            key=_listing_key,
+        )
+        assert [p.id for p in streamed] == [p.id for p in expected]
+
+
+class TestStreamReport:
+
+    async def test_csv_report_is_chunked_and_bounded_to_the_year(self, session, payments):
+        chunks = [
+            chunk async for chunk in ComplianceService().stream_report(
+                USER, "csv", T0.year, session, rows_per_chunk=2
+            )
+        ]
+
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        in_year = sorted(
+            (p for p in payments if USER in (p.sender_id, p.recipient_id) and p.created_at.year == T0.year),
+            key=_listing_key,
+        )
+        assert [row["Payment ID"] for row in rows] == [str(p.id) for p in in_year]
+        assert rows[0]["Amount"] == "10.00" and rows[0]["Currency"] == "USD"
+        # Header plus two rows, then two rows per chunk, then the remainder
+        assert len(chunks) == 1 + len(in_year) // 2
+        assert chunks[0].startswith("Date,Payment ID,")
@@ -0,0 +1,110 @@
+"""
+Unit tests for PaymentRepository statistics helpers
+(applications/capp/capp/repositories/payment.py).
+
+Covers:
+  - splitting a statistics range into rollup-backed and live segments
+  - per-bucket rollup deltas for inserts, status transitions and deletes
+  - bulk status transitions adjusting rollups for every moved payment
+"""
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from applications.capp.capp.repositories.payment import (
+    PaymentRepository,
+    _plan_statistics_segments,
+)
+
+
+def _row(status="pending", created_at=datetime(2026, 1, 1, 10, 30), amount="100.00", fees="1.50"):
+    return SimpleNamespace(
+        created_at=created_at,
+        sender_country="KE",
+        recipient_country="UG",
+        status=status,
+        amount=Decimal(amount),
+        fees=Decimal(fees),
+    )
+
+
+class TestPlanStatisticsSegments:
+
+    def test_multi_day_range_uses_day_and_hour_rollups(self):
+        segments = _plan_statistics_segments(
+            datetime(2026, 1, 1, 10, 30), datetime(2026, 1, 5, 3, 15)
+        )
+        assert [source for source, _, _ in segments] == ["live", "hour", "day", "hour", "live"]
+        assert segments[2] == ("day", datetime(2026, 1, 2), datetime(2026, 1, 5))
+
+    def test_short_range_is_aggregated_live(self):
+        segments = _plan_statistics_segments(
+            datetime(2026, 1, 1, 10, 30), datetime(2026, 1, 1, 11, 5)
+        )
+        assert segments == [("live", datetime(2026, 1, 1, 10, 30), datetime(2026, 1, 1, 11, 5))]
+
+    def test_segments_are_contiguous(self):
+        start, end = datetime(2026, 1, 1, 7, 45), datetime(2026, 2, 1, 16, 20)
+        segments = _plan_statistics_segments(start, end)
+        assert segments[0][1] == start
+        assert segments[-1][2] == end
+        for (_, _, prev_end), (_, next_start, _) in zip(segments, segments[1:]):
+            assert prev_end == next_start
+
+    def test_open_start_reads_all_daily_rollups(self):
+        segments = _plan_statistics_segments(None, datetime(2026, 1, 5, 3, 15))
+        assert segments[0] == ("day", None, datetime(2026, 1, 5))
+
+
+class TestRollupDeltas:
+
+    def test_insert_adds_to_hour_and_day_buckets(self):
+        deltas = PaymentRepository._rollup_deltas(None, _row())
+        assert deltas[("hour", datetime(2026, 1, 1, 10), "KE", "UG", "pending")] == [1, Decimal("100.00"), Decimal("1.50")]
+        assert deltas[("day", datetime(2026, 1, 1), "KE", "UG", "pending")] == [1, Decimal("100.00"), Decimal("1.50")]
+
+    def test_status_transition_moves_between_buckets(self):
+        deltas = PaymentRepository._rollup_deltas(_row("pending"), _row("completed"))
+        assert deltas[("hour", datetime(2026, 1, 1, 10), "KE", "UG", "pending")][0] == -1
+        assert deltas[("hour", datetime(2026, 1, 1, 10), "KE", "UG", "completed")][0] == 1
+        assert len(deltas) == 4
+
+    def test_unchanged_payment_produces_no_deltas(self):
+        assert PaymentRepository._rollup_deltas(_row(), _row()) == {}
+
+
+class _ReturnedRow(SimpleNamespace):
+    def _asdict(self):
+        return dict(vars(self))
+
+
+class TestTransitionStatuses:
+
+    async def test_bulk_transition_moves_rollup_buckets(self):
+        from unittest.mock import AsyncMock, MagicMock
+        from uuid import uuid4
+
+        # RETURNING yields the rows as they are after the update
+        rows = [
+            _ReturnedRow(id=uuid4(), **vars(_row("refunded"))),
+            _ReturnedRow(id=uuid4(), **vars(_row("refunded", amount="50.00", fees="0.50"))),
+        ]
+        result = MagicMock()
+        result.all.return_value = rows
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+        session.commit = AsyncMock()
+
+        repository = PaymentRepository(session)
+        repository._apply_rollup_deltas = AsyncMock()
+
+        moved = await repository.transition_statuses(
+            [row.id for row in rows], "settling", "refunded", commit=False
+        )
+
+        assert moved == [row.id for row in rows]
+        session.commit.assert_not_awaited()
+        deltas = repository._apply_rollup_deltas.await_args.args[0]
+        hour = datetime(2026, 1, 1, 10)
+        assert deltas[("hour", hour, "KE", "UG", "settling")] == [-2, Decimal("-150.00"), Decimal("-2.00")]
+        assert deltas[("hour", hour, "KE", "UG", "refunded")] == [2, Decimal("150.00"), Decimal("2.00")]
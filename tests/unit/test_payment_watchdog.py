@@ -0,0 +1,150 @@
+"""
+Unit tests for PaymentWatchdog paging and refunds (packages/core/orchestration/payment_watchdog.py).
+
+Covers:
+  - full scans page by (settled_at, id) keyset
+  - refunds run concurrently up to max_concurrent_refunds
+  - each outcome is persisted as soon as its rollback finishes
+  - a failed status write only leaves that payment unresolved
+  - deadline-index cycles only touch due payments and clear resolved entries
+  - a malformed index entry is dropped without clearing the rest of the page
+  - a failed index query keeps every entry for the next cycle
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from packages.core.orchestration.payment_watchdog import PaymentWatchdog, StuckPayment
+from packages.core.orchestration.payment_workflow_orchestrator import RollbackResult
+
+
+def _stuck(i: int) -> StuckPayment:
+    return StuckPayment(
+        payment_id=f"00000000-0000-0000-0000-{i:012d}",
+        settled_at=datetime(2026, 1, 1) + timedelta(seconds=i),
+    )
+
+
+class _Orchestrator:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def rollback_payment(self, payment_id, completed_steps, context, agents):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return RollbackResult(success=True, payment_id=payment_id, message="ok")
+
+
+class _DeadlineIndex:
+    def __init__(self, payment_ids):
+        self.payment_ids = list(payment_ids)
+
+    async def due(self, now=None, offset=0, limit=500):
+        return self.payment_ids[offset:offset + limit]
+
+    async def clear(self, *payment_ids):
+        self.payment_ids = [pid for pid in self.payment_ids if pid not in payment_ids]
+
+
+def _watchdog(orchestrator, stuck, **kwargs):
+    watchdog = PaymentWatchdog(orchestrator, db_session_factory=None, **kwargs)
+    watchdog.queries = []
+    watchdog.persisted = []
+    watchdog.fail_persist = set()
+
+    async def find(cutoff, after=None, limit=None, payment_ids=None):
+        watchdog.queries.append(after)
+        rows = [s for s in stuck if after is None or (s.settled_at, s.payment_id) > after]
+        if payment_ids is not None:
+            rows = [s for s in rows if s.payment_id in payment_ids]
+        return rows[:limit] if limit else rows
+
+    async def persist(outcomes):
+        if any(pid in watchdog.fail_persist for pid in outcomes):
+            return False
+        watchdog.persisted.append(sorted(outcomes))
+        for pid in outcomes:
+            stuck[:] = [s for s in stuck if s.payment_id != pid]
+        return True
+
+    watchdog._find_stuck_payments = find
+    watchdog._persist_refund_statuses = persist
+    return watchdog
+
+
+class TestPaymentWatchdog:
+
+    @pytest.mark.asyncio
+    async def test_full_scan_pages_and_caps_concurrency(self):
+        orchestrator = _Orchestrator(delay=0.01)
+        stuck = [_stuck(i) for i in range(25)]
+        watchdog = _watchdog(orchestrator, stuck, page_size=10, max_concurrent_refunds=4)
+
+        totals = await watchdog.run_once()
+
+        assert totals == {"found": 25, "refunded": 25, "refund_failed": 0}
+        assert orchestrator.peak == 4
+        assert len(watchdog.persisted) == 25
+        assert all(len(saved) == 1 for saved in watchdog.persisted)
+        assert watchdog.queries[0] is None and len(watchdog.queries) == 3
+
+    @pytest.mark.asyncio
+    async def test_deadline_index_cycle(self):
+        stuck = [_stuck(i) for i in range(5)]
+        index = _DeadlineIndex([s.payment_id for s in stuck[:3]] + ["00000000-0000-0000-0000-999999999999"])
+        watchdog = _watchdog(_Orchestrator(), stuck, deadline_index=index, full_scan_every=10)
+        watchdog._cycles = 1  # skip the boot-time full scan
+
+        totals = await watchdog.run_once()
+
+        assert totals["found"] == 3
+        assert index.payment_ids == []  # resolved and stale entries cleared
+        assert len(stuck) == 2  # payments not yet due were never touched
+
+    @pytest.mark.asyncio
+    async def test_failed_status_write_only_affects_that_payment(self):
+        stuck = [_stuck(i) for i in range(4)]
+        index = _DeadlineIndex([s.payment_id for s in stuck])
+        watchdog = _watchdog(_Orchestrator(), stuck, deadline_index=index, full_scan_every=10)
+        watchdog._cycles = 1
+        watchdog.fail_persist = {stuck[1].payment_id}
+
+        totals = await watchdog.run_once()
+
+        assert totals == {"found": 4, "refunded": 3, "refund_failed": 0}
+        assert index.payment_ids == [_stuck(1).payment_id]
+        assert [s.payment_id for s in stuck] == [_stuck(1).payment_id]
+
+    @pytest.mark.asyncio
+    async def test_malformed_index_entry_only_drops_itself(self):
+        stuck = [_stuck(i) for i in range(2)]
+        index = _DeadlineIndex([stuck[0].payment_id, "not-a-uuid", stuck[1].payment_id])
+        watchdog = _watchdog(_Orchestrator(), stuck, deadline_index=index, full_scan_every=10)
+        watchdog._cycles = 1
+
+        totals = await watchdog.run_once()
+
+        assert totals["refunded"] == 2
+        assert index.payment_ids == []
+        assert stuck == []
+
+    @pytest.mark.asyncio
+    async def test_failed_index_query_keeps_entries(self):
+        stuck = [_stuck(i) for i in range(3)]
+        index = _DeadlineIndex([s.payment_id for s in stuck])
+        watchdog = _watchdog(_Orchestrator(), stuck, deadline_index=index, full_scan_every=10)
+        watchdog._cycles = 1
+
+        async def failing_find(cutoff, after=None, limit=None, payment_ids=None):
+            return None
+
+        watchdog._find_stuck_payments = failing_find
+        totals = await watchdog.run_once()
+
+        assert totals["found"] == 0
+        assert index.payment_ids == [s.payment_id for s in stuck]
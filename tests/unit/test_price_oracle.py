@@ -0,0 +1,84 @@
+"""
+Unit tests for batched price fetches (apps/api/app/services/price_oracle.py).
+
+Covers:
+  - one MGET, one upstream batch and one write-back pipeline per get_prices call
+  - write-back TTLs are jittered around the configured TTL
+  - concurrent callers share in-flight upstream fetches (single-flight)
+"""
+import asyncio
+from collections import Counter
+
+import pytest
+
+from apps.api.app.services.price_oracle import PriceOracle, StaticPriceSource
+
+SYMBOLS = [f"TOK{i}" for i in range(20)]
+
+
+class _FakeRedis:
+    """Records round trips; stores values like a decode_responses client."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.round_trips = Counter()
+
+    async def mget(self, keys):
+        self.round_trips["mget"] += 1
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    async def execute(self):
+        self.redis.round_trips["pipeline"] += 1
+        for key, ttl, value in self.commands:
+            self.redis.data[key] = value
+            self.redis.ttls[key] = ttl
+        return [True] * len(self.commands)
+
+
+class TestPriceOracleBatching:
+
+    @pytest.mark.asyncio
+    async def test_one_round_trip_per_stage_with_jittered_ttls(self):
+        redis = _FakeRedis()
+        source = StaticPriceSource({sym: float(i + 1) for i, sym in enumerate(SYMBOLS)})
+        oracle = PriceOracle(cache_ttl=60, source=source, redis_client=redis, ttl_jitter=0.2)
+
+        prices = await oracle.get_prices(SYMBOLS)
+        assert prices == {sym: float(i + 1) for i, sym in enumerate(SYMBOLS)}
+        assert source.calls == [SYMBOLS]
+        assert redis.round_trips == {"mget": 1, "pipeline": 1}
+
+        ttls = list(redis.ttls.values())
+        assert all(48 <= ttl <= 72 for ttl in ttls)
+        assert len(set(ttls)) > 1
+
+        # Warm cache: a single MGET, no upstream call, no writes
+        assert await oracle.get_prices(SYMBOLS) == prices
+        assert len(source.calls) == 1
+        assert redis.round_trips == {"mget": 2, "pipeline": 1}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_upstream_fetches(self):
+        source = StaticPriceSource({sym: 1.0 for sym in SYMBOLS}, delay=0.01)
+        oracle = PriceOracle(source=source, redis_client=_FakeRedis())
+
+        requests = [SYMBOLS[i:i + 5] for i in range(0, 16, 3)] * 3
+        results = await asyncio.gather(*(oracle.get_prices(syms) for syms in requests))
+
+        assert all(set(result) == set(syms) for result, syms in zip(results, requests))
+        fetched = Counter(sym for call in source.calls for sym in call)
+        assert set(fetched.values()) == {1}
+        assert not oracle._inflight
@@ -0,0 +1,169 @@
+"""
+Unit tests for QuantileSketch (packages/core/performance/sketch.py).
+
+Covers:
+  - quantile estimates stay within the configured relative accuracy
+  - exact count / sum / min / max / mean / std_dev tracking
+  - merging sketches recorded on separate workers
+  - removing values tracks a sliding window
+  - to_dict / from_dict round trip
+  - bounded memory via bucket collapsing
+  - raw timer samples are opt-in; tracker buckets are evicted
+"""
+import random
+import statistics
+
+import pytest
+
+from packages.core.performance.sketch import QuantileSketch
+
+
+def _true_quantile(sorted_values, q):
+    return sorted_values[int(q * (len(sorted_values) - 1))]
+
+
+@pytest.fixture()
+def samples():
+    rng = random.Random(42)
+    return [rng.expovariate(2.0) for _ in range(20_000)]
+
+
+class TestQuantileSketch:
+
+    def test_empty_sketch(self):
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.percentiles() == {}
+        assert sketch.std_dev == 0.0
+
+    def test_quantiles_within_relative_accuracy(self, samples):
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in samples:
+            sketch.add(value)
+
+        ordered = sorted(samples)
+        for q in (0.5, 0.9, 0.95, 0.99):
+            expected = _true_quantile(ordered, q)
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.02)
+
+    def test_exact_moments(self, samples):
+        sketch = QuantileSketch()
+        for value in samples:
+            sketch.add(value)
+
+        assert sketch.count == len(samples)
+        assert sketch.sum == pytest.approx(sum(samples))
+        assert sketch.min == min(samples)
+        assert sketch.max == max(samples)
+        assert sketch.mean == pytest.approx(statistics.mean(samples))
+        assert sketch.std_dev == pytest.approx(statistics.stdev(samples))
+
+    def test_zero_and_negative_values(self):
+        sketch = QuantileSketch()
+        for value in (-2.0, -1.0, 0.0, 1.0, 2.0):
+            sketch.add(value)
+
+        assert sketch.quantile(0.0) == pytest.approx(-2.0, rel=0.01)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(2.0, rel=0.01)
+
+    def test_merge_matches_single_sketch(self, samples):
+        combined = QuantileSketch()
+        left, right = QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(samples):
+            combined.add(value)
+            (left if i % 2 else right).add(value)
+
+        left.merge(right)
+
+        assert left.count == combined.count
+        assert left.std_dev == pytest.approx(combined.std_dev)
+        assert left.percentiles() == pytest.approx(combined.percentiles())
+
+    def test_remove_tracks_sliding_window(self, samples):
+        sketch = QuantileSketch()
+        for value in samples:
+            sketch.add(value)
+        for value in samples[:-200]:
+            sketch.remove(value)
+
+        window = sorted(samples[-200:])
+        assert sketch.count == 200
+        assert sketch.sum == pytest.approx(sum(window))
+        assert sketch.mean == pytest.approx(statistics.mean(window))
+        assert sketch.std_dev == pytest.approx(statistics.stdev(window), rel=1e-6)
+        assert sketch.quantile(0.9) == pytest.approx(_true_quantile(window, 0.9), rel=0.02)
+
+        for value in window:
+            sketch.remove(value)
+        assert sketch.count == 0
+        assert sketch.quantile(0.5) is None
+
+    def test_merge_rejects_different_accuracy(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(relative_accuracy=0.01).merge(QuantileSketch(relative_accuracy=0.05))
+
+    def test_round_trip(self, samples):
+        sketch = QuantileSketch()
+        for value in samples:
+            sketch.add(value)
+
+        restored = QuantileSketch.from_dict(sketch.to_dict())
+
+        assert restored.count == sketch.count
+        assert restored.percentiles() == sketch.percentiles()
+
+    def test_memory_is_bounded(self):
+        sketch = QuantileSketch(max_bins=64)
+        for value in range(1, 100_000):
+            sketch.add(float(value))
+
+        assert len(sketch.to_dict()["positive"]["bins"]) <= 64
+        assert sketch.quantile(0.99) == pytest.approx(99_000, rel=0.02)
+
+
+class TestCollectorAndTrackerIntegration:
+
+    @pytest.mark.asyncio
+    async def test_timer_samples_only_kept_when_requested(self):
+        from packages.core.performance.metrics_collector import MetricsCollector, MetricsCollectorConfig
+
+        default = MetricsCollector(MetricsCollectorConfig(enabled=True, collection_interval=3600))
+        retaining = MetricsCollector(MetricsCollectorConfig(
+            enabled=True, collection_interval=3600, retain_distribution_samples=True
+        ))
+        for collector in (default, retaining):
+            collector.record_timer("settle_seconds", 0.25)
+            collector.record_timer("settle_seconds", 0.75)
+
+        assert await default.get_metric_data("settle_seconds") == []
+        assert default.get_sketch("settle_seconds").count == 2
+        data = await retaining.get_metric_data("settle_seconds")
+        assert [v.value for v in data] == [0.25, 0.75]
+        assert retaining.get_sketch("settle_seconds").count == 2
+
+        await default.shutdown()
+        await retaining.shutdown()
+
+    def test_expired_buckets_are_evicted(self):
+        from datetime import datetime, timedelta, timezone
+        from packages.core.performance.tracker import PerformanceTracker
+
+        tracker = PerformanceTracker(enabled=False)
+        now = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+        old = now - timedelta(days=30)
+        for ts, hourly, daily in (
+            (old, old.strftime("%Y-%m-%d-%H"), old.strftime("%Y-%m-%d")),
+            (now, now.strftime("%Y-%m-%d-%H"), now.strftime("%Y-%m-%d")),
+        ):
+            tracker._hourly_summaries[hourly] = object()
+            tracker._daily_summaries[daily] = object()
+            tracker._bucket_sketch(tracker._hourly_sketches, hourly).add(1.0)
+            tracker._bucket_sketch(tracker._daily_sketches, daily).add(1.0)
+
+        tracker._evict_expired_buckets(now)
+
+        assert list(tracker._hourly_summaries) == [now.strftime("%Y-%m-%d-%H")]
+        assert list(tracker._hourly_sketches) == [now.strftime("%Y-%m-%d-%H")]
+        assert list(tracker._daily_summaries) == [now.strftime("%Y-%m-%d")]
+        assert list(tracker._daily_sketches) == [now.strftime("%Y-%m-%d")]
@@ -0,0 +1,93 @@
+"""
+Unit tests for ReconciliationService (applications/capp/capp/services/reconciliation.py).
+
+Covers:
+  - settlements are folded into checkpointed running sums per wallet
+  - later runs only aggregate rows past the watermark
+  - per-wallet drift report, with a timed-out chain degrading only its wallet
+"""
+import asyncio
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from applications.capp.capp.services.reconciliation import HotWallet, ReconciliationService
+
+
+class _DictCache:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key, default=None):
+        return self.store.get(key, default)
+
+    async def set(self, key, value, ttl=None):
+        self.store[key] = value
+        return True
+
+
+APT = HotWallet("APTOS", "0xa1", "APT", opening_balance=Decimal("100"))
+USDC_A = HotWallet("POLYGON", "0xb1", "USDC", token_address="0xusdc", opening_balance=Decimal("2000"))
+USDC_B = HotWallet("POLYGON", "0xb2", "USDC", token_address="0xusdc", opening_balance=Decimal("500"))
+
+
+@pytest.fixture()
+def svc():
+    inst = ReconciliationService.__new__(ReconciliationService)
+    inst.cache = _DictCache()
+    inst.wallets = [APT, USDC_A, USDC_B]
+    inst.fetch_timeout = 0.05
+    inst.max_concurrent_fetches = 8
+    inst.confirmation_lag = timedelta(seconds=0)
+    inst.aptos = AsyncMock()
+    inst.polygon = AsyncMock()
+    inst.settled_calls = []
+
+    batches = [
+        [("aptos", "APT", None, Decimal("10"), 3), ("POLYGON", "USDC", "0xB2", Decimal("50"), 1)],
+        [("POLYGON", "USDC", None, Decimal("200"), 2)],
+    ]
+
+    async def settled_between(low, high):
+        inst.settled_calls.append(low)
+        return batches.pop(0) if batches else []
+
+    inst._settled_between = settled_between
+    return inst
+
+
+class TestReconciliationService:
+
+    @pytest.mark.asyncio
+    async def test_running_sums_are_incremental(self, svc):
+        first = await svc.get_internal_ledger_balances()
+        second = await svc.get_internal_ledger_balances()
+
+        assert first == {APT.key: Decimal("90"), USDC_A.key: Decimal("2000"), USDC_B.key: Decimal("450")}
+        # NULL source address is attributed to the chain's primary wallet
+        assert second[USDC_A.key] == Decimal("1800")
+        # The second run starts from the first run's watermark
+        assert svc.settled_calls[1] > svc.settled_calls[0]
+        assert svc.cache.store[svc.CHECKPOINT_KEY]["rows_applied"] == 6
+
+    @pytest.mark.asyncio
+    async def test_per_wallet_report(self, svc):
+        async def slow_token_balance(token_address, address):
+            if address == "0xb2":
+                await asyncio.sleep(1)
+            return 1500.0
+
+        svc.aptos.get_account_balance = AsyncMock(return_value=Decimal("90"))
+        svc.polygon.get_token_balance = slow_token_balance
+
+        report = await svc.check_integrity()
+        checks = {check["address"]: check for check in report["checks"]}
+
+        assert checks["0xa1"]["status"] == "OK"
+        assert checks["0xb1"]["status"] == "DRIFT_DETECTED"
+        assert checks["0xb1"]["drift"] == -500.0
+        assert checks["0xb2"]["status"] == "ERROR"
+        assert report["status"] == "CRITICAL_DRIFT"
+        assert report["elapsed_ms"] < 1000
@@ -0,0 +1,80 @@
+"""
+Unit tests for the typed Redis codec (packages/integrations/data/codec.py)
+and RedisCache bulk operations (applications/capp/capp/core/redis.py).
+
+Covers:
+  - Decimal / UUID / datetime / registered Enum values round-trip as themselves
+  - integers beyond msgpack's 64-bit range (wei amounts) round-trip and cache
+  - legacy JSON values still decode; pickle payloads are never loaded
+  - get_many / set_many / delete_many against the mock client
+"""
+import pickle
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("msgpack")
+
+from packages.integrations.data import codec
+from applications.capp.capp.core.redis import MockRedisClient, RedisCache
+
+
+@codec.register_enum
+class _Status(str, Enum):
+    PENDING = "pending"
+    SETTLED = "settled"
+
+
+class TestTypedCodec:
+
+    def test_round_trip_and_legacy_values(self):
+        payment = {
+            "payment_id": uuid4(),
+            "amount": Decimal("1250.75"),
+            "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "status": _Status.SETTLED,
+            "route": ("mpesa", "aptos"),
+        }
+        encoded = codec.encode(payment)
+        assert encoded[:2] == bytes((codec.CODEC_MARKER, codec.CODEC_VERSION))
+
+        decoded = codec.decode(encoded)
+        assert decoded == {**payment, "route": ["mpesa", "aptos"]}
+        assert type(decoded["status"]) is _Status
+
+        assert codec.decode(b'{"amount": 10}') == {"amount": 10}
+        assert codec.decode(b"LOCKED") == "LOCKED"
+        with pytest.raises(codec.CodecError):
+            codec.decode(pickle.dumps(payment))
+        with pytest.raises(TypeError):
+            codec.encode(object())
+
+
+    def test_large_integers_round_trip(self):
+        values = [2**64 - 1, 2**64, 10**30, -(2**63), -(2**63) - 1, -(10**30)]
+        assert codec.decode(codec.encode(values)) == values
+        assert codec.decode(codec.encode({"wei": 5 * 10**24}))["wei"] == 5 * 10**24
+
+
+class TestRedisCacheBulk:
+
+    @pytest.mark.asyncio
+    async def test_set_large_wei_amount(self):
+        cache = RedisCache(MockRedisClient())
+        assert await cache.set("transfer:1", {"amount_wei": 123 * 10**24})
+        assert await cache.get("transfer:1") == {"amount_wei": 123 * 10**24}
+
+    @pytest.mark.asyncio
+    async def test_get_set_delete_many(self):
+        cache = RedisCache(MockRedisClient())
+        values = {f"payment:{i}": {"amount": Decimal(i)} for i in range(5)}
+
+        assert await cache.set_many(values, ttl=60)
+        assert await cache.get_many(list(values) + ["payment:missing"]) == values
+        assert await cache.get("payment:3") == {"amount": Decimal(3)}
+
+        assert await cache.delete_many(["payment:0", "payment:1", "payment:missing"]) == 2
+        assert set(await cache.get_many(values)) == {"payment:2", "payment:3", "payment:4"}